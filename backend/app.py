@@ -1,190 +1,121 @@
 # backend/app.py
+#
+# Fábrica de la aplicación: importar este módulo no toca la BD ni crea nada.
+#   gunicorn:   gunicorn -c gunicorn.conf.py          (usa wsgi:app)
+#   flask CLI:  FLASK_APP=app flask <comando>         (Flask encuentra create_app)
+#   esquema:    flask init-db (crea la BD nueva o migra la existente, ver README); ya no se crea al importar
 
-from flask import Flask, jsonify, request, redirect, url_for, session
+from flask import Flask, jsonify
 import os
-import requests
-import json
 from dotenv import load_dotenv
-from flask_migrate import Migrate
+
+load_dotenv() # Antes de importar Config: sus valores se leen del entorno al importarse
+
+import click
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-import urllib.parse # <-- NUEVA IMPORTACIÓN!
+from flask_jwt_extended import JWTManager, jwt_required
 from config import Config # CORRECTO: Importación directa de config
 
-load_dotenv() # Cargar variables de entorno al iniciar la aplicación
-
 from extensions import db # <-- ¡CORREGIDO! Quitado 'backend.'
+# Todos los modelos se importan para que db.metadata (init-db, migraciones) los conozca
 from models.user import User # <-- ¡CORREGIDO! Quitado 'backend.'
-# from models.podcast import Podcast # Puedes quitar esto si no lo usas directamente aquí
+from models.podcast import Podcast
 from models.comment import Comment # <-- ¡CORREGIDO! Quitado 'backend.'
-
+from models.catalog_version import CatalogVersion, CatalogChange
+from models.blob import Blob
+from models.upload_session import UploadSession
+from models.play_stats import PlayEvent, PodcastPlaysHourly, PodcastPlaysDaily
+from models.trending import PodcastTrending, TrendingState
+import models.podcast_search # Registra el índice de búsqueda (FTS5 / tsvector) para db.create_all()
+
+from routes.auth_routes import auth_bp
 from routes.upload_routes import upload_bp # <-- ¡CORREGIDO! Quitado 'backend.'
 from routes.podcast_routes import podcast_bp # <-- ¡CORREGIDO! Quitado 'backend.'
 from routes.comment_routes import comment_bp # <-- ¡CORREGIDO! Quitado 'backend.'
-
-app = Flask(__name__)
-app.config.from_object(Config) # Cambiado de from_pyfile a from_object
-print(f"DEBUG APP: SQLALCHEMY_DATABASE_URI cargado: {app.config.get('SQLALCHEMY_DATABASE_URI')}") # Mantenemos el debug print
-
-instance_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
-if not os.path.exists(instance_path):
-    os.makedirs(instance_path)
-    print(f"DEBUG APP: Creada carpeta de instancia: {instance_path}")
-
-app.secret_key = app.config['SECRET_KEY']
-
-CORS(app, supports_credentials=True, origins=["http://localhost:3000", "https://ambaria-frontend.onrender.com"])
-
-db.init_app(app)
-migrate = Migrate(app, db)
-
-jwt = JWTManager(app)
-
-# ==========================================================
-# CÓDIGO PARA INICIALIZAR LA BASE DE DATOS EN RENDER (PostgreSQL)
-# Esto creará las tablas si no existen. Es seguro ejecutarlo.
-# ==========================================================
-with app.app_context():
-    db.create_all()
-    print("DEBUG APP: Database tables checked/created.")
-# ==========================================================
-
-
-# Configuración de Google OAuth 2.0 (obtenidas de la Consola de Google Cloud)
-app.config['GOOGLE_CLIENT_ID'] = os.environ.get('GOOGLE_CLIENT_ID')
-app.config['GOOGLE_CLIENT_SECRET'] = os.environ.get('GOOGLE_CLIENT_SECRET')
-app.config['GOOGLE_AUTHORIZE_URL'] = 'https://accounts.google.com/o/oauth2/auth'
-app.config['GOOGLE_TOKEN_URL'] = 'https://oauth2.googleapis.com/token'
-app.config['GOOGLE_USERINFO_URL'] = 'https://www.googleapis.com/oauth2/v1/userinfo'
-app.config['GOOGLE_REDIRECT_URI'] = os.environ.get('GOOGLE_REDIRECT_URI') or 'http://localhost:5000/auth/google/callback'
-# IMPORTANTE: En Render, esta URL deberá coincidir con la Public URL de tu backend + /auth/google/callback
-# Ejemplo: https://ambaria-backend-xxxx.onrender.com/auth/google/callback
-
-# Registrar Blueprints
-app.register_blueprint(upload_bp)
-app.register_blueprint(podcast_bp)
-app.register_blueprint(comment_bp)
-
-# --- Rutas de Autenticación con Google OAuth ---
-@app.route('/auth/google')
-def google_oauth_login():
-    """Redirige al usuario a la página de inicio de sesión de Google."""
-    print("DEBUG BACKEND: Iniciando flujo de autenticación de Google.")
-    params = {
-        'response_type': 'code',
-        'client_id': app.config['GOOGLE_CLIENT_ID'],
-        'redirect_uri': app.config['GOOGLE_REDIRECT_URI'],
-        'scope': 'openid email profile',
-        'access_type': 'offline',
-        'prompt': 'consent' # Opcional: 'select_account' o 'consent' si quieres forzar la selección de cuenta o el consentimiento
-    }
-    return redirect(f"{app.config['GOOGLE_AUTHORIZE_URL']}?{urllib.parse.urlencode(params)}")
-
-@app.route('/auth/google/callback')
-def google_oauth_callback():
-    """Maneja la devolución de llamada de Google OAuth."""
-    code = request.args.get('code')
-    if not code:
-        print("DEBUG BACKEND: No se recibió código de autorización de Google.")
-        return jsonify({"error": "No se recibió el código de autorización."}), 400
-
-    # Intercambiar código por token de acceso
-    token_params = {
-        'code': code,
-        'client_id': app.config['GOOGLE_CLIENT_ID'],
-        'client_secret': app.config['GOOGLE_CLIENT_SECRET'],
-        'redirect_uri': app.config['GOOGLE_REDIRECT_URI'],
-        'grant_type': 'authorization_code'
-    }
-    token_response = requests.post(app.config['GOOGLE_TOKEN_URL'], data=token_params)
-    token_data = token_response.json()
-
-    if 'access_token' not in token_data:
-        print(f"DEBUG BACKEND: Error al obtener token de acceso: {token_data.get('error_description', token_data)}")
-        return jsonify({"error": "Error al obtener el token de acceso de Google."}), 400
-
-    access_token = token_data['access_token']
-
-    # Obtener información del usuario
-    userinfo_response = requests.get(app.config['GOOGLE_USERINFO_URL'], headers={'Authorization': f'Bearer {access_token}'})
-    user_info = userinfo_response.json()
-
-    if user_info:
-        user = User.query.filter_by(google_id=user_info['id']).first()
-        if not user:
-            # Crear un nuevo usuario si no se encuentra
-            user = User(
-                google_id=user_info['id'],
-                email=user_info['email'],
-                name=user_info.get('name'),
-                profile_picture=user_info.get('picture')
-            )
-            db.session.add(user)
-            db.session.commit()
-            print(f"DEBUG BACKEND: Nuevo usuario creado: {user.email}")
-        else:
-            print(f"DEBUG BACKEND: Usuario existente encontrado: {user.email}")
-            # Opcionalmente, actualizar la información del usuario si cambia (ej. foto de perfil)
-            user.name = user_info.get('name')
-            user.profile_picture = user_info.get('picture')
-            db.session.commit()
-
-        # Generar token JWT
-        access_token = create_access_token(
-            identity=str(user.id),
-            additional_claims={
-                "email": user.email,
-                "profile_picture": user.profile_picture
-            }
-        )
-
-        frontend_redirect_url = os.environ.get('FRONTEND_URL', 'http://localhost:3000') + '/auth-callback'
-        print(f"DEBUG BACKEND: Redirigiendo a frontend: {frontend_redirect_url}?token={access_token}")
-        return redirect(f"{frontend_redirect_url}?token={access_token}")
-    else:
-        print("DEBUG BACKEND: No se pudo obtener la información del usuario de Google.")
-        return jsonify({"error": "No se pudo obtener la información del usuario de Google."}), 400
-
-@app.route('/profile', methods=['GET'])
-@jwt_required()
-def get_profile():
-    current_user_id = get_jwt_identity()
-    print(f"DEBUG BACKEND: Intentando obtener perfil para user_id: {current_user_id}")
-
-    try:
-        user_id_int = int(current_user_id)
-    except ValueError:
-        return jsonify({"message": "ID de usuario inválido en el token."}), 400
-
-    user = User.query.get(user_id_int)
-
-    if user:
-        print(f"DEBUG BACKEND: Usuario encontrado: {user.name}")
+from routes.upload_session_routes import upload_session_bp
+from routes.play_routes import play_bp
+from commands import register_commands
+from services.users import user_cache_stats
+from services.catalog_cache import catalog_cache_stats
+from services.db_routing import init_replica_routing, replica_configured, replica_stats
+from services.logs import configure_logging
+from services.serializers import configure_json
+from services.metrics import init_metrics, register_collector
+
+
+def _cache_metrics():
+    # Cachés por worker y reparto de lecturas con la réplica, para /metrics
+    samples = []
+    for cache, stats in (('users', user_cache_stats()), ('catalog', catalog_cache_stats())):
+        labels = (('cache', cache),)
+        samples += [('ambaria_cache_entries', labels, stats['size']),
+                    ('ambaria_cache_hits_total', labels, stats['hits']),
+                    ('ambaria_cache_misses_total', labels, stats['misses'])]
+    if replica_configured():
+        samples += [('ambaria_replica_routing_total', (('target', target),), count)
+                    for target, count in replica_stats().items()]
+    return samples
+
+
+def create_app(config=Config):
+    app = Flask(__name__)
+    app.config.from_object(config) # Cambiado de from_pyfile a from_object
+    app.secret_key = app.config['SECRET_KEY']
+    os.makedirs(app.instance_path, exist_ok=True)
+    configure_logging(app)
+    # jsonify con orjson (mismo JSON que el proveedor de Flask, más rápido)
+    configure_json(app)
+
+    CORS(app, supports_credentials=True, origins=["http://localhost:3000", "https://ambaria-frontend.onrender.com"])
+
+    db.init_app(app)
+    # Flask-Migrate (y con él Alembic) solo hace falta para "flask db ...": los workers no lo importan
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
+
+    JWTManager(app)
+    # Cookie de read-your-writes para las lecturas desde la réplica
+    init_replica_routing(app)
+
+    # Configuración de Google OAuth 2.0 en Config (GOOGLE_CLIENT_ID, GOOGLE_REDIRECT_URI, ...).
+    # IMPORTANTE: En Render, GOOGLE_REDIRECT_URI deberá coincidir con la Public URL de tu backend + /auth/google/callback
+    # Ejemplo: https://ambaria-backend-xxxx.onrender.com/auth/google/callback
+
+    # Registrar Blueprints
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(upload_bp)
+    app.register_blueprint(podcast_bp)
+    app.register_blueprint(comment_bp)
+    app.register_blueprint(upload_session_bp)
+    app.register_blueprint(play_bp)
+
+    register_commands(app)
+
+    # Latencia, SQL y tamaños por endpoint en /metrics (formato Prometheus)
+    init_metrics(app)
+    register_collector(_cache_metrics)
+
+    # --- RUTA PARA CONSULTAR LAS CACHÉS EN MEMORIA DE ESTE WORKER (GET) ---
+    # Aciertos/fallos para dimensionar USER_CACHE_* y CATALOG_CACHE_*; cada worker tiene las suyas.
+    @app.route('/stats/cache', methods=['GET'])
+    @jwt_required()
+    def get_cache_stats():
         return jsonify({
-            "message": f"¡Bienvenido, {user.name}!",
-            "user_id": user.id,
-            "email": user.email,
-            "profile_picture": user.profile_picture
-        })
-    else:
-        print(f"DEBUG BACKEND: Usuario con ID {current_user_id} no encontrado en la base de datos.")
-        return jsonify({"message": "Usuario no encontrado."}), 404
-
-@app.route('/logout', methods=['POST'])
-@jwt_required()
-def logout():
-    session.pop('user_id', None)
-    session.pop('google_id', None)
-    session.pop('email', None)
-
-    return jsonify({"message": "Sesión cerrada con éxito."})
-
-# --- Mantener tus rutas existentes (solo para claridad, ya están registradas como Blueprints): ---
-@app.route('/')
-def hello():
-    return jsonify({"message": "Bienvenido a la API de Ambaria."}), 200
+            "pid": os.getpid(),
+            "users": user_cache_stats(),
+            "catalog": catalog_cache_stats()
+        }), 200
+
+    @app.route('/')
+    def hello():
+        return jsonify({"message": "Bienvenido a la API de Ambaria."}), 200
+
+    return app
+
 
 if __name__ == '__main__':
+    app = create_app()
     if not app.config['GOOGLE_CLIENT_ID'] or not app.config['GOOGLE_CLIENT_SECRET']:
         print("ADVERTENCIA: Las variables de entorno GOOGLE_CLIENT_ID y GOOGLE_CLIENT_SECRET no están configuradas.")
         print("La autenticación de Google no funcionará correctamente. Crea un archivo .env o configúralas manualmente.")
@@ -192,4 +123,4 @@ if __name__ == '__main__':
         print("ADVERTENCIA: La variable de entorno JWT_SECRET_KEY no está configurada.")
         print("Los tokens JWT no se firmarán correctamente. Crea un archivo .env o configúrala manualmente.")
 
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=True, port=5000)
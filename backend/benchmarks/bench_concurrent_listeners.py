@@ -0,0 +1,210 @@
+# backend/benchmarks/bench_concurrent_listeners.py
+"""
+Oyentes simultáneos de audio con workers sync frente a workers gevent (gunicorn.conf.py).
+
+Para cada modo arranca gunicorn con el mismo número de workers (misma memoria: se mide
+el RSS de los workers en reposo y en el pico) y abre a la vez --listeners conexiones a
+GET /uploads/<archivo> que leen a ritmo de reproducción (--read-kbps) durante
+--listen-seconds, como haría un reproductor. El archivo es mayor que los búferes de
+los sockets, así que el servidor no puede soltarlo de golpe y cada oyente ocupa su
+conexión hasta que se va.
+
+Mide:
+  - oyentes atendidos: los que reciben el primer byte en menos de --ttfb-limit segundos
+  - tiempo hasta el primer byte (p50/p95/máx)
+  - latencia de GET / lanzado en paralelo cada --probe-interval segundos (una petición
+    normal mientras el servidor está lleno de oyentes)
+  - RSS de los workers y oyentes atendidos por cada 100 MB
+
+Uso:
+    python benchmarks/bench_concurrent_listeners.py --workers 2 --listeners 64
+    python benchmarks/bench_concurrent_listeners.py --modes gevent --listeners 500 --file-mb 64
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Config.SERVER_NAME: las peticiones deben llegar con este Host
+HOST_HEADER = 'localhost:5000'
+AUDIO_FILENAME = 'listener-test.mp3'
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _worker_pids(master_pid):
+    try:
+        with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+            return [int(pid) for pid in f.read().split()]
+    except OSError:
+        return []
+
+
+def _rss_mb(pids):
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+        except OSError:
+            pass
+    return round(total / 1024, 1)
+
+
+def _get(port, path, timeout):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", headers={'Host': HOST_HEADER})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def start_server(mode, args, env, port):
+    env = dict(env, PORT=str(port), WEB_CONCURRENCY=str(args.workers), GUNICORN_WORKER_CLASS=mode,
+               GUNICORN_THREADS='1', GUNICORN_TIMEOUT='300')
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'], cwd=BACKEND_DIR,
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if len(_worker_pids(process.pid)) >= args.workers:
+            try:
+                # Una petición por worker para que todos hayan cargado lo mismo antes de medir
+                for _ in range(args.workers * 2):
+                    _get(port, '/', 2)
+                return process
+            except OSError:
+                pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit(f"gunicorn ({mode}) no arrancó en el puerto {port}.")
+
+
+def listener(port, args, results, index):
+    """Conexión que pide el audio y lo lee a ritmo de reproducción."""
+    chunk = 4096
+    interval = chunk / (args.read_kbps * 1024)
+    started = time.perf_counter()
+    ttfb, received = None, 0
+    sock = socket.socket()
+    # Búfer de recepción pequeño: el servidor solo puede adelantarse unos pocos KB
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 32 * 1024)
+    sock.settimeout(args.listen_seconds)
+    try:
+        sock.connect(('127.0.0.1', port))
+        sock.sendall(f"GET /uploads/{AUDIO_FILENAME} HTTP/1.1\r\nHost: {HOST_HEADER}\r\n"
+                     f"Connection: close\r\n\r\n".encode())
+        while time.perf_counter() - started < args.listen_seconds:
+            data = sock.recv(chunk)
+            if not data:
+                break
+            if ttfb is None:
+                ttfb = time.perf_counter() - started
+            received += len(data)
+            time.sleep(interval)
+    except OSError:
+        pass
+    finally:
+        sock.close()
+    results[index] = (ttfb, received)
+
+
+def probe(port, args, stop, latencies, failures):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            _get(port, '/', args.listen_seconds)
+            latencies.append(time.perf_counter() - started)
+        except OSError:
+            failures.append(1)
+        stop.wait(args.probe_interval)
+
+
+def run(mode, args, env, port):
+    server = start_server(mode, args, env, port)
+    try:
+        workers = _worker_pids(server.pid)
+        rss_idle = _rss_mb(workers)
+        results = [None] * args.listeners
+        threads = [threading.Thread(target=listener, args=(port, args, results, i)) for i in range(args.listeners)]
+        stop, probe_latencies, probe_failures = threading.Event(), [], []
+        prober = threading.Thread(target=probe, args=(port, args, stop, probe_latencies, probe_failures))
+        for thread in threads:
+            thread.start()
+        prober.start()
+
+        rss_peak = rss_idle
+        while any(thread.is_alive() for thread in threads):
+            rss_peak = max(rss_peak, _rss_mb(workers))
+            time.sleep(0.25)
+        stop.set()
+        prober.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    ttfbs = [ttfb for ttfb, _ in results if ttfb is not None]
+    served = sum(1 for ttfb in ttfbs if ttfb <= args.ttfb_limit)
+    ms = lambda value: round(value * 1000, 1) if value is not None else None
+    return {
+        "mode": mode,
+        "workers": args.workers,
+        "listeners": args.listeners,
+        "listeners_served": served,
+        "listeners_never_started": args.listeners - len(ttfbs),
+        "ttfb_ms": {"p50": ms(_percentile(ttfbs, 0.5)), "p95": ms(_percentile(ttfbs, 0.95)),
+                    "max": ms(max(ttfbs)) if ttfbs else None},
+        "mb_received": round(sum(received for _, received in results) / 1024 / 1024, 1),
+        "probe_ms": {"p50": ms(statistics.median(probe_latencies)) if probe_latencies else None,
+                     "p95": ms(_percentile(probe_latencies, 0.95)), "failures": len(probe_failures)},
+        "rss_mb": {"idle": rss_idle, "peak": rss_peak},
+        "listeners_served_per_100mb": round(served / rss_peak * 100, 1) if rss_peak else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='sync,gevent')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--listeners', type=int, default=64)
+    parser.add_argument('--file-mb', type=int, default=32, help='tamaño del audio (mayor que los búferes de socket)')
+    parser.add_argument('--read-kbps', type=int, default=128, help='ritmo de lectura de cada oyente (KB/s)')
+    parser.add_argument('--listen-seconds', type=float, default=6)
+    parser.add_argument('--ttfb-limit', type=float, default=1.0)
+    parser.add_argument('--probe-interval', type=float, default=0.1)
+    parser.add_argument('--port', type=int, default=5090)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_listeners_')
+    upload_folder = os.path.join(tmpdir, 'uploads')
+    os.makedirs(upload_folder)
+    with open(os.path.join(upload_folder, AUDIO_FILENAME), 'wb') as f:
+        for _ in range(args.file_mb):
+            f.write(os.urandom(1024 * 1024))
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", UPLOAD_FOLDER=upload_folder,
+               METRICS_DIR=os.path.join(tmpdir, 'metrics'), FLASK_APP='app', PYTHONPATH=BACKEND_DIR)
+    subprocess.run([sys.executable, '-m', 'flask', 'init-db'], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    results = [run(mode, args, env, args.port + i) for i, mode in enumerate(args.modes.split(','))]
+    print(json.dumps({"file_mb": args.file_mb, "read_kbps": args.read_kbps,
+                      "listen_seconds": args.listen_seconds, "results": results}, indent=2))
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,614 @@
+# backend/benchmarks/bench_endpoints.py
+"""
+Benchmark de latencia y carga de los endpoints reales (upload_bp, podcast_bp, comment_bp, play_bp y /profile).
+
+Siembra un catálogo sintético a la escala pedida (podcasts, con usuarios y comentarios
+proporcionales) en SQLite o en un PostgreSQL local y recorre cada endpoint con el
+cliente de pruebas de Flask y JWT generados para los usuarios sembrados. Se mide el
+tiempo de aplicación + base de datos, sin red, para que las cifras sean comparables
+entre ejecuciones. Por endpoint se informa de:
+
+    latencia p50/p95/p99/media/máx (ms), peticiones por segundo, consultas SQL por
+    petición (media/máx), códigos de estado y pico de RSS del proceso (y su crecimiento)
+
+Los endpoints de lectura van primero y los de escritura después (crean y borran sus
+propios datos), así que el catálogo sembrado queda igual y se puede reutilizar.
+
+Uso:
+    python benchmarks/bench_endpoints.py --scale 1k
+    python benchmarks/bench_endpoints.py --scale 100k --database-url sqlite:////tmp/bench_100k.db
+    python benchmarks/bench_endpoints.py --scale 100k --database postgresql --database-url postgresql://localhost/ambaria_bench --reset
+    python benchmarks/bench_endpoints.py --scales 1k,100k,1m --output informe.json
+    python benchmarks/bench_endpoints.py --scale 1k --baseline informe_anterior.json --threshold 0.25
+
+Con --database-url la base de datos se reutiliza si ya tiene el catálogo de esa escala
+(sembrar 1M tarda varios minutos); --reset la vacía y vuelve a sembrar.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from collections import Counter, deque
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+SEED_BATCH_SIZE = 10_000
+CATEGORIES = ['Música', 'Tecnología', 'Historia', 'Deportes', 'Ciencia', 'Humor', 'Noticias', 'Educación']
+WORDS = (
+    'radio noche música clásica jazz entrevista historia ciencia espacio planeta futuro tecnología '
+    'programación datos inteligencia cocina receta viaje montaña mar ciudad cultura arte cine libro '
+    'poesía teatro deporte fútbol baloncesto carrera salud mente filosofía economía mercado empresa '
+    'startup diseño sonido voz directo episodio temporada invitado debate humor comedia misterio '
+    'crimen naturaleza animales clima energía política mundo local barrio memoria familia amistad'
+).split()
+
+
+def _words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KiB y macOS en bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _load_app(database_url, upload_folder):
+    # Config lee DATABASE_URL al importarse: el entorno va antes
+    os.environ['DATABASE_URL'] = database_url
+    os.chdir(BACKEND_DIR)
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    app.config['UPLOAD_FOLDER'] = upload_folder
+    os.makedirs(upload_folder, exist_ok=True)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _make_media(app):
+    """Audio WAV de 1 s y portada JPEG guardados como blobs, compartidos por todo el catálogo."""
+    from services.storage import store_file
+
+    audio_tmp = os.path.join(app.config['UPLOAD_FOLDER'], 'bench_audio.wav')
+    with wave.open(audio_tmp, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(22050)
+        w.writeframes(bytes(random.Random(1).getrandbits(8) for _ in range(44100)))
+    media = {'audio_bytes': open(audio_tmp, 'rb').read(), 'cover_bytes': None}
+    media['audio_path'], _, _ = store_file(audio_tmp, 'bench_audio.wav')
+
+    media['cover_path'] = None
+    try:
+        from PIL import Image
+        cover_tmp = os.path.join(app.config['UPLOAD_FOLDER'], 'bench_cover.jpeg')
+        Image.new('RGB', (1400, 1400), (40, 90, 160)).save(cover_tmp, 'JPEG', quality=90)
+        media['cover_bytes'] = open(cover_tmp, 'rb').read()
+        media['cover_path'], _, _ = store_file(cover_tmp, 'bench_cover.jpeg')
+    except ImportError:
+        pass
+    return media
+
+
+def seed_dataset(app, podcasts, users_per_podcast, comments_per_podcast, reset, rng):
+    """Siembra (o reutiliza) el catálogo. Devuelve un dict con los recuentos y el tiempo empleado."""
+    from sqlalchemy import func, insert, update
+    from extensions import db
+    from models.blob import Blob
+    from models.user import User
+    from models.podcast import Podcast
+    from models.comment import Comment
+    from services.storage import acquire_blob
+    from services.counters import reconcile_counters
+    from services.trending import refresh_trending
+
+    user_count = max(10, int(podcasts * users_per_podcast))
+    comment_count = int(podcasts * comments_per_podcast)
+    with app.app_context():
+        media = _make_media(app)
+        existing = db.session.query(func.count(Podcast.id)).scalar()
+        if existing and not reset:
+            if existing != podcasts:
+                raise SystemExit(f"La base de datos ya tiene {existing} podcasts (se esperaban {podcasts}); usa --reset.")
+            print(f"Reutilizando el catálogo existente ({existing} podcasts)", file=sys.stderr)
+            return {
+                'podcasts': existing,
+                'users': db.session.query(func.count(User.id)).scalar(),
+                'comments': db.session.query(func.count(Comment.id)).scalar(),
+                'seed_seconds': 0.0,
+                'reused': True,
+            }, media
+
+        if existing:
+            db.session.remove()
+            db.drop_all()
+            db.create_all()
+            media = _make_media(app)
+
+        started = time.perf_counter()
+        base = datetime(2024, 1, 1)
+        db.session.execute(insert(User), [
+            {'google_id': f'bench-{i}', 'email': f'bench{i}@example.com', 'name': f'Usuario {i}',
+             'profile_picture': None, 'created_at': base}
+            for i in range(user_count)
+        ])
+        db.session.commit()
+        user_ids = [row[0] for row in db.session.query(User.id)]
+
+        span_seconds = 365 * 24 * 3600
+        for start in range(0, podcasts, SEED_BATCH_SIZE):
+            rows = []
+            for i in range(start, min(start + SEED_BATCH_SIZE, podcasts)):
+                rows.append({
+                    'title': _words(rng, 3).capitalize(),
+                    'description': _words(rng, 20),
+                    'audio_path': media['audio_path'],
+                    'cover_image_path': media['cover_path'],
+                    'created_at': base + timedelta(seconds=rng.randrange(span_seconds), microseconds=rng.randrange(10**6)),
+                    'user_id': rng.choice(user_ids),
+                    'category': rng.choice(CATEGORIES),
+                })
+            db.session.execute(insert(Podcast), rows)
+            db.session.commit()
+            print(f"  podcasts: {min(start + SEED_BATCH_SIZE, podcasts)}/{podcasts}", file=sys.stderr)
+
+        # Referencias a los blobs compartidos: así borrar los podcasts creados por el benchmark nunca los elimina
+        for path in filter(None, (media['audio_path'], media['cover_path'])):
+            acquire_blob(path)
+            db.session.execute(update(Blob).where(Blob.filename == os.path.basename(path))
+                               .values(ref_count=Blob.ref_count + podcasts - 1))
+        db.session.commit()
+
+        podcast_ids = [row[0] for row in db.session.query(Podcast.id)]
+        for start in range(0, comment_count, SEED_BATCH_SIZE):
+            rows = [{
+                'text': _words(rng, 12),
+                'created_at': base + timedelta(seconds=rng.randrange(span_seconds), microseconds=rng.randrange(10**6)),
+                'user_id': rng.choice(user_ids),
+                'podcast_id': rng.choice(podcast_ids),
+            } for _ in range(start, min(start + SEED_BATCH_SIZE, comment_count))]
+            db.session.execute(insert(Comment), rows)
+            db.session.commit()
+            print(f"  comentarios: {min(start + SEED_BATCH_SIZE, comment_count)}/{comment_count}", file=sys.stderr)
+        # Los INSERT masivos no pasan por las rutas: los contadores se calculan de una vez al final
+        reconcile_counters()
+        refresh_trending(full=True)
+
+        return {
+            'podcasts': podcasts,
+            'users': user_count,
+            'comments': comment_count,
+            'seed_seconds': round(time.perf_counter() - started, 2),
+            'reused': False,
+        }, media
+
+
+class QueryCounter:
+    """Cuenta las sentencias SQL ejecutadas por cada hilo."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.local.count = getattr(self.local, 'count', 0) + 1
+
+    def reset(self):
+        self.local.count = 0
+
+    def value(self):
+        return getattr(self.local, 'count', 0)
+
+
+def build_context(app, media, rng):
+    """Ids, tokens y cursores que usan los endpoints."""
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import func
+    from extensions import db
+    from models.user import User
+    from models.podcast import Podcast
+    from models.comment import Comment
+    from services.pagination import encode_cursor
+
+    with app.app_context():
+        max_podcast_id = db.session.query(func.max(Podcast.id)).scalar()
+        max_user_id = db.session.query(func.max(User.id)).scalar()
+        total = db.session.query(func.count(Podcast.id)).scalar()
+        middle = db.session.query(Podcast.created_at, Podcast.id) \
+                           .order_by(Podcast.created_at.desc(), Podcast.id.desc()) \
+                           .offset(total // 2).limit(1).one()
+        # Usuario con podcasts para /my_podcasts
+        owner_id = db.session.query(Podcast.user_id).filter(Podcast.id == max_podcast_id).scalar()
+        commented_id = db.session.query(Comment.podcast_id).order_by(Comment.id).limit(1).scalar() or max_podcast_id
+        tokens = {uid: create_access_token(identity=str(uid))
+                  for uid in {owner_id, *rng.sample(range(1, max_user_id + 1), min(50, max_user_id))}}
+
+    return {
+        'max_podcast_id': max_podcast_id,
+        'owner_id': owner_id,
+        'commented_id': commented_id,
+        'tokens': tokens,
+        'user_ids': sorted(tokens),
+        'deep_cursor': encode_cursor(*middle),
+        'audio_filename': os.path.basename(media['audio_path']),
+        'cover_filename': os.path.basename(media['cover_path']) if media['cover_path'] else None,
+        'media': media,
+        # Recursos creados por los endpoints de escritura y consumidos por los de borrado
+        'created_comments': deque(),
+        'created_podcasts': deque(),
+        'podcasts_to_update': deque(),
+    }
+
+
+def _auth(ctx, user_id):
+    return {'Authorization': f"Bearer {ctx['tokens'][user_id]}"}
+
+
+def _any_user(ctx, rng):
+    return rng.choice(ctx['user_ids'])
+
+
+def _random_podcast(ctx, rng):
+    return rng.randint(1, ctx['max_podcast_id'])
+
+
+def _podcast_form(ctx, rng, with_cover=True):
+    media = ctx['media']
+    data = {
+        'title': _words(rng, 3).capitalize(),
+        'description': _words(rng, 15),
+        'category': rng.choice(CATEGORIES),
+        'audio_file': (io.BytesIO(media['audio_bytes']), 'episodio.wav'),
+    }
+    if with_cover and media['cover_bytes']:
+        data['cover_image'] = (io.BytesIO(media['cover_bytes']), 'portada.jpeg')
+    return data
+
+
+def _remember(pool, key):
+    def _callback(response):
+        if response.status_code in (200, 201) and response.is_json:
+            value = (response.get_json() or {})
+            for part in key:
+                value = (value or {}).get(part)
+            if value is not None:
+                pool.append(value)
+    return _callback
+
+
+def endpoint_specs(ctx):
+    """
+    Cada endpoint: nombre, método y una función rng -> (ruta, kwargs del cliente[, callback]).
+    `requests_factor` reduce el número de peticiones de los endpoints muy pesados.
+    """
+    specs = [
+        {'name': 'GET /podcasts', 'method': 'GET',
+         'build': lambda rng: ('/podcasts', {'headers': _auth(ctx, _any_user(ctx, rng))})},
+        {'name': 'GET /podcasts?fields (cuadrícula)', 'method': 'GET',
+         'build': lambda rng: ('/podcasts', {'headers': _auth(ctx, _any_user(ctx, rng)),
+                                             'query_string': {'fields': 'id,title,artist,cover_image_url'}})},
+        {'name': 'GET /podcasts?category', 'method': 'GET',
+         'build': lambda rng: ('/podcasts', {'headers': _auth(ctx, _any_user(ctx, rng)),
+                                             'query_string': {'category': rng.choice(CATEGORIES)}})},
+        {'name': 'GET /podcasts?cursor (página profunda)', 'method': 'GET',
+         'build': lambda rng: ('/podcasts', {'headers': _auth(ctx, _any_user(ctx, rng)),
+                                             'query_string': {'cursor': ctx['deep_cursor']}})},
+        {'name': 'GET /podcasts/<id>', 'method': 'GET',
+         'build': lambda rng: (f"/podcasts/{_random_podcast(ctx, rng)}", {'headers': _auth(ctx, _any_user(ctx, rng))})},
+        {'name': 'GET /podcasts/my_podcasts', 'method': 'GET',
+         'build': lambda rng: ('/podcasts/my_podcasts', {'headers': _auth(ctx, ctx['owner_id'])})},
+        {'name': 'GET /podcasts/search', 'method': 'GET',
+         'build': lambda rng: ('/podcasts/search', {'headers': _auth(ctx, _any_user(ctx, rng)),
+                                                    'query_string': {'q': f"{rng.choice(WORDS)} {rng.choice(WORDS)[:4]}"}})},
+        {'name': 'GET /podcasts/trending?category', 'method': 'GET',
+         'build': lambda rng: ('/podcasts/trending', {'headers': _auth(ctx, _any_user(ctx, rng)),
+                                                      'query_string': {'category': rng.choice(CATEGORIES)}})},
+        {'name': 'GET /categories', 'method': 'GET',
+         'build': lambda rng: ('/categories', {'headers': _auth(ctx, _any_user(ctx, rng))})},
+        {'name': 'GET /api/podcasts/<id>/comments', 'method': 'GET',
+         'build': lambda rng: (f"/api/podcasts/{ctx['commented_id'] if rng.random() < 0.2 else _random_podcast(ctx, rng)}/comments", {})},
+        {'name': 'GET /podcasts/<id>/page', 'method': 'GET',
+         'build': lambda rng: (f"/podcasts/{ctx['commented_id'] if rng.random() < 0.2 else _random_podcast(ctx, rng)}/page",
+                               {'headers': _auth(ctx, _any_user(ctx, rng))})},
+        {'name': 'GET /podcasts?ids (lote de 20)', 'method': 'GET',
+         'build': lambda rng: ('/podcasts', {'headers': _auth(ctx, _any_user(ctx, rng)),
+                                             'query_string': {'ids': ','.join(str(_random_podcast(ctx, rng)) for _ in range(20))}})},
+        {'name': 'GET /profile', 'method': 'GET',
+         'build': lambda rng: ('/profile', {'headers': _auth(ctx, _any_user(ctx, rng))})},
+        {'name': 'GET /uploads/<archivo> (Range)', 'method': 'GET',
+         'build': lambda rng: (f"/uploads/{ctx['audio_filename']}", {'headers': {'Range': 'bytes=0-16383'}})},
+        {'name': 'GET /podcasts/<id>/peaks', 'method': 'GET',
+         'build': lambda rng: (f"/podcasts/{_random_podcast(ctx, rng)}/peaks", {'headers': _auth(ctx, _any_user(ctx, rng))})},
+    ]
+    if ctx['cover_filename']:
+        specs.append({'name': 'GET /thumbnails/180/webp/<archivo>', 'method': 'GET',
+                      'build': lambda rng: (f"/thumbnails/180/webp/{ctx['cover_filename']}", {})})
+    specs += [
+        {'name': 'GET /podcasts?stream=1 (NDJSON completo)', 'method': 'GET', 'requests_factor': 0.02,
+         'build': lambda rng: ('/podcasts', {'headers': _auth(ctx, _any_user(ctx, rng)), 'query_string': {'stream': '1'}})},
+        # Escrituras: crean sus propios datos y los borran al final
+        {'name': 'POST /api/podcasts/<id>/comments', 'method': 'POST',
+         'build': lambda rng: (f"/api/podcasts/{_random_podcast(ctx, rng)}/comments",
+                               {'headers': _auth(ctx, ctx['owner_id']), 'json': {'text': _words(rng, 10)}},
+                               _remember(ctx['created_comments'], ('comment', 'id')))},
+        {'name': 'DELETE /api/comments/<id>', 'method': 'DELETE', 'pool': ctx['created_comments'],
+         'build': lambda rng: (f"/api/comments/{ctx['created_comments'].popleft()}", {'headers': _auth(ctx, ctx['owner_id'])})},
+        {'name': 'POST /podcasts/<id>/plays', 'method': 'POST',
+         'build': lambda rng: (f"/podcasts/{_random_podcast(ctx, rng)}/plays", {'headers': _auth(ctx, _any_user(ctx, rng))})},
+        {'name': 'POST /podcasts/plays (lote de 20)', 'method': 'POST',
+         'build': lambda rng: ('/podcasts/plays', {'headers': _auth(ctx, _any_user(ctx, rng)),
+                                                   'json': {'plays': [{'podcast_id': _random_podcast(ctx, rng)} for _ in range(20)]}})},
+        {'name': 'POST /podcasts (multipart)', 'method': 'POST', 'requests_factor': 0.5,
+         'build': lambda rng: ('/podcasts', {'headers': _auth(ctx, ctx['owner_id']), 'data': _podcast_form(ctx, rng),
+                                             'content_type': 'multipart/form-data'},
+                               _remember(ctx['podcasts_to_update'], ('podcast_id',)))},
+        {'name': 'POST /upload (upload_bp)', 'method': 'POST', 'requests_factor': 0.5,
+         'build': lambda rng: ('/upload', {'data': _podcast_form(ctx, rng, with_cover=False),
+                                           'content_type': 'multipart/form-data'})},
+        {'name': 'PUT /podcasts/<id>', 'method': 'PUT', 'pool': ctx['podcasts_to_update'],
+         'build': lambda rng: _update_request(ctx, rng)},
+        {'name': 'DELETE /podcasts/<id>', 'method': 'DELETE', 'pool': ctx['created_podcasts'],
+         'build': lambda rng: (f"/podcasts/{ctx['created_podcasts'].popleft()}", {'headers': _auth(ctx, ctx['owner_id'])})},
+    ]
+    return specs
+
+
+def _update_request(ctx, rng):
+    podcast_id = ctx['podcasts_to_update'].popleft()
+    ctx['created_podcasts'].append(podcast_id)
+    return (f"/podcasts/{podcast_id}", {'headers': _auth(ctx, ctx['owner_id']),
+                                        'data': {'title': _words(rng, 3).capitalize(), 'description': _words(rng, 15)},
+                                        'content_type': 'multipart/form-data'})
+
+
+def run_endpoint(app, counter, spec, requests, concurrency, seed):
+    """Lanza `requests` peticiones repartidas entre `concurrency` hilos y agrega las métricas."""
+    if 'pool' in spec:
+        # Los borrados/ediciones solo pueden usar lo que crearon los endpoints anteriores
+        requests = min(requests, len(spec['pool']))
+    latencies, queries, statuses, errors = [], [], Counter(), []
+    lock = threading.Lock()
+    per_thread = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    rss_before = _peak_rss_mb()
+
+    def worker(index, count):
+        rng = random.Random(seed * 1000 + index)
+        client = app.test_client()
+        for _ in range(count):
+            try:
+                built = spec['build'](rng)
+            except IndexError:
+                break
+            path, kwargs = built[0], built[1]
+            callback = built[2] if len(built) > 2 else None
+            counter.reset()
+            started = time.perf_counter()
+            try:
+                response = client.open(path, method=spec['method'], **kwargs)
+                response.get_data()
+                elapsed = time.perf_counter() - started
+                response.close()
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                continue
+            if callback:
+                callback(response)
+            with lock:
+                latencies.append(elapsed)
+                queries.append(counter.value())
+                statuses[response.status_code] += 1
+
+    threads = [threading.Thread(target=worker, args=(i, count)) for i, count in enumerate(per_thread) if count]
+    wall_started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    wall = time.perf_counter() - wall_started
+
+    latencies.sort()
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        'name': spec['name'],
+        'requests': len(latencies),
+        'exceptions': len(errors),
+        'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+        'error_rate': round(sum(n for code, n in statuses.items() if code >= 400) / len(latencies), 4) if latencies else None,
+        'latency_ms': {
+            'p50': ms(_percentile(latencies, 0.50)),
+            'p95': ms(_percentile(latencies, 0.95)),
+            'p99': ms(_percentile(latencies, 0.99)),
+            'mean': ms(statistics.fmean(latencies)) if latencies else None,
+            'max': ms(latencies[-1]) if latencies else None,
+        },
+        'throughput_rps': round(len(latencies) / wall, 1) if wall and latencies else None,
+        'sql_queries_per_request': {
+            'mean': round(statistics.fmean(queries), 2) if queries else None,
+            'max': max(queries) if queries else None,
+        },
+        'rss_peak_mb': _peak_rss_mb(),
+        'rss_peak_growth_mb': round(_peak_rss_mb() - rss_before, 1),
+    }
+
+
+def run_scale(args):
+    podcasts = SCALES[args.scale]
+    tmpdir = tempfile.mkdtemp(prefix='ambaria-bench-')
+    database_url = args.database_url
+    if not database_url:
+        if args.database == 'postgresql':
+            raise SystemExit("Para PostgreSQL indica --database-url (p. ej. postgresql://localhost/ambaria_bench).")
+        database_url = 'sqlite:///' + os.path.join(tmpdir, f'bench_{args.scale}.db')
+
+    app = _load_app(database_url, args.upload_folder or os.path.join(tmpdir, 'uploads'))
+    app.config['CATALOG_CACHE_ENABLED'] = not args.disable_catalog_cache
+    rng = random.Random(args.seed)
+    print(f"Sembrando {args.scale} en {app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}", file=sys.stderr)
+    with contextlib.redirect_stdout(io.StringIO()):
+        dataset, media = seed_dataset(app, podcasts, args.users_per_podcast, args.comments_per_podcast, args.reset, rng)
+
+    from extensions import db
+    with app.app_context():
+        counter = QueryCounter(db.engine)
+        dialect = db.engine.dialect.name
+    ctx = build_context(app, media, rng)
+
+    selected = [name.strip().lower() for name in args.endpoints.split(',')] if args.endpoints else None
+    results = []
+    for index, spec in enumerate(endpoint_specs(ctx)):
+        if selected and not any(name in spec['name'].lower() for name in selected):
+            continue
+        requests = max(1, int(args.requests * spec.get('requests_factor', 1)))
+        # Calentamiento: rellena cachés y compila lo que haga falta sin contar en las métricas
+        if args.warmup and spec['method'] == 'GET':
+            run_endpoint(app, counter, spec, min(args.warmup, requests), 1, args.seed + 10_000 + index)
+        result = run_endpoint(app, counter, spec, requests, args.concurrency, args.seed + index)
+        print(f"  {result['name']}: p95 {result['latency_ms']['p95']} ms, {result['throughput_rps']} req/s",
+              file=sys.stderr)
+        results.append(result)
+
+    # Los trabajos de medios encolados por las subidas terminan antes de borrar sus archivos
+    from services.media_jobs import shutdown_media_executor
+    shutdown_media_executor(wait=True)
+    from services.play_events import flush_play_events
+    flush_play_events()
+    if not args.database_url:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return {
+        'meta': {
+            'scale': args.scale,
+            'database': dialect,
+            'started_at': datetime.utcnow().isoformat() + 'Z',
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'requests_per_endpoint': args.requests,
+            'concurrency': args.concurrency,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'catalog_cache': not args.disable_catalog_cache,
+        },
+        'dataset': dataset,
+        'endpoints': results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(report, baseline, threshold):
+    """Imprime la comparación con un informe anterior. Devuelve True si hay regresiones de p95 > threshold."""
+    previous = {(run['meta']['database'], run['meta']['scale'], endpoint['name']): endpoint
+                for run in baseline.get('runs', []) for endpoint in run['endpoints']}
+    regressed = False
+    for run in report['runs']:
+        for endpoint in run['endpoints']:
+            old = previous.get((run['meta']['database'], run['meta']['scale'], endpoint['name']))
+            if not old or not old['latency_ms']['p95'] or endpoint['latency_ms']['p95'] is None:
+                continue
+            change = endpoint['latency_ms']['p95'] / old['latency_ms']['p95'] - 1
+            marker = '  <-- REGRESIÓN' if change > threshold else ''
+            regressed = regressed or bool(marker)
+            print(f"[{run['meta']['database']} {run['meta']['scale']}] {endpoint['name']}: p95 "
+                  f"{old['latency_ms']['p95']} -> {endpoint['latency_ms']['p95']} ms ({change:+.0%}){marker}",
+                  file=sys.stderr)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='1k')
+    parser.add_argument('--scales', help='varias escalas separadas por comas; cada una en su propio proceso')
+    parser.add_argument('--database', choices=['sqlite', 'postgresql'], default='sqlite')
+    parser.add_argument('--database-url', help='BD a usar/reutilizar; por defecto un SQLite temporal')
+    parser.add_argument('--reset', action='store_true', help='vaciar la BD y volver a sembrar')
+    parser.add_argument('--upload-folder', help='carpeta de subidas; por defecto una temporal')
+    parser.add_argument('--users-per-podcast', type=float, default=0.05)
+    parser.add_argument('--comments-per-podcast', type=float, default=2.0)
+    parser.add_argument('--requests', type=int, default=200, help='peticiones por endpoint')
+    parser.add_argument('--concurrency', type=int, default=4, help='hilos cliente simultáneos')
+    parser.add_argument('--warmup', type=int, default=10, help='peticiones de calentamiento por endpoint GET')
+    parser.add_argument('--endpoints', help='solo los endpoints cuyo nombre contenga alguno de estos textos')
+    parser.add_argument('--disable-catalog-cache', action='store_true', help='medir siempre el camino a la BD')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='fichero JSON del informe (además de stdout)')
+    parser.add_argument('--baseline', help='informe anterior con el que comparar p95')
+    parser.add_argument('--threshold', type=float, default=0.25, help='regresión de p95 tolerada (0.25 = +25%%)')
+    args = parser.parse_args()
+
+    if args.scales:
+        runs = []
+        for scale in args.scales.split(','):
+            with tempfile.NamedTemporaryFile(suffix='.json') as out:
+                child_args = _strip_option(sys.argv[1:], '--scales')
+                child_args = _strip_option(child_args, '--output')
+                child_args = _strip_option(child_args, '--baseline')
+                subprocess.run([sys.executable, os.path.abspath(__file__), *child_args,
+                                '--scale', scale.strip(), '--output', out.name], check=True, stdout=subprocess.DEVNULL)
+                runs.extend(json.load(open(out.name))['runs'])
+        report = {'runs': runs}
+    else:
+        report = {'runs': [run_scale(args)]}
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            if compare(report, json.load(f), args.threshold):
+                sys.exit(1)
+
+
+def _strip_option(argv, option):
+    result, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+            continue
+        if arg == option:
+            skip = True
+            continue
+        if arg.startswith(option + '='):
+            continue
+        result.append(arg)
+    return result
+
+
+if __name__ == '__main__':
+    main()
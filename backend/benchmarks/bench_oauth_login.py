@@ -0,0 +1,266 @@
+# backend/benchmarks/bench_oauth_login.py
+"""
+Benchmark del login con Google (/auth/google/callback) contra un servidor OAuth local.
+
+El servidor de pruebas imita a Google: /token (devuelve access_token e id_token firmado
+con RS256), /certs (JWKS con Cache-Control: max-age) y /userinfo (formato v1). La app
+se apunta a él con GOOGLE_TOKEN_URL, GOOGLE_JWKS_URL y GOOGLE_USERINFO_URL, y cada
+petición del servidor puede retrasarse con --latency-ms para simular la red.
+
+Modos:
+  - legacy: lo que hacía el callback antes (requests.post/get sin sesión ni timeout,
+            /userinfo en cada login y consulta + INSERT/UPDATE del usuario)
+  - pooled: el callback actual (sesión compartida con keep-alive, id_token verificado
+            con el JWKS en caché y upsert en una sentencia)
+
+Además de la latencia se cuentan, por login, las peticiones y las conexiones TCP
+nuevas que recibe el servidor OAuth.
+
+Uso:
+    python benchmarks/bench_oauth_login.py --logins 500 --clients 8 --latency-ms 20
+    python benchmarks/bench_oauth_login.py --no-id-token   # fuerza el camino de /userinfo
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENT_ID = 'bench-client.apps.googleusercontent.com'
+KEY_ID = 'bench-key-1'
+
+
+class StandInOAuthServer:
+    """Servidor OAuth local con las rutas que usa el callback; cuenta peticiones y conexiones."""
+
+    def __init__(self, latency, issue_id_token=True):
+        import rsa
+        from google.auth import crypt
+
+        public_key, private_key = rsa.newkeys(2048)
+        self.signer = crypt.RSASigner.from_string(private_key.save_pkcs1(), key_id=KEY_ID)
+        self.public_key = public_key
+        self.latency = latency
+        self.issue_id_token = issue_id_token
+        self.lock = threading.Lock()
+        self.stats = {'connections': 0, 'requests': 0, 'token': 0, 'certs': 0, 'userinfo': 0}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def setup(self):
+                super().setup()
+                server._count('connections')
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode()
+                server._handle(self, 'POST', parse_qs(body))
+
+            def do_GET(self):
+                server._handle(self, 'GET', {})
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def _profile(self, code):
+        # El código lleva el número de usuario: "code-<n>-<login>"
+        user = code.split('-')[1]
+        return {'sub': f"10000{user}", 'email': f"bench{user}@example.com",
+                'name': f"Usuario {user}", 'picture': f"https://example.com/avatar/{user}.jpg"}
+
+    def _handle(self, handler, method, form):
+        from google.auth import jwt as google_jwt
+
+        self._count('requests')
+        if self.latency:
+            time.sleep(self.latency)
+        path = handler.path.split('?')[0]
+        headers = {}
+        if method == 'POST' and path == '/token':
+            self._count('token')
+            code = form.get('code', [''])[0]
+            payload = {'access_token': f"at-{code}", 'expires_in': 3599, 'token_type': 'Bearer'}
+            if self.issue_id_token:
+                now = int(time.time())
+                claims = dict(self._profile(code), iss='https://accounts.google.com', aud=CLIENT_ID,
+                              iat=now, exp=now + 3600, email_verified=True)
+                payload['id_token'] = google_jwt.encode(self.signer, claims).decode()
+            status = 200
+        elif method == 'GET' and path == '/certs':
+            self._count('certs')
+            import base64
+
+            def b64(value):
+                raw = value.to_bytes((value.bit_length() + 7) // 8, 'big')
+                return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+            payload = {'keys': [{'kty': 'RSA', 'alg': 'RS256', 'use': 'sig', 'kid': KEY_ID,
+                                 'n': b64(self.public_key.n), 'e': b64(self.public_key.e)}]}
+            headers['Cache-Control'] = 'public, max-age=3600'
+            status = 200
+        elif method == 'GET' and path == '/userinfo':
+            self._count('userinfo')
+            code = handler.headers.get('Authorization', '').split('at-', 1)[-1]
+            profile = self._profile(code)
+            payload = {'id': profile.pop('sub'), **profile, 'verified_email': True}
+            status = 200
+        else:
+            payload, status = {'error': 'not_found'}, 404
+
+        body = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def shutdown(self):
+        self.httpd.shutdown()
+
+
+def _load_app(database_url, oauth_base_url):
+    # Config lee el entorno al importarse: va antes
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['GOOGLE_CLIENT_ID'] = CLIENT_ID
+    os.environ['GOOGLE_CLIENT_SECRET'] = 'bench-secret'
+    os.environ['GOOGLE_TOKEN_URL'] = f"{oauth_base_url}/token"
+    os.environ['GOOGLE_JWKS_URL'] = f"{oauth_base_url}/certs"
+    os.environ['GOOGLE_USERINFO_URL'] = f"{oauth_base_url}/userinfo"
+    os.chdir(BACKEND_DIR)
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _legacy_login(app, code):
+    """El callback anterior, reproducido para tener una línea base."""
+    import requests
+    from flask_jwt_extended import create_access_token
+    from extensions import db
+    from models.user import User
+
+    with app.app_context():
+        token_data = requests.post(app.config['GOOGLE_TOKEN_URL'], data={
+            'code': code, 'client_id': app.config['GOOGLE_CLIENT_ID'],
+            'client_secret': app.config['GOOGLE_CLIENT_SECRET'],
+            'redirect_uri': app.config['GOOGLE_REDIRECT_URI'], 'grant_type': 'authorization_code'
+        }).json()
+        user_info = requests.get(app.config['GOOGLE_USERINFO_URL'],
+                                 headers={'Authorization': f"Bearer {token_data['access_token']}"}).json()
+        user = User.query.filter_by(google_id=user_info['id']).first()
+        if not user:
+            user = User(google_id=user_info['id'], email=user_info['email'],
+                        name=user_info.get('name'), profile_picture=user_info.get('picture'))
+            db.session.add(user)
+        else:
+            user.name = user_info.get('name')
+            user.profile_picture = user_info.get('picture')
+        db.session.commit()
+        create_access_token(identity=str(user.id),
+                            additional_claims={"email": user.email, "profile_picture": user.profile_picture})
+        db.session.remove()
+    return 302
+
+
+def _client(app, mode, codes, latencies, errors):
+    client = app.test_client()
+    for code in codes:
+        started = time.perf_counter()
+        try:
+            if mode == 'legacy':
+                status = _legacy_login(app, code)
+            else:
+                status = client.get(f"/auth/google/callback?code={code}").status_code
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        if status != 302:
+            errors.append(status)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def run(app, server, mode, logins, clients, users):
+    latencies, errors = [], []
+    server.reset_stats()
+    codes = [f"code-{i % users}-{mode}{i}" for i in range(logins)]
+    threads = [threading.Thread(target=_client, args=(app, mode, codes[i::clients], latencies, errors))
+               for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+    stats = server.stats
+    return {
+        "mode": mode,
+        "logins": len(latencies),
+        "errors": len(errors),
+        "first_error": str(errors[0]) if errors else None,
+        "wall_seconds": round(wall, 3),
+        "logins_per_second": round(len(latencies) / wall, 1) if wall else None,
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "latency_ms_p95": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+        "upstream_requests_per_login": round(stats['requests'] / logins, 3),
+        "upstream_connections_per_login": round(stats['connections'] / logins, 3),
+        "upstream_calls": {name: stats[name] for name in ('token', 'certs', 'userinfo')},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='por defecto, un SQLite temporal')
+    parser.add_argument('--logins', type=int, default=300)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--users', type=int, default=50, help='usuarios distintos (los demás logins son repetidos)')
+    parser.add_argument('--latency-ms', type=float, default=20, help='retardo de cada respuesta del servidor OAuth')
+    parser.add_argument('--no-id-token', action='store_true', help='el servidor no devuelve id_token')
+    parser.add_argument('--modes', default='legacy,pooled')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    database_url = args.database_url or f"sqlite:///{os.path.join(tmpdir.name, 'bench_oauth.db')}"
+    server = StandInOAuthServer(args.latency_ms / 1000, issue_id_token=not args.no_id_token)
+    app = _load_app(database_url, server.base_url)
+
+    results = [run(app, server, mode, args.logins, args.clients, args.users) for mode in args.modes.split(',')]
+    print(json.dumps({"oauth_server": server.base_url, "latency_ms": args.latency_ms, "clients": args.clients,
+                      "id_token": not args.no_id_token, "results": results}, indent=2))
+
+    server.shutdown()
+    tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# backend/benchmarks/bench_range_seek.py
+"""
+Benchmark de ocupación de workers con muchos clientes haciendo "seek" sobre un audio largo.
+
+Compara dos modos contra /uploads/<archivo>:
+  - full:  cada seek vuelve a descargar el archivo completo (comportamiento sin Range)
+  - range: cada seek pide solo una ventana de bytes con "Range: bytes=N-M"
+
+Por defecto levanta un servidor WSGI local con services.byte_serving y mide, con un
+middleware, cuánto tiempo está ocupado el worker por petición (hasta cerrar el cuerpo).
+"ocupación media" = tiempo total ocupado / tiempo de pared, es decir, cuántos workers
+harían falta en promedio para atender la carga.
+
+Uso:
+    python benchmarks/bench_range_seek.py --clients 32 --seeks 20 --size-mb 16
+    python benchmarks/bench_range_seek.py --url http://127.0.0.1:8000/uploads/episodio.mp3 --size-mb 0
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class OccupancyMiddleware:
+    """Mide el tiempo que cada petición mantiene ocupado al worker (incluido el envío del cuerpo)."""
+
+    def __init__(self, app):
+        self.app = app
+        self.lock = threading.Lock()
+        self.busy_seconds = 0.0
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        body = self.app(environ, start_response)
+        middleware = self
+
+        class _Closing:
+            def __iter__(self):
+                return iter(body)
+
+            def close(self):
+                if hasattr(body, 'close'):
+                    body.close()
+                with middleware.lock:
+                    middleware.busy_seconds += time.perf_counter() - started
+
+        return _Closing()
+
+
+def _start_local_server(directory):
+    from flask import Flask
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from services.byte_serving import serve_file
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    app = Flask(__name__)
+
+    @app.route('/uploads/<filename>')
+    def uploaded_file(filename):
+        return serve_file(directory, filename)
+
+    middleware = OccupancyMiddleware(app)
+    server = make_server('127.0.0.1', 0, middleware, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, middleware
+
+
+def _client(url, mode, seeks, window, size, latencies, errors):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    rng = random.Random()
+    for _ in range(seeks):
+        headers = {}
+        if mode == 'range':
+            start = rng.randrange(0, max(1, size - window))
+            headers['Range'] = f"bytes={start}-{start + window - 1}"
+        started = time.perf_counter()
+        try:
+            conn.request('GET', parts.path, headers=headers)
+            response = conn.getresponse()
+            while response.read(256 * 1024):
+                pass
+            if response.status not in (200, 206):
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+
+def run(url, mode, clients, seeks, window, size, middleware=None):
+    latencies, errors = [], []
+    if middleware is not None:
+        middleware.busy_seconds = 0.0
+    threads = [threading.Thread(target=_client, args=(url, mode, seeks, window, size, latencies, errors))
+               for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    busy = middleware.busy_seconds if middleware is not None else sum(latencies)
+    latencies.sort()
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(len(latencies) / wall, 1) if wall else None,
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "latency_ms_p95": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+        "worker_busy_seconds": round(busy, 3),
+        "worker_ms_per_request": round(busy / len(latencies) * 1000, 2) if latencies else None,
+        "mean_worker_occupancy": round(busy / wall, 2) if wall else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='URL de un servidor ya levantado (p. ej. gunicorn); si falta se usa uno local')
+    parser.add_argument('--size-mb', type=int, default=16, help='tamaño del audio sintético (servidor local)')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seeks', type=int, default=10, help='seeks por cliente')
+    parser.add_argument('--window-kb', type=int, default=256, help='bytes pedidos por seek en modo range')
+    parser.add_argument('--modes', default='full,range')
+    args = parser.parse_args()
+
+    server = middleware = None
+    tmpdir = None
+    url = args.url
+    size = args.size_mb * 1024 * 1024
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, 'episodio.mp3')
+        with open(path, 'wb') as f:
+            chunk = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                f.write(chunk)
+        server, middleware = _start_local_server(tmpdir.name)
+        url = f"http://127.0.0.1:{server.server_port}/uploads/episodio.mp3"
+    else:
+        parts = urlsplit(url)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        conn.request('HEAD', parts.path)
+        size = int(conn.getresponse().getheader('Content-Length') or 0)
+        conn.close()
+
+    results = [run(url, mode, args.clients, args.seeks, args.window_kb * 1024, size, middleware)
+               for mode in args.modes.split(',')]
+    print(json.dumps({"url": url, "file_bytes": size, "clients": args.clients, "seeks_per_client": args.seeks,
+                      "results": results}, indent=2))
+
+    if server is not None:
+        server.shutdown()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+# backend/benchmarks/bench_replica_reads.py
+"""
+Comprueba y mide el reparto de lecturas entre la BD principal y la réplica.
+
+Con dos archivos SQLite (por defecto) la "replicación" se simula copiando la principal
+sobre la réplica con la API de backup de SQLite. Pasos:
+
+  1. siembra la principal y la copia a la réplica
+  2. recorre las vistas con @replica_reads y cuenta las consultas que llegan a cada BD
+  3. añade un comentario y lo lee enseguida: la réplica va por detrás, así que la
+     lectura del autor (con la cookie de read-your-writes) debe ir a la principal y el
+     comentario debe aparecer; la de otro cliente, sin cookie, sigue yendo a la réplica
+  4. vuelve a copiar y repite la lectura: ahora debe servirla la réplica
+
+Con dos PostgreSQL locales (--database-url y --replica-url) no se copia nada: la
+réplica debe estar replicando de verdad, y el paso 4 espera hasta --wait-seconds a
+que alcance a la principal.
+
+Uso:
+    python benchmarks/bench_replica_reads.py --podcasts 2000 --requests 200
+    python benchmarks/bench_replica_reads.py --database-url postgresql://localhost/ambaria \\
+        --replica-url postgresql://localhost:5433/ambaria
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_app(database_url, replica_url, upload_folder):
+    # Config lee el entorno al importarse: va antes
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['DATABASE_REPLICA_URL'] = replica_url
+    os.chdir(BACKEND_DIR)
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    app.config['UPLOAD_FOLDER'] = upload_folder
+    app.config['CATALOG_CACHE_ENABLED'] = False  # cada petición debe llegar a la BD
+    os.makedirs(upload_folder, exist_ok=True)
+    with app.app_context():
+        db.create_all(bind_key=None)
+    return app
+
+
+def _sqlite_path(url):
+    return url.split(':///', 1)[1] if url.startswith('sqlite:///') else None
+
+
+def _replicate(app, database_url, replica_url, wait_seconds):
+    """Copia la principal a la réplica (SQLite) o espera a que la réplica la alcance (PostgreSQL)."""
+    from extensions import db
+    from services.db_routing import replica_caught_up
+
+    primary_path, replica_path = _sqlite_path(database_url), _sqlite_path(replica_url)
+    with app.app_context():
+        if primary_path and replica_path:
+            db.engines['replica'].dispose()
+            source, target = sqlite3.connect(primary_path), sqlite3.connect(replica_path)
+            source.backup(target)
+            source.close()
+            target.close()
+            return True
+        deadline = time.monotonic() + wait_seconds
+        while time.monotonic() < deadline:
+            if replica_caught_up():
+                return True
+            db.session.rollback()
+            time.sleep(0.05)
+        return False
+
+
+class BindCounter:
+    """Cuenta las sentencias que llegan a cada engine."""
+
+    def __init__(self, engines):
+        from sqlalchemy import event
+
+        self.counts = Counter()
+        for name, engine in engines.items():
+            event.listen(engine, 'before_cursor_execute',
+                         lambda *args, _name=name: self.counts.update([_name]))
+
+    def take(self):
+        counts = dict(self.counts)
+        self.counts.clear()
+        return counts
+
+
+def _specs(ctx):
+    return [
+        ('GET /podcasts', lambda rng: '/podcasts?limit=20'),
+        ('GET /podcasts/<id>', lambda rng: f"/podcasts/{rng.choice(ctx['podcast_ids'])}"),
+        ('GET /podcasts/my_podcasts', lambda rng: '/podcasts/my_podcasts?limit=20'),
+        ('GET /categories', lambda rng: '/categories'),
+        ('GET /api/podcasts/<id>/comments', lambda rng: f"/api/podcasts/{rng.choice(ctx['podcast_ids'])}/comments"),
+    ]
+
+
+def run(app, client, headers, counter, name, build, requests, rng):
+    latencies, statuses, binds = [], Counter(), Counter()
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(build(rng), headers=headers)
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] += 1
+        binds.update(counter.take())
+    latencies.sort()
+    return {
+        "name": name,
+        "requests": requests,
+        "status_codes": dict(statuses),
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 3),
+        "statements_per_request": {bind: round(count / requests, 2) for bind, count in sorted(binds.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='principal (por defecto, un SQLite temporal)')
+    parser.add_argument('--replica-url', help='réplica (por defecto, otro SQLite temporal)')
+    parser.add_argument('--podcasts', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=100, help='peticiones por endpoint')
+    parser.add_argument('--wait-seconds', type=float, default=10, help='espera máxima a la réplica (PostgreSQL)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_replica_')
+    database_url = args.database_url or f"sqlite:///{os.path.join(tmpdir, 'primary.db')}"
+    replica_url = args.replica_url or f"sqlite:///{os.path.join(tmpdir, 'replica.db')}"
+    app = _load_app(database_url, replica_url, os.path.join(tmpdir, 'uploads'))
+
+    from bench_endpoints import seed_dataset
+    from flask_jwt_extended import create_access_token
+    from extensions import db
+    from models.podcast import Podcast
+    from services.db_routing import replica_stats
+
+    rng = random.Random(args.seed)
+    print(f"Sembrando {args.podcasts} podcasts", file=sys.stderr)
+    seed_dataset(app, args.podcasts, 0.1, 0.5, True, rng)
+    with app.app_context():
+        owner_id = db.session.query(Podcast.user_id).first()[0]
+        ctx = {'podcast_ids': [row[0] for row in db.session.query(Podcast.id).filter_by(user_id=owner_id)]}
+        headers = {'Authorization': f"Bearer {create_access_token(identity=str(owner_id))}"}
+        counter = BindCounter({'primary': db.engine, 'replica': db.engines['replica']})
+    if not _replicate(app, database_url, replica_url, args.wait_seconds):
+        raise SystemExit("La réplica no ha alcanzado a la principal.")
+
+    client = app.test_client()
+    results = [run(app, client, headers, counter, name, build, args.requests, rng)
+               for name, build in _specs(ctx)]
+
+    # Read-your-writes: el comentario recién creado se lee aunque la réplica vaya por detrás
+    podcast_id = ctx['podcast_ids'][0]
+    counter.take()
+    created = client.post(f"/api/podcasts/{podcast_id}/comments", json={'text': 'Comentario de prueba'}, headers=headers)
+    comment_id = created.get_json()['comment']['id']
+    counter.take()
+    lagging = client.get(f"/api/podcasts/{podcast_id}/comments", headers=headers)
+    lagging_binds = counter.take()
+    other_reader = app.test_client().get(f"/api/podcasts/{podcast_id}/comments", headers=headers)
+    other_reader_binds = counter.take()
+    caught_up = _replicate(app, database_url, replica_url, args.wait_seconds)
+    counter.take()
+    synced = client.get(f"/api/podcasts/{podcast_id}/comments", headers=headers)
+    synced_binds = counter.take()
+
+    print(json.dumps({
+        "primary": database_url.split('@')[-1],
+        "replica": replica_url.split('@')[-1],
+        "results": results,
+        "read_your_writes": {
+            "lagging_replica": {"sees_own_comment": any(c['id'] == comment_id for c in lagging.get_json()['comments']),
+                                "statements": lagging_binds},
+            "other_reader": {"sees_comment": any(c['id'] == comment_id for c in other_reader.get_json()['comments']),
+                             "statements": other_reader_binds},
+            "replica_caught_up": caught_up,
+            "after_replication": {"sees_own_comment": any(c['id'] == comment_id for c in synced.get_json()['comments']),
+                                  "statements": synced_binds},
+        },
+        "routing": replica_stats(),
+    }, indent=2))
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+# backend/benchmarks/bench_serializer.py
+"""
+Microbenchmark de la serialización de listados de podcasts (services/serializers.py).
+
+Siembra --rows podcasts en un SQLite temporal (la mitad con portada) y compara, para
+el mismo listado y dentro de una petición de prueba:
+
+  antes    entidades Podcast (con load_only si hay --fields), url_for por cada URL de cada
+           fila (audio, portada y las 6 variantes de miniatura) y json de la stdlib
+           (DefaultJSONProvider)
+  después  tuplas Row con las columnas necesarias, plantillas de URL de MediaUrls,
+           serializador compilado y OrjsonProvider
+
+Por fase (lectura de la BD, construcción de los dicts, codificación JSON) se da la mediana
+de --repeat ejecuciones, normalizada a ms por cada 10k filas. Los dos caminos deben
+producir el mismo JSON (se comprueba antes de medir).
+
+Uso:
+    python benchmarks/bench_serializer.py
+    python benchmarks/bench_serializer.py --rows 50000 --repeat 5 --fields id,title,artist
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def _load_app(tmpdir):
+    # Config lee DATABASE_URL al importarse: el entorno va antes
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ['METRICS_ENABLED'] = '0'
+    os.chdir(BACKEND_DIR)
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    app.config['UPLOAD_FOLDER'] = os.path.join(tmpdir, 'uploads')
+    with app.app_context():
+        db.create_all(bind_key=None)
+    return app
+
+
+def seed(app, rows, users):
+    from sqlalchemy import insert
+    from extensions import db
+    from models.podcast import Podcast
+    from models.user import User
+
+    upload_folder = app.config['UPLOAD_FOLDER']
+    base = datetime(2025, 1, 1)
+    with app.app_context():
+        db.session.execute(insert(User), [
+            {'google_id': f'g{i}', 'email': f'usuario{i}@ambaria.test', 'name': f'Usuario {i}'} for i in range(users)
+        ])
+        db.session.execute(insert(Podcast), [{
+            'title': f'Episodio {i}',
+            'description': f'Descripción del episodio {i} con algo de texto.',
+            'audio_path': os.path.join(upload_folder, f'{i:064x}.mp3'),
+            'cover_image_path': os.path.join(upload_folder, f'{i:064x}.jpeg') if i % 2 else None,
+            'category': 'Música' if i % 3 else 'Ciencia',
+            'user_id': i % users + 1,
+            'created_at': base + timedelta(minutes=i),
+            'duration_seconds': 60.0 + i % 3600,
+        } for i in range(rows)])
+        db.session.commit()
+
+
+def legacy_to_dicts(podcasts, fields=None):
+    """El serializador anterior: un url_for por URL y por fila."""
+    from flask import url_for
+    from services.thumbnails import THUMBNAIL_SIZES, THUMBNAIL_FORMATS
+    from services.users import get_users
+
+    def media_url(path):
+        return url_for('podcasts.uploaded_file', filename=os.path.basename(path), _external=True)
+
+    def variants(path):
+        if not path:
+            return None
+        filename = os.path.basename(path)
+        return {fmt: {str(size): url_for('podcasts.cover_thumbnail', size=size, fmt=fmt, filename=filename, _external=True)
+                      for size in THUMBNAIL_SIZES}
+                for fmt in THUMBNAIL_FORMATS}
+
+    builders = {
+        'id': lambda podcast, author: podcast.id,
+        'title': lambda podcast, author: podcast.title,
+        'description': lambda podcast, author: podcast.description,
+        'artist': lambda podcast, author: author.name if author else "Desconocido",
+        'category': lambda podcast, author: podcast.category,
+        'audio_url': lambda podcast, author: media_url(podcast.audio_path),
+        'cover_image_url': lambda podcast, author: media_url(podcast.cover_image_path) if podcast.cover_image_path else None,
+        'cover_image_variants': lambda podcast, author: variants(podcast.cover_image_path),
+        'created_at': lambda podcast, author: podcast.created_at.isoformat(),
+        'user_id': lambda podcast, author: podcast.user_id,
+        'duration_seconds': lambda podcast, author: podcast.duration_seconds,
+        'comment_count': lambda podcast, author: podcast.comment_count,
+    }
+    wants_artist = fields is None or 'artist' in fields
+    authors = get_users(podcast.user_id for podcast in podcasts) if wants_artist else {}
+    return [{name: build(podcast, authors.get(podcast.user_id)) for name, build in builders.items()
+             if fields is None or name in fields}
+            for podcast in podcasts]
+
+
+def run(app, args, fields):
+    from flask.json.provider import DefaultJSONProvider
+    from extensions import db
+    from models.podcast import Podcast
+    from sqlalchemy.orm import load_only
+    from services.serializers import OrjsonProvider, podcasts_to_dicts, podcast_columns, project_podcasts, media_urls
+    from services.users import get_users
+
+    def ordered(query):
+        return query.order_by(Podcast.created_at.desc(), Podcast.id.desc())
+
+    paths = {
+        'before': (lambda: ordered(Podcast.query.options(load_only(*podcast_columns(fields))) if fields else Podcast.query).all(),
+                   lambda rows: legacy_to_dicts(rows, fields),
+                   DefaultJSONProvider(app).dumps),
+        'after': (lambda: ordered(project_podcasts(Podcast.query, fields)).all(),
+                  lambda rows: podcasts_to_dicts(rows, fields),
+                  OrjsonProvider(app).dumps),
+    }
+    results, outputs = {}, {}
+    with app.test_request_context('/podcasts', base_url='http://localhost:5000'):
+        # Autores en la caché de usuarios y plantillas de URL resueltas: se mide el régimen estable
+        get_users(range(1, args.users + 1))
+        media_urls()
+        for name, (fetch, build, dumps) in paths.items():
+            outputs[name] = json.loads(dumps({"podcasts": build(fetch())}))
+            db.session.expunge_all()
+        if outputs['before'] != outputs['after']:
+            raise SystemExit("Los dos serializadores no producen el mismo JSON.")
+
+        scale = 10_000 / args.rows
+        for name, (fetch, build, dumps) in paths.items():
+            timings = {'query': [], 'build': [], 'encode': []}
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                rows = fetch()
+                fetched = time.perf_counter()
+                data = build(rows)
+                built = time.perf_counter()
+                body = dumps({"podcasts": data})
+                encoded = time.perf_counter()
+                timings['query'].append(fetched - started)
+                timings['build'].append(built - fetched)
+                timings['encode'].append(encoded - built)
+                db.session.expunge_all()
+            phases = {phase: round(statistics.median(values) * 1000 * scale, 1) for phase, values in timings.items()}
+            phases['total'] = round(sum(phases.values()), 1)
+            results[name] = {"ms_per_10k_rows": phases, "bytes": len(body.encode())}
+    results['speedup'] = {phase: round(results['before']['ms_per_10k_rows'][phase] / results['after']['ms_per_10k_rows'][phase], 1)
+                          for phase in ('query', 'build', 'encode', 'total')}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--fields', help='lista de campos como en ?fields= (por defecto la respuesta completa)')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='bench_serializer_')
+    try:
+        app = _load_app(tmpdir)
+        seed(app, args.rows, args.users)
+        from services.serializers import parse_fields
+        fields = parse_fields(args.fields)
+        with app.app_context():
+            results = run(app, args, fields)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    print(json.dumps({"rows": args.rows, "fields": args.fields, "repeat": args.repeat, **results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# backend/commands.py
+# Comandos de mantenimiento: se ejecutan con "flask <comando>" (p. ej. desde un cron en Render).
+import os
+
+import click
+from sqlalchemy import inspect
+
+from extensions import db
+from models.podcast import Podcast
+from services.counters import PODCAST_COUNTERS, reconcile_counters
+from services.audio_metadata import extract_audio_metadata
+from services.media_jobs import get_media_executor, save_audio_metadata
+from services.play_events import purge_play_events
+from services.resumable_uploads import purge_expired_upload_sessions
+from services.search import rebuild_search_index
+from services.trending import refresh_trending
+
+
+def register_commands(app):
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Crea el esquema en una BD nueva o aplica las migraciones pendientes a una existente."""
+        from alembic.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+        from flask_migrate import stamp, upgrade
+
+        # Solo la principal: la réplica (bind "replica") recibe el esquema por replicación
+        with db.engine.connect() as connection:
+            existing = inspect(connection).get_table_names()
+            current = MigrationContext.configure(connection).get_current_revision()
+        head = ScriptDirectory.from_config(app.extensions['migrate'].migrate.get_config()).get_current_head()
+
+        if not existing:
+            db.create_all(bind_key=None)
+            # create_all ya deja el esquema de la última revisión: las migraciones no deben volver a aplicarse
+            stamp()
+            click.echo("Esquema creado y marcado con la última migración.")
+        elif current is None:
+            # Tablas sin alembic_version: no se sabe de qué revisión vienen y upgrade intentaría recrearlas
+            raise click.ClickException(
+                "La BD ya tiene tablas pero no está marcada con ninguna migración. Márcala con la revisión "
+                "que corresponda a su esquema (\"flask db stamp <revisión>\") y vuelve a ejecutar \"flask init-db\"."
+            )
+        elif current == head:
+            click.echo(f"La BD ya está en la última migración ({head}).")
+        else:
+            click.echo(f"Aplicando migraciones: {current} -> {head}")
+            upgrade()
+            click.echo("BD actualizada a la última migración.")
+
+    @app.cli.command('purge-upload-sessions')
+    def purge_upload_sessions_command():
+        """Elimina las subidas reanudables caducadas o abandonadas."""
+        removed = purge_expired_upload_sessions()
+        click.echo(f"Sesiones de subida eliminadas: {removed}")
+
+    @app.cli.command('extract-audio-metadata')
+    @click.option('--all', 'process_all', is_flag=True, help='Recalcular también los que ya tienen metadatos.')
+    def extract_audio_metadata_command(process_all):
+        """Rellena duración, bitrate, etc. de los podcasts existentes."""
+        query = db.session.query(Podcast.id, Podcast.audio_path)
+        if not process_all:
+            query = query.filter(Podcast.duration_seconds.is_(None))
+        rows = [(pid, path) for pid, path in query if path and os.path.exists(path)]
+        results = get_media_executor().map(extract_audio_metadata, [path for _, path in rows])
+        for (podcast_id, audio_path), meta in zip(rows, results):
+            save_audio_metadata(podcast_id, audio_path, meta)
+        click.echo(f"Podcasts procesados: {len(rows)}")
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Regenera el índice de búsqueda de texto completo desde cero."""
+        indexed = rebuild_search_index()
+        click.echo(f"Podcasts indexados: {indexed}")
+
+    @app.cli.command('reconcile-counters')
+    @click.option('--counter', 'names', multiple=True, type=click.Choice(sorted(PODCAST_COUNTERS)),
+                  help='Contador a recalcular (se puede repetir). Por defecto, todos.')
+    def reconcile_counters_command(names):
+        """Recalcula los contadores desnormalizados de los podcasts y corrige los desviados."""
+        fixed = reconcile_counters(names or None)
+        for name, rows in fixed.items():
+            click.echo(f"{name}: {rows} podcasts corregidos")
+
+    @app.cli.command('purge-play-events')
+    @click.option('--days', type=int, default=None, help='Conservar los eventos de los últimos N días (por defecto PLAY_EVENTS_RETENTION_DAYS).')
+    def purge_play_events_command(days):
+        """Borra las reproducciones individuales antiguas (los agregados por hora/día se conservan)."""
+        removed = purge_play_events(days if days is not None else app.config['PLAY_EVENTS_RETENTION_DAYS'])
+        click.echo(f"Reproducciones eliminadas: {removed}")
+
+    @app.cli.command('refresh-trending')
+    @click.option('--full', is_flag=True, help='Recalcular todos los podcasts, no solo los que tienen actividad nueva.')
+    def refresh_trending_command(full):
+        """Recalcula el ranking de tendencias (pensado para un cron cada pocos minutos)."""
+        result = refresh_trending(full=full)
+        mode = 'completo' if result['full'] else 'incremental'
+        click.echo(f"Recálculo {mode}: {result['recomputed']} podcasts, {result['removed']} filas eliminadas")
@@ -2,6 +2,25 @@
 import os
 from datetime import timedelta
 
+def engine_options(url):
+    """Opciones del engine de SQLAlchemy (pool y timeouts) para una URL, ajustables por entorno."""
+    options = {
+        # Comprueba la conexión al sacarla del pool: sin errores tras un reinicio de la BD o un corte por inactividad
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1') == '1',
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
+    if url.startswith('sqlite') and (':memory:' in url or url.rstrip('/') == 'sqlite:'):
+        # SQLite en memoria usa un pool de una sola conexión: no admite tamaño
+        return options
+    options['pool_size'] = int(os.environ.get('DB_POOL_SIZE', 5))
+    options['max_overflow'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    options['pool_timeout'] = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    statement_timeout = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))
+    if statement_timeout and url.startswith(('postgresql', 'postgres')):
+        options['connect_args'] = {'options': f"-c statement_timeout={statement_timeout}"}
+    return options
+
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'una_cadena_secreta_muy_dificil_de_adivinar_y_larga_12345'
     
@@ -10,19 +29,97 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
                               'sqlite:///' + os.path.join(os.path.abspath(os.path.dirname(__file__)), 'instance', 'site.db')
     
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # Réplica de solo lectura (opcional): las vistas con @replica_reads leen de ella (services/db_routing.py)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': dict(url=DATABASE_REPLICA_URL, **engine_options(DATABASE_REPLICA_URL))} \
+        if DATABASE_REPLICA_URL else {}
+    # Cookie con el estado del catálogo tras la última escritura del usuario: sus lecturas van a
+    # la principal hasta que la réplica lo alcanza. Con el frontend en otro sitio, SAMESITE=None
+    READ_YOUR_WRITES_COOKIE_MAX_AGE = int(os.environ.get('READ_YOUR_WRITES_COOKIE_MAX_AGE', 300))
+    READ_YOUR_WRITES_COOKIE_SAMESITE = os.environ.get('READ_YOUR_WRITES_COOKIE_SAMESITE', 'Lax')
+    # Segundos sin usar la réplica después de un error
+    REPLICA_RETRY_SECONDS = float(os.environ.get('REPLICA_RETRY_SECONDS', 30))
+
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Conexiones que cada worker abre al arrancar (gunicorn.conf.py) para que la primera petición no las espere
+    DB_POOL_PREWARM = int(os.environ.get('DB_POOL_PREWARM', 2))
     
-    UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024 
 
+    # Subidas reanudables por trozos (/upload-sessions) para audios de más de MAX_CONTENT_LENGTH.
+    # Cada PATCH debe caber en MAX_CONTENT_LENGTH; las sesiones sin actividad caducan tras el TTL.
+    RESUMABLE_UPLOAD_MAX_SIZE = int(os.environ.get('RESUMABLE_UPLOAD_MAX_SIZE', 4 * 1024 * 1024 * 1024))
+    RESUMABLE_UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get('RESUMABLE_UPLOAD_CHUNK_MAX_SIZE', 8 * 1024 * 1024))
+    RESUMABLE_UPLOAD_TTL = int(os.environ.get('RESUMABLE_UPLOAD_TTL', 24 * 3600))
+
+    # Análisis de los archivos subidos (metadatos de audio) en un pool de procesos por worker
+    MEDIA_JOBS_ASYNC = os.environ.get('MEDIA_JOBS_ASYNC', '1') == '1'
+    MEDIA_JOB_WORKERS = int(os.environ.get('MEDIA_JOB_WORKERS', 1))
+    # Segundos que GET /podcasts/<id>/peaks espera a que se regenere un sidecar que falta (después: 202)
+    WAVEFORM_PEAKS_SYNC_TIMEOUT = float(os.environ.get('WAVEFORM_PEAKS_SYNC_TIMEOUT', 5))
+
+    # Miniaturas de portadas: directorio de caché (por defecto UPLOAD_FOLDER/.thumbs) y tamaño máximo
+    THUMBNAIL_CACHE_DIR = os.environ.get('THUMBNAIL_CACHE_DIR')
+    THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get('THUMBNAIL_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+    # Reproducciones (POST /podcasts/<id>/plays): búfer en memoria por worker que se vuelca
+    # a la BD por lotes al llegar a FLUSH_SIZE eventos o cada FLUSH_INTERVAL segundos
+    PLAY_EVENTS_ASYNC = os.environ.get('PLAY_EVENTS_ASYNC', '1') == '1'
+    PLAY_EVENTS_FLUSH_SIZE = int(os.environ.get('PLAY_EVENTS_FLUSH_SIZE', 500))
+    PLAY_EVENTS_FLUSH_INTERVAL = float(os.environ.get('PLAY_EVENTS_FLUSH_INTERVAL', 5))
+    PLAY_EVENTS_MAX_BUFFER = int(os.environ.get('PLAY_EVENTS_MAX_BUFFER', 50000))
+    PLAY_EVENTS_MAX_BATCH = int(os.environ.get('PLAY_EVENTS_MAX_BATCH', 100))
+    # Antigüedad máxima de un played_at enviado por el cliente y días que se guardan los eventos individuales
+    PLAY_EVENTS_MAX_AGE_DAYS = int(os.environ.get('PLAY_EVENTS_MAX_AGE_DAYS', 7))
+    PLAY_EVENTS_RETENTION_DAYS = int(os.environ.get('PLAY_EVENTS_RETENTION_DAYS', 30))
+
+    # Tendencias (flask refresh-trending): semivida del decaimiento exponencial de las señales
+    TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', 48))
+
+    # Caché en memoria (por worker) de GET /podcasts, /podcasts/<id> y /categories.
+    # Se invalida con el contador de la tabla catalog_version, compartido por todos los workers.
+    CATALOG_CACHE_ENABLED = os.environ.get('CATALOG_CACHE_ENABLED', '1') == '1'
+    CATALOG_CACHE_MAX_ENTRIES = int(os.environ.get('CATALOG_CACHE_MAX_ENTRIES', 512))
+    CATALOG_CACHE_TTL = int(os.environ.get('CATALOG_CACHE_TTL', 60))
+    # Cambios de un solo podcast (comentarios) que se conservan en catalog_changes; un worker
+    # que se quede más atrás vacía su caché entera
+    CATALOG_CHANGE_LOG_SIZE = int(os.environ.get('CATALOG_CHANGE_LOG_SIZE', 1000))
+
+    # Caché de usuarios por worker (id -> nombre, email, foto) para /profile y los autores de podcasts y comentarios
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 10000))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))
+
+    # Métricas de Prometheus en /metrics (services/metrics.py). Con METRICS_DIR cada worker vuelca
+    # allí las suyas y /metrics suma las de todos; con METRICS_TOKEN hace falta "Bearer <token>".
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # Trazas estructuradas (services/logs.py): nivel y fracción que se escribe de los eventos muestreados
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 0.01))
+
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'super_secreta_clave_jwt_cambiala_en_produccion'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     JWT_TOKEN_LOCATION = ['headers']
 
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
-    GOOGLE_AUTHORIZE_URL = 'https://accounts.google.com/o/oauth2/auth'
-    GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
-    GOOGLE_USERINFO_URL = 'https://www.googleapis.com/oauth2/v3/userinfo'
-    GOOGLE_REDIRECT_URI = os.environ.get('GOOGLE_REDIRECT_URI') or 'http://localhost:5000/auth/callback'
+    # Sobrescribibles para probar el login contra un servidor OAuth local
+    GOOGLE_AUTHORIZE_URL = os.environ.get('GOOGLE_AUTHORIZE_URL') or 'https://accounts.google.com/o/oauth2/auth'
+    GOOGLE_TOKEN_URL = os.environ.get('GOOGLE_TOKEN_URL') or 'https://oauth2.googleapis.com/token'
+    GOOGLE_USERINFO_URL = os.environ.get('GOOGLE_USERINFO_URL') or 'https://www.googleapis.com/oauth2/v1/userinfo'
+    GOOGLE_JWKS_URL = os.environ.get('GOOGLE_JWKS_URL') or 'https://www.googleapis.com/oauth2/v3/certs'
+    # Segundos que se guardan las claves de Google si la respuesta no trae Cache-Control: max-age
+    GOOGLE_JWKS_TTL = int(os.environ.get('GOOGLE_JWKS_TTL', 3600))
+    GOOGLE_REDIRECT_URI = os.environ.get('GOOGLE_REDIRECT_URI') or 'http://localhost:5000/auth/google/callback'
+
+    # Llamadas HTTP salientes (services/http_client.py): timeouts en segundos y reintentos
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 3.05))
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 10))
+    HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', 2))
+    HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 10))
     SERVER_NAME = os.environ.get('FLASK_SERVER_NAME') or 'localhost:5000'
\ No newline at end of file
@@ -1,3 +1,21 @@
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select
 
-db = SQLAlchemy()
\ No newline at end of file
+
+class RoutingSession(Session):
+    """
+    Envía los SELECT a la réplica (bind "replica") cuando la vista lo ha pedido con
+    @replica_reads (services/db_routing.py) y la réplica está al día. Todo lo demás
+    (flush, INSERT/UPDATE/DELETE, consultas por mapper) va a la BD principal.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and isinstance(clause, Select) \
+                and has_app_context() and g.get('read_replica'):
+            return self._db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
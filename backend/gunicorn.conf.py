@@ -0,0 +1,62 @@
+# backend/gunicorn.conf.py
+# Uso (desde backend/):  gunicorn -c gunicorn.conf.py
+# Todo se puede ajustar por entorno; Render define PORT y WEB_CONCURRENCY.
+import glob
+import multiprocessing
+import os
+import tempfile
+
+wsgi_app = 'wsgi:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+# "sync" (por defecto) o "gevent": un greenlet por conexión, para muchos oyentes de audio
+# simultáneos por worker (services/green.py). Con gevent, GUNICORN_THREADS no se usa.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+if worker_class == 'gevent':
+    # Antes de cargar la app (preload_app): sus locks y sockets deben nacer ya parcheados
+    from services.green import patch_all
+
+    patch_all()
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+    # Los oyentes no usan la BD; las peticiones que sí, esperan turno en el pool (sin bloquear
+    # el worker) en vez de abrir una conexión por greenlet. Y más conexiones HTTP reutilizables
+    # hacia Google, porque ahora hay muchos callbacks OAuth a la vez en cada worker.
+    os.environ.setdefault('DB_POOL_SIZE', '10')
+    os.environ.setdefault('DB_MAX_OVERFLOW', '5')
+    os.environ.setdefault('DB_POOL_TIMEOUT', '10')
+    os.environ.setdefault('HTTP_POOL_MAXSIZE', '50')
+
+# La app se importa y se crea una vez en el maestro (sin tocar la BD) y los workers la
+# heredan al bifurcarse: arrancan más rápido y comparten la memoria de los módulos.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# Cada worker vuelca aquí sus métricas y /metrics suma las de todos (services/metrics.py).
+# Se fija antes de cargar la app: Config lee el entorno al importarse.
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), f"ambaria-metrics-{bind.rsplit(':', 1)[-1]}"))
+
+
+def on_starting(server):
+    # Contadores desde cero en cada arranque del maestro
+    for path in glob.glob(os.path.join(os.environ['METRICS_DIR'], '*.json')):
+        os.remove(path)
+
+
+def post_worker_init(worker):
+    # Ya en el worker y con la app cargada: pool propio y conexiones abiertas antes de la primera petición
+    from services.db_pool import prewarm_pool
+
+    prewarm_pool(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    # Último volcado: lo atendido por este worker sigue contando cuando ya no existe. Los
+    # workers terminan con os._exit, así que los atexit (p. ej. el del búfer de
+    # reproducciones) no llegan a ejecutarse
+    from services.metrics import flush
+    from services.play_events import flush_play_events
+
+    flush_play_events()
+    flush(worker.wsgi)
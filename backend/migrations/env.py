@@ -5,6 +5,8 @@ from flask import current_app
 
 from alembic import context
 
+from models.podcast_search import SEARCH_TABLE
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -51,6 +53,16 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # El índice de búsqueda (models/podcast_search.py) no está en los modelos: lo crean DDL
+    # propias con sus tablas internas (FTS5: podcast_search_data, _idx, _content, ...).
+    # Autogenerate no debe proponer borrarlo.
+    table_name = name if type_ == 'table' else getattr(getattr(object, 'table', None), 'name', None)
+    if table_name and (table_name == SEARCH_TABLE or table_name.startswith(SEARCH_TABLE + '_')):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +77,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +106,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,35 @@
+"""indices compuestos para paginación keyset de podcasts
+
+Revision ID: a1c3e5f70001
+Revises: 81fdc35669aa
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70001'
+down_revision = '81fdc35669aa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Las filas antiguas se crearon con CURRENT_TIMESTAMP de SQLite ("2025-06-15 22:22:33"); SQLAlchemy
+    # escribe y compara "2025-06-15 22:22:33.000000". Los cursores comparan texto: se igualan al formato nuevo.
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("UPDATE podcasts SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+    with op.batch_alter_table('podcasts', schema=None) as batch_op:
+        batch_op.create_index('ix_podcasts_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_podcasts_category_created_at_id', ['category', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_podcasts_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('podcasts', schema=None) as batch_op:
+        batch_op.drop_index('ix_podcasts_user_id_created_at_id')
+        batch_op.drop_index('ix_podcasts_category_created_at_id')
+        batch_op.drop_index('ix_podcasts_created_at_id')
@@ -0,0 +1,36 @@
+"""metadatos de audio en podcasts
+
+Revision ID: a1c3e5f70005
+Revises: a1c3e5f70004
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70005'
+down_revision = 'a1c3e5f70004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('podcasts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('duration_seconds', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('audio_bitrate', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('audio_sample_rate', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('audio_channels', sa.SmallInteger(), nullable=True))
+        batch_op.add_column(sa.Column('audio_size', sa.BigInteger(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_podcasts_duration_seconds'), ['duration_seconds'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('podcasts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_podcasts_duration_seconds'))
+        batch_op.drop_column('audio_size')
+        batch_op.drop_column('audio_channels')
+        batch_op.drop_column('audio_sample_rate')
+        batch_op.drop_column('audio_bitrate')
+        batch_op.drop_column('duration_seconds')
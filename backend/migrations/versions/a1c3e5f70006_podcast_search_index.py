@@ -0,0 +1,129 @@
+"""índice de búsqueda de texto completo (FTS5 en SQLite, tsvector + GIN en PostgreSQL)
+
+Revision ID: a1c3e5f70006
+Revises: a1c3e5f70005
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70006'
+down_revision = 'a1c3e5f70005'
+branch_labels = None
+depends_on = None
+
+# Se copian las DDL de models/podcast_search.py en el momento de esta revisión.
+SQLITE_UPGRADE = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS podcast_search USING fts5(
+        title, description, comments,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_podcasts_ai AFTER INSERT ON podcasts BEGIN
+        INSERT INTO podcast_search (rowid, title, description, comments)
+        VALUES (new.id, new.title, coalesce(new.description, ''), '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_podcasts_au AFTER UPDATE OF title, description ON podcasts BEGIN
+        UPDATE podcast_search SET title = new.title, description = coalesce(new.description, '')
+        WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_podcasts_ad AFTER DELETE ON podcasts BEGIN
+        DELETE FROM podcast_search WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_comments_ai AFTER INSERT ON comments BEGIN
+        UPDATE podcast_search SET comments = coalesce(
+            (SELECT group_concat(text, ' ') FROM comments WHERE podcast_id = new.podcast_id), '')
+        WHERE rowid = new.podcast_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_comments_au AFTER UPDATE OF text ON comments BEGIN
+        UPDATE podcast_search SET comments = coalesce(
+            (SELECT group_concat(text, ' ') FROM comments WHERE podcast_id = new.podcast_id), '')
+        WHERE rowid = new.podcast_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_comments_ad AFTER DELETE ON comments BEGIN
+        UPDATE podcast_search SET comments = coalesce(
+            (SELECT group_concat(text, ' ') FROM comments WHERE podcast_id = old.podcast_id), '')
+        WHERE rowid = old.podcast_id;
+    END""",
+    """INSERT INTO podcast_search (rowid, title, description, comments)
+        SELECT p.id, p.title, coalesce(p.description, ''),
+               coalesce((SELECT group_concat(c.text, ' ') FROM comments c WHERE c.podcast_id = p.id), '')
+        FROM podcasts p
+        WHERE NOT EXISTS (SELECT 1 FROM podcast_search)""",
+)
+
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS podcast_search_comments_ad",
+    "DROP TRIGGER IF EXISTS podcast_search_comments_au",
+    "DROP TRIGGER IF EXISTS podcast_search_comments_ai",
+    "DROP TRIGGER IF EXISTS podcast_search_podcasts_ad",
+    "DROP TRIGGER IF EXISTS podcast_search_podcasts_au",
+    "DROP TRIGGER IF EXISTS podcast_search_podcasts_ai",
+    "DROP TABLE IF EXISTS podcast_search",
+)
+
+POSTGRES_UPGRADE = (
+    """CREATE TABLE IF NOT EXISTS podcast_search (
+        podcast_id INTEGER PRIMARY KEY REFERENCES podcasts (id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_podcast_search_document ON podcast_search USING GIN (document)",
+    """CREATE OR REPLACE FUNCTION podcast_search_refresh(pid INTEGER) RETURNS void AS $$
+        INSERT INTO podcast_search (podcast_id, document)
+        SELECT p.id,
+               setweight(to_tsvector('spanish', coalesce(p.title, '')), 'A') ||
+               setweight(to_tsvector('spanish', coalesce(p.description, '')), 'B') ||
+               setweight(to_tsvector('spanish', coalesce(
+                   (SELECT string_agg(c.text, ' ') FROM comments c WHERE c.podcast_id = p.id), '')), 'D')
+        FROM podcasts p WHERE p.id = pid
+        ON CONFLICT (podcast_id) DO UPDATE SET document = EXCLUDED.document;
+    $$ LANGUAGE sql""",
+    """CREATE OR REPLACE FUNCTION podcast_search_podcasts_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM podcast_search_refresh(NEW.id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION podcast_search_comments_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM podcast_search_refresh(OLD.podcast_id);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM podcast_search_refresh(NEW.podcast_id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS podcast_search_podcasts ON podcasts",
+    """CREATE TRIGGER podcast_search_podcasts AFTER INSERT OR UPDATE OF title, description ON podcasts
+        FOR EACH ROW EXECUTE FUNCTION podcast_search_podcasts_trigger()""",
+    "DROP TRIGGER IF EXISTS podcast_search_comments ON comments",
+    """CREATE TRIGGER podcast_search_comments AFTER INSERT OR UPDATE OF text, podcast_id OR DELETE ON comments
+        FOR EACH ROW EXECUTE FUNCTION podcast_search_comments_trigger()""",
+    "SELECT podcast_search_refresh(id) FROM podcasts WHERE NOT EXISTS (SELECT 1 FROM podcast_search)",
+)
+
+POSTGRES_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS podcast_search_comments ON comments",
+    "DROP TRIGGER IF EXISTS podcast_search_podcasts ON podcasts",
+    "DROP FUNCTION IF EXISTS podcast_search_comments_trigger()",
+    "DROP FUNCTION IF EXISTS podcast_search_podcasts_trigger()",
+    "DROP FUNCTION IF EXISTS podcast_search_refresh(INTEGER)",
+    "DROP TABLE IF EXISTS podcast_search",
+)
+
+
+def _run(statements_by_dialect):
+    dialect = op.get_bind().dialect.name
+    for statement in statements_by_dialect.get(dialect, ()):
+        op.execute(statement)
+
+
+def upgrade():
+    _run({'sqlite': SQLITE_UPGRADE, 'postgresql': POSTGRES_UPGRADE})
+
+
+def downgrade():
+    _run({'sqlite': SQLITE_DOWNGRADE, 'postgresql': POSTGRES_DOWNGRADE})
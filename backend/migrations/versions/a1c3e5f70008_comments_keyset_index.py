@@ -0,0 +1,29 @@
+"""índice compuesto para paginar comentarios por podcast
+
+Revision ID: a1c3e5f70008
+Revises: a1c3e5f70007
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70008'
+down_revision = 'a1c3e5f70007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # El índice compuesto empieza por podcast_id, así que reemplaza al índice simple
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_podcast_id_created_at_id', ['podcast_id', 'created_at', 'id'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_comments_podcast_id'))
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_comments_podcast_id'), ['podcast_id'], unique=False)
+        batch_op.drop_index('ix_comments_podcast_id_created_at_id')
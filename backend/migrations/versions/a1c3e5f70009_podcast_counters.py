@@ -0,0 +1,31 @@
+"""contadores desnormalizados en podcasts
+
+Revision ID: a1c3e5f70009
+Revises: a1c3e5f70008
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70009'
+down_revision = 'a1c3e5f70008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('podcasts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE podcasts SET comment_count = "
+        "(SELECT count(*) FROM comments WHERE comments.podcast_id = podcasts.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('podcasts', schema=None) as batch_op:
+        batch_op.drop_column('comment_count')
@@ -0,0 +1,54 @@
+"""reproducciones: eventos y agregados por hora/día
+
+Revision ID: a1c3e5f70010
+Revises: a1c3e5f70009
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70010'
+down_revision = 'a1c3e5f70009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('play_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('podcast_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('played_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['podcast_id'], ['podcasts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('play_events', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_play_events_played_at'), ['played_at'], unique=False)
+
+    op.create_table('podcast_plays_hourly',
+    sa.Column('podcast_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.DateTime(), nullable=False),
+    sa.Column('plays', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['podcast_id'], ['podcasts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('podcast_id', 'period_start')
+    )
+    op.create_table('podcast_plays_daily',
+    sa.Column('podcast_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.DateTime(), nullable=False),
+    sa.Column('plays', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['podcast_id'], ['podcasts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('podcast_id', 'period_start')
+    )
+
+
+def downgrade():
+    op.drop_table('podcast_plays_daily')
+    op.drop_table('podcast_plays_hourly')
+    with op.batch_alter_table('play_events', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_play_events_played_at'))
+
+    op.drop_table('play_events')
@@ -0,0 +1,48 @@
+"""ranking de tendencias materializado
+
+Revision ID: a1c3e5f70011
+Revises: a1c3e5f70010
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70011'
+down_revision = 'a1c3e5f70010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('podcast_trending',
+    sa.Column('podcast_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['podcast_id'], ['podcasts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('podcast_id')
+    )
+    with op.batch_alter_table('podcast_trending', schema=None) as batch_op:
+        batch_op.create_index('ix_podcast_trending_score', ['score', 'podcast_id'], unique=False)
+        batch_op.create_index('ix_podcast_trending_category_score', ['category', 'score', 'podcast_id'], unique=False)
+
+    op.create_table('trending_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.Column('last_podcast_id', sa.Integer(), nullable=False),
+    sa.Column('last_comment_id', sa.Integer(), nullable=False),
+    sa.Column('last_play_event_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('trending_state')
+    with op.batch_alter_table('podcast_trending', schema=None) as batch_op:
+        batch_op.drop_index('ix_podcast_trending_category_score')
+        batch_op.drop_index('ix_podcast_trending_score')
+
+    op.drop_table('podcast_trending')
@@ -0,0 +1,33 @@
+"""cambios por podcast para invalidar la caché del catálogo sin vaciarla
+
+Revision ID: a1c3e5f70012
+Revises: a1c3e5f70011
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70012'
+down_revision = 'a1c3e5f70011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('catalog_version', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+
+    op.create_table('catalog_changes',
+    sa.Column('seq', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('podcast_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
+
+
+def downgrade():
+    op.drop_table('catalog_changes')
+    with op.batch_alter_table('catalog_version', schema=None) as batch_op:
+        batch_op.drop_column('change_seq')
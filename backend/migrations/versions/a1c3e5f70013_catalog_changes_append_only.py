@@ -0,0 +1,39 @@
+"""catalog_changes solo por inserción (seq autoincremental, sin catalog_version.change_seq)
+
+Revision ID: a1c3e5f70013
+Revises: a1c3e5f70012
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70013'
+down_revision = 'a1c3e5f70012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # El registro solo sirve para invalidar cachés en memoria: se puede empezar de cero
+    op.drop_table('catalog_changes')
+    op.create_table('catalog_changes',
+    sa.Column('seq', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('podcast_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
+    with op.batch_alter_table('catalog_version', schema=None) as batch_op:
+        batch_op.drop_column('change_seq')
+
+
+def downgrade():
+    with op.batch_alter_table('catalog_version', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+    op.drop_table('catalog_changes')
+    op.create_table('catalog_changes',
+    sa.Column('seq', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('podcast_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
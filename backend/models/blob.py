@@ -0,0 +1,21 @@
+# backend/models/blob.py
+from datetime import datetime
+from extensions import db
+
+
+class Blob(db.Model):
+    """
+    Archivo subido guardado por contenido (<sha256>.<ext> en UPLOAD_FOLDER).
+    ref_count cuenta cuántas columnas de Podcast (audio o portada) apuntan a él;
+    el archivo solo se borra del disco cuando llega a cero.
+    """
+    __tablename__ = 'blobs'
+
+    filename = db.Column(db.String(255), primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, index=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Blob {self.filename} refs={self.ref_count}>'
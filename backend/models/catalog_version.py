@@ -0,0 +1,31 @@
+# backend/models/catalog_version.py
+from extensions import db
+
+
+class CatalogVersion(db.Model):
+    """
+    Fila única con un contador que se incrementa en cada escritura del catálogo.
+    Vive en la BD para que todos los workers de gunicorn vean el mismo valor.
+    """
+    __tablename__ = 'catalog_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<CatalogVersion {self.version}>'
+
+
+class CatalogChange(db.Model):
+    """
+    Podcast cuyo contenido en los listados cambió sin tocar el resto del catálogo
+    (p. ej. comment_count). Solo se insertan filas, sin bloquear ninguna compartida;
+    se conservan más o menos los últimos CATALOG_CHANGE_LOG_SIZE cambios.
+    """
+    __tablename__ = 'catalog_changes'
+
+    seq = db.Column(db.Integer, primary_key=True)
+    podcast_id = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<CatalogChange {self.seq} podcast={self.podcast_id}>'
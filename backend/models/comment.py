@@ -14,13 +14,21 @@ class Comment(db.Model):
     # los comentarios cuando el podcast_id al que se refieren sea eliminado.
     podcast_id = db.Column(db.Integer, db.ForeignKey('podcasts.id', ondelete='CASCADE'), nullable=False)
 
+    # Paginación por cursor sobre (created_at, id) dentro de un podcast. Al empezar por
+    # podcast_id también sirve a los triggers del índice de búsqueda que filtran por esa columna.
+    __table_args__ = (
+        db.Index('ix_comments_podcast_id_created_at_id', 'podcast_id', 'created_at', 'id'),
+    )
+
 
     def __repr__(self):
         return f'<Comment {self.id} by User {self.user_id} on Podcast {self.podcast_id}>'
 
-    def to_dict(self):
-        username = self.user.name if self.user else "Desconocido"
-        profile_picture = self.user.profile_picture if self.user else None
+    def to_dict(self, author=None):
+        # `author` permite pasar el usuario ya cargado y evitar la carga perezosa de self.user
+        author = author if author is not None else self.user
+        username = author.name if author else "Desconocido"
+        profile_picture = author.profile_picture if author else None
         
         return {
             'id': self.id,
@@ -0,0 +1,38 @@
+# backend/models/play_stats.py
+from datetime import datetime
+from extensions import db
+
+
+class PlayEvent(db.Model):
+    """
+    Reproducción individual tal como llega del reproductor. Se escribe por lotes
+    (services/play_events.py) y solo se conserva unos días: las consultas leen
+    siempre los agregados por hora/día.
+    """
+    __tablename__ = 'play_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    podcast_id = db.Column(db.Integer, db.ForeignKey('podcasts.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'))
+    played_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<PlayEvent podcast={self.podcast_id} at={self.played_at}>'
+
+
+class PodcastPlaysHourly(db.Model):
+    """Reproducciones por podcast y hora (period_start = inicio de la hora, UTC)."""
+    __tablename__ = 'podcast_plays_hourly'
+
+    podcast_id = db.Column(db.Integer, db.ForeignKey('podcasts.id', ondelete='CASCADE'), primary_key=True)
+    period_start = db.Column(db.DateTime, primary_key=True)
+    plays = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class PodcastPlaysDaily(db.Model):
+    """Reproducciones por podcast y día (period_start = medianoche, UTC)."""
+    __tablename__ = 'podcast_plays_daily'
+
+    podcast_id = db.Column(db.Integer, db.ForeignKey('podcasts.id', ondelete='CASCADE'), primary_key=True)
+    period_start = db.Column(db.DateTime, primary_key=True)
+    plays = db.Column(db.BigInteger, nullable=False, default=0)
@@ -11,15 +11,35 @@ class Podcast(db.Model):
     # Mantenemos longitud mayor por si volvemos a GCS o rutas largas
     audio_path = db.Column(db.String(500), nullable=False) 
     cover_image_path = db.Column(db.String(500)) 
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    # Default en Python (como en Comment): SQLite guarda así siempre el mismo formato con
+    # microsegundos, necesario para comparar correctamente el cursor de paginación.
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     category = db.Column(db.String(50))
 
+    # Metadatos del audio, extraídos en segundo plano tras la subida (services/media_jobs.py)
+    duration_seconds = db.Column(db.Float, index=True)
+    audio_bitrate = db.Column(db.Integer)
+    audio_sample_rate = db.Column(db.Integer)
+    audio_channels = db.Column(db.SmallInteger)
+    audio_size = db.Column(db.BigInteger)
+
+    # Contadores desnormalizados, mantenidos con UPDATE atómicos (services/counters.py)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     user = relationship('User', backref='podcasts_created', lazy=True)
 
     # Relación con Comment - ¡Añadimos cascade='all, delete-orphan' para eliminar comentarios!
     # Esto asegura que al borrar un podcast, se borren sus comentarios relacionados a nivel de ORM.
     comments = relationship('Comment', backref='podcast', lazy=True, cascade='all, delete-orphan')
 
+    # Índices compuestos para la paginación por cursor (keyset) sobre (created_at, id),
+    # tanto en el listado filtrado por categoría como en "mis podcasts".
+    __table_args__ = (
+        db.Index('ix_podcasts_created_at_id', 'created_at', 'id'),
+        db.Index('ix_podcasts_category_created_at_id', 'category', 'created_at', 'id'),
+        db.Index('ix_podcasts_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f'<Podcast {self.title}>'
\ No newline at end of file
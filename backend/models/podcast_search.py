@@ -0,0 +1,107 @@
+# backend/models/podcast_search.py
+"""
+Índice de búsqueda de texto completo sobre podcasts (título, descripción y comentarios).
+
+No es un modelo ORM: son DDL propias de cada motor que se crean junto al resto de
+tablas (db.create_all) y que la base de datos mantiene sola mediante triggers, así
+que cualquier INSERT/UPDATE/DELETE sobre podcasts o comments queda reflejado.
+
+    SQLite:     tabla virtual FTS5 `podcast_search` (rowid = id del podcast), ranking bm25
+    PostgreSQL: tabla `podcast_search` (podcast_id, document tsvector) con índice GIN, ts_rank
+
+Si el índice se crea sobre una base de datos con podcasts, se rellena en ese momento.
+"""
+from sqlalchemy import DDL, event
+
+from extensions import db
+
+SEARCH_TABLE = 'podcast_search'
+PG_TS_CONFIG = 'spanish'
+
+SQLITE_DDL = (
+    # prefix='2 3' mantiene índices de prefijos cortos para que "term*" no recorra todo el vocabulario
+    """CREATE VIRTUAL TABLE IF NOT EXISTS podcast_search USING fts5(
+        title, description, comments,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_podcasts_ai AFTER INSERT ON podcasts BEGIN
+        INSERT INTO podcast_search (rowid, title, description, comments)
+        VALUES (new.id, new.title, coalesce(new.description, ''), '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_podcasts_au AFTER UPDATE OF title, description ON podcasts BEGIN
+        UPDATE podcast_search SET title = new.title, description = coalesce(new.description, '')
+        WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_podcasts_ad AFTER DELETE ON podcasts BEGIN
+        DELETE FROM podcast_search WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_comments_ai AFTER INSERT ON comments BEGIN
+        UPDATE podcast_search SET comments = coalesce(
+            (SELECT group_concat(text, ' ') FROM comments WHERE podcast_id = new.podcast_id), '')
+        WHERE rowid = new.podcast_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_comments_au AFTER UPDATE OF text ON comments BEGIN
+        UPDATE podcast_search SET comments = coalesce(
+            (SELECT group_concat(text, ' ') FROM comments WHERE podcast_id = new.podcast_id), '')
+        WHERE rowid = new.podcast_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS podcast_search_comments_ad AFTER DELETE ON comments BEGIN
+        UPDATE podcast_search SET comments = coalesce(
+            (SELECT group_concat(text, ' ') FROM comments WHERE podcast_id = old.podcast_id), '')
+        WHERE rowid = old.podcast_id;
+    END""",
+    """INSERT INTO podcast_search (rowid, title, description, comments)
+        SELECT p.id, p.title, coalesce(p.description, ''),
+               coalesce((SELECT group_concat(c.text, ' ') FROM comments c WHERE c.podcast_id = p.id), '')
+        FROM podcasts p
+        WHERE NOT EXISTS (SELECT 1 FROM podcast_search)""",
+)
+
+POSTGRES_DDL = (
+    """CREATE TABLE IF NOT EXISTS podcast_search (
+        podcast_id INTEGER PRIMARY KEY REFERENCES podcasts (id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_podcast_search_document ON podcast_search USING GIN (document)",
+    # Pesos: título A, descripción B, comentarios D
+    f"""CREATE OR REPLACE FUNCTION podcast_search_refresh(pid INTEGER) RETURNS void AS $$
+        INSERT INTO podcast_search (podcast_id, document)
+        SELECT p.id,
+               setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(p.title, '')), 'A') ||
+               setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(p.description, '')), 'B') ||
+               setweight(to_tsvector('{PG_TS_CONFIG}', coalesce(
+                   (SELECT string_agg(c.text, ' ') FROM comments c WHERE c.podcast_id = p.id), '')), 'D')
+        FROM podcasts p WHERE p.id = pid
+        ON CONFLICT (podcast_id) DO UPDATE SET document = EXCLUDED.document;
+    $$ LANGUAGE sql""",
+    """CREATE OR REPLACE FUNCTION podcast_search_podcasts_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM podcast_search_refresh(NEW.id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION podcast_search_comments_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM podcast_search_refresh(OLD.podcast_id);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM podcast_search_refresh(NEW.podcast_id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS podcast_search_podcasts ON podcasts",
+    """CREATE TRIGGER podcast_search_podcasts AFTER INSERT OR UPDATE OF title, description ON podcasts
+        FOR EACH ROW EXECUTE FUNCTION podcast_search_podcasts_trigger()""",
+    "DROP TRIGGER IF EXISTS podcast_search_comments ON comments",
+    """CREATE TRIGGER podcast_search_comments AFTER INSERT OR UPDATE OF text, podcast_id OR DELETE ON comments
+        FOR EACH ROW EXECUTE FUNCTION podcast_search_comments_trigger()""",
+    "SELECT podcast_search_refresh(id) FROM podcasts WHERE NOT EXISTS (SELECT 1 FROM podcast_search)",
+)
+
+for _statement in SQLITE_DDL:
+    event.listen(db.metadata, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in POSTGRES_DDL:
+    event.listen(db.metadata, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+event.listen(db.metadata, 'before_drop', DDL("DROP TABLE IF EXISTS podcast_search"))
@@ -0,0 +1,33 @@
+# backend/models/trending.py
+from extensions import db
+
+
+class PodcastTrending(db.Model):
+    """
+    Ranking de tendencias materializado (lo rellena services/trending.py). `score` es
+    el logaritmo de la puntuación con decaimiento, referido a una fecha fija: así el
+    orden no cambia con el paso del tiempo y solo hay que recalcular los podcasts con
+    actividad nueva. La categoría se copia aquí para leer el top-K por índice.
+    """
+    __tablename__ = 'podcast_trending'
+
+    podcast_id = db.Column(db.Integer, db.ForeignKey('podcasts.id', ondelete='CASCADE'), primary_key=True)
+    category = db.Column(db.String(50))
+    score = db.Column(db.Float, nullable=False)
+    refreshed_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_podcast_trending_score', 'score', 'podcast_id'),
+        db.Index('ix_podcast_trending_category_score', 'category', 'score', 'podcast_id'),
+    )
+
+
+class TrendingState(db.Model):
+    """Fila única con las marcas de agua (últimos ids vistos) del recálculo incremental."""
+    __tablename__ = 'trending_state'
+
+    id = db.Column(db.Integer, primary_key=True)
+    refreshed_at = db.Column(db.DateTime, nullable=False)
+    last_podcast_id = db.Column(db.Integer, nullable=False, default=0)
+    last_comment_id = db.Column(db.Integer, nullable=False, default=0)
+    last_play_event_id = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,94 @@
+# backend/routes/auth_routes.py
+import logging
+import os
+import urllib.parse
+
+from flask import Blueprint, jsonify, request, redirect, session, current_app
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+
+from services.google_oauth import fetch_google_profile, OAuthError
+from services.logs import log_event
+from services.users import upsert_google_user, get_user, sync_user_cache_with_catalog
+
+auth_bp = Blueprint('auth', __name__)
+
+# --- Rutas de Autenticación con Google OAuth ---
+@auth_bp.route('/auth/google')
+def google_oauth_login():
+    """Redirige al usuario a la página de inicio de sesión de Google."""
+    log_event('auth.google_login')
+    params = {
+        'response_type': 'code',
+        'client_id': current_app.config['GOOGLE_CLIENT_ID'],
+        'redirect_uri': current_app.config['GOOGLE_REDIRECT_URI'],
+        'scope': 'openid email profile',
+        'access_type': 'offline',
+        'prompt': 'consent' # Opcional: 'select_account' o 'consent' si quieres forzar la selección de cuenta o el consentimiento
+    }
+    return redirect(f"{current_app.config['GOOGLE_AUTHORIZE_URL']}?{urllib.parse.urlencode(params)}")
+
+@auth_bp.route('/auth/google/callback')
+def google_oauth_callback():
+    """Maneja la devolución de llamada de Google OAuth."""
+    code = request.args.get('code')
+    if not code:
+        log_event('auth.google_callback_without_code', logging.INFO)
+        return jsonify({"error": "No se recibió el código de autorización."}), 400
+
+    try:
+        # Intercambio del código y verificación local del id_token (services/google_oauth.py)
+        profile = fetch_google_profile(code)
+    except OAuthError as e:
+        log_event('auth.google_callback_failed', logging.WARNING, error=str(e), status=e.status_code)
+        return jsonify({"error": str(e)}), e.status_code
+
+    user_id, email, profile_picture = upsert_google_user(profile)
+    log_event('auth.login', logging.INFO, user_id=user_id)
+
+    # Generar token JWT
+    access_token = create_access_token(
+        identity=str(user_id),
+        additional_claims={
+            "email": email,
+            "profile_picture": profile_picture
+        }
+    )
+
+    frontend_redirect_url = os.environ.get('FRONTEND_URL', 'http://localhost:3000') + '/auth-callback'
+    return redirect(f"{frontend_redirect_url}?token={access_token}")
+
+@auth_bp.route('/profile', methods=['GET'])
+@jwt_required()
+def get_profile():
+    current_user_id = get_jwt_identity()
+    log_event('auth.profile', sampled=True, user_id=current_user_id)
+
+    try:
+        user_id_int = int(current_user_id)
+    except ValueError:
+        return jsonify({"message": "ID de usuario inválido en el token."}), 400
+
+    # Caché de usuarios del worker: solo se lee la versión del catálogo (un login en otro
+    # worker puede haber cambiado el nombre o la foto) mientras la entrada siga viva
+    sync_user_cache_with_catalog()
+    user = get_user(user_id_int)
+
+    if user:
+        return jsonify({
+            "message": f"¡Bienvenido, {user.name}!",
+            "user_id": user.id,
+            "email": user.email,
+            "profile_picture": user.profile_picture
+        })
+    else:
+        log_event('auth.profile_not_found', logging.INFO, user_id=current_user_id)
+        return jsonify({"message": "Usuario no encontrado."}), 404
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required()
+def logout():
+    session.pop('user_id', None)
+    session.pop('google_id', None)
+    session.pop('email', None)
+
+    return jsonify({"message": "Sesión cerrada con éxito."})
@@ -6,6 +6,12 @@ from models.comment import Comment
 from models.podcast import Podcast
 from models.user import User # Necesario para la relación inversa y obtener nombre de usuario
 from sqlalchemy.exc import SQLAlchemyError
+from services.pagination import parse_limit
+from services.comments import comment_page
+from services.counters import increment_counter
+from services.catalog_cache import mark_podcast_changed
+from services.db_routing import replica_reads
+from services.users import get_user
 from datetime import datetime # Asegúrate de que datetime esté importado si lo usas directamente
 
 comment_bp = Blueprint('comments', __name__, url_prefix='/api') # Prefijo para todas las rutas de este blueprint
@@ -27,6 +33,8 @@ def add_comment(podcast_id):
     if not podcast:
         return jsonify({"error": "Podcast no encontrado."}), 404
 
+    author = get_user(user_id_int)
+
     data = request.get_json()
     comment_text = data.get('text', '').strip()
 
@@ -41,10 +49,16 @@ def add_comment(podcast_id):
             created_at=datetime.utcnow() # Usa datetime.utcnow() para la marca de tiempo
         )
         db.session.add(new_comment)
+        increment_counter(podcast_id, 'comment_count')
+        # Los listados cacheados muestran comment_count: solo se descartan los que incluyen este podcast
+        mark_podcast_changed(podcast_id)
+        db.session.flush()
+        # La respuesta se arma antes del commit (que expira el objeto) y con el autor ya
+        # cargado: así no hacen falta un SELECT de refresco ni la carga perezosa de new_comment.user
+        comment_data = new_comment.to_dict(author=author)
         db.session.commit()
 
-        # Usamos to_dict() para la respuesta, que ya incluye username y profile_picture
-        return jsonify({"message": "Comentario añadido con éxito.", "comment": new_comment.to_dict()}), 201
+        return jsonify({"message": "Comentario añadido con éxito.", "comment": comment_data}), 201
 
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -55,18 +69,21 @@ def add_comment(podcast_id):
         return jsonify({"error": "Error interno del servidor."}), 500
 
 # --- RUTA PARA OBTENER LOS COMENTARIOS DE UN PODCAST (GET) ---
+# Paginación por cursor: ?limit=N&cursor=<next_cursor de la página anterior>
 @comment_bp.route('/podcasts/<int:podcast_id>/comments', methods=['GET'])
+@replica_reads
 def get_comments(podcast_id):
-    podcast = Podcast.query.get(podcast_id)
-    if not podcast:
+    # Solo se comprueba que exista: no hace falta cargar la fila completa del podcast
+    if db.session.query(Podcast.id).filter_by(id=podcast_id).first() is None:
         return jsonify({"error": "Podcast no encontrado."}), 404
 
     try:
-        # Ordenar comentarios por fecha de creación descendente (más recientes primero)
-        comments = Comment.query.filter_by(podcast_id=podcast_id).order_by(Comment.created_at.desc()).all()
-        # Convertir cada objeto Comment a su representación de diccionario
-        comments_data = [comment.to_dict() for comment in comments]
-        return jsonify({"comments": comments_data}), 200
+        limit = parse_limit(request.args.get('limit'))
+        # Más recientes primero; los autores salen de la caché de usuarios (evita el N+1 de comment.user)
+        comments_data, next_cursor, _ = comment_page(podcast_id, limit, request.args.get('cursor'))
+        return jsonify({"comments": comments_data, "next_cursor": next_cursor}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except SQLAlchemyError as e:
         current_app.logger.error(f"Error al obtener comentarios de la BD: {e}")
         return jsonify({"error": "Error interno al obtener los comentarios.", "details": str(e)}), 500
@@ -97,6 +114,8 @@ def delete_comment(comment_id):
 
     try:
         db.session.delete(comment)
+        increment_counter(comment.podcast_id, 'comment_count', -1)
+        mark_podcast_changed(comment.podcast_id)
         db.session.commit()
         return jsonify({"message": "Comentario eliminado con éxito."}), 200
     except SQLAlchemyError as e:
@@ -0,0 +1,143 @@
+# backend/routes/play_routes.py
+"""
+Reproducciones de episodios.
+
+    POST /podcasts/<id>/plays   registra una reproducción
+    POST /podcasts/plays        registra varias ({"plays": [{"podcast_id", "played_at"?}, ...]})
+    GET  /podcasts/<id>/plays   serie por hora o día (?granularity=hour|day&days=N)
+
+Las escrituras se aceptan con 202: van a un búfer en memoria que se vuelca a la BD
+por lotes (services/play_events.py). Las lecturas solo usan las tablas de agregados.
+"""
+from datetime import datetime, timedelta, timezone
+
+from flask import Blueprint, jsonify, request, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models.play_stats import PodcastPlaysDaily, PodcastPlaysHourly
+from models.podcast import Podcast
+from services.play_events import record_plays, hour_start, day_start
+
+play_bp = Blueprint('plays', __name__)
+
+# Margen para relojes de cliente adelantados
+CLOCK_SKEW = timedelta(minutes=5)
+GRANULARITIES = {
+    # granularidad -> (modelo, inicio del periodo, máximo de días consultables)
+    'hour': (PodcastPlaysHourly, hour_start, 31),
+    'day': (PodcastPlaysDaily, day_start, 366),
+}
+
+
+def _current_user_id():
+    try:
+        return int(get_jwt_identity())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_played_at(raw, now):
+    """played_at enviado por el cliente (reproducciones offline), en UTC sin zona horaria."""
+    if raw is None:
+        return now
+    try:
+        played_at = datetime.fromisoformat(str(raw).replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError("'played_at' debe ser una fecha ISO 8601.")
+    if played_at.tzinfo is not None:
+        played_at = played_at.astimezone(timezone.utc).replace(tzinfo=None)
+    max_age = timedelta(days=current_app.config.get('PLAY_EVENTS_MAX_AGE_DAYS', 7))
+    if played_at < now - max_age or played_at > now + CLOCK_SKEW:
+        raise ValueError("'played_at' está fuera del intervalo admitido.")
+    return min(played_at, now)
+
+
+# --- RUTA PARA REGISTRAR UNA REPRODUCCIÓN (POST) ---
+@play_bp.route('/podcasts/<int:podcast_id>/plays', methods=['POST'])
+@jwt_required()
+def record_play(podcast_id):
+    try:
+        data = request.get_json(silent=True) or {}
+        played_at = _parse_played_at(data.get('played_at'), datetime.utcnow())
+        # El podcast no se comprueba aquí: los de podcasts inexistentes se descartan al volcar el lote
+        record_plays([(podcast_id, _current_user_id(), played_at)])
+        return jsonify({"accepted": 1}), 202
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error al registrar la reproducción: {e}")
+        return jsonify({"error": "Error al registrar la reproducción.", "code": 500}), 500
+
+
+# --- RUTA PARA REGISTRAR VARIAS REPRODUCCIONES (POST) ---
+@play_bp.route('/podcasts/plays', methods=['POST'])
+@jwt_required()
+def record_plays_batch():
+    data = request.get_json(silent=True) or {}
+    plays = data.get('plays')
+    max_batch = current_app.config.get('PLAY_EVENTS_MAX_BATCH', 100)
+    if not isinstance(plays, list) or not plays:
+        return jsonify({"error": "Se esperaba una lista 'plays' no vacía.", "code": 400}), 400
+    if len(plays) > max_batch:
+        return jsonify({"error": f"Como máximo {max_batch} reproducciones por petición.", "code": 400}), 400
+
+    try:
+        user_id = _current_user_id()
+        now = datetime.utcnow()
+        events = []
+        for play in plays:
+            if not isinstance(play, dict):
+                raise ValueError("Cada reproducción debe ser un objeto.")
+            try:
+                podcast_id = int(play.get('podcast_id'))
+            except (TypeError, ValueError):
+                raise ValueError("'podcast_id' debe ser un número entero.")
+            events.append((podcast_id, user_id, _parse_played_at(play.get('played_at'), now)))
+        record_plays(events)
+        return jsonify({"accepted": len(events)}), 202
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error al registrar las reproducciones: {e}")
+        return jsonify({"error": "Error al registrar las reproducciones.", "code": 500}), 500
+
+
+# --- RUTA PARA OBTENER LAS REPRODUCCIONES DE UN PODCAST (GET) ---
+@play_bp.route('/podcasts/<int:podcast_id>/plays', methods=['GET'])
+@jwt_required()
+def get_plays(podcast_id):
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        return jsonify({"error": "'granularity' debe ser 'hour' o 'day'.", "code": 400}), 400
+    model, period_start, max_days = GRANULARITIES[granularity]
+    try:
+        days = max(1, min(int(request.args.get('days', 7 if granularity == 'day' else 2)), max_days))
+    except ValueError:
+        return jsonify({"error": "El parámetro 'days' debe ser un número entero.", "code": 400}), 400
+
+    try:
+        if db.session.query(Podcast.id).filter_by(id=podcast_id).first() is None:
+            return jsonify({"error": "Podcast no encontrado.", "code": 404}), 404
+
+        since = period_start(datetime.utcnow() - timedelta(days=days))
+        rows = db.session.execute(
+            select(model.period_start, model.plays)
+            .where(model.podcast_id == podcast_id, model.period_start >= since)
+            .order_by(model.period_start)
+        ).all()
+        series = [{'period_start': start.isoformat() + 'Z', 'plays': plays} for start, plays in rows]
+        return jsonify({
+            "podcast_id": podcast_id,
+            "granularity": granularity,
+            "since": since.isoformat() + 'Z',
+            "total": sum(plays for _, plays in rows),
+            "series": series
+        }), 200
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Error al obtener las reproducciones: {e}")
+        return jsonify({"error": "Error al obtener las reproducciones.", "code": 500}), 500
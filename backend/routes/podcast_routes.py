@@ -1,5 +1,6 @@
-from flask import Blueprint, jsonify, request, current_app, send_from_directory, url_for
+from flask import Blueprint, jsonify, request, current_app, Response, stream_with_context
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
 import os
 
 from models.podcast import Podcast
@@ -8,25 +9,118 @@ from models.comment import Comment # Asegúrate de que Comment esté importado
 from extensions import db
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.exc import SQLAlchemyError
 
+from services.pagination import parse_limit, apply_keyset, apply_rank_keyset, split_page, encode_rank_cursor
+from models.trending import PodcastTrending, TrendingState
+from models.play_stats import PlayEvent, PodcastPlaysHourly, PodcastPlaysDaily
+from services.trending import TRENDING_STATE_ROW_ID
+from services.search import search_terms, search_subquery, SearchUnavailable
+from services.catalog_cache import catalog_cached, bump_catalog_version
+from services.db_routing import replica_reads
+from services.byte_serving import serve_file, file_etag
+from services.media_jobs import schedule_media_processing, schedule_cover_thumbnails, ensure_waveform_peaks, schedule_file_cleanup
+from services.waveform import read_peaks_index, read_peaks_level, choose_level, CorruptPeaksError
+from services.thumbnails import THUMBNAIL_SIZES, THUMBNAIL_FORMATS, thumbnail_cache_dir, ensure_variant
+from services.users import get_user
+from services.comments import comment_page
+from services.logs import log_event
+from services.green import cooperative_yield
+from services.storage import store_upload, acquire_blob, release_blob, release_blobs, unlink_unreferenced, is_blob_filename
+from services.serializers import media_urls, parse_fields, project_podcasts, wants_artist, podcast_to_dict, podcasts_to_dicts
+
 podcast_bp = Blueprint('podcasts', __name__)
 
 # --- FUNCIONES DE AYUDA PARA EXTENSIONES ---
 ALLOWED_AUDIO_EXTENSIONS = {'mp3', 'wav', 'ogg', 'aac', 'flac'}
 ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+TRENDING_DEFAULT_LIMIT = 20
+TRENDING_MAX_LIMIT = 100
+BULK_DELETE_MAX_IDS = 100
+BATCH_LOOKUP_MAX_IDS = 100
 
 def allowed_file(filename, allowed_extensions):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
+def _parse_id_list(raw_ids):
+    # "?ids=3,1,2" -> [3, 1, 2] (sin repetidos, en el orden pedido)
+    try:
+        ids = [int(part) for part in raw_ids.split(',') if part.strip()]
+    except ValueError:
+        raise ValueError("El parámetro 'ids' debe ser una lista de números enteros separados por comas.")
+    if not ids:
+        raise ValueError("El parámetro 'ids' no puede estar vacío.")
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > BATCH_LOOKUP_MAX_IDS:
+        raise ValueError(f"Como máximo {BATCH_LOOKUP_MAX_IDS} ids por petición.")
+    return ids
+
+# --- STREAMING NDJSON PARA LISTADOS GRANDES (exportaciones / admin) ---
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 500
+
+def _wants_stream():
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    # application/json va primero para que "Accept: */*" siga devolviendo JSON paginado
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def _stream_podcasts(query, fields=None):
+    """
+    Emite un podcast por línea (NDJSON) a medida que se leen de la BD.
+    yield_per + stream_results usan un cursor del lado del servidor, así que la
+    memoria se mantiene plana sin importar el tamaño del catálogo.
+    """
+    # Se ejecuta el SELECT 2.0 (sin el unique() implícito de Query) para poder usar yield_per
+    statement = query.order_by(Podcast.created_at.desc(), Podcast.id.desc()).statement \
+                     .execution_options(yield_per=STREAM_BATCH_SIZE, stream_results=True)
+
+    def generate():
+        dumps = current_app.json.dumps
+        for rows in db.session.execute(statement).partitions():
+            for podcast_data in podcasts_to_dicts(rows, fields):
+                yield dumps(podcast_data) + '\n'
+            # Con workers gevent, serializar un lote es CPU pura: se cede el turno entre lotes
+            cooperative_yield()
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
 # --- RUTA PARA SERVIR ARCHIVOS SUBIDOS (¡LOCALMENTE DESDE RENDER!) ---
 @podcast_bp.route('/uploads/<filename>')
 def uploaded_file(filename):
-    print(f"DEBUG BACKEND: Sirviendo archivo desde UPLOAD_FOLDER: {filename}")
-    return send_from_directory(current_app.config['UPLOAD_FOLDER'], filename)
+    log_event('uploads.serve', sampled=True, filename=filename)
+    # Soporta Range/If-Range/ETag para que cada "seek" del reproductor sea una lectura parcial.
+    # Los blobs <sha256>.<ext> nunca cambian de contenido: se pueden cachear para siempre.
+    if is_blob_filename(filename):
+        return serve_file(current_app.config['UPLOAD_FOLDER'], filename, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    return serve_file(current_app.config['UPLOAD_FOLDER'], filename)
+
+
+# --- RUTA PARA SERVIR MINIATURAS DE PORTADAS (50/180/300 px, WebP o JPEG) ---
+@podcast_bp.route('/thumbnails/<int:size>/<fmt>/<filename>')
+def cover_thumbnail(size, fmt, filename):
+    if size not in THUMBNAIL_SIZES or fmt not in THUMBNAIL_FORMATS:
+        return jsonify({"error": "Tamaño o formato de miniatura no disponible.", "code": 404}), 404
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    source_path = safe_join(upload_folder, filename)
+    if source_path is None or not allowed_file(filename, ALLOWED_IMAGE_EXTENSIONS) or not os.path.isfile(source_path):
+        return jsonify({"error": "Imagen no encontrada.", "code": 404}), 404
+
+    cache_dir = thumbnail_cache_dir(current_app.config)
+    try:
+        variant_path = ensure_variant(source_path, cache_dir, size, fmt, current_app.config['THUMBNAIL_CACHE_MAX_BYTES'])
+    except Exception as e:
+        # Imagen que Pillow no sabe leer: mejor el original que una portada rota
+        current_app.logger.warning(f"No se pudo generar la miniatura {size}/{fmt} de {filename}: {e}")
+        return uploaded_file(filename)
 
+    if is_blob_filename(filename):
+        return serve_file(cache_dir, os.path.basename(variant_path), max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    return serve_file(cache_dir, os.path.basename(variant_path))
 
 # --- RUTA PARA CREAR UN PODCAST (POST) ---
 @podcast_bp.route('/podcasts', methods=['POST'], strict_slashes=False)
@@ -63,24 +157,19 @@ def create_podcast():
     cover_image_path = None
 
     try:
-        # --- GUARDAR AUDIO LOCALMENTE ---
-        audio_filename = secure_filename(audio_file.filename)
-        audio_path = os.path.join(current_app.config['UPLOAD_FOLDER'], audio_filename)
-        audio_file.save(audio_path)
-        print(f"DEBUG BACKEND: Audio guardado localmente en: {audio_path}")
+        # --- GUARDAR AUDIO LOCALMENTE (por contenido: <sha256>.<ext>) ---
+        audio_path = store_upload(audio_file)
+        log_event('podcasts.audio_stored', path=audio_path)
 
 
         # --- GUARDAR IMAGEN DE PORTADA LOCALMENTE (si se proporciona) ---
         if 'cover_image' in request.files and request.files['cover_image'].filename != '':
             cover_image_file = request.files['cover_image']
             if allowed_file(cover_image_file.filename, ALLOWED_IMAGE_EXTENSIONS):
-                cover_image_filename = secure_filename(cover_image_file.filename)
-                cover_image_path = os.path.join(current_app.config['UPLOAD_FOLDER'], cover_image_filename)
-                cover_image_file.save(cover_image_path)
-                print(f"DEBUG BACKEND: Imagen guardada localmente en: {cover_image_path}")
+                cover_image_path = store_upload(cover_image_file)
+                log_event('podcasts.cover_stored', path=cover_image_path)
             else:
-                if audio_path and os.path.exists(audio_path):
-                    os.remove(audio_path)
+                unlink_unreferenced(audio_path)
                 return jsonify({"error": "Tipo de archivo de imagen de portada no permitido.", "code": 400}), 400
 
         new_podcast = Podcast(
@@ -92,50 +181,67 @@ def create_podcast():
             cover_image_path=cover_image_path
         )
         db.session.add(new_podcast)
+        acquire_blob(audio_path)
+        if cover_image_path:
+            acquire_blob(cover_image_path)
+        bump_catalog_version()
         db.session.commit()
-        return jsonify({"message": "Podcast creado con éxito.", "podcast_id": new_podcast.id, "audio_url": url_for('podcasts.uploaded_file', filename=os.path.basename(new_podcast.audio_path), _external=True), "cover_image_url": url_for('podcasts.uploaded_file', filename=os.path.basename(new_podcast.cover_image_path), _external=True) if new_podcast.cover_image_path else None}), 201
+        schedule_media_processing(new_podcast.id, audio_path)
+        schedule_cover_thumbnails(cover_image_path)
+        return jsonify({"message": "Podcast creado con éxito.", "podcast_id": new_podcast.id, "audio_url": media_urls().media(new_podcast.audio_path), "cover_image_url": media_urls().media(new_podcast.cover_image_path)}), 201
     except Exception as e:
         db.session.rollback()
-        if audio_path and os.path.exists(audio_path):
-            os.remove(audio_path)
-        if cover_image_path and os.path.exists(cover_image_path):
-            os.remove(cover_image_path)
+        # Solo se borran si ningún otro podcast comparte el mismo contenido
+        unlink_unreferenced(audio_path)
+        unlink_unreferenced(cover_image_path)
         current_app.logger.error(f"Error al crear el podcast (local save/DB): {e}")
         return jsonify({"error": "Error al subir el podcast: " + str(e), "code": 500}), 500
 
 
 # --- RUTA PARA OBTENER TODOS LOS PODCASTS (GET) ---
+# Paginación por cursor: ?limit=N&cursor=<next_cursor de la página anterior>
+# Con ?stream=1 o "Accept: application/x-ndjson" devuelve el catálogo completo en streaming.
+# Con ?ids=1,2,3 devuelve esos podcasts (hasta BATCH_LOOKUP_MAX_IDS) y los que no existen.
+# Con ?fields=id,title,artist solo esos campos (y solo sus columnas); igual en my_podcasts,
+# search, trending y /podcasts/<id>.
 @podcast_bp.route('/podcasts', methods=['GET'], strict_slashes=False)
 @jwt_required()
+@catalog_cached
+@replica_reads
 def get_all_podcasts():
     try:
+        fields = parse_fields(request.args.get('fields'))
+        raw_ids = request.args.get('ids')
+        if raw_ids is not None:
+            # Búsqueda por lotes (?ids=1,2,3): una consulta, en el orden pedido
+            podcast_ids = _parse_id_list(raw_ids)
+            query = project_podcasts(Podcast.query.filter(Podcast.id.in_(podcast_ids)), fields)
+            found = {row.id: row for row in query}
+            return jsonify({
+                "podcasts": podcasts_to_dicts([found[podcast_id] for podcast_id in podcast_ids if podcast_id in found], fields),
+                "not_found": [podcast_id for podcast_id in podcast_ids if podcast_id not in found]
+            }), 200
+
         category_filter = request.args.get('category')
-        
+        limit = parse_limit(request.args.get('limit'))
+
+        # El artista sale de la caché de usuarios (una consulta por página como mucho, no N+1)
         query = Podcast.query
         if category_filter and category_filter != 'All':
             query = query.filter_by(category=category_filter)
+        # Tuplas con las columnas de los campos pedidos, no entidades Podcast
+        query = project_podcasts(query, fields)
 
-        podcasts = query.all()
-        
-        podcasts_data = []
-        for podcast in podcasts:
-            artist_name = podcast.user.name if podcast.user else "Desconocido"
-            
-            audio_url = url_for('podcasts.uploaded_file', filename=os.path.basename(podcast.audio_path), _external=True)
-            cover_image_url = url_for('podcasts.uploaded_file', filename=os.path.basename(podcast.cover_image_path), _external=True) if podcast.cover_image_path else None
-
-            podcasts_data.append({
-                'id': podcast.id,
-                'title': podcast.title,
-                'description': podcast.description,
-                'artist': artist_name,
-                'category': podcast.category,
-                'audio_url': audio_url,
-                'cover_image_url': cover_image_url,
-                'created_at': podcast.created_at.isoformat(),
-                'user_id': podcast.user_id
-            })
-        return jsonify({"podcasts": podcasts_data}), 200
+        if _wants_stream():
+            return _stream_podcasts(query, fields)
+
+        query = apply_keyset(query, Podcast.created_at, Podcast.id, request.args.get('cursor'), limit)
+        podcasts, next_cursor = split_page(query.all(), limit)
+
+        podcasts_data = podcasts_to_dicts(podcasts, fields)
+        return jsonify({"podcasts": podcasts_data, "next_cursor": next_cursor}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
     except SQLAlchemyError as e:
         current_app.logger.error(f"Error al obtener los podcasts de la BD: {e}")
         return jsonify({"error": "Error al obtener los podcasts: " + str(e), "code": 500}), 500
@@ -144,67 +250,233 @@ def get_all_podcasts():
         return jsonify({"error": "Error inesperado del servidor: " + str(e), "code": 500}), 500
 
 
+# --- RUTA PARA BUSCAR PODCASTS POR TEXTO (GET) ---
+# ?q=  palabras a buscar en título, descripción y comentarios (todas, como prefijo)
+# Ordenado por relevancia (bm25 / ts_rank) y paginado con cursor como el listado general.
+@podcast_bp.route('/podcasts/search', methods=['GET'], strict_slashes=False)
+@jwt_required()
+def search_podcasts():
+    terms = search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({"error": "El parámetro 'q' es obligatorio.", "code": 400}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        fields = parse_fields(request.args.get('fields'))
+        search = search_subquery(terms)
+        query = project_podcasts(db.session.query(Podcast), fields, search.c.score) \
+                          .join(search, search.c.podcast_id == Podcast.id)
+        category = request.args.get('category')
+        if category:
+            query = query.filter(Podcast.category == category)
+
+        query = apply_rank_keyset(query, search.c.score, Podcast.id, request.args.get('cursor'), limit)
+        rows, next_cursor = split_page(query.all(), limit, lambda row: row.score, lambda row: row.id,
+                                       encoder=encode_rank_cursor)
+
+        podcasts_data = podcasts_to_dicts(rows, fields)
+        return jsonify({"podcasts": podcasts_data, "next_cursor": next_cursor}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
+    except SearchUnavailable as e:
+        return jsonify({"error": str(e), "code": 501}), 501
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Error al buscar podcasts en la BD: {e}")
+        return jsonify({"error": "Error al buscar podcasts: " + str(e), "code": 500}), 500
+
+
+# --- RUTA PARA OBTENER LOS PODCASTS EN TENDENCIA (GET) ---
+# ?category= &limit=  Top-K leído por índice de la tabla podcast_trending, que recalcula
+# "flask refresh-trending" (cron). Hasta el primer recálculo se devuelven los más recientes.
+# La puntuación solo ordena: guardada en escala logarítmica desde SCORE_EPOCH no significa
+# nada para el cliente, y decaída a "ahora" quedaría desfasada en la respuesta cacheada.
+@podcast_bp.route('/podcasts/trending', methods=['GET'], strict_slashes=False)
+@jwt_required()
+@catalog_cached
+def get_trending_podcasts():
+    try:
+        limit = parse_limit(request.args.get('limit'), default=TRENDING_DEFAULT_LIMIT, maximum=TRENDING_MAX_LIMIT)
+        category = request.args.get('category')
+        if category == 'All':
+            category = None
+
+        fields = parse_fields(request.args.get('fields'))
+        query = project_podcasts(db.session.query(Podcast), fields) \
+                          .join(PodcastTrending, PodcastTrending.podcast_id == Podcast.id)
+        if category:
+            query = query.filter(PodcastTrending.category == category)
+        rows = query.order_by(PodcastTrending.score.desc(), PodcastTrending.podcast_id.desc()).limit(limit).all()
+
+        if not rows and db.session.get(TrendingState, TRENDING_STATE_ROW_ID) is None:
+            fallback = Podcast.query
+            if category:
+                fallback = fallback.filter_by(category=category)
+            podcasts = project_podcasts(fallback, fields).order_by(Podcast.created_at.desc(), Podcast.id.desc()).limit(limit).all()
+            return jsonify({"podcasts": podcasts_to_dicts(podcasts, fields)}), 200
+
+        return jsonify({"podcasts": podcasts_to_dicts(rows, fields)}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Error al obtener los podcasts en tendencia de la BD: {e}")
+        return jsonify({"error": "Error al obtener las tendencias: " + str(e), "code": 500}), 500
+
+
 # --- RUTA PARA OBTENER UN SOLO PODCAST POR ID (GET) ---
 @podcast_bp.route('/podcasts/<int:podcast_id>', methods=['GET'], strict_slashes=False)
 @jwt_required()
+@catalog_cached
+@replica_reads
 def get_podcast(podcast_id):
     try:
-        podcast = Podcast.query.get(podcast_id)
+        fields = parse_fields(request.args.get('fields'))
+        podcast = project_podcasts(Podcast.query.filter(Podcast.id == podcast_id), fields).first()
         if not podcast:
              return jsonify({"error": "Podcast no encontrado.", "code": 404}), 404
 
-        artist_name = podcast.user.name if podcast.user else "Desconocido"
+        author = get_user(podcast.user_id) if wants_artist(fields) else None
+        return jsonify(podcast_to_dict(podcast, author, fields)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Error al obtener el podcast de la BD: {e}")
+        return jsonify({"error": "Error al obtener el podcast: " + str(e), "code": 500}), 500
+    except Exception as e:
+        current_app.logger.error(f"Error inesperado al obtener el podcast: {e}")
+        return jsonify({"error": "Error inesperado del servidor: " + str(e), "code": 500}), 500
 
-        audio_url = url_for('podcasts.uploaded_file', filename=os.path.basename(podcast.audio_path), _external=True)
-        cover_image_url = url_for('podcasts.uploaded_file', filename=os.path.basename(podcast.cover_image_path), _external=True) if podcast.cover_image_path else None
 
+# --- RUTA PARA LA PÁGINA DE UN PODCAST (GET) ---
+# Todo lo que muestra la vista de detalle en una sola petición: el podcast, el perfil de su
+# autor y la primera página de comentarios (?limit=). Las páginas siguientes, con el
+# next_cursor, en /api/podcasts/<id>/comments. Sin caché del catálogo (los comentarios
+# cambian con cada publicación): podcast + comentarios + autores que falten en la caché de
+# usuarios, tres consultas como mucho.
+@podcast_bp.route('/podcasts/<int:podcast_id>/page', methods=['GET'], strict_slashes=False)
+@jwt_required()
+@replica_reads
+def get_podcast_page(podcast_id):
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        podcast = db.session.get(Podcast, podcast_id)
+        if not podcast:
+            return jsonify({"error": "Podcast no encontrado.", "code": 404}), 404
+
+        comments_data, next_cursor, users = comment_page(podcast_id, limit, extra_user_ids=[podcast.user_id])
+        author = users.get(podcast.user_id)
         return jsonify({
-            'id': podcast.id,
-            'title': podcast.title,
-            'description': podcast.description,
-            'artist': artist_name,
-            'category': podcast.category,
-            'audio_url': audio_url,
-            'cover_image_url': cover_image_url,
-            'created_at': podcast.created_at.isoformat(),
-            'user_id': podcast.user_id
+            "podcast": podcast_to_dict(podcast, author),
+            "author": {"id": author.id, "name": author.name, "profile_picture": author.profile_picture} if author else None,
+            "comments": comments_data,
+            "next_cursor": next_cursor
         }), 200
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
     except SQLAlchemyError as e:
-        current_app.logger.error(f"Error al obtener el podcast de la BD: {e}")
-        return jsonify({"error": "Error al obtener el podcast: " + str(e), "code": 500}), 500
+        current_app.logger.error(f"Error al obtener la página del podcast de la BD: {e}")
+        return jsonify({"error": "Error al obtener el podcast.", "code": 500}), 500
+
+
+# --- RUTA PARA OBTENER LOS PICOS DE LA FORMA DE ONDA (GET) ---
+# Devuelve pares (min, max) int8 intercalados para el nivel de zoom pedido:
+#   ?level=N   nivel explícito (0 = el más detallado)
+#   ?width=N   el nivel más grueso con al menos N picos (por defecto PEAKS_DEFAULT_WIDTH)
+# Las cabeceras X-Peaks-* describen el nivel y los disponibles.
+PEAKS_DEFAULT_WIDTH = 1000
+
+def _peaks_index(audio_path):
+    """
+    (ruta del sidecar, índice). Un sidecar corrupto o truncado se borra y se calcula de
+    nuevo una vez; si el nuevo tampoco se puede leer, CorruptPeaksError llega a la vista.
+    """
+    timeout = current_app.config['WAVEFORM_PEAKS_SYNC_TIMEOUT']
+    peaks_path = ensure_waveform_peaks(audio_path, timeout)
+    try:
+        return peaks_path, read_peaks_index(peaks_path)
+    except CorruptPeaksError as e:
+        current_app.logger.warning(f"Sidecar de picos inválido, se regenera ({peaks_path}): {e}")
+        try:
+            os.remove(peaks_path)
+        except FileNotFoundError:
+            pass
+    peaks_path = ensure_waveform_peaks(audio_path, timeout)
+    return peaks_path, read_peaks_index(peaks_path)
+
+@podcast_bp.route('/podcasts/<int:podcast_id>/peaks', methods=['GET'], strict_slashes=False)
+@jwt_required()
+def get_podcast_peaks(podcast_id):
+    podcast = db.session.get(Podcast, podcast_id)
+    if not podcast:
+        return jsonify({"error": "Podcast no encontrado.", "code": 404}), 404
+    if not podcast.audio_path or not os.path.exists(podcast.audio_path):
+        return jsonify({"error": "Archivo de audio no encontrado.", "code": 404}), 404
+
+    try:
+        level = request.args.get('level', type=int)
+        width = request.args.get('width', PEAKS_DEFAULT_WIDTH, type=int)
+        if width <= 0:
+            raise ValueError("El parámetro 'width' debe ser mayor que cero.")
+
+        peaks_path, (sample_rate, total_frames, levels) = _peaks_index(podcast.audio_path)
+        if not levels:
+            # Sidecar sin niveles: el audio ya se intentó decodificar y no se pudo
+            return jsonify({"error": "Formato de audio no soportado para la forma de onda.", "code": 415}), 415
+
+        if level is None:
+            level = choose_level(levels, width)
+        if not 0 <= level < len(levels):
+            raise ValueError(f"Nivel de zoom inválido (0-{len(levels) - 1}).")
+        samples_per_peak, peak_count, offset = levels[level]
+
+        response = Response(mimetype='application/octet-stream')
+        # El sidecar solo cambia si se regenera, y entonces cambia su inodo/mtime
+        response.set_etag(f"{file_etag(os.stat(peaks_path))}-{level}")
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.headers['X-Peaks-Level'] = str(level)
+        response.headers['X-Peaks-Levels'] = str(len(levels))
+        response.headers['X-Peaks-Samples-Per-Peak'] = str(samples_per_peak)
+        response.headers['X-Peaks-Sample-Rate'] = str(sample_rate)
+        response.headers['X-Peaks-Total-Frames'] = str(total_frames)
+        response.headers['X-Peaks-Format'] = 'int8'
+        if response.make_conditional(request).status_code == 304:
+            return response
+        response.set_data(read_peaks_level(peaks_path, offset, peak_count))
+        return response
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
+    except CorruptPeaksError as e:
+        current_app.logger.error(f"Sidecar de picos inválido tras regenerarlo (podcast {podcast_id}): {e}")
+        return jsonify({"error": "No se pudo leer la forma de onda.", "code": 500}), 500
+    except TimeoutError:
+        response = jsonify({"message": "La forma de onda se está generando. Inténtalo de nuevo en unos segundos.", "code": 202})
+        response.status_code = 202
+        response.headers['Retry-After'] = '2'
+        return response
     except Exception as e:
-        current_app.logger.error(f"Error inesperado al obtener el podcast: {e}")
+        current_app.logger.error(f"Error al obtener los picos del podcast {podcast_id}: {e}")
         return jsonify({"error": "Error inesperado del servidor: " + str(e), "code": 500}), 500
 
 
 # --- RUTA PARA OBTENER LOS PODCASTS DEL USUARIO ACTUAL (GET) ---
 @podcast_bp.route('/podcasts/my_podcasts', methods=['GET'], strict_slashes=False)
 @jwt_required()
+@replica_reads
 def get_my_podcasts():
     current_user_id = get_jwt_identity()
     if not current_user_id:
         return jsonify({"error": "No autenticado. Inicia sesión para ver tus podcasts.", "code": 401}), 401
 
     try:
-        user_podcasts = Podcast.query.filter_by(user_id=current_user_id).all()
-        podcasts_data = []
-        for podcast in user_podcasts:
-            artist_name = podcast.user.name if podcast.user else "Desconocido"
-            audio_url = url_for('podcasts.uploaded_file', filename=os.path.basename(podcast.audio_path), _external=True)
-            cover_image_url = url_for('podcasts.uploaded_file', filename=os.path.basename(podcast.cover_image_path), _external=True) if podcast.cover_image_path else None
-
-            podcasts_data.append({
-                'id': podcast.id,
-                'title': podcast.title,
-                'description': podcast.description,
-                'artist': artist_name,
-                'category': podcast.category,
-                'audio_url': audio_url,
-                'cover_image_url': cover_image_url,
-                'created_at': podcast.created_at.isoformat(),
-                'user_id': podcast.user_id
-            })
-        return jsonify({"podcasts": podcasts_data}), 200
+        limit = parse_limit(request.args.get('limit'))
+        fields = parse_fields(request.args.get('fields'))
+        query = project_podcasts(Podcast.query.filter_by(user_id=current_user_id), fields)
+        query = apply_keyset(query, Podcast.created_at, Podcast.id, request.args.get('cursor'), limit)
+        user_podcasts, next_cursor = split_page(query.all(), limit)
+
+        podcasts_data = podcasts_to_dicts(user_podcasts, fields)
+        return jsonify({"podcasts": podcasts_data, "next_cursor": next_cursor}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e), "code": 400}), 400
     except SQLAlchemyError as e:
         current_app.logger.error(f"Error al obtener tus podcasts de la BD: {e}")
         return jsonify({"error": "Error al obtener tus podcasts: " + str(e), "code": 500}), 500
@@ -213,6 +485,31 @@ def get_my_podcasts():
         return jsonify({"error": "Error inesperado del servidor: " + str(e), "code": 500}), 500
 
 
+def _deletable_podcasts_query(podcast_ids):
+    # Solo las columnas necesarias: no se cargan objetos Podcast ni sus comentarios
+    return select(Podcast.id, Podcast.user_id, Podcast.audio_path, Podcast.cover_image_path) \
+        .where(Podcast.id.in_(podcast_ids))
+
+def _delete_podcasts(rows):
+    """
+    Borra los podcasts de `rows` (filas de _deletable_podcasts_query) con sus comentarios,
+    reproducciones y tendencias: un DELETE ... WHERE id IN (...) por tabla, dentro de la
+    transacción en curso.
+    Devuelve los archivos que han quedado sin referencias, para schedule_file_cleanup() tras el commit.
+    """
+    podcast_ids = [row.id for row in rows]
+    # Primero los podcasts: así los triggers del índice de búsqueda no rehacen el documento
+    # de un podcast por cada uno de sus comentarios borrados.
+    db.session.execute(delete(Podcast).where(Podcast.id.in_(podcast_ids))
+                       .execution_options(synchronize_session=False))
+    # ondelete='CASCADE' ya borra todo esto donde la BD aplica las claves foráneas (PostgreSQL);
+    # SQLite no lo hace (foreign_keys está desactivado) y además reutiliza el id más alto, así que
+    # un podcast nuevo heredaría las reproducciones y la puntuación de tendencia que quedaran.
+    for model in (Comment, PlayEvent, PodcastPlaysHourly, PodcastPlaysDaily, PodcastTrending):
+        db.session.execute(delete(model).where(model.podcast_id.in_(podcast_ids))
+                           .execution_options(synchronize_session=False))
+    return release_blobs([path for row in rows for path in (row.audio_path, row.cover_image_path)])
+
 # --- RUTA PARA ELIMINAR UN PODCAST (DELETE) ---
 @podcast_bp.route('/podcasts/<int:podcast_id>', methods=['DELETE'], strict_slashes=False)
 @jwt_required()
@@ -227,31 +524,17 @@ def delete_podcast(podcast_id):
         return jsonify({"error": "ID de usuario inválido en el token."}), 400
 
     try:
-        podcast = Podcast.query.get(podcast_id)
+        podcast = db.session.execute(_deletable_podcasts_query([podcast_id])).first()
         if not podcast:
             return jsonify({"error": "Podcast no encontrado."}), 404
 
         if podcast.user_id != user_id_int:
             return jsonify({"error": "No tienes permiso para eliminar este podcast."}), 403
 
-        # --- ¡PASO EXTRA DE SEGURIDAD! BORRAR COMENTARIOS ASOCIADOS EXPLICITAMENTE ---
-        # Esto es un respaldo por si el CASCADE DELETE de la DB no se aplica o se revierte.
-        # Aquí es donde busco y borro los comentarios ANTES de borrar el podcast.
-        associated_comments = Comment.query.filter_by(podcast_id=podcast_id).all()
-        for comment in associated_comments:
-            db.session.delete(comment)
-        db.session.commit() # ¡Commit los comentarios antes de eliminar el podcast!
-
-        # Eliminar los archivos localmente de Render
-        if podcast.audio_path and os.path.exists(podcast.audio_path):
-            os.remove(podcast.audio_path)
-            print(f"DEBUG: Archivo de audio eliminado: {podcast.audio_path}")
-        if podcast.cover_image_path and os.path.exists(podcast.cover_image_path):
-            os.remove(podcast.cover_image_path)
-            print(f"DEBUG: Archivo de portada eliminado: {podcast.cover_image_path}")
-
-        db.session.delete(podcast)
+        unreferenced_paths = _delete_podcasts([podcast])
+        bump_catalog_version()
         db.session.commit()
+        schedule_file_cleanup(unreferenced_paths)
 
         return jsonify({"message": "Podcast eliminado con éxito."}), 200
 
@@ -264,6 +547,52 @@ def delete_podcast(podcast_id):
         return jsonify({"error": "Error interno del servidor al eliminar el podcast."}), 500
 
 
+# --- RUTA PARA ELIMINAR VARIOS PODCASTS (DELETE) ---
+# Cuerpo: {"ids": [1, 2, 3]}. Todos deben ser del usuario: si alguno no lo es, no se borra ninguno.
+# Los ids que no existen se devuelven en "not_found" (reintentar un borrado no falla).
+@podcast_bp.route('/podcasts', methods=['DELETE'], strict_slashes=False)
+@jwt_required()
+def delete_podcasts():
+    try:
+        user_id_int = int(get_jwt_identity())
+    except (TypeError, ValueError):
+        return jsonify({"error": "ID de usuario inválido en el token.", "code": 400}), 400
+
+    data = request.get_json(silent=True) or {}
+    raw_ids = data.get('ids')
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return jsonify({"error": "Se esperaba una lista 'ids' no vacía.", "code": 400}), 400
+    if len(raw_ids) > BULK_DELETE_MAX_IDS:
+        return jsonify({"error": f"Como máximo {BULK_DELETE_MAX_IDS} podcasts por petición.", "code": 400}), 400
+    if not all(isinstance(podcast_id, int) and not isinstance(podcast_id, bool) for podcast_id in raw_ids):
+        return jsonify({"error": "Los 'ids' deben ser números enteros.", "code": 400}), 400
+    podcast_ids = list(dict.fromkeys(raw_ids))
+
+    try:
+        rows = db.session.execute(_deletable_podcasts_query(podcast_ids)).all()
+        forbidden = sorted(row.id for row in rows if row.user_id != user_id_int)
+        if forbidden:
+            return jsonify({"error": "No tienes permiso para eliminar algunos de los podcasts.",
+                            "ids": forbidden, "code": 403}), 403
+
+        deleted = {row.id for row in rows}
+        if rows:
+            unreferenced_paths = _delete_podcasts(rows)
+            bump_catalog_version()
+            db.session.commit()
+            schedule_file_cleanup(unreferenced_paths)
+
+        return jsonify({
+            "message": f"Podcasts eliminados: {len(deleted)}.",
+            "deleted": [podcast_id for podcast_id in podcast_ids if podcast_id in deleted],
+            "not_found": [podcast_id for podcast_id in podcast_ids if podcast_id not in deleted]
+        }), 200
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error al eliminar podcasts de la BD: {e}")
+        return jsonify({"error": "Error al eliminar los podcasts.", "code": 500}), 500
+
+
 # --- RUTA PARA EDITAR UN PODCAST (PUT/PATCH) ---
 @podcast_bp.route('/podcasts/<int:podcast_id>', methods=['PUT'], strict_slashes=False)
 @jwt_required()
@@ -277,6 +606,8 @@ def update_podcast(podcast_id):
     except ValueError:
         return jsonify({"error": "ID de usuario inválido en el token."}), 400
 
+    # Archivos guardados en esta petición: si algo falla se borran (si nada los referencia)
+    new_paths = []
     try:
         podcast = Podcast.query.get(podcast_id)
         if not podcast:
@@ -296,44 +627,72 @@ def update_podcast(podcast_id):
         if category:
             podcast.category = category
 
+        unreferenced_paths = []
+        audio_replaced = False
+        cover_replaced = False
+
         if 'audio_file' in request.files and request.files['audio_file'].filename != '':
             new_audio_file = request.files['audio_file']
             if allowed_file(new_audio_file.filename, ALLOWED_AUDIO_EXTENSIONS): # Usar ALLOWED_AUDIO_EXTENSIONS
-                if podcast.audio_path and os.path.exists(podcast.audio_path):
-                    os.remove(podcast.audio_path)
-                audio_filename = secure_filename(new_audio_file.filename)
-                new_audio_file.save(os.path.join(current_app.config['UPLOAD_FOLDER'], audio_filename))
-                podcast.audio_path = os.path.join(current_app.config['UPLOAD_FOLDER'], audio_filename)
-                print(f"DEBUG BACKEND: Audio actualizado localmente en: {podcast.audio_path}")
+                new_audio_path = store_upload(new_audio_file)
+                new_paths.append(new_audio_path)
+                acquire_blob(new_audio_path)
+                unreferenced_paths.append(release_blob(podcast.audio_path))
+                podcast.audio_path = new_audio_path
+                # Los metadatos del audio anterior ya no valen; se recalculan tras el commit
+                podcast.duration_seconds = podcast.audio_bitrate = podcast.audio_sample_rate = None
+                podcast.audio_channels = podcast.audio_size = None
+                audio_replaced = True
+                log_event('podcasts.audio_stored', path=podcast.audio_path, podcast_id=podcast.id)
             else:
                 return jsonify({"error": "Tipo de archivo de audio no permitido para la actualización."}), 400
 
         if 'cover_image' in request.files and request.files['cover_image'].filename != '':
             new_cover_image_file = request.files['cover_image']
             if allowed_file(new_cover_image_file.filename, ALLOWED_IMAGE_EXTENSIONS): # Usar ALLOWED_IMAGE_EXTENSIONS
-                if podcast.cover_image_path and os.path.exists(podcast.cover_image_path):
-                    os.remove(podcast.cover_image_path)
-                cover_image_filename = secure_filename(new_cover_image_file.filename)
-                new_cover_image_file.save(os.path.join(current_app.config['UPLOAD_FOLDER'], cover_image_filename))
-                podcast.cover_image_path = os.path.join(current_app.config['UPLOAD_FOLDER'], cover_image_filename)
-                print(f"DEBUG BACKEND: Imagen actualizada localmente en: {podcast.cover_image_path}")
+                new_cover_image_path = store_upload(new_cover_image_file)
+                new_paths.append(new_cover_image_path)
+                acquire_blob(new_cover_image_path)
+                unreferenced_paths.append(release_blob(podcast.cover_image_path))
+                podcast.cover_image_path = new_cover_image_path
+                cover_replaced = True
+                log_event('podcasts.cover_stored', path=podcast.cover_image_path, podcast_id=podcast.id)
             else:
+                db.session.rollback()
+                for path in new_paths:
+                    unlink_unreferenced(path)
                 return jsonify({"error": "Tipo de archivo de imagen de portada no permitido para la actualización."}), 400
 
+        bump_catalog_version()
         db.session.commit()
+
+        # Archivos sustituidos que ya no referencia ningún podcast
+        for path in unreferenced_paths:
+            unlink_unreferenced(path)
+        if audio_replaced:
+            schedule_media_processing(podcast.id, podcast.audio_path)
+        if cover_replaced:
+            schedule_cover_thumbnails(podcast.cover_image_path)
         return jsonify({"message": "Podcast actualizado con éxito."}), 200
 
     except SQLAlchemyError as e:
         db.session.rollback()
+        for path in new_paths:
+            unlink_unreferenced(path)
         current_app.logger.error(f"Error al actualizar el podcast de la BD: {e}")
-        return jsonify({"error": "Error al actualizar el podcast: " + str(e)}), 500
+        return jsonify({"error": "Error al actualizar el podcast: " + str(e), "code": 500}), 500
     except Exception as e:
+        db.session.rollback()
+        for path in new_paths:
+            unlink_unreferenced(path)
         current_app.logger.error(f"Error inesperado al actualizar el podcast: {e}")
-        return jsonify({"error": "Error inesperado al actualizar el podcast: " + str(e)}), 500
+        return jsonify({"error": "Error inesperado al actualizar el podcast: " + str(e), "code": 500}), 500
 
 # --- NUEVA RUTA: Obtener categorías únicas ---
 @podcast_bp.route('/categories', methods=['GET'])
 @jwt_required()
+@catalog_cached
+@replica_reads
 def get_podcast_categories():
     try:
         categories = db.session.query(Podcast.category).distinct().all()
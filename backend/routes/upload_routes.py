@@ -4,6 +4,9 @@ from models.podcast import Podcast
 from extensions import db  # Importamos db desde extensions.py para evitar el bucle
 from os import path,  remove
 from sqlalchemy.exc import SQLAlchemyError  # Importamos la excepción de SQLAlchemy
+from services.catalog_cache import bump_catalog_version
+from services.media_jobs import schedule_media_processing, schedule_cover_thumbnails
+from services.storage import store_upload, acquire_blob, unlink_unreferenced
 import os
 
 upload_bp = Blueprint('upload', __name__, url_prefix='/')
@@ -27,21 +30,16 @@ def upload_podcast():
                 return jsonify({"error": "No se ha seleccionado ningún archivo de audio", "code": 400}), 400
 
             if audio_file and allowed_file(audio_file.filename, ALLOWED_AUDIO_EXTENSIONS):
-                filename = secure_filename(audio_file.filename)
-                audio_path = path.join(current_app.config['UPLOAD_FOLDER'], filename)
-                audio_file.save(audio_path)
+                audio_path = store_upload(audio_file)
 
                 title = request.form['title']
                 description = request.form['description']
                 category = request.form['category']
                 cover_image = request.files.get('cover_image')
 
-                cover_image_filename = None
                 cover_image_path = None
                 if cover_image and cover_image.filename != '' and allowed_file(cover_image.filename, ALLOWED_IMAGE_EXTENSIONS):
-                    cover_image_filename = secure_filename(cover_image.filename)
-                    cover_image_path = path.join(current_app.config['UPLOAD_FOLDER'], cover_image_filename)
-                    cover_image.save(cover_image_path)
+                    cover_image_path = store_upload(cover_image)
 
                 new_podcast = Podcast(
                     title=title,
@@ -51,7 +49,13 @@ def upload_podcast():
                     cover_image_path=cover_image_path
                 )
                 db.session.add(new_podcast)
+                acquire_blob(audio_path)
+                if cover_image_path:
+                    acquire_blob(cover_image_path)
+                bump_catalog_version()
                 db.session.commit()
+                schedule_media_processing(new_podcast.id, audio_path)
+                schedule_cover_thumbnails(cover_image_path)
                 return jsonify({"message": "¡Podcast subido y guardado en la base de datos con éxito!", "code": 201}), 201
 
             else:
@@ -59,18 +63,19 @@ def upload_podcast():
 
         except SQLAlchemyError as db_error:
             db.session.rollback()
-            # Eliminar archivos subidos si falla la base de datos
-            if 'audio_path' in locals() and os.path.exists(audio_path):
-                os.remove(audio_path)
-            if 'cover_image_path' in locals() and os.path.exists(cover_image_path):
-                os.remove(cover_image_path)
+            # Eliminar archivos subidos si falla la base de datos (salvo que otro podcast los comparta)
+            if 'audio_path' in locals():
+                unlink_unreferenced(audio_path)
+            if 'cover_image_path' in locals():
+                unlink_unreferenced(cover_image_path)
             return jsonify({"error": "Error de base de datos: " + str(db_error), "code": 500}), 500
         except Exception as e:
             # Eliminar archivos subidos si ocurre un error inesperado
-            if 'audio_path' in locals() and os.path.exists(audio_path):
-                os.remove(audio_path)
-            if 'cover_image_path' in locals() and os.path.exists(cover_image_path):
-                os.remove(cover_image_path)
+            db.session.rollback()
+            if 'audio_path' in locals():
+                unlink_unreferenced(audio_path)
+            if 'cover_image_path' in locals():
+                unlink_unreferenced(cover_image_path)
             return jsonify({"error": "Error al subir el podcast: " + str(e), "code": 500}), 500
 
     return render_template('upload_form.html')
\ No newline at end of file
@@ -0,0 +1,298 @@
+# backend/routes/upload_session_routes.py
+"""
+Subidas reanudables por trozos (estilo tus) para audios que superan MAX_CONTENT_LENGTH.
+
+    POST   /upload-sessions                 crea la sesión ({"filename", "size"} o Upload-Length)
+    PATCH  /upload-sessions/<id>            añade un trozo (Upload-Offset + application/offset+octet-stream)
+    HEAD   /upload-sessions/<id>            estado: cabeceras Upload-Offset / Upload-Length
+    POST   /upload-sessions/<id>/finalize   crea el Podcast (title, description, category, cover_image)
+    DELETE /upload-sessions/<id>            cancela la subida
+"""
+import base64
+import fcntl
+import os
+import uuid
+
+from flask import Blueprint, jsonify, request, current_app, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import ClientDisconnected
+
+from extensions import db
+from models.podcast import Podcast
+from models.upload_session import UploadSession
+from routes.podcast_routes import allowed_file, ALLOWED_AUDIO_EXTENSIONS, ALLOWED_IMAGE_EXTENSIONS
+from services.catalog_cache import bump_catalog_version
+from services.media_jobs import schedule_media_processing, schedule_cover_thumbnails
+from services.resumable_uploads import part_path, session_expiry, purge_expired_upload_sessions
+from services.serializers import media_urls
+from services.storage import store_file, store_upload, acquire_blob, unlink_unreferenced
+
+upload_session_bp = Blueprint('upload_sessions', __name__, url_prefix='/upload-sessions')
+
+OFFSET_CONTENT_TYPE = 'application/offset+octet-stream'
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+def _current_user_id():
+    try:
+        return int(get_jwt_identity())
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_owned_session(session_id):
+    """Devuelve (sesión, None) o (None, respuesta de error)."""
+    user_id = _current_user_id()
+    if user_id is None:
+        return None, (jsonify({"error": "ID de usuario inválido en el token.", "code": 400}), 400)
+    upload_session = db.session.get(UploadSession, session_id)
+    if not upload_session or upload_session.user_id != user_id:
+        return None, (jsonify({"error": "Sesión de subida no encontrada.", "code": 404}), 404)
+    return upload_session, None
+
+
+def _offset_headers(upload_session):
+    return {
+        'Upload-Offset': str(upload_session.upload_offset),
+        'Upload-Length': str(upload_session.upload_length),
+        'Cache-Control': 'no-store'
+    }
+
+
+def _remove_part(session_id):
+    try:
+        os.remove(part_path(session_id))
+    except FileNotFoundError:
+        pass
+
+
+def _parse_upload_metadata(header):
+    """Upload-Metadata de tus: "clave base64,clave base64"."""
+    metadata = {}
+    for pair in (header or '').split(','):
+        parts = pair.strip().split(' ', 1)
+        if len(parts) == 2:
+            try:
+                metadata[parts[0]] = base64.b64decode(parts[1]).decode('utf-8')
+            except (ValueError, UnicodeDecodeError):
+                continue
+    return metadata
+
+
+# --- RUTA PARA CREAR UNA SESIÓN DE SUBIDA (POST) ---
+@upload_session_bp.route('', methods=['POST'], strict_slashes=False)
+@jwt_required()
+def create_upload_session():
+    user_id = _current_user_id()
+    if user_id is None:
+        return jsonify({"error": "ID de usuario inválido en el token.", "code": 400}), 400
+
+    data = request.get_json(silent=True) or {}
+    metadata = _parse_upload_metadata(request.headers.get('Upload-Metadata'))
+    filename = data.get('filename') or metadata.get('filename')
+    try:
+        upload_length = int(data.get('size') or request.headers.get('Upload-Length'))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Falta el tamaño total de la subida (size / Upload-Length).", "code": 400}), 400
+
+    if not filename or not allowed_file(filename, ALLOWED_AUDIO_EXTENSIONS):
+        return jsonify({"error": "Tipo de archivo de audio no permitido.", "code": 400}), 400
+    if upload_length <= 0:
+        return jsonify({"error": "El tamaño de la subida debe ser mayor que cero.", "code": 400}), 400
+    if upload_length > current_app.config['RESUMABLE_UPLOAD_MAX_SIZE']:
+        return jsonify({"error": "El archivo supera el tamaño máximo permitido.", "code": 413}), 413
+
+    try:
+        # Aprovechamos la creación para recoger las sesiones abandonadas
+        purge_expired_upload_sessions(scan_orphans=False)
+
+        upload_session = UploadSession(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            filename=filename,
+            upload_length=upload_length,
+            upload_offset=0,
+            expires_at=session_expiry()
+        )
+        open(part_path(upload_session.id), 'wb').close()
+        db.session.add(upload_session)
+        db.session.commit()
+
+        response = jsonify(upload_session.to_dict())
+        response.status_code = 201
+        response.headers['Location'] = url_for('upload_sessions.get_upload_session', session_id=upload_session.id, _external=True)
+        response.headers.update(_offset_headers(upload_session))
+        return response
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error al crear la sesión de subida: {e}")
+        return jsonify({"error": "Error interno al crear la sesión de subida.", "code": 500}), 500
+
+
+# --- RUTA PARA CONSULTAR EL ESTADO DE UNA SESIÓN (GET/HEAD) ---
+@upload_session_bp.route('/<session_id>', methods=['GET'])
+@jwt_required()
+def get_upload_session(session_id):
+    upload_session, error = _get_owned_session(session_id)
+    if error:
+        return error
+    response = jsonify(upload_session.to_dict())
+    response.headers.update(_offset_headers(upload_session))
+    return response
+
+
+# --- RUTA PARA AÑADIR UN TROZO (PATCH) ---
+@upload_session_bp.route('/<session_id>', methods=['PATCH'])
+@jwt_required()
+def append_upload_chunk(session_id):
+    upload_session, error = _get_owned_session(session_id)
+    if error:
+        return error
+
+    if request.mimetype != OFFSET_CONTENT_TYPE:
+        return jsonify({"error": f"Content-Type debe ser {OFFSET_CONTENT_TYPE}.", "code": 415}), 415
+    try:
+        client_offset = int(request.headers['Upload-Offset'])
+    except (KeyError, ValueError):
+        return jsonify({"error": "Falta la cabecera Upload-Offset.", "code": 400}), 400
+
+    path = part_path(session_id)
+    if not os.path.exists(path):
+        return jsonify({"error": "Sesión de subida no encontrada.", "code": 404}), 404
+
+    with open(path, 'r+b') as part:
+        # Un único escritor por sesión: si hay otro PATCH en curso, el cliente debe reintentar
+        try:
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return jsonify({"error": "Hay otra petición escribiendo en esta sesión.", "code": 409}), 409
+
+        db.session.refresh(upload_session)
+        offset = upload_session.upload_offset
+        if client_offset != offset:
+            response = jsonify({"error": "Upload-Offset no coincide con el estado del servidor.", "code": 409})
+            response.status_code = 409
+            response.headers.update(_offset_headers(upload_session))
+            return response
+
+        # Se descarta cualquier byte posterior al último offset confirmado
+        part.seek(offset)
+        part.truncate()
+        remaining = upload_session.upload_length - offset
+        max_chunk = current_app.config['RESUMABLE_UPLOAD_CHUNK_MAX_SIZE']
+        received = 0
+        try:
+            while True:
+                chunk = request.stream.read(WRITE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if received + len(chunk) > remaining or received + len(chunk) > max_chunk:
+                    part.truncate(offset)
+                    return jsonify({"error": "El trozo supera el tamaño permitido o el total declarado.", "code": 413}), 413
+                part.write(chunk)
+                received += len(chunk)
+        except ClientDisconnected:
+            # Se conserva lo recibido: el cliente reanudará desde el nuevo offset
+            current_app.logger.info(f"Subida {session_id} interrumpida tras {received} bytes")
+        part.flush()
+        os.fsync(part.fileno())
+
+        try:
+            upload_session.upload_offset = offset + received
+            upload_session.expires_at = session_expiry()
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            part.truncate(offset)
+            current_app.logger.error(f"Error al actualizar la sesión de subida: {e}")
+            return jsonify({"error": "Error interno al guardar el trozo.", "code": 500}), 500
+
+    return '', 204, _offset_headers(upload_session)
+
+
+# --- RUTA PARA CANCELAR UNA SESIÓN (DELETE) ---
+@upload_session_bp.route('/<session_id>', methods=['DELETE'])
+@jwt_required()
+def delete_upload_session(session_id):
+    upload_session, error = _get_owned_session(session_id)
+    if error:
+        return error
+    try:
+        db.session.delete(upload_session)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error al eliminar la sesión de subida: {e}")
+        return jsonify({"error": "Error interno al eliminar la sesión de subida.", "code": 500}), 500
+    _remove_part(session_id)
+    return '', 204
+
+
+# --- RUTA PARA CERRAR LA SUBIDA Y CREAR EL PODCAST (POST) ---
+@upload_session_bp.route('/<session_id>/finalize', methods=['POST'])
+@jwt_required()
+def finalize_upload_session(session_id):
+    upload_session, error = _get_owned_session(session_id)
+    if error:
+        return error
+
+    if upload_session.upload_offset != upload_session.upload_length:
+        response = jsonify({"error": "La subida todavía no está completa.", "code": 409})
+        response.status_code = 409
+        response.headers.update(_offset_headers(upload_session))
+        return response
+
+    title = request.form.get('title')
+    description = request.form.get('description')
+    category = request.form.get('category')
+    if not all([title, description, category]):
+        missing_fields = []
+        if not title: missing_fields.append('título')
+        if not description: missing_fields.append('descripción')
+        if not category: missing_fields.append('categoría')
+        return jsonify({"error": f"Faltan campos requeridos ({', '.join(missing_fields)})", "code": 400}), 400
+
+    cover_image_file = request.files.get('cover_image')
+    if cover_image_file and cover_image_file.filename != '' and \
+            not allowed_file(cover_image_file.filename, ALLOWED_IMAGE_EXTENSIONS):
+        return jsonify({"error": "Tipo de archivo de imagen de portada no permitido.", "code": 400}), 400
+
+    audio_path = None
+    cover_image_path = None
+    try:
+        # El .part se conserva hasta el commit: si algo falla, la sesión se puede volver a finalizar
+        audio_path, _, _ = store_file(part_path(session_id), upload_session.filename, keep_source=True)
+        if cover_image_file and cover_image_file.filename != '':
+            cover_image_path = store_upload(cover_image_file)
+
+        new_podcast = Podcast(
+            title=title,
+            description=description,
+            user_id=upload_session.user_id,
+            category=category,
+            audio_path=audio_path,
+            cover_image_path=cover_image_path
+        )
+        db.session.add(new_podcast)
+        acquire_blob(audio_path)
+        if cover_image_path:
+            acquire_blob(cover_image_path)
+        db.session.delete(upload_session)
+        bump_catalog_version()
+        db.session.commit()
+        _remove_part(session_id)
+        schedule_media_processing(new_podcast.id, audio_path)
+        schedule_cover_thumbnails(cover_image_path)
+        return jsonify({
+            "message": "Podcast creado con éxito.",
+            "podcast_id": new_podcast.id,
+            "audio_url": media_urls().media(audio_path),
+            "cover_image_url": media_urls().media(cover_image_path)
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        unlink_unreferenced(audio_path)
+        unlink_unreferenced(cover_image_path)
+        current_app.logger.error(f"Error al finalizar la subida {session_id}: {e}")
+        return jsonify({"error": "Error al crear el podcast: " + str(e), "code": 500}), 500
@@ -0,0 +1,251 @@
+# backend/services/audio_metadata.py
+"""
+Lectura de metadatos de audio a partir de las cabeceras del archivo, sin decodificar.
+
+Soporta WAV (RIFF fmt/data), MP3 (cabecera de frame MPEG + Xing/Info/VBRI para VBR,
+estimación CBR si no hay), FLAC (STREAMINFO) y OGG (Vorbis/Opus + último granule).
+Este módulo no importa Flask ni SQLAlchemy: se ejecuta en procesos hijos del pool.
+"""
+import os
+import struct
+
+MP3_BITRATES = {
+    # (versión MPEG-1?, capa) -> kbps por índice
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+MP3_SCAN_LIMIT = 256 * 1024
+
+
+def _empty(file_size):
+    return {
+        'duration_seconds': None,
+        'bitrate': None,
+        'sample_rate': None,
+        'channels': None,
+        'file_size': file_size,
+    }
+
+
+def _parse_wav(f, file_size):
+    meta = _empty(file_size)
+    header = f.read(12)
+    if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+        return None
+    byte_rate = None
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            break
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+        if chunk_id == b'fmt ':
+            fmt = f.read(chunk_size)
+            _, channels, sample_rate, byte_rate, _, _ = struct.unpack('<HHIIHH', fmt[:16])
+            meta.update(channels=channels, sample_rate=sample_rate, bitrate=byte_rate * 8)
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)
+        elif chunk_id == b'data':
+            # Algunos grabadores dejan 0 o 0xFFFFFFFF en streaming: se usa el resto del archivo
+            data_size = chunk_size
+            if data_size in (0, 0xFFFFFFFF) or f.tell() + data_size > file_size:
+                data_size = file_size - f.tell()
+            if byte_rate:
+                meta['duration_seconds'] = data_size / byte_rate
+            break
+        else:
+            f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+    return meta
+
+
+def _parse_flac(f, file_size):
+    if f.read(4) != b'fLaC':
+        return None
+    meta = _empty(file_size)
+    while True:
+        block_header = f.read(4)
+        if len(block_header) < 4:
+            break
+        is_last = block_header[0] & 0x80
+        block_type = block_header[0] & 0x7F
+        length = int.from_bytes(block_header[1:4], 'big')
+        if block_type == 0:
+            info = f.read(length)
+            packed = int.from_bytes(info[10:18], 'big')
+            sample_rate = packed >> 44
+            channels = ((packed >> 41) & 0x7) + 1
+            total_samples = packed & 0xFFFFFFFFF
+            meta.update(sample_rate=sample_rate, channels=channels)
+            if sample_rate and total_samples:
+                meta['duration_seconds'] = total_samples / sample_rate
+                meta['bitrate'] = int(file_size * 8 / meta['duration_seconds'])
+            break
+        f.seek(length, os.SEEK_CUR)
+        if is_last:
+            break
+    return meta
+
+
+def _last_ogg_granule(f, file_size):
+    tail = min(file_size, 64 * 1024)
+    f.seek(file_size - tail)
+    data = f.read(tail)
+    index = data.rfind(b'OggS')
+    while index != -1:
+        if index + 14 <= len(data):
+            granule = struct.unpack('<q', data[index + 6:index + 14])[0]
+            if granule >= 0:
+                return granule
+        index = data.rfind(b'OggS', 0, index)
+    return None
+
+
+def _parse_ogg(f, file_size):
+    page = f.read(27)
+    if len(page) < 27 or page[:4] != b'OggS':
+        return None
+    segments = page[26]
+    lacing = f.read(segments)
+    packet = f.read(sum(lacing))
+    meta = _empty(file_size)
+    if packet[:7] == b'\x01vorbis':
+        channels = packet[11]
+        sample_rate, _, nominal_bitrate = struct.unpack('<IiI', packet[12:24])[:3]
+        meta.update(channels=channels, sample_rate=sample_rate)
+        granule = _last_ogg_granule(f, file_size)
+        if granule and sample_rate:
+            meta['duration_seconds'] = granule / sample_rate
+        if nominal_bitrate and nominal_bitrate < 0x7FFFFFFF:
+            meta['bitrate'] = nominal_bitrate
+    elif packet[:8] == b'OpusHead':
+        channels = packet[9]
+        pre_skip = struct.unpack('<H', packet[10:12])[0]
+        input_sample_rate = struct.unpack('<I', packet[12:16])[0]
+        meta.update(channels=channels, sample_rate=input_sample_rate or 48000)
+        granule = _last_ogg_granule(f, file_size)
+        if granule:
+            # Opus siempre cuenta el granule a 48 kHz
+            meta['duration_seconds'] = max(0, granule - pre_skip) / 48000
+    else:
+        return meta
+    if meta['duration_seconds'] and not meta['bitrate']:
+        meta['bitrate'] = int(file_size * 8 / meta['duration_seconds'])
+    return meta
+
+
+def _parse_mp3_header(header):
+    """Devuelve los campos de una cabecera de frame MPEG de 4 bytes o None si no es válida."""
+    b1, b2, b3 = header[1], header[2], header[3]
+    if header[0] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version_bits = (b1 >> 3) & 0x3
+    layer_bits = (b1 >> 1) & 0x3
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x3
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    is_mpeg1 = version_bits == 3
+    layer = 4 - layer_bits
+    bitrate = MP3_BITRATES[(is_mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b2 >> 1) & 0x1
+    channel_mode = b3 >> 6
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if (layer == 2 or is_mpeg1) else 576
+        frame_length = (samples_per_frame // 8) * bitrate // sample_rate + padding
+    return {
+        'is_mpeg1': is_mpeg1,
+        'layer': layer,
+        'bitrate': bitrate,
+        'sample_rate': sample_rate,
+        'channels': 1 if channel_mode == 3 else 2,
+        'samples_per_frame': samples_per_frame,
+        'frame_length': frame_length,
+    }
+
+
+def _parse_mp3(f, file_size):
+    start = 0
+    head = f.read(10)
+    if head[:3] == b'ID3' and len(head) == 10:
+        # Tamaño "syncsafe" de 28 bits (+ 10 de cabecera, + 10 si hay footer)
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+    f.seek(start)
+    data = f.read(MP3_SCAN_LIMIT)
+
+    frame = None
+    offset = data.find(b'\xff')
+    while offset != -1 and offset + 4 <= len(data):
+        frame = _parse_mp3_header(data[offset:offset + 4])
+        if frame:
+            # Se confirma con el siguiente frame para no confundir datos con una cabecera
+            next_offset = offset + frame['frame_length']
+            if next_offset + 4 > len(data) or _parse_mp3_header(data[next_offset:next_offset + 4]):
+                break
+            frame = None
+        offset = data.find(b'\xff', offset + 1)
+    if not frame:
+        return None
+
+    meta = _empty(file_size)
+    meta.update(sample_rate=frame['sample_rate'], channels=frame['channels'], bitrate=frame['bitrate'])
+    audio_start = start + offset
+
+    # Xing/Info: justo después de la "side information" del primer frame
+    if frame['is_mpeg1']:
+        side_info = 17 if frame['channels'] == 1 else 32
+    else:
+        side_info = 9 if frame['channels'] == 1 else 17
+    xing_offset = offset + 4 + side_info
+    frames = None
+    if data[xing_offset:xing_offset + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', data[xing_offset + 4:xing_offset + 8])[0]
+        if flags & 0x1:
+            frames = struct.unpack('>I', data[xing_offset + 8:xing_offset + 12])[0]
+    elif data[offset + 36:offset + 40] == b'VBRI':
+        frames = struct.unpack('>I', data[offset + 50:offset + 54])[0]
+
+    audio_bytes = file_size - audio_start
+    f.seek(max(0, file_size - 128))
+    if f.read(3) == b'TAG':
+        audio_bytes -= 128
+
+    if frames:
+        meta['duration_seconds'] = frames * frame['samples_per_frame'] / frame['sample_rate']
+        if meta['duration_seconds']:
+            meta['bitrate'] = int(audio_bytes * 8 / meta['duration_seconds'])
+    elif frame['bitrate']:
+        # Sin cabecera VBR se asume CBR
+        meta['duration_seconds'] = audio_bytes * 8 / frame['bitrate']
+    return meta
+
+
+PARSERS = (_parse_wav, _parse_flac, _parse_ogg, _parse_mp3)
+
+
+def extract_audio_metadata(path):
+    """
+    Devuelve un dict con duration_seconds, bitrate, sample_rate, channels y file_size.
+    Los campos que no se puedan determinar quedan en None.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        for parser in PARSERS:
+            f.seek(0)
+            try:
+                meta = parser(f, file_size)
+            except (struct.error, IndexError, KeyError, ZeroDivisionError):
+                meta = None
+            if meta is not None:
+                if meta['duration_seconds'] is not None:
+                    meta['duration_seconds'] = round(meta['duration_seconds'], 3)
+                return meta
+    return _empty(file_size)
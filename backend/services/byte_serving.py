@@ -0,0 +1,198 @@
+# backend/services/byte_serving.py
+"""
+Servidor de archivos con soporte completo de HTTP Range (RFC 7233).
+
+- Rango único y respuesta completa: el archivo se entrega con wsgi.file_wrapper
+  ya posicionado en el offset inicial y con Content-Length exacto, de modo que
+  gunicorn lo envía con sendfile() (zero-copy) sin pasar los bytes por Python.
+- Varios rangos: respuesta multipart/byteranges generada por trozos (cediendo el
+  turno entre trozos con workers gevent).
+- ETag fuerte derivado de la identidad del archivo (inode, tamaño, mtime),
+  If-None-Match / If-Modified-Since (304) e If-Range.
+"""
+import mimetypes
+import os
+import secrets
+from datetime import datetime, timezone
+
+from flask import current_app, request
+from werkzeug.exceptions import NotFound
+from werkzeug.http import is_resource_modified, parse_range_header
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+
+from services.green import cooperative_yield
+
+MULTIPART_CHUNK_SIZE = 64 * 1024
+# Con más rangos que esto se sirve el archivo completo (evita amplificación con
+# peticiones de miles de rangos diminutos).
+MAX_RANGES = 16
+
+
+def file_etag(stat_result):
+    return f"{stat_result.st_ino:x}-{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"
+
+
+def _satisfiable_ranges(parsed_range, size):
+    """Normaliza los rangos pedidos a tuplas (inicio, fin_exclusivo) dentro del archivo."""
+    ranges = []
+    for start, stop in parsed_range.ranges:
+        if start < 0:
+            # Rango sufijo: "bytes=-500" son los últimos 500 bytes
+            start = max(0, size + start)
+            stop = size
+        else:
+            if start >= size:
+                continue
+            stop = size if stop is None else min(stop, size)
+        if start < stop:
+            ranges.append((start, stop))
+    return ranges
+
+
+def _coalesce(ranges):
+    """Une rangos solapados o contiguos para no enviar los mismos bytes dos veces."""
+    merged = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def _base_headers(response, etag, stat_result, mimetype):
+    response.set_etag(etag)
+    response.last_modified = datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
+    response.accept_ranges = 'bytes'
+    if mimetype:
+        response.mimetype = mimetype
+
+
+class _BoundedFile:
+    """
+    Archivo abierto en `start` que no deja leer más de `length` bytes.
+    Expone fileno(): gunicorn hace lseek(SEEK_CUR) sobre él y sendfile() de
+    Content-Length bytes (zero-copy). Los servidores sin sendfile iteran read(),
+    que respeta el límite del rango.
+    """
+
+    def __init__(self, path, start, length):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = length
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self._file.close()
+
+
+def _single_part_response(path, start, stop, size, status, etag, stat_result, mimetype):
+    body = wrap_file(request.environ, _BoundedFile(path, start, stop - start))
+    response = current_app.response_class(body, status=status, direct_passthrough=True)
+    _base_headers(response, etag, stat_result, mimetype)
+    response.content_length = stop - start
+    if status == 206:
+        response.headers['Content-Range'] = f"bytes {start}-{stop - 1}/{size}"
+    return response
+
+
+def _multipart_response(path, ranges, size, etag, stat_result, mimetype):
+    boundary = secrets.token_hex(16)
+    content_type = mimetype or 'application/octet-stream'
+    part_headers = [
+        (f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+         f"Content-Range: bytes {start}-{stop - 1}/{size}\r\n\r\n").encode('latin-1')
+        for start, stop in ranges
+    ]
+    closing = f"\r\n--{boundary}--\r\n".encode('latin-1')
+    content_length = sum(len(h) for h in part_headers) + sum(stop - start for start, stop in ranges) \
+        + 2 * (len(ranges) - 1) + len(closing)
+
+    def generate():
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            for index, ((start, stop), header) in enumerate(zip(ranges, part_headers)):
+                if index:
+                    yield b"\r\n"
+                yield header
+                offset = start
+                while offset < stop:
+                    chunk = os.pread(fd, min(MULTIPART_CHUNK_SIZE, stop - offset), offset)
+                    if not chunk:
+                        return
+                    offset += len(chunk)
+                    yield chunk
+                    cooperative_yield()
+            yield closing
+        finally:
+            os.close(fd)
+
+    response = current_app.response_class(generate(), status=206, direct_passthrough=True)
+    _base_headers(response, etag, stat_result, None)
+    response.headers['Content-Type'] = f"multipart/byteranges; boundary={boundary}"
+    response.content_length = content_length
+    return response
+
+
+def serve_file(directory, filename, max_age=None, immutable=False):
+    """Sirve `filename` desde `directory` atendiendo cabeceras condicionales y Range."""
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+
+    stat_result = os.stat(path)
+    size = stat_result.st_size
+    etag = file_etag(stat_result)
+    last_modified = datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    environ = request.environ
+
+    if not is_resource_modified(environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+        _base_headers(response, etag, stat_result, None)
+        return _with_cache_control(response, max_age, immutable)
+
+    range_header = environ.get('HTTP_RANGE')
+    # If-Range: si el validador no coincide con el archivo actual se ignora Range y se envía todo
+    if_range_matches = 'HTTP_IF_RANGE' not in environ or not is_resource_modified(
+        environ, etag=etag, last_modified=last_modified, ignore_if_range=False)
+    if range_header and size and if_range_matches:
+        parsed_range = parse_range_header(range_header)
+        if parsed_range is not None and parsed_range.units == 'bytes':
+            ranges = _satisfiable_ranges(parsed_range, size)
+            if not ranges:
+                response = current_app.response_class(status=416)
+                _base_headers(response, etag, stat_result, None)
+                response.headers['Content-Range'] = f"bytes */{size}"
+                return response
+            ranges = _coalesce(ranges)
+            if len(ranges) == 1:
+                start, stop = ranges[0]
+                response = _single_part_response(path, start, stop, size, 206, etag, stat_result, mimetype)
+                return _with_cache_control(response, max_age, immutable)
+            if len(ranges) <= MAX_RANGES:
+                response = _multipart_response(path, ranges, size, etag, stat_result, mimetype)
+                return _with_cache_control(response, max_age, immutable)
+
+    response = _single_part_response(path, 0, size, size, 200, etag, stat_result, mimetype)
+    return _with_cache_control(response, max_age, immutable)
+
+
+def _with_cache_control(response, max_age, immutable=False):
+    if max_age is not None:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = immutable
+    return response
@@ -0,0 +1,201 @@
+# backend/services/catalog_cache.py
+import time
+from functools import wraps
+
+from flask import current_app, g, request
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models.catalog_version import CatalogVersion, CatalogChange
+from services.cache import TTLCache
+
+CATALOG_VERSION_ROW_ID = 1
+# Solo una de cada tantas escrituras poda catalog_changes: dos escrituras simultáneas
+# casi nunca intentan borrar las mismas filas
+CHANGE_LOG_PRUNE_EVERY = 100
+
+_cache = None
+_last_seen_version = None
+# Cambios por podcast ya aplicados a la caché de este worker: todos los seq hasta
+# _last_seen_change y los de _applied_changes, que están por encima de un hueco (un seq
+# de una transacción que aún no ha hecho commit, o que hizo rollback)
+_last_seen_change = 0
+_applied_changes = set()
+_gap_since = None
+# Cambia cada vez que se descartan entradas: una respuesta calculada antes no se guarda
+_discard_generation = 0
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        _cache = TTLCache(
+            max_entries=current_app.config.get('CATALOG_CACHE_MAX_ENTRIES', 512),
+            ttl_seconds=current_app.config.get('CATALOG_CACHE_TTL', 60)
+        )
+    return _cache
+
+
+def current_catalog_state(engine=None):
+    """
+    (versión, último seq de catalog_changes) de la BD de `engine`; por defecto la principal
+    (db.engine), también dentro de las vistas que leen de la réplica.
+    """
+    row = db.session.execute(
+        select(
+            select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ROW_ID).scalar_subquery(),
+            select(func.max(CatalogChange.seq)).scalar_subquery()
+        ),
+        bind_arguments={'bind': engine if engine is not None else db.engine}
+    ).one()
+    return row[0] or 0, row[1] or 0
+
+
+def bump_catalog_version():
+    """
+    Incrementa el contador del catálogo dentro de la transacción en curso.
+    Debe llamarse antes del commit de cualquier escritura que cambie lo que
+    devuelven los endpoints cacheados, para que el cambio y la invalidación
+    se confirmen juntos.
+    """
+    g.catalog_written = True
+    result = db.session.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ROW_ID)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.session.add(CatalogVersion(id=CATALOG_VERSION_ROW_ID, version=1))
+
+
+def mark_podcast_changed(podcast_id):
+    """
+    Como bump_catalog_version, pero para escrituras que solo cambian lo que se muestra de
+    un podcast (comment_count): cada worker descarta únicamente las entradas cacheadas que
+    lo contienen. Solo inserta una fila en catalog_changes, sin actualizar ninguna fila
+    compartida, así que las escrituras de comentarios no se esperan unas a otras.
+    Devuelve el seq del cambio.
+    """
+    g.catalog_written = True
+    change = CatalogChange(podcast_id=podcast_id)
+    db.session.add(change)
+    db.session.flush()
+    if change.seq % CHANGE_LOG_PRUNE_EVERY == 0:
+        log_size = current_app.config.get('CATALOG_CHANGE_LOG_SIZE', 1000)
+        db.session.execute(delete(CatalogChange).where(CatalogChange.seq <= change.seq - log_size))
+    return change.seq
+
+
+def note_catalog_podcasts(podcast_ids):
+    """Apunta los podcasts que salen en la respuesta cacheable en curso (serializers)."""
+    noted = g.get('catalog_podcast_ids')
+    if noted is not None:
+        noted.update(podcast_ids)
+
+
+def _sync_with_catalog(cache, version, change):
+    """
+    Pone la caché de este worker al día con el estado (version, change) de la BD: otra
+    versión la vacía; los cambios por podcast nuevos descartan las entradas que los muestran.
+    """
+    global _last_seen_version, _last_seen_change, _applied_changes, _gap_since, _discard_generation
+    config = current_app.config
+    if version != _last_seen_version or change - _last_seen_change > config.get('CATALOG_CHANGE_LOG_SIZE', 1000):
+        # Otra versión, o el registro ya no guarda todos los cambios que este worker no ha visto
+        cache.clear()
+        _last_seen_version, _last_seen_change = version, change
+        _applied_changes, _gap_since = set(), None
+        _discard_generation += 1
+        return
+    if change <= _last_seen_change:
+        return
+
+    changes = db.session.execute(
+        select(CatalogChange.seq, CatalogChange.podcast_id)
+        .where(CatalogChange.seq > _last_seen_change, CatalogChange.seq <= change),
+        bind_arguments={'bind': db.engine}
+    ).all()
+    new_changes = [row for row in changes if row.seq not in _applied_changes]
+    if new_changes:
+        changed = {row.podcast_id for row in new_changes}
+        cache.delete_where(lambda value: not changed.isdisjoint(value[2]))
+        _applied_changes.update(row.seq for row in new_changes)
+        _discard_generation += 1
+
+    # Los seq se asignan al insertar pero se ven al hacer commit, que puede llegar en otro
+    # orden: solo se avanza hasta el primer hueco y lo de encima se vuelve a mirar
+    while _last_seen_change + 1 in _applied_changes:
+        _last_seen_change += 1
+        _applied_changes.discard(_last_seen_change)
+    if not _applied_changes:
+        _gap_since = None
+    elif _gap_since is None:
+        _gap_since = time.monotonic()
+    elif time.monotonic() - _gap_since > config.get('CATALOG_CACHE_TTL', 60):
+        # Un hueco tan largo es un rollback: las entradas guardadas mientras estaba abierto
+        # caducan por TTL de todos modos
+        _last_seen_change = max(_applied_changes)
+        _applied_changes, _gap_since = set(), None
+
+
+def _replica_has(state):
+    """True si la réplica tiene ya el estado `state` de la principal."""
+    replica_state = g.get('replica_catalog_state')
+    if replica_state is None:
+        try:
+            replica_state = current_catalog_state(db.engines['replica'])
+        except SQLAlchemyError:
+            db.session.rollback()
+            return False
+    return all(replica >= primary for replica, primary in zip(replica_state, state))
+
+
+def catalog_cached(view):
+    """
+    Caché de lectura para endpoints del catálogo. La versión se lee antes de
+    consultar los datos, así que una entrada guardada bajo la versión N nunca
+    contiene datos más antiguos que N; cuando otro worker incrementa la versión,
+    todas las entradas previas dejan de usarse. Los cambios de un solo podcast
+    (mark_podcast_changed) descartan solo las entradas en las que aparece.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_app.config.get('CATALOG_CACHE_ENABLED', True):
+            return view(*args, **kwargs)
+
+        cache = _get_cache()
+        version, change = g.catalog_state = current_catalog_state()
+        _sync_with_catalog(cache, version, change)
+        generation = _discard_generation
+
+        key = (
+            version,
+            request.endpoint,
+            request.host_url,
+            tuple(sorted(kwargs.items())),
+            tuple(sorted(request.args.items(multi=True))),
+            request.headers.get('Accept', '')
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            body, mimetype, _ = cached
+            response = current_app.response_class(body, status=200, mimetype=mimetype)
+            response.headers['X-Catalog-Cache'] = 'HIT'
+            return response
+
+        podcast_ids = g.catalog_podcast_ids = set()
+        response = current_app.make_response(view(*args, **kwargs))
+        # Si otra petición ya ha descartado cambios posteriores, esta respuesta puede ser
+        # anterior a ellos y no se guarda; tampoco si sale de una réplica que va por detrás
+        if response.status_code == 200 and not response.is_streamed and _discard_generation == generation \
+                and (not g.get('read_replica') or _replica_has((version, change))):
+            cache.set(key, (response.get_data(), response.mimetype, frozenset(podcast_ids)))
+        response.headers['X-Catalog-Cache'] = 'MISS'
+        return response
+
+    return wrapper
+
+
+def catalog_cache_stats():
+    return _get_cache().stats()
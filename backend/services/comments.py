@@ -0,0 +1,18 @@
+# backend/services/comments.py
+from models.comment import Comment
+from services.pagination import apply_keyset, split_page
+from services.users import get_users
+
+
+def comment_page(podcast_id, limit, cursor=None, extra_user_ids=()):
+    """
+    Una página de comentarios de un podcast, más recientes primero: una consulta más, como
+    mucho, otra para los autores que falten en la caché de usuarios (junto con
+    `extra_user_ids`, p. ej. el autor del podcast). Devuelve (comentarios, next_cursor, usuarios).
+    """
+    query = Comment.query.filter_by(podcast_id=podcast_id)
+    query = apply_keyset(query, Comment.created_at, Comment.id, cursor, limit)
+    comments, next_cursor = split_page(query.all(), limit)
+
+    users = get_users([comment.user_id for comment in comments] + list(extra_user_ids))
+    return [comment.to_dict(author=users.get(comment.user_id)) for comment in comments], next_cursor, users
@@ -0,0 +1,53 @@
+# backend/services/counters.py
+"""
+Contadores desnormalizados en la tabla podcasts (comment_count, ...).
+
+Se actualizan con UPDATE ... SET n = n + delta dentro de la transacción de la
+escritura que los cambia, nunca leyendo y reescribiendo el valor, así que dos
+peticiones simultáneas no pueden pisarse. reconcile_counters() los recalcula
+en bloque por si alguna vez se desvían (restauraciones, borrados manuales...).
+
+Para añadir un contador: columna en Podcast + entrada en PODCAST_COUNTERS.
+"""
+from sqlalchemy import func, select, update
+
+from extensions import db
+from models.comment import Comment
+from models.podcast import Podcast
+from services.catalog_cache import bump_catalog_version
+
+# nombre de la columna en Podcast -> (modelo que se cuenta, su columna con el id del podcast)
+PODCAST_COUNTERS = {
+    'comment_count': (Comment, Comment.podcast_id),
+}
+
+
+def increment_counter(podcast_id, name, delta=1):
+    """Suma `delta` al contador `name` del podcast en la transacción en curso."""
+    column = getattr(Podcast, name)
+    db.session.execute(
+        update(Podcast).where(Podcast.id == podcast_id).values({column: column + delta})
+    )
+
+
+def reconcile_counters(names=None):
+    """
+    Recalcula los contadores desde las tablas de origen con un UPDATE por contador,
+    tocando solo las filas desviadas. Devuelve {nombre: filas corregidas}.
+    """
+    fixed = {}
+    for name in names or PODCAST_COUNTERS:
+        model, podcast_id_column = PODCAST_COUNTERS[name]
+        actual = select(func.count()).select_from(model) \
+                                     .where(podcast_id_column == Podcast.id).scalar_subquery()
+        column = getattr(Podcast, name)
+        result = db.session.execute(
+            update(Podcast).where(column != actual).values({column: actual})
+            .execution_options(synchronize_session=False)
+        )
+        fixed[name] = result.rowcount
+    if any(fixed.values()):
+        # Los listados cacheados incluyen los contadores
+        bump_catalog_version()
+    db.session.commit()
+    return fixed
@@ -0,0 +1,28 @@
+# backend/services/db_pool.py
+"""
+Pool de conexiones de SQLAlchemy en workers bifurcados (gunicorn --preload).
+
+Con preload la app se crea una vez en el proceso maestro y los workers la heredan al
+hacer fork, incluido el pool del engine. Un socket de BD no se puede compartir entre
+procesos, así que cada worker descarta lo heredado (sin cerrarlo: sigue siendo del
+maestro) y abre sus propias conexiones antes de aceptar peticiones, para que la
+primera no pague el connect/handshake con la BD.
+"""
+from extensions import db
+
+
+def prewarm_pool(app, connections=None):
+    """Reinicia el pool de cada engine de la app en este proceso y abre `connections` conexiones."""
+    if connections is None:
+        connections = app.config.get('DB_POOL_PREWARM', 2)
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+            opened = []
+            try:
+                for _ in range(connections):
+                    opened.append(engine.connect())
+            finally:
+                # Devueltas al pool, abiertas
+                for connection in opened:
+                    connection.close()
@@ -0,0 +1,140 @@
+# backend/services/db_routing.py
+"""
+Lecturas desde la réplica (DATABASE_REPLICA_URL, bind "replica").
+
+Las vistas de solo lectura se marcan con @replica_reads y por defecto leen de la réplica
+sin ninguna consulta previa. Para que cada usuario lea sus propias escrituras, toda
+petición que cambia el catálogo (bump_catalog_version, mark_podcast_changed) devuelve la
+cookie READ_YOUR_WRITES_COOKIE con el estado del catálogo de la principal tras el commit
+(catalog_version.version y el último seq de catalog_changes). Mientras la tenga, sus
+lecturas comparan ese estado con el de la réplica (una consulta, a la réplica) y van a
+la principal si la réplica aún no ha recibido la escritura; cuando la ha recibido se
+borra la cookie. Las escrituras de un usuario no desvían las lecturas de los demás.
+
+Si la réplica falla, la lectura se repite en la principal y la réplica no se usa durante
+REPLICA_RETRY_SECONDS. Sin DATABASE_REPLICA_URL el decorador no hace nada.
+"""
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, g, request
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from services.catalog_cache import current_catalog_state
+
+READ_YOUR_WRITES_COOKIE = 'ambaria_rw'
+
+_stats = {'replica': 0, 'primary_lagging': 0, 'primary_error': 0}
+_stats_lock = threading.Lock()
+_replica_down_until = 0.0
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def replica_configured():
+    return 'replica' in current_app.config.get('SQLALCHEMY_BINDS', {})
+
+
+def replica_catalog_state():
+    return current_catalog_state(db.engines['replica'])
+
+
+def replica_caught_up(primary_state=None):
+    """True si la réplica tiene ya todas las escrituras del catálogo de `primary_state` (por defecto, las de la principal)."""
+    if primary_state is None:
+        primary_state = current_catalog_state()
+    replica_state = g.replica_catalog_state = replica_catalog_state()
+    return all(replica >= primary for replica, primary in zip(replica_state, primary_state))
+
+
+def _written_state():
+    """Estado del catálogo guardado en la cookie de read-your-writes, o None."""
+    try:
+        version, change = request.cookies[READ_YOUR_WRITES_COOKIE].split('.')
+        return int(version), int(change)
+    except (KeyError, ValueError):
+        return None
+
+
+def _replica_failed(e):
+    global _replica_down_until
+    db.session.rollback()
+    _replica_down_until = time.monotonic() + current_app.config.get('REPLICA_RETRY_SECONDS', 30)
+    current_app.logger.warning(f"Réplica no disponible, se lee de la principal: {e}")
+    _count('primary_error')
+
+
+def replica_reads(view):
+    """Sirve la vista desde la réplica salvo que el usuario tenga escrituras que aún no ha recibido."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not replica_configured():
+            return view(*args, **kwargs)
+        if time.monotonic() < _replica_down_until:
+            _count('primary_error')
+            return view(*args, **kwargs)
+
+        written = _written_state()
+        if written is not None:
+            try:
+                if not replica_caught_up(written):
+                    _count('primary_lagging')
+                    return view(*args, **kwargs)
+            except SQLAlchemyError as e:
+                _replica_failed(e)
+                return view(*args, **kwargs)
+            # La réplica ya tiene las escrituras del usuario: la cookie sobra
+            g.forget_catalog_writes = True
+
+        g.read_replica = True
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code >= 500:
+            # Las vistas convierten los errores de BD en un 500: si la réplica no responde,
+            # se repite la lectura en la principal
+            db.session.rollback()
+            try:
+                replica_catalog_state()
+            except SQLAlchemyError as e:
+                g.read_replica = False
+                _replica_failed(e)
+                return view(*args, **kwargs)
+        _count('replica')
+        return response
+
+    return wrapper
+
+
+def _remember_catalog_writes(response):
+    if g.get('catalog_written') and response.status_code < 400:
+        try:
+            version, change = current_catalog_state()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            current_app.logger.warning(f"No se pudo leer el estado del catálogo tras la escritura: {e}")
+            return response
+        same_site = current_app.config.get('READ_YOUR_WRITES_COOKIE_SAMESITE', 'Lax')
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE, f"{version}.{change}",
+            max_age=current_app.config.get('READ_YOUR_WRITES_COOKIE_MAX_AGE', 300),
+            httponly=True, samesite=same_site, secure=same_site == 'None' or request.is_secure
+        )
+    elif g.get('forget_catalog_writes'):
+        response.delete_cookie(READ_YOUR_WRITES_COOKIE)
+    return response
+
+
+def init_replica_routing(app):
+    """Cookie de read-your-writes en las respuestas a escrituras (solo con réplica)."""
+    if 'replica' in app.config.get('SQLALCHEMY_BINDS', {}):
+        app.after_request(_remember_catalog_writes)
+
+
+def replica_stats():
+    """Peticiones de este worker servidas desde la réplica o desviadas a la principal (y por qué)."""
+    with _stats_lock:
+        return dict(_stats)
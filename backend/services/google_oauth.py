@@ -0,0 +1,151 @@
+# backend/services/google_oauth.py
+"""
+Intercambio del código de autorización de Google por el perfil del usuario.
+
+El endpoint de tokens devuelve, además del access_token, un id_token (JWT firmado por
+Google) con sub, email, name y picture. Se verifica localmente contra las claves
+públicas de Google (JWKS), que se guardan en memoria durante el max-age que indica
+la respuesta y se vuelven a pedir si llega un "kid" desconocido (rotación de claves).
+Así el login son una llamada saliente en lugar de dos; /userinfo solo se usa si la
+respuesta no trae id_token.
+
+Todas las URLs vienen de la configuración (GOOGLE_TOKEN_URL, GOOGLE_JWKS_URL,
+GOOGLE_USERINFO_URL), de modo que se puede apuntar a un servidor OAuth local de pruebas.
+"""
+import base64
+import re
+import threading
+import time
+
+from flask import current_app
+
+from services.http_client import http_get, http_post
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+# Margen para relojes desajustados al comprobar iat/exp del id_token
+CLOCK_SKEW_SECONDS = 30
+# Con un kid desconocido no se vuelve a pedir el JWKS más de una vez por este intervalo
+MIN_JWKS_REFRESH_INTERVAL = 60
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class OAuthError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _b64_to_int(value):
+    return int.from_bytes(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)), 'big')
+
+
+class SigningKeyCache:
+    """Claves públicas de Google (kid -> PEM) con caducidad; una por proceso."""
+
+    def __init__(self):
+        self._keys = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, kid):
+        now = time.monotonic()
+        with self._lock:
+            if kid in self._keys and now < self._expires_at:
+                return self._keys[kid]
+            if now >= self._expires_at or now - self._fetched_at >= MIN_JWKS_REFRESH_INTERVAL:
+                # Bajo el lock: varios logins a la vez comparten una sola descarga
+                self._refresh(now)
+            return self._keys.get(kid)
+
+    def _refresh(self, now):
+        import rsa
+
+        response = http_get(current_app.config['GOOGLE_JWKS_URL'])
+        response.raise_for_status()
+        keys = {}
+        for jwk in response.json().get('keys', []):
+            if jwk.get('kty') == 'RSA' and jwk.get('kid'):
+                public_key = rsa.PublicKey(_b64_to_int(jwk['n']), _b64_to_int(jwk['e']))
+                keys[jwk['kid']] = public_key.save_pkcs1().decode('ascii')
+        match = MAX_AGE_RE.search(response.headers.get('Cache-Control', ''))
+        ttl = int(match.group(1)) if match else current_app.config.get('GOOGLE_JWKS_TTL', 3600)
+        self._keys = keys
+        self._fetched_at = now
+        self._expires_at = now + max(MIN_JWKS_REFRESH_INTERVAL, min(ttl, 24 * 3600))
+
+    def clear(self):
+        with self._lock:
+            self._keys, self._expires_at, self._fetched_at = {}, 0.0, 0.0
+
+
+signing_keys = SigningKeyCache()
+
+
+def verify_id_token(id_token, client_id):
+    """Comprueba firma, audiencia, emisor y fechas del id_token. Devuelve sus claims."""
+    from google.auth import jwt as google_jwt
+
+    try:
+        kid = google_jwt.decode_header(id_token).get('kid')
+    except ValueError as e:
+        raise OAuthError(f"id_token con formato inválido: {e}")
+    public_key = signing_keys.get(kid)
+    if public_key is None:
+        raise OAuthError("id_token firmado con una clave desconocida.")
+    try:
+        claims = google_jwt.decode(id_token, certs={kid: public_key}, audience=client_id,
+                                   clock_skew_in_seconds=CLOCK_SKEW_SECONDS)
+    except ValueError as e:
+        current_app.logger.warning(f"id_token rechazado: {e}")
+        raise OAuthError("id_token inválido.")
+    if claims.get('iss') not in GOOGLE_ISSUERS:
+        raise OAuthError("id_token con un emisor no válido.")
+    return claims
+
+
+def fetch_google_profile(code):
+    """
+    Cambia el código por tokens y devuelve {'google_id', 'email', 'name', 'picture'}.
+    Lanza OAuthError (status_code 400, o 502 si Google no responde).
+    """
+    import requests
+
+    config = current_app.config
+    try:
+        token_response = http_post(config['GOOGLE_TOKEN_URL'], data={
+            'code': code,
+            'client_id': config['GOOGLE_CLIENT_ID'],
+            'client_secret': config['GOOGLE_CLIENT_SECRET'],
+            'redirect_uri': config['GOOGLE_REDIRECT_URI'],
+            'grant_type': 'authorization_code'
+        })
+        token_data = token_response.json()
+        if 'access_token' not in token_data:
+            current_app.logger.warning(f"Google no devolvió access_token: {token_data.get('error_description', token_data)}")
+            raise OAuthError("Error al obtener el token de acceso de Google.")
+
+        if token_data.get('id_token'):
+            info = verify_id_token(token_data['id_token'], config['GOOGLE_CLIENT_ID'])
+        else:
+            userinfo_response = http_get(config['GOOGLE_USERINFO_URL'],
+                                         headers={'Authorization': f"Bearer {token_data['access_token']}"})
+            userinfo_response.raise_for_status()
+            info = userinfo_response.json()
+    except requests.RequestException as e:
+        current_app.logger.error(f"Error en la llamada a Google: {e}")
+        raise OAuthError("No se pudo contactar con Google.", status_code=502)
+    except ValueError as e:
+        current_app.logger.error(f"Respuesta de Google inválida: {e}")
+        raise OAuthError("Respuesta de Google inválida.", status_code=502)
+
+    # id_token y /v3/userinfo usan "sub"; /v1/userinfo, "id"
+    google_id = info.get('sub') or info.get('id')
+    if not google_id or not info.get('email'):
+        raise OAuthError("No se pudo obtener la información del usuario de Google.")
+    return {
+        'google_id': str(google_id),
+        'email': info['email'],
+        'name': info.get('name'),
+        'picture': info.get('picture')
+    }
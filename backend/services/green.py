@@ -0,0 +1,69 @@
+# backend/services/green.py
+"""
+Modo cooperativo (workers gevent de gunicorn, GUNICORN_WORKER_CLASS=gevent).
+
+Con gevent cada petición es un greenlet: mientras uno espera a la red (un oyente que
+descarga un MP3, la llamada a Google del callback OAuth) el worker atiende a los demás.
+Para que eso se cumpla:
+
+  - patch_all() parchea la librería estándar antes de importar la app (gunicorn.conf.py),
+    así los locks, hilos y sockets que crean los módulos al importarse ya son cooperativos;
+  - psycopg2 espera a PostgreSQL con gevent (set_wait_callback) en lugar de bloquear el
+    proceso entero;
+  - los generadores que hacen trabajo de CPU entre envíos (NDJSON del catálogo,
+    multipart/byteranges) llaman a cooperative_yield() para no acaparar el worker.
+
+Sin gevent (workers sync, flask run, scripts) cooperative_yield() no hace nada.
+"""
+import sys
+
+_sleep = None
+_checked = False
+
+
+def patch_all():
+    """Monkey-patching de gevent y conexiones psycopg2 cooperativas. Llamar antes de importar la app."""
+    from gevent import monkey
+
+    monkey.patch_all()
+    try:
+        import psycopg2.extensions
+    except ImportError:  # solo SQLite: no hay nada más que parchear
+        return
+    psycopg2.extensions.set_wait_callback(_gevent_wait_callback)
+
+
+def _gevent_wait_callback(conn, timeout=None):
+    """Como psycogreen: espera en el hub de gevent a que el socket de la conexión esté listo."""
+    import psycopg2
+    from psycopg2 import extensions
+    from gevent.socket import wait_read, wait_write
+
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f"Resultado inesperado de poll(): {state!r}")
+
+
+def is_green():
+    """True si el proceso corre con la librería estándar parcheada por gevent."""
+    monkey = sys.modules.get('gevent.monkey')
+    return monkey is not None and monkey.is_module_patched('socket')
+
+
+def cooperative_yield():
+    """Cede el turno a los demás greenlets; sin gevent no hace nada."""
+    global _sleep, _checked
+    if not _checked:
+        # Se decide en la primera llamada, ya dentro del worker (después del patch)
+        if is_green():
+            from gevent import sleep as _sleep
+        _checked = True
+    if _sleep is not None:
+        _sleep(0)
@@ -0,0 +1,63 @@
+# backend/services/http_client.py
+"""
+Cliente HTTP compartido para las llamadas salientes (Google OAuth).
+
+Una requests.Session por proceso: reutiliza las conexiones keep-alive (sin un TCP+TLS
+nuevo por llamada), aplica siempre un timeout (conexión, lectura) para que un servidor
+lento no bloquee el worker y reintenta con backoff los fallos de conexión y, solo en
+peticiones idempotentes (GET/HEAD), las respuestas 429/5xx. Tras un fork se crea una
+sesión nueva para no compartir sockets entre workers.
+"""
+import os
+import threading
+
+from flask import current_app
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            # requests solo se importa con la primera llamada saliente
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            config = current_app.config
+            retries = config.get('HTTP_RETRIES', 2)
+            adapter = HTTPAdapter(
+                pool_maxsize=config.get('HTTP_POOL_MAXSIZE', 10),
+                max_retries=Retry(
+                    total=retries, connect=retries, read=retries, status=retries,
+                    backoff_factor=0.3,
+                    status_forcelist=RETRY_STATUS_CODES,
+                    allowed_methods=frozenset({'GET', 'HEAD'}),
+                    raise_on_status=False
+                )
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session, _session_pid = session, os.getpid()
+        return _session
+
+
+def http_request(method, url, **kwargs):
+    """Como requests.request, pero con la sesión compartida y un timeout por defecto."""
+    kwargs.setdefault('timeout', (current_app.config.get('HTTP_CONNECT_TIMEOUT', 3.05),
+                                  current_app.config.get('HTTP_READ_TIMEOUT', 10)))
+    return get_http_session().request(method, url, **kwargs)
+
+
+def http_get(url, **kwargs):
+    return http_request('GET', url, **kwargs)
+
+
+def http_post(url, **kwargs):
+    return http_request('POST', url, **kwargs)
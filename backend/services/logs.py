@@ -0,0 +1,34 @@
+# backend/services/logs.py
+"""
+Trazas estructuradas (una línea JSON por evento) en el logger de la app.
+
+    log_event('uploads.serve', filename=filename)                      # DEBUG
+    log_event('auth.login', logging.INFO, user_id=user_id)
+    log_event('uploads.serve', sampled=True, filename=filename)         # 1 de cada 1/LOG_SAMPLE_RATE
+
+El nivel se comprueba antes de construir la línea, así que un evento por debajo de
+LOG_LEVEL no cuesta nada más que la llamada. Los eventos de rutas calientes se marcan
+con sampled=True y solo se escribe una fracción (LOG_SAMPLE_RATE). Nunca se registran
+tokens ni secretos.
+"""
+import json
+import logging
+import random
+
+from flask import current_app
+
+
+def configure_logging(app):
+    app.logger.setLevel(app.config['LOG_LEVEL'])
+
+
+def log_event(event, level=logging.DEBUG, sampled=False, **fields):
+    logger = current_app.logger
+    if not logger.isEnabledFor(level):
+        return
+    if sampled:
+        rate = current_app.config['LOG_SAMPLE_RATE']
+        if rate < 1 and random.random() >= rate:
+            return
+        fields['sample_rate'] = rate
+    logger.log(level, json.dumps({'event': event, **fields}, ensure_ascii=False, default=str))
@@ -0,0 +1,240 @@
+# backend/services/media_jobs.py
+"""
+Trabajos sobre los archivos subidos que se ejecutan fuera del ciclo de la petición.
+
+El análisis corre en un ProcessPoolExecutor propio de cada worker (contexto
+"spawn", para no heredar conexiones ni hilos del proceso padre). Cuando termina,
+el resultado se guarda desde un hilo del proceso padre con su propio contexto de
+aplicación.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models.podcast import Podcast
+from services.audio_metadata import extract_audio_metadata
+from services.catalog_cache import bump_catalog_version
+from services.storage import unlink_unreferenced
+from services.thumbnails import generate_all_variants, thumbnail_cache_dir, prune_cache
+from services.waveform import compute_peaks, sidecar_path
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_janitor = None
+_janitor_pid = None
+_pending_peaks = {}
+_pending_peaks_lock = threading.Lock()
+
+
+def get_media_executor():
+    """Pool de procesos perezoso; se recrea si el worker se ha bifurcado (fork) desde el que lo creó."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=current_app.config.get('MEDIA_JOB_WORKERS', 1),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _get_file_janitor():
+    """Hilo único por worker que borra del disco los archivos que se han quedado sin referencias."""
+    global _janitor, _janitor_pid
+    with _executor_lock:
+        if _janitor is None or _janitor_pid != os.getpid():
+            _janitor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-janitor')
+            _janitor_pid = os.getpid()
+        return _janitor
+
+
+def shutdown_media_executor(wait=True):
+    """Cierra el pool (y el hilo de limpieza) de este proceso; con wait=True espera a los trabajos pendientes."""
+    global _executor, _janitor
+    with _executor_lock:
+        executor, _executor = _executor, None
+        janitor, _janitor = _janitor, None
+    if executor is not None and _executor_pid == os.getpid():
+        executor.shutdown(wait=wait)
+    if janitor is not None and _janitor_pid == os.getpid():
+        janitor.shutdown(wait=wait)
+
+
+def run_in_background(app, fn, args, on_result, description):
+    """
+    Ejecuta fn(*args) en el pool y llama a on_result(resultado) dentro de un
+    contexto de aplicación. Con MEDIA_JOBS_ASYNC=False todo ocurre en línea
+    (útil para scripts y pruebas).
+    """
+    if not app.config.get('MEDIA_JOBS_ASYNC', True):
+        try:
+            on_result(fn(*args))
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Fallo en trabajo de medios ({description}): {e}")
+        return None
+
+    # Un fallo al encolar nunca debe tumbar la petición que ya hizo commit
+    try:
+        future = get_media_executor().submit(fn, *args)
+    except Exception as e:
+        app.logger.warning(f"No se pudo encolar el trabajo de medios ({description}): {e}")
+        return None
+
+    def _done(fut):
+        try:
+            result = fut.result()
+        except Exception as e:
+            app.logger.warning(f"Fallo en trabajo de medios ({description}): {e}")
+            return
+        with app.app_context():
+            try:
+                on_result(result)
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                app.logger.error(f"Error al guardar el resultado de {description}: {e}")
+            finally:
+                db.session.remove()
+
+    future.add_done_callback(_done)
+    return future
+
+
+def save_audio_metadata(podcast_id, audio_path, meta):
+    # Solo se aplica si el podcast sigue apuntando al mismo audio (pudo editarse mientras tanto)
+    result = db.session.execute(
+        update(Podcast)
+        .where(Podcast.id == podcast_id, Podcast.audio_path == audio_path)
+        .values(
+            duration_seconds=meta['duration_seconds'],
+            audio_bitrate=meta['bitrate'],
+            audio_sample_rate=meta['sample_rate'],
+            audio_channels=meta['channels'],
+            audio_size=meta['file_size']
+        )
+    )
+    if result.rowcount:
+        bump_catalog_version()
+    db.session.commit()
+
+
+def schedule_audio_metadata(podcast_id, audio_path):
+    """Programa la extracción de metadatos de audio. Llamar después del commit del Podcast."""
+    app = current_app._get_current_object()
+    return run_in_background(
+        app, extract_audio_metadata, (audio_path,),
+        lambda meta: save_audio_metadata(podcast_id, audio_path, meta),
+        f"metadatos de audio del podcast {podcast_id}"
+    )
+
+
+def _discard_stale_peaks(audio_path, peaks_path):
+    # Si el audio se borró mientras se calculaban los picos, el sidecar sobra
+    if peaks_path and not os.path.exists(audio_path):
+        try:
+            os.remove(peaks_path)
+        except FileNotFoundError:
+            pass
+
+
+def schedule_waveform_peaks(podcast_id, audio_path):
+    """Programa el cálculo del sidecar de picos. Llamar después del commit del Podcast."""
+    app = current_app._get_current_object()
+    return run_in_background(
+        app, compute_peaks, (audio_path,),
+        lambda peaks_path: _discard_stale_peaks(audio_path, peaks_path),
+        f"picos de forma de onda del podcast {podcast_id}"
+    )
+
+
+def schedule_media_processing(podcast_id, audio_path):
+    """Todo lo que se calcula a partir de un audio nuevo: metadatos y picos."""
+    schedule_audio_metadata(podcast_id, audio_path)
+    schedule_waveform_peaks(podcast_id, audio_path)
+
+
+def _unlink_files(app, paths):
+    try:
+        for path in paths:
+            if unlink_unreferenced(path):
+                app.logger.info(f"Archivo eliminado: {path}")
+    except (OSError, SQLAlchemyError) as e:
+        app.logger.warning(f"No se pudieron borrar los archivos {paths}: {e}")
+
+
+def _unlink_files_in_context(app, paths):
+    with app.app_context():
+        try:
+            _unlink_files(app, paths)
+        finally:
+            db.session.remove()
+
+
+def schedule_file_cleanup(paths):
+    """
+    Borra del disco, fuera de la petición, los archivos que release_blob(s) dejó sin
+    referencias (y sus sidecars). Llamar después del commit.
+    """
+    paths = [path for path in paths if path]
+    if not paths:
+        return None
+    app = current_app._get_current_object()
+    if not app.config.get('MEDIA_JOBS_ASYNC', True):
+        _unlink_files(app, paths)
+        return None
+    return _get_file_janitor().submit(_unlink_files_in_context, app, paths)
+
+
+def _forget_pending_peaks(audio_path):
+    with _pending_peaks_lock:
+        _pending_peaks.pop(audio_path, None)
+
+
+def schedule_cover_thumbnails(cover_image_path):
+    """Pregenera las variantes de una portada nueva para que el primer listado no las espere."""
+    if not cover_image_path:
+        return None
+    app = current_app._get_current_object()
+    cache_dir = thumbnail_cache_dir(app.config)
+    os.makedirs(cache_dir, exist_ok=True)
+    return run_in_background(
+        app, generate_all_variants, (cover_image_path, cache_dir),
+        lambda _: prune_cache(cache_dir, app.config['THUMBNAIL_CACHE_MAX_BYTES']),
+        f"miniaturas de {os.path.basename(cover_image_path)}"
+    )
+
+
+def ensure_waveform_peaks(audio_path, timeout):
+    """
+    Devuelve la ruta del sidecar de picos, calculándolo si falta (sin niveles si el
+    formato no se puede decodificar). Si el cálculo tarda más de `timeout` segundos
+    lanza TimeoutError; el trabajo sigue en el pool y la siguiente petición lo encontrará.
+    """
+    peaks_path = sidecar_path(audio_path)
+    if os.path.exists(peaks_path):
+        return peaks_path
+    if not current_app.config.get('MEDIA_JOBS_ASYNC', True):
+        return compute_peaks(audio_path)
+
+    # Varias peticiones a la vez por el mismo audio comparten un único cálculo
+    with _pending_peaks_lock:
+        future = _pending_peaks.get(audio_path)
+        submitted = future is None
+        if submitted:
+            future = get_media_executor().submit(compute_peaks, audio_path)
+            _pending_peaks[audio_path] = future
+    if submitted:
+        # Fuera del lock: si el futuro ya terminó, el callback se ejecuta en este mismo hilo
+        future.add_done_callback(lambda _: _forget_pending_peaks(audio_path))
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        raise TimeoutError(f"Picos de {audio_path} todavía en cálculo")
@@ -0,0 +1,378 @@
+# backend/services/metrics.py
+"""
+Métricas de la API en el formato de texto de Prometheus (GET /metrics).
+
+Por petición, etiquetadas con el endpoint del blueprint (p. ej. podcasts.get_all_podcasts):
+  - latencia (histograma) y peticiones por método y código de estado
+  - sentencias SQL y su tiempo (eventos before/after_cursor_execute de los Engine)
+  - tamaño de la respuesta (histograma); en las respuestas en streaming se cuenta al enviarlas
+  - en los archivos (audio, portadas: direct_passthrough) y en los generadores la latencia
+    incluye el envío del cuerpo: se registra cuando el servidor cierra la respuesta
+  - en las subidas (multipart y PATCH de sesiones), bytes recibidos y segundos: el
+    rendimiento es rate(ambaria_upload_bytes_total) / rate(ambaria_upload_seconds_total)
+
+Cada worker acumula en memoria y, si hay METRICS_DIR, vuelca su copia a
+METRICS_DIR/<pid>.json cada METRICS_FLUSH_INTERVAL segundos y al salir. /metrics suma
+los archivos de todos los workers (el suyo con los valores en vivo), así que responda
+el worker que responda se ven los totales. Los archivos de workers ya terminados se
+siguen sumando para que los contadores no retrocedan (solo contadores e histogramas: los
+gauges, como ambaria_cache_entries, salen de los workers vivos); gunicorn.conf.py vacía
+la carpeta al arrancar. Sin METRICS_DIR solo se ve el proceso que responde.
+"""
+import glob
+import json
+import os
+import threading
+import time
+
+from flask import Response, current_app, g, has_request_context, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# nombre -> (tipo, ayuda, buckets si es histograma)
+METRICS = {
+    'ambaria_http_requests_total': ('counter', 'Peticiones HTTP atendidas.', None),
+    'ambaria_http_request_duration_seconds': ('histogram', 'Latencia de las peticiones HTTP.', LATENCY_BUCKETS),
+    'ambaria_http_response_size_bytes': ('histogram', 'Tamaño del cuerpo de las respuestas.', SIZE_BUCKETS),
+    'ambaria_sql_statements_total': ('counter', 'Sentencias SQL ejecutadas durante las peticiones.', None),
+    'ambaria_sql_duration_seconds_total': ('counter', 'Tiempo en sentencias SQL durante las peticiones.', None),
+    'ambaria_upload_bytes_total': ('counter', 'Bytes recibidos en subidas.', None),
+    'ambaria_upload_seconds_total': ('counter', 'Segundos empleados en atender subidas.', None),
+    'ambaria_cache_entries': ('gauge', 'Entradas en las cachés en memoria (suma de workers).', None),
+    'ambaria_cache_hits_total': ('counter', 'Aciertos de las cachés en memoria.', None),
+    'ambaria_cache_misses_total': ('counter', 'Fallos de las cachés en memoria.', None),
+    'ambaria_replica_routing_total': ('counter', 'Vistas @replica_reads por destino de sus lecturas.', None),
+}
+
+# Cuerpos que cuentan como subida (multipart de /upload y /podcasts, PATCH de /upload-sessions)
+UPLOAD_MIMETYPES = frozenset({'multipart/form-data', 'application/offset+octet-stream', 'application/octet-stream'})
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Registry:
+    """Contadores e histogramas de este proceso; seguro entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0]
+            histogram[0][index] += 1
+            histogram[1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(labels), list(counts), total]
+                               for (name, labels), (counts, total) in self._histograms.items()],
+            }
+
+
+registry = Registry()
+_collectors = []
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def register_collector(collector):
+    """
+    `collector()` devuelve [(nombre, etiquetas, valor)] con valores leídos en el momento
+    (tamaños y aciertos de cachés, ...). Se llama con contexto de aplicación.
+    """
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+class _RequestMetrics:
+    __slots__ = ('started', 'sql_count', 'sql_seconds')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+
+
+# --- SQL: sentencias y tiempo de la petición en curso ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is None or not has_request_context():
+        return
+    current = g.get('_metrics')
+    if current is not None:
+        current.sql_count += 1
+        current.sql_seconds += time.perf_counter() - started
+
+
+# --- Peticiones ---
+def _record(endpoint, method, status, current, response_bytes, upload_bytes):
+    seconds = time.perf_counter() - current.started
+    labels = (('endpoint', endpoint), ('method', method))
+    registry.inc('ambaria_http_requests_total', labels + (('status', str(status)),))
+    registry.observe('ambaria_http_request_duration_seconds', labels, seconds)
+    if response_bytes is not None:
+        registry.observe('ambaria_http_response_size_bytes', labels, response_bytes)
+    if current.sql_count:
+        registry.inc('ambaria_sql_statements_total', labels, current.sql_count)
+        registry.inc('ambaria_sql_duration_seconds_total', labels, current.sql_seconds)
+    if upload_bytes:
+        registry.inc('ambaria_upload_bytes_total', labels, upload_bytes)
+        registry.inc('ambaria_upload_seconds_total', labels, seconds)
+
+
+def _counting_stream(body, record):
+    """Reenvía el cuerpo en streaming contando bytes; registra la petición al terminar de enviarlo."""
+    sent = 0
+    try:
+        for chunk in body:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()  # lo mismo que haría werkzeug después, pero ya medido
+            sent += len(chunk)
+            yield chunk
+    finally:
+        close = getattr(body, 'close', None)
+        if close is not None:
+            close()
+        record(sent)
+
+
+def _record_on_close(response, record):
+    """
+    Registra la petición cuando el servidor cierra el cuerpo, ya enviado. El cuerpo de un
+    archivo es el wsgi.file_wrapper del servidor y se deja tal cual (gunicorn lo manda con
+    sendfile si lo reconoce): solo se le engancha el close(). Un generador se envuelve.
+    """
+    body, length = response.response, response.content_length
+    close = getattr(body, 'close', None)
+
+    def close_and_record():
+        try:
+            if close is not None:
+                close()
+        finally:
+            record(length)
+
+    try:
+        body.close = close_and_record
+    except AttributeError:  # generadores: no admiten atributos
+        response.response = _counting_stream(body, record)
+
+
+def _before_request():
+    g._metrics = _RequestMetrics()
+    _ensure_flusher(current_app._get_current_object())
+
+
+def _after_request(response):
+    # Se deja en g: las consultas de una respuesta en streaming también se cuentan
+    current = g.get('_metrics')
+    if current is None:
+        return response
+    endpoint = request.endpoint or 'unmatched'
+    method, status = request.method, response.status_code
+    upload_bytes = request.content_length if request.mimetype in UPLOAD_MIMETYPES else 0
+
+    record = lambda response_bytes: _record(endpoint, method, status, current, response_bytes, upload_bytes)
+
+    if response.direct_passthrough:
+        # Archivos y rangos (byte_serving): la latencia incluye el envío del audio
+        _record_on_close(response, record)
+    elif response.is_streamed and response.content_length is None:
+        # Generadores (NDJSON, ...): la latencia y el tamaño se conocen al acabar de enviar
+        response.response = _counting_stream(response.response, record)
+    else:
+        record(response.content_length)
+    return response
+
+
+# --- Volcado por worker y agregación ---
+def _collect():
+    samples = []
+    for collector in _collectors:
+        try:
+            samples.extend(collector())
+        except Exception as e:  # una métrica rota no debe tumbar /metrics
+            current_app.logger.warning(f"Colector de métricas fallido: {e}")
+    return samples
+
+
+def process_snapshot():
+    """Métricas de este proceso, serializables a JSON. Requiere contexto de aplicación."""
+    snapshot = registry.snapshot()
+    snapshot['collected'] = [[name, list(labels), value] for name, labels, value in _collect()]
+    return snapshot
+
+
+def _snapshot_path(metrics_dir, pid):
+    return os.path.join(metrics_dir, f"{pid}.json")
+
+
+def flush(app):
+    """Escribe la copia de este worker en METRICS_DIR (escritura atómica)."""
+    metrics_dir = app.config.get('METRICS_DIR')
+    if not metrics_dir:
+        return
+    with app.app_context():
+        snapshot = process_snapshot()
+    os.makedirs(metrics_dir, exist_ok=True)
+    path = _snapshot_path(metrics_dir, os.getpid())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def _flush_loop(app, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flush(app)
+        except Exception as e:
+            app.logger.warning(f"No se pudieron volcar las métricas: {e}")
+
+
+def _ensure_flusher(app):
+    # Un hilo por proceso, arrancado en la primera petición (ya en el worker, tras el fork)
+    global _flusher_pid
+    pid = os.getpid()
+    if _flusher_pid == pid or not app.config.get('METRICS_DIR'):
+        return
+    with _flusher_lock:
+        if _flusher_pid != pid:
+            threading.Thread(target=_flush_loop, args=(app, app.config['METRICS_FLUSH_INTERVAL']),
+                             name='metrics-flush', daemon=True).start()
+            _flusher_pid = pid
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # existe, pero es de otro usuario
+        return True
+    return True
+
+
+def _load_snapshots(metrics_dir):
+    own_path = _snapshot_path(metrics_dir, os.getpid())
+    snapshots = []
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        if path == own_path:
+            continue
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue  # el worker acaba de terminar o se está escribiendo
+        pid = os.path.basename(path).split('.', 1)[0]
+        snapshot['live'] = pid.isdigit() and _pid_alive(int(pid))
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def merge_snapshots(snapshots):
+    """
+    Suma las copias de los workers: {(nombre, etiquetas): valor o [cuentas, suma]}.
+    De los workers terminados (live=False) solo cuentan contadores e histogramas: sus
+    gauges son valores de un proceso que ya no existe y no deben sumarse a los actuales.
+    """
+    values, histograms = {}, {}
+    for snapshot in snapshots:
+        live = snapshot.get('live', True)
+        for name, labels, value in snapshot.get('counters', []) + snapshot.get('collected', []):
+            if not live and METRICS.get(name, ('gauge',))[0] == 'gauge':
+                continue
+            key = (name, tuple(map(tuple, labels)))
+            values[key] = values.get(key, 0) + value
+        for name, labels, counts, total in snapshot.get('histograms', []):
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [[0] * len(counts), 0.0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+    return values, histograms
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(values, histograms):
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (metric, labels), value in
+                        (histograms if kind == 'histogram' else values).items() if metric == name)
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in series:
+            if kind != 'histogram':
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip(buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels, (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view():
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        return jsonify({"error": "No autorizado.", "code": 401}), 401
+    snapshots = [process_snapshot()]
+    metrics_dir = current_app.config.get('METRICS_DIR')
+    if metrics_dir:
+        snapshots.extend(_load_snapshots(metrics_dir))
+    return Response(render_prometheus(*merge_snapshots(snapshots)), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def init_metrics(app):
+    """Hooks de petición, eventos SQL (una vez por proceso) y la ruta /metrics."""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    # --- RUTA PARA LAS MÉTRICAS DE PROMETHEUS (GET) ---
+    app.add_url_rule('/metrics', 'metrics', metrics_view, methods=['GET'])
@@ -0,0 +1,94 @@
+# backend/services/pagination.py
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_limit(raw_limit, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Convierte el parámetro ?limit= en un entero acotado entre 1 y `maximum`."""
+    if raw_limit is None or raw_limit == '':
+        return default
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError("El parámetro 'limit' debe ser un número entero.")
+    return max(1, min(limit, maximum))
+
+
+def _encode(raw):
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+
+
+def encode_cursor(created_at, row_id):
+    """Codifica la posición (created_at, id) de la última fila como un token opaco."""
+    return _encode(f"{created_at.isoformat()}|{row_id}")
+
+
+def decode_cursor(cursor):
+    """Devuelve la tupla (created_at, id) codificada en el cursor."""
+    try:
+        created_at_raw, row_id_raw = _decode(cursor).rsplit('|', 1)
+        return datetime.fromisoformat(created_at_raw), int(row_id_raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor("Cursor de paginación inválido.") from e
+
+
+def encode_rank_cursor(score, row_id):
+    """Cursor para listados ordenados por puntuación; repr() conserva el float exacto."""
+    return _encode(f"{score!r}|{row_id}")
+
+
+def decode_rank_cursor(cursor):
+    try:
+        score_raw, row_id_raw = _decode(cursor).rsplit('|', 1)
+        return float(score_raw), int(row_id_raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor("Cursor de paginación inválido.") from e
+
+
+def apply_keyset(query, created_at_column, id_column, cursor, limit):
+    """
+    Ordena por (created_at DESC, id DESC) y se posiciona después del cursor.
+    Se pide una fila extra para saber si existe una página siguiente sin hacer COUNT(*).
+    """
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            created_at_column < cursor_created_at,
+            and_(created_at_column == cursor_created_at, id_column < cursor_id)
+        ))
+    return query.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def apply_rank_keyset(query, score_column, id_column, cursor, limit):
+    """Como apply_keyset, pero por (score ASC, id ASC): menor puntuación = más relevante."""
+    if cursor:
+        cursor_score, cursor_id = decode_rank_cursor(cursor)
+        query = query.filter(or_(
+            score_column > cursor_score,
+            and_(score_column == cursor_score, id_column > cursor_id)
+        ))
+    return query.order_by(score_column.asc(), id_column.asc()).limit(limit + 1)
+
+
+def split_page(rows, limit, created_at_getter=lambda row: row.created_at, id_getter=lambda row: row.id,
+               encoder=encode_cursor):
+    """Recorta la fila extra pedida por apply_keyset y calcula el next_cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encoder(created_at_getter(last), id_getter(last))
@@ -0,0 +1,184 @@
+# backend/services/play_events.py
+"""
+Ingesta de reproducciones con escritura por lotes.
+
+Cada worker guarda las reproducciones en un búfer en memoria y un hilo propio las
+escribe en la BD cuando se acumulan PLAY_EVENTS_FLUSH_SIZE o pasan
+PLAY_EVENTS_FLUSH_INTERVAL segundos, y una última vez al terminar el proceso
+(worker_exit en gunicorn.conf.py; atexit fuera de gunicorn).
+Cada vaciado es una sola transacción:
+
+    - INSERT multi-fila (executemany) de los eventos en play_events
+    - UPSERT "plays = plays + n" en podcast_plays_hourly y podcast_plays_daily
+
+así que los agregados siempre cuadran con los eventos escritos y las consultas no
+necesitan recorrer play_events. Con PLAY_EVENTS_ASYNC=False se escribe en línea
+(útil para scripts y pruebas).
+"""
+import atexit
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models.play_stats import PlayEvent, PodcastPlaysDaily, PodcastPlaysHourly
+from models.podcast import Podcast
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def hour_start(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def day_start(moment):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _upsert_plays(model, counts):
+    """Suma counts {(podcast_id, period_start): n} a la tabla de agregados con un único executemany."""
+    table = model.__table__
+    # Orden fijo de claves: dos workers que vacían a la vez bloquean las filas en el mismo orden
+    rows = [{'podcast_id': podcast_id, 'period_start': period_start, 'plays': plays}
+            for (podcast_id, period_start), plays in sorted(counts.items())]
+    dialect = db.session.get_bind(mapper=model.__mapper__).dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        statement = (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.podcast_id, table.c.period_start],
+            set_={'plays': table.c.plays + statement.excluded.plays}
+        )
+        db.session.execute(statement, rows)
+        return
+    # Otros motores: UPDATE atómico y, si la fila no existía, INSERT
+    for row in rows:
+        result = db.session.execute(
+            update(table)
+            .where(table.c.podcast_id == row['podcast_id'], table.c.period_start == row['period_start'])
+            .values(plays=table.c.plays + row['plays'])
+        )
+        if result.rowcount == 0:
+            db.session.execute(insert(table), [row])
+
+
+def write_play_events(events):
+    """
+    Escribe una lista de (podcast_id, user_id, played_at) y actualiza los agregados.
+    Se descartan los de podcasts que ya no existen. Hace commit; devuelve cuántos escribió.
+    """
+    podcast_ids = {podcast_id for podcast_id, _, _ in events}
+    existing = set(db.session.scalars(select(Podcast.id).where(Podcast.id.in_(podcast_ids))))
+    events = [event for event in events if event[0] in existing]
+    if not events:
+        return 0
+
+    db.session.execute(insert(PlayEvent), [
+        {'podcast_id': podcast_id, 'user_id': user_id, 'played_at': played_at}
+        for podcast_id, user_id, played_at in events
+    ])
+    _upsert_plays(PodcastPlaysHourly, Counter((podcast_id, hour_start(played_at)) for podcast_id, _, played_at in events))
+    _upsert_plays(PodcastPlaysDaily, Counter((podcast_id, day_start(played_at)) for podcast_id, _, played_at in events))
+    db.session.commit()
+    return len(events)
+
+
+class PlayEventBuffer:
+    """Búfer de reproducciones de un worker, con su hilo de vaciado."""
+
+    def __init__(self, app):
+        self.app = app
+        self.pid = os.getpid()
+        self.flush_size = app.config.get('PLAY_EVENTS_FLUSH_SIZE', 500)
+        self.flush_interval = app.config.get('PLAY_EVENTS_FLUSH_INTERVAL', 5)
+        # Si la BD no responde durante mucho tiempo se descartan las más antiguas
+        self.events = deque(maxlen=app.config.get('PLAY_EVENTS_MAX_BUFFER', 50000))
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def add(self, events):
+        with self._lock:
+            overflow = max(0, len(self.events) + len(events) - self.events.maxlen)
+            self.events.extend(events)
+            self.dropped += overflow
+            pending = len(self.events)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='play-events-flusher', daemon=True)
+                self._thread.start()
+        if overflow:
+            self.app.logger.warning(f"Búfer de reproducciones lleno: {overflow} descartadas")
+        if pending >= self.flush_size:
+            # El vaciado lo hace el hilo: la petición no espera a la BD
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Escribe todo lo pendiente. Devuelve cuántos eventos se escribieron."""
+        # atexit se hereda al bifurcar: un búfer copiado del proceso padre no se vacía en el hijo
+        if os.getpid() != self.pid:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                events = list(self.events)
+                self.events.clear()
+            if not events:
+                return 0
+            with self.app.app_context():
+                try:
+                    return write_play_events(events)
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Error al escribir {len(events)} reproducciones (se reintentará): {e}")
+                    with self._lock:
+                        overflow = max(0, len(self.events) + len(events) - self.events.maxlen)
+                        # Las nuevas llegadas tienen prioridad: si no caben, se pierden las más antiguas
+                        self.events.extendleft(reversed(events[overflow:]))
+                        self.dropped += overflow
+                    return 0
+
+
+def get_play_buffer():
+    """Búfer perezoso; se recrea si el worker se ha bifurcado (fork) desde el que lo creó."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None or _buffer.pid != os.getpid():
+            _buffer = PlayEventBuffer(current_app._get_current_object())
+        return _buffer
+
+
+def record_plays(events):
+    """Registra reproducciones (podcast_id, user_id, played_at); se escriben en el próximo vaciado."""
+    if not current_app.config.get('PLAY_EVENTS_ASYNC', True):
+        return write_play_events(list(events))
+    get_play_buffer().add(events)
+    return len(events)
+
+
+def flush_play_events():
+    """Vacía el búfer de este proceso (p. ej. al apagar el worker). Devuelve cuántos eventos escribió."""
+    return _buffer.flush() if _buffer is not None else 0
+
+
+def purge_play_events(older_than_days):
+    """Borra los eventos individuales antiguos; los agregados se conservan. Devuelve cuántos borró."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    result = db.session.execute(
+        delete(PlayEvent).where(PlayEvent.played_at < cutoff).execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,69 @@
+# backend/services/resumable_uploads.py
+import os
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, delete
+
+from extensions import db
+from models.upload_session import UploadSession
+
+SESSIONS_DIRNAME = '.sessions'
+
+
+def sessions_dir():
+    path = os.path.join(current_app.config['UPLOAD_FOLDER'], SESSIONS_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def part_path(session_id):
+    return os.path.join(sessions_dir(), f"{session_id}.part")
+
+
+def session_expiry():
+    return datetime.utcnow() + timedelta(seconds=current_app.config.get('RESUMABLE_UPLOAD_TTL', 24 * 3600))
+
+
+def purge_expired_upload_sessions(scan_orphans=True):
+    """
+    Borra las sesiones caducadas (filas y .part). Con scan_orphans también recorre
+    el directorio y elimina los .part que hayan quedado sin fila, p. ej. tras un
+    fallo entre escribir el archivo y el commit. Devuelve cuántos archivos se eliminaron.
+    """
+    now = datetime.utcnow()
+    expired_ids = db.session.execute(
+        select(UploadSession.id).where(UploadSession.expires_at < now)
+    ).scalars().all()
+    if expired_ids:
+        db.session.execute(delete(UploadSession).where(UploadSession.id.in_(expired_ids)))
+        db.session.commit()
+
+    if not scan_orphans:
+        removed = 0
+        for session_id in expired_ids:
+            try:
+                os.remove(part_path(session_id))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    directory = sessions_dir()
+    ttl = current_app.config.get('RESUMABLE_UPLOAD_TTL', 24 * 3600)
+    expired_ids = set(expired_ids)
+    removed = 0
+    for entry in os.scandir(directory):
+        if not entry.name.endswith('.part'):
+            continue
+        session_id = entry.name[:-len('.part')]
+        orphaned = entry.stat().st_mtime < time.time() - ttl and \
+            db.session.get(UploadSession, session_id) is None
+        if session_id in expired_ids or orphaned:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
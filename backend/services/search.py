@@ -0,0 +1,75 @@
+# backend/services/search.py
+"""
+Consultas sobre el índice de texto completo definido en models/podcast_search.py.
+
+search_subquery() devuelve una subconsulta (podcast_id, score) para unir con Podcast.
+`score` se ordena siempre de forma ascendente (menor = más relevante): bm25 ya
+funciona así en FTS5 y en PostgreSQL se usa -ts_rank.
+"""
+import re
+
+from sqlalchemy import Float, Integer, text
+
+from extensions import db
+from models.podcast import Podcast
+from models.podcast_search import PG_TS_CONFIG
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+# Pesos bm25 de FTS5 por columna: title, description, comments
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+
+class SearchUnavailable(RuntimeError):
+    pass
+
+
+def search_terms(raw_query):
+    """Palabras de la consulta, ya saneadas: solo caracteres de palabra, como mucho MAX_TERMS."""
+    return TERM_RE.findall((raw_query or '').lower())[:MAX_TERMS]
+
+
+def _dialect_name():
+    return db.session.get_bind(mapper=Podcast.__mapper__).dialect.name
+
+
+def search_subquery(terms):
+    """Documentos que contienen todos los términos (cada uno como prefijo) con su puntuación."""
+    dialect = _dialect_name()
+    if dialect == 'sqlite':
+        # "term"* = prefijo; varios términos separados por espacio = AND
+        match = ' '.join(f'"{term}"*' for term in terms)
+        weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+        statement = text(
+            f"SELECT rowid AS podcast_id, bm25(podcast_search, {weights}) AS score "
+            "FROM podcast_search WHERE podcast_search MATCH :match"
+        ).bindparams(match=match)
+    elif dialect == 'postgresql':
+        tsquery = ' & '.join(f"{term}:*" for term in terms)
+        statement = text(
+            "SELECT podcast_id, -ts_rank(document, query) AS score "
+            f"FROM podcast_search, to_tsquery('{PG_TS_CONFIG}', :tsquery) AS query "
+            "WHERE document @@ query"
+        ).bindparams(tsquery=tsquery)
+    else:
+        raise SearchUnavailable(f"Búsqueda no disponible para la base de datos '{dialect}'.")
+    return statement.columns(podcast_id=Integer, score=Float).subquery('search')
+
+
+def rebuild_search_index():
+    """Vuelve a generar el índice completo (tras restaurar una copia, p. ej.). Devuelve cuántos podcasts indexó."""
+    dialect = _dialect_name()
+    if dialect == 'sqlite':
+        db.session.execute(text("DELETE FROM podcast_search"))
+        db.session.execute(text(
+            "INSERT INTO podcast_search (rowid, title, description, comments) "
+            "SELECT p.id, p.title, coalesce(p.description, ''), "
+            "coalesce((SELECT group_concat(c.text, ' ') FROM comments c WHERE c.podcast_id = p.id), '') "
+            "FROM podcasts p"
+        ))
+    elif dialect == 'postgresql':
+        db.session.execute(text("SELECT podcast_search_refresh(id) FROM podcasts"))
+    else:
+        raise SearchUnavailable(f"Búsqueda no disponible para la base de datos '{dialect}'.")
+    db.session.commit()
+    return db.session.query(Podcast.id).count()
@@ -0,0 +1,213 @@
+# backend/services/serializers.py
+"""
+Serialización de podcasts para las respuestas JSON.
+
+- URL de medios: url_for se resuelve una vez por app y host (MediaUrls) y queda una
+  plantilla "prefijo + nombre de archivo"; por fila solo se concatena el nombre.
+- Filas: los listados piden solo las columnas necesarias (podcast_columns) y reciben
+  tuplas Row en lugar de entidades Podcast. El serializador lee atributos, así que
+  sirve igual para una entidad (p. ej. la de GET /podcasts/<id>/page).
+- Campos: cada combinación de ?fields= se compila una vez en una tupla de
+  (clave, atributo) y (clave, función); sin ?fields la respuesta es la completa.
+- Caché del catálogo: los ids serializados se apuntan (note_catalog_podcasts) para que
+  un cambio en un podcast descarte solo las respuestas cacheadas en las que sale.
+- OrjsonProvider: proveedor JSON de Flask (jsonify, request.get_json, NDJSON) con orjson.
+"""
+from functools import lru_cache
+from urllib.parse import quote
+
+from flask import current_app, has_request_context, request, url_for
+from flask.json.provider import DefaultJSONProvider
+
+from models.podcast import Podcast
+from services.catalog_cache import note_catalog_podcasts
+from services.thumbnails import THUMBNAIL_SIZES, THUMBNAIL_FORMATS
+from services.users import get_users
+
+try:
+    import orjson
+except ImportError:  # sin orjson se queda el proveedor de Flask (json de la stdlib)
+    orjson = None
+
+# Los mismos caracteres que deja sin escapar el conversor de rutas de werkzeug
+URL_SAFE_CHARS = "!$&'()*+,/:;=@"
+_FILENAME_PLACEHOLDER = 'ambaria-media-filename'
+# Hosts distintos (Host de la petición) con plantillas guardadas; al pasar de aquí se vacía
+MEDIA_URLS_MAX_HOSTS = 32
+
+
+def _basename(path):
+    return path.rpartition('/')[2]
+
+
+def _url_template(endpoint, **values):
+    prefix, suffix = url_for(endpoint, filename=_FILENAME_PLACEHOLDER, _external=True, **values) \
+        .split(_FILENAME_PLACEHOLDER, 1)
+    return prefix, suffix
+
+
+class MediaUrls:
+    """Plantillas de URL de /uploads y /thumbnails para un host."""
+    __slots__ = ('_uploads', '_thumbnails')
+
+    def __init__(self):
+        self._uploads = _url_template('podcasts.uploaded_file')
+        self._thumbnails = tuple(
+            (fmt, tuple((str(size), _url_template('podcasts.cover_thumbnail', size=size, fmt=fmt))
+                        for size in THUMBNAIL_SIZES))
+            for fmt in THUMBNAIL_FORMATS
+        )
+
+    def media(self, path):
+        """URL pública de un archivo subido (audio o portada); None si no hay archivo."""
+        if not path:
+            return None
+        prefix, suffix = self._uploads
+        return prefix + quote(_basename(path), safe=URL_SAFE_CHARS) + suffix
+
+    def cover_variants(self, cover_image_path):
+        # {"webp": {"50": url, "180": url, "300": url}, "jpeg": {...}}
+        if not cover_image_path:
+            return None
+        filename = quote(_basename(cover_image_path), safe=URL_SAFE_CHARS)
+        return {fmt: {size: prefix + filename + suffix for size, (prefix, suffix) in sizes}
+                for fmt, sizes in self._thumbnails}
+
+
+def media_urls():
+    """MediaUrls del host de la petición actual, resueltas la primera vez que se piden."""
+    key = request.url_root if has_request_context() else None
+    cache = current_app.extensions.setdefault('ambaria_media_urls', {})
+    urls = cache.get(key)
+    if urls is None:
+        if len(cache) >= MEDIA_URLS_MAX_HOSTS:
+            cache.clear()
+        urls = cache[key] = MediaUrls()
+    return urls
+
+
+# --- CAMPOS DE LA RESPUESTA (?fields=id,title,artist,...) ---
+# campo -> (columnas de Podcast que necesita, atributo a copiar tal cual o función (fila, autor, urls))
+PODCAST_FIELDS = {
+    'id': (('id',), 'id'),
+    'title': (('title',), 'title'),
+    'description': (('description',), 'description'),
+    'artist': (('user_id',), lambda row, author, urls: author.name if author else "Desconocido"),
+    'category': (('category',), 'category'),
+    'audio_url': (('audio_path',), lambda row, author, urls: urls.media(row.audio_path)),
+    'cover_image_url': (('cover_image_path',), lambda row, author, urls: urls.media(row.cover_image_path)),
+    'cover_image_variants': (('cover_image_path',), lambda row, author, urls: urls.cover_variants(row.cover_image_path)),
+    'created_at': (('created_at',), lambda row, author, urls: row.created_at.isoformat()),
+    'user_id': (('user_id',), 'user_id'),
+    'duration_seconds': (('duration_seconds',), 'duration_seconds'),
+    'comment_count': (('comment_count',), 'comment_count'),
+}
+# Siempre se leen: el orden y el cursor de los listados las usan
+PODCAST_KEY_COLUMNS = ('id', 'created_at')
+
+
+def parse_fields(raw_fields):
+    """?fields= -> frozenset de campos pedidos; sin el parámetro, None (todos: la respuesta de siempre)."""
+    if raw_fields is None:
+        return None
+    fields = frozenset(field.strip() for field in raw_fields.split(',') if field.strip())
+    if not fields:
+        raise ValueError("El parámetro 'fields' no puede estar vacío.")
+    unknown = fields - PODCAST_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Campos desconocidos en 'fields': {', '.join(sorted(unknown))}.")
+    return fields
+
+
+@lru_cache(maxsize=None)
+def podcast_columns(fields=None):
+    """Columnas de Podcast que hay que leer para `fields` (None = todos los campos)."""
+    names = set(PODCAST_KEY_COLUMNS).union(*(PODCAST_FIELDS[field][0] for field in (fields or PODCAST_FIELDS)))
+    return tuple(getattr(Podcast, name) for name in sorted(names))
+
+
+def project_podcasts(query, fields=None, *extra_columns):
+    """Cambia las entidades de `query` por tuplas con solo las columnas de `fields` (y `extra_columns`)."""
+    return query.with_entities(*podcast_columns(fields), *extra_columns)
+
+
+@lru_cache(maxsize=None)
+def _compile(fields):
+    copied = tuple((name, spec) for name, (_, spec) in PODCAST_FIELDS.items()
+                   if isinstance(spec, str) and (fields is None or name in fields))
+    computed = tuple((name, spec) for name, (_, spec) in PODCAST_FIELDS.items()
+                     if not isinstance(spec, str) and (fields is None or name in fields))
+    return copied, computed
+
+
+def wants_artist(fields):
+    return fields is None or 'artist' in fields
+
+
+def podcast_to_dict(row, author=None, fields=None, urls=None):
+    copied, computed = _compile(fields)
+    urls = urls or media_urls()
+    note_catalog_podcasts((row.id,))
+    data = {name: getattr(row, attribute) for name, attribute in copied}
+    for name, build in computed:
+        data[name] = build(row, author, urls)
+    return data
+
+
+def podcasts_to_dicts(rows, fields=None, authors=None):
+    """
+    Serializa una lista de podcasts (Row o entidades). Los autores salen de `authors`
+    ({user_id: usuario}) o de la caché de usuarios; sin 'artist' en `fields` no se buscan.
+    """
+    copied, computed = _compile(fields)
+    urls = media_urls()
+    if authors is None and wants_artist(fields):
+        authors = get_users(row.user_id for row in rows)
+    # catalog_cached descarta la respuesta cuando cambia uno de estos podcasts
+    note_catalog_podcasts(row.id for row in rows)
+    serialized = []
+    for row in rows:
+        data = {name: getattr(row, attribute) for name, attribute in copied}
+        author = authors.get(row.user_id) if authors is not None else None
+        for name, build in computed:
+            data[name] = build(row, author, urls)
+        serialized.append(data)
+    return serialized
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider con orjson: las mismas claves ordenadas y los mismos valores
+    (fechas como HTTP date, Decimal/UUID como texto) que el de Flask. Los caracteres no
+    ASCII salen en UTF-8 en lugar de escapados como \\uXXXX.
+    """
+
+    def _options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop('indent', None)
+        kwargs.pop('separators', None)
+        if kwargs:
+            # Opciones que orjson no tiene (cls, ensure_ascii=False, ...): json de la stdlib
+            return super().dumps(obj, indent=indent, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options(indent)).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def configure_json(app):
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,260 @@
+# backend/services/storage.py
+"""
+Almacenamiento de subidas direccionado por contenido.
+
+El archivo se copia por trozos a un temporal dentro de UPLOAD_FOLDER calculando su
+SHA-256 al vuelo y después se renombra atómicamente a <sha256>.<ext>. Dos subidas
+con los mismos bytes comparten el mismo archivo; la tabla `blobs` lleva la cuenta
+de referencias para que solo se borren los archivos que ya nadie usa.
+"""
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from collections import Counter
+
+from flask import current_app
+from sqlalchemy import case, select, update, delete
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
+
+from extensions import db
+from models.blob import Blob
+from services.thumbnails import remove_variants, thumbnail_cache_dir
+from services.waveform import PEAKS_SUFFIX
+
+COPY_CHUNK_SIZE = 1024 * 1024
+BLOB_FILENAME_RE = re.compile(r'^[0-9a-f]{64}\.[a-z0-9]+$')
+TMP_DIRNAME = '.tmp'
+# Archivos derivados que viven junto al original y se borran con él (las miniaturas de
+# las portadas, en el caché de thumbnails, también)
+SIDECAR_SUFFIXES = (PEAKS_SUFFIX,)
+
+
+def is_blob_filename(filename):
+    return bool(BLOB_FILENAME_RE.match(filename or ''))
+
+
+def _extension(original_filename):
+    safe_name = secure_filename(original_filename or '')
+    if '.' not in safe_name:
+        return 'bin'
+    return safe_name.rsplit('.', 1)[1].lower()
+
+
+def store_stream(stream, original_filename, upload_folder=None):
+    """
+    Copia `stream` a disco calculando el hash y devuelve (ruta_final, sha256, tamaño).
+    No toca la BD: hay que llamar a acquire_blob() en la misma transacción que
+    guarda la ruta en el Podcast.
+    """
+    upload_folder = upload_folder or current_app.config['UPLOAD_FOLDER']
+    tmp_dir = os.path.join(upload_folder, TMP_DIRNAME)
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        sha256 = digest.hexdigest()
+        final_path = os.path.join(upload_folder, f"{sha256}.{_extension(original_filename)}")
+        if os.path.exists(final_path):
+            # Mismo contenido ya almacenado: no se gasta disco extra
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return final_path, sha256, size
+
+
+def store_file(source_path, original_filename, upload_folder=None, keep_source=False):
+    """
+    Mueve a su ruta direccionada por contenido un archivo que ya está en disco
+    (p. ej. el .part de una subida reanudable), calculando el hash sin copiarlo.
+    Con keep_source=True el origen no se toca (se enlaza con un hard link, o se copia
+    si el sistema de archivos no lo permite): así sigue ahí si la transacción falla.
+    Devuelve (ruta_final, sha256, tamaño).
+    """
+    upload_folder = upload_folder or current_app.config['UPLOAD_FOLDER']
+    digest = hashlib.sha256()
+    size = 0
+    with open(source_path, 'rb') as f:
+        while True:
+            chunk = f.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    sha256 = digest.hexdigest()
+    final_path = os.path.join(upload_folder, f"{sha256}.{_extension(original_filename)}")
+    if os.path.exists(final_path):
+        if not keep_source:
+            os.remove(source_path)
+    elif keep_source:
+        _link_or_copy(source_path, final_path, upload_folder)
+    else:
+        os.replace(source_path, final_path)
+    return final_path, sha256, size
+
+
+def _link_or_copy(source_path, final_path, upload_folder):
+    try:
+        os.link(source_path, final_path)
+        return
+    except FileExistsError:
+        # Otra subida con el mismo contenido llegó antes
+        return
+    except OSError:
+        pass
+    tmp_dir = os.path.join(upload_folder, TMP_DIRNAME)
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix='.part')
+    os.close(fd)
+    try:
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store_upload(file_storage, upload_folder=None):
+    """Guarda un FileStorage de Werkzeug (request.files[...]) y devuelve la ruta final."""
+    final_path, _, _ = store_stream(file_storage.stream, file_storage.filename, upload_folder)
+    return final_path
+
+
+def acquire_blob(path):
+    """
+    Suma una referencia al blob de `path` dentro de la transacción en curso.
+    Lanza FileNotFoundError si el archivo ya no está en disco (lo borró un
+    unlink_unreferenced concurrente entre el store_* y esta llamada).
+    """
+    filename = os.path.basename(path)
+    result = db.session.execute(
+        update(Blob).where(Blob.filename == filename).values(ref_count=Blob.ref_count + 1)
+    )
+    if not result.rowcount:
+        sha256 = filename.split('.', 1)[0]
+        try:
+            with db.session.begin_nested():
+                db.session.add(Blob(filename=filename, sha256=sha256, size=os.path.getsize(path), ref_count=1))
+        except IntegrityError:
+            # Otra petición creó la fila a la vez: basta con incrementar
+            db.session.execute(
+                update(Blob).where(Blob.filename == filename).values(ref_count=Blob.ref_count + 1)
+            )
+    # La fila queda bloqueada por esta transacción hasta el commit y unlink_unreferenced la reclama
+    # antes de borrar: si el archivo sigue aquí ahora, ya no se puede borrar por debajo.
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"El archivo {filename} se ha borrado mientras se guardaba; vuelve a subirlo.")
+
+
+def release_blob(path):
+    """
+    Resta una referencia al blob de `path` dentro de la transacción en curso.
+    Devuelve la ruta si el archivo ha quedado sin referencias (hay que borrarlo
+    después del commit con unlink_unreferenced) o None si sigue en uso.
+    Los archivos antiguos, guardados antes de existir `blobs`, no tienen fila y
+    se consideran sin referencias, como hasta ahora.
+    """
+    if not path:
+        return None
+    filename = os.path.basename(path)
+    if not is_blob_filename(filename):
+        return path
+    db.session.execute(
+        update(Blob).where(Blob.filename == filename).values(ref_count=Blob.ref_count - 1)
+    )
+    db.session.execute(delete(Blob).where(Blob.filename == filename, Blob.ref_count <= 0))
+    remaining = db.session.execute(select(Blob.ref_count).where(Blob.filename == filename)).scalar()
+    return None if remaining else path
+
+
+def release_blobs(paths):
+    """
+    Como release_blob() para muchos archivos a la vez (borrado masivo de podcasts):
+    un UPDATE, un DELETE y un SELECT en total, sea cual sea el número de rutas.
+    Devuelve la lista de rutas que han quedado sin referencias.
+    """
+    paths = [path for path in paths if path]
+    by_filename = {os.path.basename(path): path for path in paths}
+    unreferenced = {path for filename, path in by_filename.items() if not is_blob_filename(filename)}
+    released = Counter(os.path.basename(path) for path in paths if is_blob_filename(os.path.basename(path)))
+    if released:
+        db.session.execute(
+            update(Blob).where(Blob.filename.in_(released))
+            .values(ref_count=Blob.ref_count - case(released, value=Blob.filename, else_=0))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            delete(Blob).where(Blob.filename.in_(released), Blob.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+        remaining = set(db.session.scalars(select(Blob.filename).where(Blob.filename.in_(released))))
+        unreferenced.update(by_filename[filename] for filename in released if filename not in remaining)
+    return sorted(unreferenced)
+
+
+def _claim_unreferenced_blob(filename):
+    """
+    Reclama la fila de `filename` en la transacción en curso y devuelve True si ningún
+    podcast lo referencia. Hasta el commit, un acquire_blob concurrente del mismo archivo
+    espera a esta transacción (o esta a la suya): la comprobación y el borrado del disco
+    no pueden intercalarse con una subida que reutiliza el archivo.
+    """
+    # Fila que se ha quedado a 0 referencias: se borra, y así queda bloqueada hasta el commit
+    if db.session.execute(delete(Blob).where(Blob.filename == filename, Blob.ref_count <= 0)).rowcount:
+        return True
+    if db.session.execute(select(Blob.ref_count).where(Blob.filename == filename)).scalar():
+        return False
+    # Sin fila: se inserta una provisional para que el INSERT de un acquire_blob simultáneo choque con ella
+    try:
+        with db.session.begin_nested():
+            db.session.add(Blob(filename=filename, sha256=filename.split('.', 1)[0], size=0, ref_count=0))
+    except IntegrityError:
+        # Otra petición acaba de crear la fila: el archivo vuelve a estar en uso
+        return False
+    db.session.execute(delete(Blob).where(Blob.filename == filename))
+    return True
+
+
+def unlink_unreferenced(path):
+    """
+    Borra `path` del disco (con sus sidecars y miniaturas) si ya no hay ningún Podcast que
+    lo referencie. Llamar tras el commit/rollback: usa (y confirma) su propia transacción
+    en db.session.
+    """
+    if not path or not os.path.exists(path):
+        return False
+    filename = os.path.basename(path)
+    try:
+        if is_blob_filename(filename) and not _claim_unreferenced_blob(filename):
+            db.session.rollback()
+            return False
+        # Con la fila reclamada: el archivo se borra antes de soltarla en el commit
+        os.remove(path)
+        for suffix in SIDECAR_SUFFIXES:
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+        remove_variants(filename, thumbnail_cache_dir(current_app.config))
+        db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        raise
+    return True
@@ -0,0 +1,139 @@
+# backend/services/thumbnails.py
+"""
+Variantes reducidas de las portadas (50, 180 y 300 px, en WebP y JPEG).
+
+Cada variante se genera una sola vez con Pillow y se guarda en un directorio de
+caché cuyo tamaño total está acotado: la fecha de acceso (atime) de cada archivo
+se usa como "último uso" y, al superar el límite, se borran las menos usadas. La
+fecha de modificación no se toca, así que el ETag de la variante no cambia.
+Pillow solo se importa al generar, así que servir una variante ya cacheada no lo carga.
+"""
+import os
+import threading
+import time
+
+THUMBNAIL_SIZES = (50, 180, 300)
+THUMBNAIL_FORMATS = {
+    # formato en la URL -> (formato de Pillow, mimetype, opciones de guardado)
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+CACHE_DIRNAME = '.thumbs'
+# Tras podar, el caché queda en este porcentaje del máximo para no podar en cada generación
+CACHE_LOW_WATER = 0.9
+# No se reescribe la fecha de "último uso" más de una vez por este intervalo (segundos)
+TOUCH_INTERVAL = 60
+
+_prune_lock = threading.Lock()
+
+
+def thumbnail_cache_dir(config):
+    return config.get('THUMBNAIL_CACHE_DIR') or os.path.join(config['UPLOAD_FOLDER'], CACHE_DIRNAME)
+
+
+def variant_filename(source_filename, size, fmt):
+    return f"{source_filename}.{size}.{fmt}"
+
+
+def generate_variant(source_path, target_path, size, fmt):
+    """Escribe en target_path la portada reducida para caber en size x size (sin ampliar)."""
+    from PIL import Image, ImageOps
+
+    pil_format, _, save_options = THUMBNAIL_FORMATS[fmt]
+    with Image.open(source_path) as image:
+        # En JPEG, draft() decodifica directamente a una escala reducida: mucho más rápido
+        image.draft('RGB', (size * 2, size * 2))
+        image = ImageOps.exif_transpose(image)
+        if pil_format == 'WEBP' and image.has_transparency_data:
+            image = image.convert('RGBA')
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.thumbnail((size, size), Image.LANCZOS)
+        tmp_path = f"{target_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        image.save(tmp_path, pil_format, **save_options)
+    os.replace(tmp_path, target_path)
+    return target_path
+
+
+def generate_all_variants(source_path, cache_dir):
+    """Genera todas las variantes de una portada (se usa en segundo plano al subirla)."""
+    source_filename = os.path.basename(source_path)
+    generated = []
+    for size in THUMBNAIL_SIZES:
+        for fmt in THUMBNAIL_FORMATS:
+            target = os.path.join(cache_dir, variant_filename(source_filename, size, fmt))
+            if not os.path.exists(target):
+                generated.append(generate_variant(source_path, target, size, fmt))
+    return generated
+
+
+def remove_variants(source_filename, cache_dir):
+    """Borra las variantes de una portada (cuando se borra el original). Devuelve cuántas había."""
+    removed = 0
+    for size in THUMBNAIL_SIZES:
+        for fmt in THUMBNAIL_FORMATS:
+            try:
+                os.remove(os.path.join(cache_dir, variant_filename(source_filename, size, fmt)))
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def ensure_variant(source_path, cache_dir, size, fmt, max_bytes):
+    """
+    Devuelve la ruta de la variante, generándola si falta o si el original es más
+    reciente (archivos antiguos sin nombre por contenido). Marca el uso para el LRU.
+    """
+    target = os.path.join(cache_dir, variant_filename(os.path.basename(source_path), size, fmt))
+    try:
+        variant_stat = os.stat(target)
+    except FileNotFoundError:
+        variant_stat = None
+
+    if variant_stat is None or variant_stat.st_mtime < os.stat(source_path).st_mtime:
+        os.makedirs(cache_dir, exist_ok=True)
+        generate_variant(source_path, target, size, fmt)
+        prune_cache(cache_dir, max_bytes)
+    elif time.time() - variant_stat.st_atime > TOUCH_INTERVAL:
+        try:
+            os.utime(target, ns=(time.time_ns(), variant_stat.st_mtime_ns))
+        except FileNotFoundError:
+            # Podada por otro proceso entre el stat y el utime
+            generate_variant(source_path, target, size, fmt)
+    return target
+
+
+def prune_cache(cache_dir, max_bytes):
+    """Borra las variantes menos usadas hasta dejar el caché por debajo de max_bytes. Devuelve cuántas borró."""
+    if not _prune_lock.acquire(blocking=False):
+        return 0
+    try:
+        entries = []
+        total = 0
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith('.tmp') or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total += stat.st_size
+        if total <= max_bytes:
+            return 0
+
+        removed = 0
+        target = max_bytes * CACHE_LOW_WATER
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+    finally:
+        _prune_lock.release()
@@ -0,0 +1,143 @@
+# backend/services/trending.py
+"""
+Ranking de tendencias (GET /podcasts/trending), recalculado por lotes fuera de las peticiones.
+
+Cada señal de un podcast aporta peso * e^(-λ·edad), con λ = ln 2 / TRENDING_HALF_LIFE_HOURS:
+
+    publicación       Podcast.created_at                       TRENDING_WEIGHTS['published']
+    comentarios       Comment.created_at                       TRENDING_WEIGHTS['comment']
+    reproducciones    podcast_plays_hourly (a mitad de la hora) TRENDING_WEIGHTS['play'] por reproducción
+
+Como todas las puntuaciones decaen al mismo ritmo, el orden es el mismo si la edad se
+mide desde una fecha fija (SCORE_EPOCH) en lugar de desde "ahora". Se guarda
+log(Σ peso·e^(λ·(t - SCORE_EPOCH))), que no desborda y no hay que reescribir mientras
+el podcast no tenga actividad nueva. Por eso cada recálculo incremental solo toca los
+podcasts con publicaciones, comentarios o reproducciones posteriores a la marca de agua
+(por id, guardada en trending_state). `refresh_trending(full=True)` lo recalcula todo
+(conviene de vez en cuando para recoger comentarios borrados).
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, exists, func, insert, select, update
+
+from extensions import db
+from models.comment import Comment
+from models.play_stats import PlayEvent, PodcastPlaysHourly
+from models.podcast import Podcast
+from models.trending import PodcastTrending, TrendingState
+from services.catalog_cache import bump_catalog_version
+
+TRENDING_WEIGHTS = {
+    'published': 10.0,
+    'comment': 3.0,
+    'play': 1.0,
+}
+SCORE_EPOCH = datetime(2024, 1, 1)
+# Las señales más antiguas que este número de semividas aportan menos de un 0,1 %: no se leen
+WINDOW_HALF_LIVES = 10
+REFRESH_BATCH_SIZE = 500
+TRENDING_STATE_ROW_ID = 1
+
+
+def _decay_rate():
+    return math.log(2) / (current_app.config.get('TRENDING_HALF_LIFE_HOURS', 48) * 3600)
+
+
+def _log_term(weight, moment, decay):
+    return math.log(weight) + decay * (moment - SCORE_EPOCH).total_seconds()
+
+
+def _log_sum(terms):
+    peak = max(terms)
+    return peak + math.log(sum(math.exp(term - peak) for term in terms))
+
+
+def _compute_rows(podcast_ids, now, decay):
+    window_start = now - timedelta(seconds=WINDOW_HALF_LIVES * math.log(2) / decay)
+    terms = defaultdict(list)
+    categories = {}
+    for podcast_id, category, created_at in db.session.execute(
+        select(Podcast.id, Podcast.category, Podcast.created_at).where(Podcast.id.in_(podcast_ids))
+    ):
+        categories[podcast_id] = category
+        terms[podcast_id].append(_log_term(TRENDING_WEIGHTS['published'], created_at or now, decay))
+    for podcast_id, created_at in db.session.execute(
+        select(Comment.podcast_id, Comment.created_at)
+        .where(Comment.podcast_id.in_(podcast_ids), Comment.created_at >= window_start)
+    ):
+        terms[podcast_id].append(_log_term(TRENDING_WEIGHTS['comment'], created_at, decay))
+    for podcast_id, period_start, plays in db.session.execute(
+        select(PodcastPlaysHourly.podcast_id, PodcastPlaysHourly.period_start, PodcastPlaysHourly.plays)
+        .where(PodcastPlaysHourly.podcast_id.in_(podcast_ids), PodcastPlaysHourly.period_start >= window_start)
+    ):
+        if plays > 0:
+            terms[podcast_id].append(_log_term(TRENDING_WEIGHTS['play'] * plays, period_start + timedelta(minutes=30), decay))
+
+    # Solo los que siguen existiendo (los demás se borran al final del recálculo)
+    return [{'podcast_id': podcast_id, 'category': category, 'score': _log_sum(terms[podcast_id]), 'refreshed_at': now}
+            for podcast_id, category in categories.items()]
+
+
+def _changed_podcast_ids(state):
+    """Podcasts con actividad posterior a la marca de agua."""
+    changed = set(db.session.scalars(select(Podcast.id).where(Podcast.id > state.last_podcast_id)))
+    changed.update(db.session.scalars(select(Comment.podcast_id).where(Comment.id > state.last_comment_id).distinct()))
+    changed.update(db.session.scalars(select(PlayEvent.podcast_id).where(PlayEvent.id > state.last_play_event_id).distinct()))
+    return changed
+
+
+def refresh_trending(full=False):
+    """
+    Recalcula el ranking (todo, o solo lo que ha cambiado desde la última vez) y hace
+    commit por lotes. Devuelve {'full', 'recomputed', 'removed'}.
+    """
+    now = datetime.utcnow()
+    decay = _decay_rate()
+    state = db.session.get(TrendingState, TRENDING_STATE_ROW_ID)
+    # Las marcas de agua se leen antes que los datos: lo que llegue durante el recálculo entra en el siguiente
+    watermarks = {
+        'last_podcast_id': db.session.scalar(select(func.max(Podcast.id))) or 0,
+        'last_comment_id': db.session.scalar(select(func.max(Comment.id))) or 0,
+        'last_play_event_id': db.session.scalar(select(func.max(PlayEvent.id))) or 0,
+    }
+    full = full or state is None
+    if full:
+        podcast_ids = list(db.session.scalars(select(Podcast.id).where(Podcast.id <= watermarks['last_podcast_id'])))
+    else:
+        podcast_ids = sorted(_changed_podcast_ids(state))
+
+    for start in range(0, len(podcast_ids), REFRESH_BATCH_SIZE):
+        batch = podcast_ids[start:start + REFRESH_BATCH_SIZE]
+        rows = _compute_rows(batch, now, decay)
+        db.session.execute(delete(PodcastTrending).where(PodcastTrending.podcast_id.in_(batch))
+                           .execution_options(synchronize_session=False))
+        if rows:
+            db.session.execute(insert(PodcastTrending), rows)
+        db.session.commit()
+
+    # Podcasts borrados y cambios de categoría de los que no han tenido actividad
+    removed = db.session.execute(
+        delete(PodcastTrending)
+        .where(~exists().where(Podcast.id == PodcastTrending.podcast_id))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.execute(
+        update(PodcastTrending)
+        .where(exists().where(Podcast.id == PodcastTrending.podcast_id,
+                              Podcast.category.is_distinct_from(PodcastTrending.category)))
+        .values(category=select(Podcast.category).where(Podcast.id == PodcastTrending.podcast_id).scalar_subquery())
+        .execution_options(synchronize_session=False)
+    )
+
+    if state is None:
+        state = TrendingState(id=TRENDING_STATE_ROW_ID)
+        db.session.add(state)
+    state.refreshed_at = now
+    for name, value in watermarks.items():
+        setattr(state, name, value)
+    bump_catalog_version()
+    db.session.commit()
+    return {'full': full, 'recomputed': len(podcast_ids), 'removed': removed}
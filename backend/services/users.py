@@ -0,0 +1,148 @@
+# backend/services/users.py
+"""
+Usuarios: alta/actualización desde Google y caché de identidad por worker.
+
+`upsert_google_user` lee el usuario y, si el nombre y la foto de Google son los
+guardados (lo normal), no escribe nada. Si no, lo crea o actualiza en una sola
+sentencia (INSERT ... ON CONFLICT (google_id) DO UPDATE ... RETURNING) en lugar de
+insertar o actualizar según lo leído: sin carreras entre dos logins simultáneos del
+mismo usuario.
+
+`get_user` / `get_users` devuelven (id, name, email, profile_picture) desde una
+TTLCache del proceso (USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL); los que faltan se leen
+en una sola consulta. Si un login cambia el nombre o la foto se incrementa la versión
+del catálogo (los listados cacheados muestran al autor); cada worker vacía su caché de
+usuarios al ver una versión nueva en las vistas del catálogo, para no reconstruir los
+listados con el nombre viejo. GET /profile, que no es una vista del catálogo, lee la
+versión con sync_user_cache_with_catalog() para no mostrar un nombre o una foto cambiados
+en otro worker.
+"""
+from collections import namedtuple
+from datetime import datetime
+
+from flask import current_app, g
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from extensions import db
+from models.user import User
+from services.cache import TTLCache
+from services.catalog_cache import bump_catalog_version, current_catalog_state
+
+CachedUser = namedtuple('CachedUser', 'id name email profile_picture')
+
+_user_cache = None
+_user_cache_version = None
+
+
+def _get_user_cache():
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = TTLCache(
+            max_entries=current_app.config.get('USER_CACHE_MAX_ENTRIES', 10000),
+            ttl_seconds=current_app.config.get('USER_CACHE_TTL', 300)
+        )
+    return _user_cache
+
+
+def _sync_user_cache(cache, version):
+    global _user_cache_version
+    if version is not None and version != _user_cache_version:
+        cache.clear()
+        _user_cache_version = version
+
+
+def sync_user_cache_with_catalog():
+    """
+    Vacía la caché de usuarios de este worker si la versión del catálogo ha cambiado
+    (p. ej. un login en otro worker con nombre o foto nuevos). Para vistas fuera de
+    catalog_cached; cuesta una consulta de una fila.
+    """
+    state = g.get('catalog_state')
+    _sync_user_cache(_get_user_cache(), state[0] if state is not None else current_catalog_state()[0])
+
+
+def get_users(user_ids):
+    """{id: CachedUser} de los ids indicados que existen; los que no están en caché, en una consulta."""
+    cache = _get_user_cache()
+    # catalog_cached deja en g los contadores de la principal
+    _sync_user_cache(cache, g.get('catalog_state', (None,))[0])
+    users, missing = {}, []
+    for user_id in set(user_ids):
+        if user_id is None:
+            continue
+        user = cache.get(user_id)
+        if user is None:
+            missing.append(user_id)
+        else:
+            users[user_id] = user
+    if missing:
+        # Siempre de la principal: una réplica que va por detrás dejaría en la caché un nombre viejo
+        for row in db.session.execute(
+            select(User.id, User.name, User.email, User.profile_picture).where(User.id.in_(missing)),
+            bind_arguments={'bind': db.engine}
+        ):
+            user = CachedUser(*row)
+            cache.set(user.id, user)
+            users[user.id] = user
+    return users
+
+
+def get_user(user_id):
+    """CachedUser o None si no existe."""
+    return get_users([user_id]).get(user_id)
+
+
+def invalidate_user(user_id):
+    _get_user_cache().delete(user_id)
+
+
+def user_cache_stats():
+    return _get_user_cache().stats()
+
+
+def upsert_google_user(profile):
+    """
+    Crea el usuario o actualiza su nombre y foto a partir del perfil de Google
+    ({'google_id', 'email', 'name', 'picture'}). Si no han cambiado no escribe nada.
+    Hace commit; devuelve (id, email, profile_picture).
+    """
+    table = User.__table__
+    values = {
+        'google_id': profile['google_id'],
+        'email': profile['email'],
+        'name': profile.get('name'),
+        'profile_picture': profile.get('picture'),
+    }
+    returning = (table.c.id, table.c.email, table.c.profile_picture)
+    stored = db.session.execute(
+        select(*returning, table.c.name).where(table.c.google_id == values['google_id'])
+    ).first()
+    if stored is not None and (stored.name, stored.profile_picture) == (values['name'], values['profile_picture']):
+        db.session.commit()
+        return stored[:3]
+
+    dialect = db.session.get_bind(mapper=User.__mapper__).dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        statement = (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(table)
+        statement = statement.values(created_at=datetime.utcnow(), **values).on_conflict_do_update(
+            index_elements=[table.c.google_id],
+            set_={'name': statement.excluded.name, 'profile_picture': statement.excluded.profile_picture}
+        ).returning(*returning)
+        row = db.session.execute(statement).one()
+    else:
+        # Otros motores: UPDATE y, si no había fila, INSERT
+        result = db.session.execute(
+            update(table).where(table.c.google_id == values['google_id'])
+            .values(name=values['name'], profile_picture=values['profile_picture'])
+        )
+        if result.rowcount == 0:
+            db.session.execute(insert(table).values(created_at=datetime.utcnow(), **values))
+        row = db.session.execute(select(*returning).where(table.c.google_id == values['google_id'])).one()
+    if stored is not None:
+        # Nombre o foto nuevos: los listados cacheados (artista) y la réplica deben verlos
+        bump_catalog_version()
+    db.session.commit()
+    # El nombre o la foto pueden haber cambiado
+    invalidate_user(row.id)
+    return row
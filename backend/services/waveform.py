@@ -0,0 +1,208 @@
+# backend/services/waveform.py
+"""
+Picos de forma de onda precalculados, guardados como sidecar binario junto al audio.
+
+Para cada bloque de `samples_per_peak` muestras se guarda el mínimo y el máximo
+(todas las pistas mezcladas) cuantizados a int8. El nivel 0 usa BASE_SAMPLES_PER_PEAK
+y cada nivel siguiente agrupa de dos en dos el anterior, de modo que el cliente puede
+pedir el zoom que necesite sin descargar ni decodificar el audio. Si el audio no se
+puede decodificar se guarda igualmente un sidecar, sin niveles (formato 0), para no
+volver a intentarlo en cada petición.
+
+Formato del archivo <audio>.peaks (little endian):
+    cabecera:  magic "AMBP", versión u8, formato u8 (1 = int8, 0 = sin picos), niveles u16,
+               sample_rate u32, frames totales u64
+    por nivel: samples_per_peak u32, número de picos u32, offset de los datos u64
+    datos:     pares (min, max) int8 intercalados
+
+NumPy solo se importa al calcular (en el pool de procesos); leer el sidecar no lo necesita.
+"""
+import os
+import struct
+
+PEAKS_SUFFIX = '.peaks'
+MAGIC = b'AMBP'
+VERSION = 1
+FORMAT_NONE = 0
+FORMAT_INT8 = 1
+HEADER = struct.Struct('<4sBBHIQ')
+LEVEL = struct.Struct('<IIQ')
+
+BASE_SAMPLES_PER_PEAK = 256
+MAX_LEVELS = 8
+BLOCKS_PER_SLAB = 4096
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class CorruptPeaksError(Exception):
+    """El sidecar está truncado o no tiene el formato esperado."""
+
+
+def sidecar_path(audio_path):
+    return audio_path + PEAKS_SUFFIX
+
+
+def _wav_layout(path):
+    """Devuelve (offset_datos, bytes_datos, formato, canales, bits, sample_rate) o None si no es WAV PCM/float."""
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return None
+        fmt = None
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+            if chunk_id == b'fmt ':
+                body = f.read(chunk_size)
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', body[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (format_tag, channels, bits, sample_rate)
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    return None
+                offset = f.tell()
+                data_size = chunk_size
+                if data_size in (0, 0xFFFFFFFF) or offset + data_size > file_size:
+                    data_size = file_size - offset
+                format_tag, channels, bits, sample_rate = fmt
+                if (format_tag, bits) not in ((WAVE_FORMAT_PCM, 8), (WAVE_FORMAT_PCM, 16), (WAVE_FORMAT_PCM, 24),
+                                              (WAVE_FORMAT_PCM, 32), (WAVE_FORMAT_IEEE_FLOAT, 32)):
+                    return None
+                return offset, data_size, format_tag, channels, bits, sample_rate
+            else:
+                f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+
+def _to_float(np, raw, format_tag, bits):
+    """Convierte bytes PCM intercalados a float32 en [-1, 1]."""
+    if bits == 8:
+        return (raw.astype(np.float32) - 128.0) / 128.0
+    if bits == 16:
+        return raw.view('<i2').astype(np.float32) / 32768.0
+    if bits == 24:
+        triplets = raw.reshape(-1, 3).astype(np.int32)
+        values = triplets[:, 0] | (triplets[:, 1] << 8) | (triplets[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        return values.astype(np.float32) / 8388608.0
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        return raw.view('<f4').astype(np.float32)
+    return raw.view('<i4').astype(np.float32) / 2147483648.0
+
+
+def _merge_level(np, mins, maxs):
+    if len(mins) % 2:
+        mins = np.append(mins, mins[-1])
+        maxs = np.append(maxs, maxs[-1])
+    return mins.reshape(-1, 2).min(axis=1), maxs.reshape(-1, 2).max(axis=1)
+
+
+def _write_sidecar(audio_path, sample_format, sample_rate, total_frames, levels):
+    target = sidecar_path(audio_path)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    data_offset = HEADER.size + LEVEL.size * len(levels)
+    with open(tmp_path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, VERSION, sample_format, len(levels), sample_rate, total_frames))
+        for spp, level_mins, _ in levels:
+            out.write(LEVEL.pack(spp, len(level_mins), data_offset))
+            data_offset += 2 * len(level_mins)
+        for _, level_mins, level_maxs in levels:
+            interleaved = bytearray(2 * len(level_mins))
+            interleaved[0::2] = level_mins.tobytes()
+            interleaved[1::2] = level_maxs.tobytes()
+            out.write(interleaved)
+    os.replace(tmp_path, target)
+    return target
+
+
+def compute_peaks(audio_path, base_samples_per_peak=BASE_SAMPLES_PER_PEAK, max_levels=MAX_LEVELS):
+    """
+    Calcula los picos del audio y escribe el sidecar; devuelve su ruta. Si el formato
+    no se puede decodificar (por ahora solo WAV PCM/float) el sidecar queda sin niveles.
+    """
+    layout = _wav_layout(audio_path)
+    if layout is None:
+        return _write_sidecar(audio_path, FORMAT_NONE, 0, 0, [])
+    data_offset, data_size, format_tag, channels, bits, sample_rate = layout
+    frame_bytes = channels * bits // 8
+    total_frames = data_size // frame_bytes
+    if not total_frames:
+        return _write_sidecar(audio_path, FORMAT_NONE, sample_rate, 0, [])
+
+    import numpy as np
+
+    raw = np.memmap(audio_path, dtype=np.uint8, mode='r', offset=data_offset, shape=(total_frames * frame_bytes,))
+    slab_frames = base_samples_per_peak * BLOCKS_PER_SLAB
+    mins_parts, maxs_parts = [], []
+    # Se recorre por bloques de tamaño fijo para que la memoria no dependa de la duración
+    for start in range(0, total_frames, slab_frames):
+        stop = min(start + slab_frames, total_frames)
+        samples = _to_float(np, np.asarray(raw[start * frame_bytes:stop * frame_bytes]), format_tag, bits)
+        frames = samples.reshape(-1, channels)
+        remainder = len(frames) % base_samples_per_peak
+        if remainder:
+            frames = np.concatenate([frames, np.repeat(frames[-1:], base_samples_per_peak - remainder, axis=0)])
+        blocks = frames.reshape(-1, base_samples_per_peak * channels)
+        mins_parts.append(blocks.min(axis=1))
+        maxs_parts.append(blocks.max(axis=1))
+    del raw
+
+    def quantize(values):
+        return np.clip(np.round(values * 127.0), -128, 127).astype(np.int8)
+
+    mins = quantize(np.concatenate(mins_parts))
+    maxs = quantize(np.concatenate(maxs_parts))
+
+    levels = [(base_samples_per_peak, mins, maxs)]
+    while len(levels) < max_levels and len(levels[-1][1]) > 1:
+        spp, level_mins, level_maxs = levels[-1]
+        merged_mins, merged_maxs = _merge_level(np, level_mins, level_maxs)
+        levels.append((spp * 2, merged_mins, merged_maxs))
+
+    return _write_sidecar(audio_path, FORMAT_INT8, sample_rate, total_frames, levels)
+
+
+def read_peaks_index(path):
+    """
+    Devuelve (sample_rate, frames_totales, [(samples_per_peak, picos, offset), ...]); sin
+    niveles si el audio no se pudo decodificar. Lanza CorruptPeaksError si el sidecar está
+    truncado o no es de este formato.
+    """
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise CorruptPeaksError("Sidecar de picos truncado.")
+        magic, version, sample_format, level_count, sample_rate, total_frames = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or sample_format not in (FORMAT_NONE, FORMAT_INT8):
+            raise CorruptPeaksError("Sidecar de picos con formato desconocido.")
+        table = f.read(LEVEL.size * level_count)
+    if len(table) < LEVEL.size * level_count:
+        raise CorruptPeaksError("Sidecar de picos truncado.")
+    levels = list(LEVEL.iter_unpack(table))
+    if any(offset + 2 * peak_count > file_size for _, peak_count, offset in levels):
+        raise CorruptPeaksError("Sidecar de picos truncado.")
+    return sample_rate, total_frames, levels
+
+
+def read_peaks_level(path, offset, peak_count):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return f.read(2 * peak_count)
+
+
+def choose_level(levels, width):
+    """El nivel más grueso que todavía tiene al menos `width` picos (o el más fino si ninguno llega)."""
+    chosen = 0
+    for index, (_, peak_count, _) in enumerate(levels):
+        if peak_count >= width:
+            chosen = index
+    return chosen
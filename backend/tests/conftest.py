@@ -0,0 +1,158 @@
+# backend/tests/conftest.py
+"""
+Fixtures comunes: una app por prueba con su propio SQLite y su carpeta de subidas en
+tmp_path, trabajos de medios en línea (MEDIA_JOBS_ASYNC=False) y las cachés por
+proceso vacías. Se ejecutan desde backend/ con "python -m pytest".
+"""
+import io
+import math
+import os
+import struct
+import sys
+import wave
+from datetime import datetime, timedelta
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from config import Config, engine_options
+from extensions import db
+from models.podcast import Podcast
+from models.user import User
+import services.catalog_cache as catalog_cache
+import services.db_routing as db_routing
+import services.play_events as play_events
+import services.users as users
+
+
+def _reset_process_caches():
+    # Cachés de módulo (una por worker en producción): cada prueba empieza sin nada
+    catalog_cache._cache = None
+    catalog_cache._last_seen_version = None
+    catalog_cache._last_seen_change = 0
+    catalog_cache._applied_changes = set()
+    catalog_cache._gap_since = None
+    db_routing._replica_down_until = 0.0
+    play_events._buffer = None
+    users._user_cache = None
+    users._user_cache_version = None
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """
+    Crea apps con la configuración de pruebas más `overrides` (p. ej. SQLALCHEMY_BINDS).
+    Los módulos que necesitan otra configuración redefinen `app` con esta fábrica; al
+    terminar la prueba se cierran las conexiones de todas las apps creadas.
+    """
+    created = []
+
+    def factory(**overrides):
+        database_url = f"sqlite:///{tmp_path / 'ambaria.db'}"
+        settings = {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_url,
+            'SQLALCHEMY_ENGINE_OPTIONS': engine_options(database_url),
+            'SQLALCHEMY_BINDS': {},
+            'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+            'MEDIA_JOBS_ASYNC': False,
+            'METRICS_ENABLED': False,
+            'LOG_LEVEL': 'WARNING',
+        }
+        settings.update(overrides)
+        _reset_process_caches()
+        app = create_app(type('TestConfig', (Config,), settings))
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        with app.app_context():
+            db.create_all(bind_key=None)
+        created.append(app)
+        return app
+
+    yield factory
+    for app in created:
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+    _reset_process_caches()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    """auth_headers(user_id) -> cabecera Authorization con un JWT de ese usuario."""
+    def headers(user_id):
+        with app.app_context():
+            return {'Authorization': f"Bearer {create_access_token(identity=str(user_id))}"}
+    return headers
+
+
+@pytest.fixture
+def seed(app):
+    """
+    seed(podcasts, users) crea usuarios y podcasts (con un audio en disco cada uno) y
+    devuelve (ids de usuarios, ids de podcasts). Los podcasts van de dos en dos con el
+    mismo created_at, para que los cursores tengan que desempatar por id.
+    """
+    def create(podcasts=5, user_count=1):
+        with app.app_context():
+            created_users = [User(google_id=f"g{i}", email=f"usuario{i}@ambaria.test", name=f"Usuario {i}")
+                             for i in range(user_count)]
+            db.session.add_all(created_users)
+            db.session.flush()
+            base = datetime(2025, 1, 1)
+            created_podcasts = []
+            for i in range(podcasts):
+                audio_path = os.path.join(app.config['UPLOAD_FOLDER'], f"episodio{i}.mp3")
+                with open(audio_path, 'wb') as f:
+                    f.write(b'ID3' + bytes(1000))
+                created_podcasts.append(Podcast(
+                    title=f"Episodio {i}",
+                    description=f"Descripción del episodio {i}",
+                    audio_path=audio_path,
+                    user_id=created_users[i % user_count].id,
+                    category='Música' if i % 2 else 'Ciencia',
+                    created_at=base + timedelta(hours=i // 2)
+                ))
+            db.session.add_all(created_podcasts)
+            db.session.commit()
+            return [user.id for user in created_users], [podcast.id for podcast in created_podcasts]
+    return create
+
+
+@pytest.fixture
+def user(seed, auth_headers):
+    """Cabeceras de un usuario sin podcasts."""
+    (user_id,), _ = seed(podcasts=0)
+    return auth_headers(user_id)
+
+
+@pytest.fixture
+def make_wav():
+    """make_wav(seconds, sample_rate, channels) -> bytes de un WAV PCM de 16 bits con un tono de 440 Hz."""
+    def build(seconds=1.0, sample_rate=8000, channels=1):
+        frames = int(seconds * sample_rate)
+        samples = (int(12000 * math.sin(2 * math.pi * 440 * n / sample_rate)) for n in range(frames))
+        pcm = b''.join(struct.pack('<h', sample) * channels for sample in samples)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        return buffer.getvalue()
+    return build
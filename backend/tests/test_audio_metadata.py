@@ -0,0 +1,115 @@
+# backend/tests/test_audio_metadata.py
+"""Metadatos leídos de las cabeceras del audio (services/audio_metadata.py) y sus columnas en Podcast."""
+import io
+import struct
+
+import pytest
+from sqlalchemy import inspect
+
+from extensions import db
+from models.podcast import Podcast
+from services.audio_metadata import extract_audio_metadata
+
+# MPEG-1 capa III, 128 kbps, 44,1 kHz, estéreo: frames de 144 * 128000 // 44100 = 417 bytes
+MP3_HEADER = b'\xff\xfb\x90\x00'
+MP3_FRAME_LENGTH = 417
+
+
+def _mp3_frame(payload=b''):
+    return (MP3_HEADER + payload).ljust(MP3_FRAME_LENGTH, b'\x00')
+
+
+def _id3_tag(size=20):
+    # Tamaño "syncsafe": 7 bits por byte
+    return b'ID3\x04\x00\x00' + bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F]) \
+        + bytes(size)
+
+
+def _flac(sample_rate, channels, total_samples):
+    packed = (sample_rate << 44) | ((channels - 1) << 41) | (15 << 36) | total_samples
+    streaminfo = bytes(10) + packed.to_bytes(8, 'big') + bytes(16)
+    return b'fLaC' + bytes([0x80]) + len(streaminfo).to_bytes(3, 'big') + streaminfo + bytes(1000)
+
+
+def _ogg_page(granule, packet):
+    return b'OggS' + bytes(2) + struct.pack('<q', granule) + bytes(12) + bytes([1, len(packet)]) + packet
+
+
+def _write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_wav(tmp_path, make_wav):
+    meta = extract_audio_metadata(_write(tmp_path, 'tono.wav', make_wav(seconds=2, sample_rate=8000, channels=2)))
+
+    assert meta['duration_seconds'] == 2.0
+    assert (meta['sample_rate'], meta['channels'], meta['bitrate']) == (8000, 2, 8000 * 2 * 16)
+
+
+def test_cbr_mp3_duration_comes_from_size(tmp_path):
+    data = _id3_tag() + _mp3_frame() * 50
+
+    meta = extract_audio_metadata(_write(tmp_path, 'cbr.mp3', data))
+
+    assert (meta['sample_rate'], meta['channels'], meta['bitrate']) == (44100, 2, 128000)
+    assert meta['duration_seconds'] == round(50 * MP3_FRAME_LENGTH * 8 / 128000, 3)
+    assert meta['file_size'] == len(data)
+
+
+def test_vbr_mp3_uses_xing_frame_count(tmp_path):
+    # Estéreo MPEG-1: la cabecera Xing va tras 32 bytes de "side information"
+    xing = bytes(32) + b'Xing' + struct.pack('>II', 0x1, 1000)
+    data = _mp3_frame(xing) + _mp3_frame() * 20
+
+    meta = extract_audio_metadata(_write(tmp_path, 'vbr.mp3', data))
+
+    assert meta['duration_seconds'] == round(1000 * 1152 / 44100, 3)
+    assert meta['bitrate'] == int(len(data) * 8 / (1000 * 1152 / 44100))
+
+
+def test_flac_streaminfo(tmp_path):
+    data = _flac(44100, 2, 441000)
+
+    meta = extract_audio_metadata(_write(tmp_path, 'pista.flac', data))
+
+    assert (meta['duration_seconds'], meta['sample_rate'], meta['channels']) == (10.0, 44100, 2)
+    assert meta['bitrate'] == int(len(data) * 8 / 10)
+
+
+def test_opus_duration_from_last_granule(tmp_path):
+    head = b'OpusHead' + bytes([1, 2]) + struct.pack('<HIhB', 312, 44100, 0, 0)
+    data = _ogg_page(0, head) + bytes(2000) + _ogg_page(5 * 48000 + 312, b'\x00')
+
+    meta = extract_audio_metadata(_write(tmp_path, 'voz.opus', data))
+
+    assert (meta['duration_seconds'], meta['sample_rate'], meta['channels']) == (5.0, 44100, 2)
+
+
+@pytest.mark.parametrize('data', [b'', b'no es audio' * 100, b'RIFF\x00\x00', b'fLaC'])
+def test_unknown_or_truncated_files_give_empty_metadata(tmp_path, data):
+    meta = extract_audio_metadata(_write(tmp_path, 'raro.mp3', data))
+
+    assert meta == {'duration_seconds': None, 'bitrate': None, 'sample_rate': None,
+                    'channels': None, 'file_size': len(data)}
+
+
+def test_upload_fills_metadata_columns(app, client, user, make_wav):
+    response = client.post('/podcasts', headers=user, content_type='multipart/form-data', data={
+        'title': 'Tono', 'description': 'Un segundo', 'category': 'Ciencia',
+        'audio_file': (io.BytesIO(make_wav(seconds=1.5)), 'tono.wav'),
+    })
+    assert response.status_code == 201
+    podcast_id = response.get_json()['podcast_id']
+
+    with app.app_context():
+        podcast = db.session.get(Podcast, podcast_id)
+        assert podcast.duration_seconds == 1.5
+        assert (podcast.audio_sample_rate, podcast.audio_channels, podcast.audio_bitrate) == (8000, 1, 128000)
+        assert podcast.audio_size > 0
+        indexes = {index['name']: index['column_names'] for index in inspect(db.engine).get_indexes('podcasts')}
+    assert indexes['ix_podcasts_duration_seconds'] == ['duration_seconds']
+
+    body = client.get(f"/podcasts/{podcast_id}", headers=user).get_json()
+    assert body['duration_seconds'] == 1.5
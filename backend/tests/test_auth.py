@@ -0,0 +1,90 @@
+# backend/tests/test_auth.py
+"""Callback de Google OAuth contra el servidor OAuth local de benchmarks/bench_oauth_login.py."""
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from benchmarks.bench_oauth_login import CLIENT_ID, StandInOAuthServer
+from models.user import User
+from services.google_oauth import signing_keys
+
+
+@pytest.fixture(scope='module')
+def oauth_server():
+    # Generar la clave RSA cuesta: un servidor para todo el módulo
+    server = StandInOAuthServer(0)
+    yield server
+    server.shutdown()
+
+
+def _oauth_config(base_url, **overrides):
+    return dict({
+        'GOOGLE_CLIENT_ID': CLIENT_ID,
+        'GOOGLE_CLIENT_SECRET': 'secreto-de-pruebas',
+        'GOOGLE_TOKEN_URL': f"{base_url}/token",
+        'GOOGLE_JWKS_URL': f"{base_url}/certs",
+        'GOOGLE_USERINFO_URL': f"{base_url}/userinfo",
+    }, **overrides)
+
+
+@pytest.fixture
+def app(make_app, oauth_server):
+    signing_keys.clear()
+    yield make_app(**_oauth_config(oauth_server.base_url))
+    signing_keys.clear()
+
+
+def _login(client, code):
+    response = client.get(f"/auth/google/callback?code={code}")
+    assert response.status_code == 302, response.get_json()
+    location = urlparse(response.headers['Location'])
+    assert location.path.endswith('/auth-callback')
+    return parse_qs(location.query)['token'][0]
+
+
+def test_callback_creates_user_and_issues_token(app, client, oauth_server):
+    oauth_server.reset_stats()
+
+    token = _login(client, 'code-1-a')
+
+    with app.app_context():
+        user = User.query.filter_by(google_id='100001').one()
+        assert (user.email, user.name) == ('bench1@example.com', 'Usuario 1')
+    profile = client.get('/profile', headers={'Authorization': f"Bearer {token}"}).get_json()
+    assert profile['user_id'] == user.id
+    assert profile['email'] == 'bench1@example.com'
+    # Perfil sacado del id_token verificado: sin llamada a /userinfo
+    assert oauth_server.stats['userinfo'] == 0
+
+
+def test_signing_keys_are_fetched_once(client, oauth_server):
+    oauth_server.reset_stats()
+
+    _login(client, 'code-1-a')
+    _login(client, 'code-2-a')
+
+    assert oauth_server.stats['certs'] == 1
+    assert oauth_server.stats['token'] == 2
+
+
+def test_callback_without_code_is_bad_request(client):
+    assert client.get('/auth/google/callback').status_code == 400
+
+
+def test_id_token_for_another_client_is_rejected(make_app, oauth_server):
+    app = make_app(**_oauth_config(oauth_server.base_url, GOOGLE_CLIENT_ID='otra-app.apps.googleusercontent.com'))
+
+    response = app.test_client().get('/auth/google/callback?code=code-1-a')
+
+    assert response.status_code == 400
+    with app.app_context():
+        assert User.query.count() == 0
+
+
+def test_unreachable_google_is_bad_gateway(make_app):
+    # Puerto 9 (discard): nadie escucha y la conexión se rechaza al momento
+    app = make_app(**_oauth_config('http://127.0.0.1:9'))
+
+    response = app.test_client().get('/auth/google/callback?code=code-1-a')
+
+    assert response.status_code == 502
@@ -0,0 +1,105 @@
+# backend/tests/test_byte_serving.py
+import os
+
+import pytest
+
+CONTENT = bytes(range(256)) * 4  # 1024 bytes distinguibles por posición
+
+
+@pytest.fixture
+def media(app):
+    """Nombre de un archivo de CONTENT en la carpeta de subidas."""
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], 'muestra.mp3'), 'wb') as f:
+        f.write(CONTENT)
+    return 'muestra.mp3'
+
+
+def _get(client, filename, **headers):
+    response = client.get(f"/uploads/{filename}", headers=headers)
+    body = response.get_data()
+    response.close()
+    return response, body
+
+
+def test_full_response_has_validators(client, media):
+    response, body = _get(client, media)
+    assert response.status_code == 200
+    assert body == CONTENT
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['Content-Length'] == str(len(CONTENT))
+    assert response.headers['ETag']
+    assert response.headers['Last-Modified']
+
+
+@pytest.mark.parametrize('range_header, start, stop', [
+    ('bytes=10-19', 10, 20),
+    ('bytes=1000-', 1000, 1024),
+    ('bytes=-5', 1019, 1024),
+    ('bytes=1000-5000', 1000, 1024),
+])
+def test_single_range(client, media, range_header, start, stop):
+    response, body = _get(client, media, Range=range_header)
+    assert response.status_code == 206
+    assert body == CONTENT[start:stop]
+    assert response.headers['Content-Range'] == f"bytes {start}-{stop - 1}/{len(CONTENT)}"
+    assert response.headers['Content-Length'] == str(stop - start)
+
+
+def test_adjacent_ranges_are_coalesced(client, media):
+    response, body = _get(client, media, Range='bytes=0-9,10-19')
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == f"bytes 0-19/{len(CONTENT)}"
+    assert body == CONTENT[0:20]
+
+
+def test_multiple_ranges_are_multipart(client, media):
+    response, body = _get(client, media, Range='bytes=0-3,100-103')
+    assert response.status_code == 206
+    assert response.mimetype == 'multipart/byteranges'
+    assert int(response.headers['Content-Length']) == len(body)
+    assert b'Content-Range: bytes 0-3/1024\r\n\r\n' + CONTENT[0:4] in body
+    assert b'Content-Range: bytes 100-103/1024\r\n\r\n' + CONTENT[100:104] in body
+
+
+def test_unsatisfiable_range(client, media):
+    response, _ = _get(client, media, Range='bytes=5000-6000')
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == f"bytes */{len(CONTENT)}"
+
+
+def test_if_none_match_returns_not_modified(client, media):
+    etag = _get(client, media)[0].headers['ETag']
+    response, body = _get(client, media, **{'If-None-Match': etag})
+    assert response.status_code == 304
+    assert body == b''
+
+
+def test_if_range_with_stale_etag_sends_whole_file(client, media):
+    etag = _get(client, media)[0].headers['ETag']
+
+    response, body = _get(client, media, Range='bytes=0-9', **{'If-Range': etag})
+    assert response.status_code == 206 and body == CONTENT[:10]
+
+    response, body = _get(client, media, Range='bytes=0-9', **{'If-Range': '"otra-version"'})
+    assert response.status_code == 200 and body == CONTENT
+
+
+def test_etag_changes_with_content(app, client, media):
+    etag = _get(client, media)[0].headers['ETag']
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], media), 'ab') as f:
+        f.write(b'mas')
+    assert _get(client, media)[0].headers['ETag'] != etag
+
+
+def test_blobs_are_cached_forever(app, client):
+    filename = 'a' * 64 + '.mp3'
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], filename), 'wb') as f:
+        f.write(CONTENT)
+    response, _ = _get(client, filename)
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age > 0
+
+
+def test_missing_file_and_traversal_are_not_found(client, media):
+    assert _get(client, 'no-existe.mp3')[0].status_code == 404
+    assert _get(client, '..%2Fambaria.db')[0].status_code == 404
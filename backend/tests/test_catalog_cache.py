@@ -0,0 +1,81 @@
+# backend/tests/test_catalog_cache.py
+"""Invalidación de la caché del catálogo: versión global y cambios por podcast."""
+import io
+
+import pytest
+
+
+@pytest.fixture
+def catalog(seed, auth_headers):
+    (user_id,), podcast_ids = seed(podcasts=3)
+    return auth_headers(user_id), podcast_ids
+
+
+def _get(client, url, headers):
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return response.headers['X-Catalog-Cache'], response.get_json()
+
+
+def test_second_read_is_served_from_cache(client, catalog):
+    headers, _ = catalog
+
+    assert _get(client, '/podcasts', headers)[0] == 'MISS'
+    assert _get(client, '/podcasts', headers)[0] == 'HIT'
+    # Otros parámetros, otra entrada
+    assert _get(client, '/podcasts?limit=1', headers)[0] == 'MISS'
+
+
+def test_new_podcast_invalidates_every_listing(client, catalog):
+    headers, podcast_ids = catalog
+    _get(client, '/podcasts', headers)
+    _get(client, '/categories', headers)
+
+    response = client.post('/podcasts', headers=headers, content_type='multipart/form-data', data={
+        'title': 'Recién llegado', 'description': 'Nuevo', 'category': 'Historia',
+        'audio_file': (io.BytesIO(b'ID3 nuevo'), 'nuevo.mp3'),
+    })
+    assert response.status_code == 201
+
+    status, body = _get(client, '/podcasts', headers)
+    assert status == 'MISS'
+    assert len(body['podcasts']) == len(podcast_ids) + 1
+    assert _get(client, '/categories', headers)[0] == 'MISS'
+
+
+def test_comment_only_invalidates_listings_with_that_podcast(client, catalog):
+    headers, (first, second, _) = catalog
+    for url in (f"/podcasts/{first}", f"/podcasts?ids={second}", '/podcasts', '/categories'):
+        _get(client, url, headers)
+
+    response = client.post(f"/api/podcasts/{first}/comments", json={'text': 'Muy bueno'}, headers=headers)
+    assert response.status_code == 201
+
+    status, body = _get(client, f"/podcasts/{first}", headers)
+    assert status == 'MISS'
+    assert body['comment_count'] == 1
+    assert _get(client, '/podcasts', headers)[0] == 'MISS'
+    assert _get(client, f"/podcasts?ids={second}", headers)[0] == 'HIT'
+    assert _get(client, '/categories', headers)[0] == 'HIT'
+
+
+def test_pruned_change_log_clears_the_cache(app, client, catalog):
+    headers, (first, second, _) = catalog
+    app.config['CATALOG_CHANGE_LOG_SIZE'] = 1
+    _get(client, f"/podcasts?ids={second}", headers)
+
+    # Dos cambios seguidos sin lecturas entre medias: el primero ya no está en el registro
+    for text in ('uno', 'dos'):
+        client.post(f"/api/podcasts/{first}/comments", json={'text': text}, headers=headers)
+
+    assert _get(client, f"/podcasts?ids={second}", headers)[0] == 'MISS'
+
+
+def test_cache_can_be_disabled(app, client, catalog):
+    headers, _ = catalog
+    app.config['CATALOG_CACHE_ENABLED'] = False
+
+    response = client.get('/podcasts', headers=headers)
+
+    assert response.status_code == 200
+    assert 'X-Catalog-Cache' not in response.headers
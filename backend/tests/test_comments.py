@@ -0,0 +1,93 @@
+# backend/tests/test_comments.py
+"""Comentarios paginados por cursor (GET /api/podcasts/<id>/comments) con autores de la caché de usuarios."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+from models.comment import Comment
+
+
+@pytest.fixture
+def thread(app, seed):
+    """Un podcast con 5 comentarios de 2 usuarios; los tres primeros, en el mismo instante."""
+    (first_user, second_user), (podcast_id,) = seed(podcasts=1, user_count=2)
+    with app.app_context():
+        base = datetime(2025, 2, 1)
+        db.session.add_all([
+            Comment(text=f"comentario {i}", user_id=(first_user, second_user)[i % 2], podcast_id=podcast_id,
+                    created_at=base + timedelta(minutes=max(0, i - 2)))
+            for i in range(5)
+        ])
+        db.session.commit()
+    return podcast_id
+
+
+def _page(client, podcast_id, query=''):
+    response = client.get(f"/api/podcasts/{podcast_id}/comments?{query}")
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_pages_are_newest_first_and_break_ties_by_id(client, thread):
+    ids, cursor = [], None
+    while True:
+        body = _page(client, thread, 'limit=2' + (f"&cursor={cursor}" if cursor else ''))
+        assert len(body['comments']) <= 2
+        ids += [comment['id'] for comment in body['comments']]
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    assert ids == [5, 4, 3, 2, 1]
+
+
+def test_comments_carry_their_author(client, thread):
+    comments = _page(client, thread)['comments']
+
+    assert {comment['user_id']: comment['username'] for comment in comments} == {1: 'Usuario 0', 2: 'Usuario 1'}
+    assert comments[0]['created_at'].endswith('Z')
+
+
+def _capture_queries(app, client, url):
+    """Ejecuta GET url y devuelve las consultas SQL emitidas, como (sentencia, parámetros)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        assert client.get(url).status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return statements
+
+
+def test_page_needs_at_most_three_queries(app, client, thread):
+    # Existencia del podcast, la página y los autores (una sola consulta para todos)
+    assert len(_capture_queries(app, client, f"/api/podcasts/{thread}/comments")) == 3
+    # Con los autores ya en la caché del worker, sobra la tercera
+    assert len(_capture_queries(app, client, f"/api/podcasts/{thread}/comments")) == 2
+
+
+def test_page_query_walks_the_composite_index(app, client, thread):
+    cursor = _page(client, thread, 'limit=2')['next_cursor']
+    queries = _capture_queries(app, client, f"/api/podcasts/{thread}/comments?limit=2&cursor={cursor}")
+    statement, parameters = next(query for query in queries if 'FROM comments' in query[0])
+
+    with app.app_context():
+        plan = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+
+    details = ' '.join(row[-1] for row in plan)
+    # Ni recorrido de la tabla ni ordenación aparte: el índice da el orden de la página
+    assert 'ix_comments_podcast_id_created_at_id' in details
+    assert 'TEMP B-TREE' not in details
+
+
+def test_unknown_podcast_or_bad_cursor(client, thread):
+    assert client.get('/api/podcasts/999/comments').status_code == 404
+    assert client.get(f"/api/podcasts/{thread}/comments?cursor=basura").status_code == 400
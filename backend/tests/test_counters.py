@@ -0,0 +1,138 @@
+# backend/tests/test_counters.py
+"""comment_count (services/counters.py), reconcile-counters y el registro de cambios por podcast."""
+import pytest
+from sqlalchemy import update
+
+from extensions import db
+from models.catalog_version import CatalogChange
+from models.comment import Comment
+from models.podcast import Podcast
+import services.catalog_cache as catalog_cache
+from services.catalog_cache import current_catalog_state
+from services.counters import reconcile_counters
+
+
+@pytest.fixture
+def catalog(seed, auth_headers):
+    (user_id,), podcast_ids = seed(podcasts=2)
+    return auth_headers(user_id), podcast_ids
+
+
+def _comment_count(app, podcast_id):
+    with app.app_context():
+        return db.session.get(Podcast, podcast_id).comment_count
+
+
+def _comment(client, headers, podcast_id, text='Muy bueno'):
+    response = client.post(f"/api/podcasts/{podcast_id}/comments", json={'text': text}, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['comment']['id']
+
+
+def _state(app):
+    with app.app_context():
+        return current_catalog_state()
+
+
+def test_comment_count_follows_comments(app, client, catalog):
+    headers, (first, second) = catalog
+    comment_id = _comment(client, headers, first)
+    _comment(client, headers, first)
+
+    assert _comment_count(app, first) == 2
+    assert _comment_count(app, second) == 0
+
+    assert client.delete(f"/api/comments/{comment_id}", headers=headers).status_code == 200
+    assert _comment_count(app, first) == 1
+
+
+def test_comment_only_appends_to_the_change_log(app, client, catalog):
+    headers, (first, second) = catalog
+    version, change = _state(app)
+
+    _comment(client, headers, first)
+    _comment(client, headers, second)
+
+    # La versión global no cambia: cada comentario es una fila nueva en catalog_changes
+    assert _state(app) == (version, change + 2)
+    with app.app_context():
+        assert [row.podcast_id for row in CatalogChange.query.order_by(CatalogChange.seq)] == [first, second]
+
+
+def test_change_log_is_pruned(make_app, seed, auth_headers, monkeypatch):
+    app = make_app(CATALOG_CHANGE_LOG_SIZE=3)
+    monkeypatch.setattr(catalog_cache, 'CHANGE_LOG_PRUNE_EVERY', 5)
+    client = app.test_client()
+    (user_id,), (podcast_id,) = seed(podcasts=1)
+    headers = auth_headers(user_id)
+
+    for i in range(5):
+        _comment(client, headers, podcast_id, f"comentario {i}")
+
+    with app.app_context():
+        assert [row.seq for row in CatalogChange.query.order_by(CatalogChange.seq)] == [3, 4, 5]
+
+
+def test_reconcile_fixes_drifted_counts(app, client, catalog):
+    headers, (first, second) = catalog
+    _comment(client, headers, first)
+    with app.app_context():
+        db.session.execute(update(Podcast).where(Podcast.id == first).values(comment_count=7))
+        db.session.execute(update(Podcast).where(Podcast.id == second).values(comment_count=3))
+        db.session.commit()
+    version, _ = _state(app)
+
+    with app.app_context():
+        assert reconcile_counters() == {'comment_count': 2}
+
+    assert (_comment_count(app, first), _comment_count(app, second)) == (1, 0)
+    # Los listados cacheados muestran los contadores
+    assert _state(app)[0] == version + 1
+
+
+def test_reconcile_without_drift_keeps_the_cache(app, client, catalog):
+    headers, (first, _) = catalog
+    _comment(client, headers, first)
+    version, _ = _state(app)
+
+    with app.app_context():
+        assert reconcile_counters() == {'comment_count': 0}
+
+    assert _state(app)[0] == version
+
+
+def test_reconcile_counters_command(app, catalog):
+    _, (first, _) = catalog
+    with app.app_context():
+        db.session.add(Comment(text='Sin contador', user_id=1, podcast_id=first))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['reconcile-counters', '--counter', 'comment_count'])
+
+    assert result.exit_code == 0, result.output
+    assert 'comment_count: 1 podcasts corregidos' in result.output
+    assert _comment_count(app, first) == 1
+
+
+def test_changes_committed_out_of_order_are_not_missed(app, client, catalog):
+    headers, (first, second) = catalog
+    client.get(f"/podcasts/{first}", headers=headers)
+    client.get(f"/podcasts/{second}", headers=headers)
+
+    # Dos escrituras: la de seq menor (first) hace commit después que la de seq mayor
+    with app.app_context():
+        db.session.add_all([CatalogChange(seq=1, podcast_id=first), CatalogChange(seq=2, podcast_id=second)])
+        db.session.commit()
+        db.session.execute(db.delete(CatalogChange).where(CatalogChange.seq == 1))
+        db.session.commit()
+
+    assert client.get(f"/podcasts/{second}", headers=headers).headers['X-Catalog-Cache'] == 'MISS'
+    assert client.get(f"/podcasts/{first}", headers=headers).headers['X-Catalog-Cache'] == 'HIT'
+
+    with app.app_context():
+        db.session.add(CatalogChange(seq=1, podcast_id=first))
+        db.session.commit()
+
+    # El seq 1 estaba por debajo del último visto, pero quedó pendiente como hueco
+    assert client.get(f"/podcasts/{first}", headers=headers).headers['X-Catalog-Cache'] == 'MISS'
+    assert client.get(f"/podcasts/{second}", headers=headers).headers['X-Catalog-Cache'] == 'HIT'
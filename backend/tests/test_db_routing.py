@@ -0,0 +1,149 @@
+# backend/tests/test_db_routing.py
+"""Lecturas desde la réplica y read-your-writes por usuario (services/db_routing.py), con dos SQLite."""
+import io
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+import services.db_routing as db_routing
+from services.db_routing import READ_YOUR_WRITES_COOKIE
+
+
+def copy_sqlite(source, target):
+    """Copia completa de la BD `source` en `target`: la réplica "se pone al día"."""
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'ambaria.db'), str(tmp_path / 'replica.db')
+
+
+@pytest.fixture
+def app(make_app, paths):
+    _, replica = paths
+    return make_app(SQLALCHEMY_BINDS={'replica': {'url': f"sqlite:///{replica}"}}, CATALOG_CACHE_ENABLED=False)
+
+
+@pytest.fixture
+def catalog(seed, auth_headers, paths):
+    (user_id,), podcast_ids = seed(podcasts=2)
+    copy_sqlite(*paths)
+    return auth_headers(user_id), podcast_ids
+
+
+def _set_replica_title(paths, podcast_id, title):
+    # Marca la réplica para saber de qué BD sale cada respuesta
+    with sqlite3.connect(paths[1]) as replica:
+        replica.execute('UPDATE podcasts SET title = ? WHERE id = ?', (title, podcast_id))
+
+
+def _title(client, headers, podcast_id):
+    response = client.get(f"/podcasts/{podcast_id}", headers=headers)
+    assert response.status_code == 200
+    return response.get_json()['title']
+
+
+def _create_podcast(client, headers):
+    # Una escritura que incrementa la versión del catálogo y que la réplica aún no tiene
+    return client.post('/podcasts', headers=headers, content_type='multipart/form-data', data={
+        'title': 'Nuevo', 'description': 'Nuevo', 'category': 'Música',
+        'audio_file': (io.BytesIO(b'ID3 nuevo'), 'nuevo.mp3'),
+    })
+
+
+def test_reads_go_to_replica_without_checking_the_primary(app, client, catalog, paths):
+    headers, (podcast_id, _) = catalog
+    _set_replica_title(paths, podcast_id, 'Desde la réplica')
+    before = db_routing.replica_stats()['replica']
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        assert _title(client, headers, podcast_id) == 'Desde la réplica'
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert db_routing.replica_stats()['replica'] == before + 1
+    # Sin escrituras propias no se lee el estado del catálogo (solo el autor, que sale de la principal)
+    assert not any('catalog_' in statement for statement in statements)
+
+
+def test_writer_reads_from_primary_until_the_replica_catches_up(app, client, catalog, paths):
+    headers, (podcast_id, _) = catalog
+    _set_replica_title(paths, podcast_id, 'Desde la réplica')
+
+    response = _create_podcast(client, headers)
+    assert response.status_code == 201
+    assert READ_YOUR_WRITES_COOKIE in response.headers['Set-Cookie']
+    before = db_routing.replica_stats()['primary_lagging']
+
+    assert _title(client, headers, podcast_id) == 'Episodio 0'
+    assert db_routing.replica_stats()['primary_lagging'] == before + 1
+    # Las escrituras de un usuario no desvían las lecturas de los demás
+    assert _title(app.test_client(), headers, podcast_id) == 'Desde la réplica'
+
+    # En cuanto la réplica recibe la escritura, vuelve a usarse y la cookie se borra
+    copy_sqlite(*paths)
+    _set_replica_title(paths, podcast_id, 'Desde la réplica')
+    response = client.get(f"/podcasts/{podcast_id}", headers=headers)
+    assert response.get_json()['title'] == 'Desde la réplica'
+    assert 'Max-Age=0' in response.headers['Set-Cookie']
+    assert client.get_cookie(READ_YOUR_WRITES_COOKIE) is None
+
+
+def test_failed_write_sets_no_cookie(client, catalog):
+    headers, _ = catalog
+
+    response = client.post('/podcasts', headers=headers, content_type='multipart/form-data', data={'title': 'Sin audio'})
+
+    assert response.status_code == 400
+    assert client.get_cookie(READ_YOUR_WRITES_COOKIE) is None
+
+
+def test_own_comment_is_read_back_from_primary(client, catalog):
+    headers, (podcast_id, _) = catalog
+
+    response = client.post(f"/api/podcasts/{podcast_id}/comments", json={'text': 'Primero'}, headers=headers)
+    assert response.status_code == 201
+
+    comments = client.get(f"/api/podcasts/{podcast_id}/comments").get_json()['comments']
+    assert [comment['text'] for comment in comments] == ['Primero']
+    assert client.get(f"/podcasts/{podcast_id}", headers=headers).get_json()['comment_count'] == 1
+
+
+def test_broken_replica_falls_back_to_primary(client, catalog, paths):
+    headers, (podcast_id, _) = catalog
+    with open(paths[1], 'wb') as f:
+        f.write(b'esto no es una base de datos' * 100)
+    before = db_routing.replica_stats()['primary_error']
+
+    # La lectura falla en la réplica y se repite en la principal; la siguiente ya no la intenta
+    assert _title(client, headers, podcast_id) == 'Episodio 0'
+    assert _title(client, headers, podcast_id) == 'Episodio 0'
+    assert db_routing.replica_stats()['primary_error'] == before + 2
+
+
+def test_lagging_replica_responses_are_not_cached(make_app, paths, seed, auth_headers):
+    replica = paths[1]
+    app = make_app(SQLALCHEMY_BINDS={'replica': {'url': f"sqlite:///{replica}"}})
+    (user_id,), _ = seed(podcasts=2)
+    copy_sqlite(*paths)
+    headers = auth_headers(user_id)
+    writer, reader = app.test_client(), app.test_client()
+    assert _create_podcast(writer, headers).status_code == 201
+
+    # El lector lee de la réplica, que aún no tiene el podcast nuevo: no se guarda bajo la versión nueva
+    for _ in range(2):
+        response = reader.get('/podcasts', headers=headers)
+        assert (response.headers['X-Catalog-Cache'], len(response.get_json()['podcasts'])) == ('MISS', 2)
+
+    copy_sqlite(*paths)
+    assert reader.get('/podcasts', headers=headers).headers['X-Catalog-Cache'] == 'MISS'
+    response = writer.get('/podcasts', headers=headers)
+    assert (response.headers['X-Catalog-Cache'], len(response.get_json()['podcasts'])) == ('HIT', 3)
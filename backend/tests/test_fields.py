@@ -0,0 +1,127 @@
+# backend/tests/test_fields.py
+"""Respuestas parciales con ?fields= (services/serializers.py): solo esos campos y solo sus columnas."""
+import json
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+from services.serializers import PODCAST_FIELDS
+
+
+@pytest.fixture
+def catalog(seed, auth_headers):
+    (user_id,), podcast_ids = seed(podcasts=5)
+    return auth_headers(user_id), podcast_ids
+
+
+def _get(app, client, url, headers):
+    """GET url; devuelve (cuerpo JSON, SELECT emitidos)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json(), statements
+
+
+def _podcast_select(statements):
+    return next(statement for statement in statements if 'FROM podcasts' in statement)
+
+
+def test_without_fields_every_field_is_returned(app, client, catalog):
+    headers, _ = catalog
+
+    body, _ = _get(app, client, '/podcasts', headers)
+
+    assert all(set(podcast) == set(PODCAST_FIELDS) for podcast in body['podcasts'])
+
+
+def test_only_requested_fields_and_their_columns(app, client, catalog):
+    headers, _ = catalog
+
+    body, statements = _get(app, client, '/podcasts?fields=id,title', headers)
+
+    assert all(set(podcast) == {'id', 'title'} for podcast in body['podcasts'])
+    select = _podcast_select(statements)
+    assert 'podcasts.title' in select
+    assert 'podcasts.description' not in select and 'podcasts.audio_path' not in select
+    # Sin artista no hace falta la consulta de usuarios
+    assert not any('FROM users' in statement for statement in statements)
+
+
+def test_artist_reads_the_author(app, client, catalog):
+    headers, _ = catalog
+
+    body, statements = _get(app, client, '/podcasts?fields=title,artist', headers)
+
+    assert {podcast['artist'] for podcast in body['podcasts']} == {'Usuario 0'}
+    assert 'podcasts.user_id' in _podcast_select(statements)
+    assert any('FROM users' in statement for statement in statements)
+
+
+def test_cursor_works_with_partial_fields(app, client, catalog):
+    headers, podcast_ids = catalog
+    ids, cursor = [], None
+    while True:
+        body, _ = _get(app, client, '/podcasts?fields=id&limit=2' + (f"&cursor={cursor}" if cursor else ''), headers)
+        ids += [podcast['id'] for podcast in body['podcasts']]
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    assert sorted(ids) == sorted(podcast_ids)
+    assert len(ids) == len(podcast_ids)
+
+
+@pytest.mark.parametrize('url', [
+    '/podcasts/{id}?fields=id,comment_count',
+    '/podcasts?ids={id}&fields=id,comment_count',
+    '/podcasts/my_podcasts?fields=id,comment_count',
+    '/podcasts/trending?fields=id,comment_count',
+])
+def test_other_endpoints_accept_fields(app, client, catalog, url):
+    headers, podcast_ids = catalog
+
+    body, _ = _get(app, client, url.format(id=podcast_ids[0]), headers)
+
+    podcasts = [body] if 'podcasts' not in body else body['podcasts']
+    assert podcasts and all(set(podcast) == {'id', 'comment_count'} for podcast in podcasts)
+
+
+def test_stream_honours_fields(client, catalog):
+    headers, podcast_ids = catalog
+
+    response = client.get('/podcasts?stream=1&fields=id,category', headers=headers)
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == len(podcast_ids)
+    assert all(set(line) == {'id', 'category'} for line in lines)
+
+
+def test_fields_are_part_of_the_cache_key(client, catalog):
+    headers, _ = catalog
+
+    assert client.get('/podcasts?fields=id', headers=headers).headers['X-Catalog-Cache'] == 'MISS'
+    assert client.get('/podcasts?fields=title', headers=headers).headers['X-Catalog-Cache'] == 'MISS'
+    cached = client.get('/podcasts?fields=id', headers=headers)
+    assert cached.headers['X-Catalog-Cache'] == 'HIT'
+    assert set(cached.get_json()['podcasts'][0]) == {'id'}
+
+
+@pytest.mark.parametrize('fields', ['', ' , ', 'id,contraseña'])
+def test_bad_fields_are_bad_requests(client, catalog, fields):
+    headers, podcast_ids = catalog
+
+    for url in (f"/podcasts?fields={fields}", f"/podcasts/{podcast_ids[0]}?fields={fields}"):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 400
+        assert response.get_json()['code'] == 400
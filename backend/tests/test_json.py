@@ -0,0 +1,108 @@
+# backend/tests/test_json.py
+"""OrjsonProvider (services/serializers.py): la misma salida que el proveedor JSON de Flask."""
+import io
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask import jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from services.serializers import OrjsonProvider
+
+
+@dataclass
+class Punto:
+    x: int
+    y: int
+
+
+SAMPLE = {
+    'zeta': [1, 2.5, None, True],
+    'alfa': 'Canción en español ñ €',
+    'creado': datetime(2025, 3, 1, 12, 30, 5, tzinfo=timezone.utc),
+    'dia': date(2025, 3, 1),
+    'precio': Decimal('9.99'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'punto': Punto(1, 2),
+    'anidado': {'b': 1, 'a': {'d': [], 'c': {}}},
+}
+
+
+@pytest.fixture
+def providers(app):
+    return app.json, DefaultJSONProvider(app)
+
+
+def test_app_uses_orjson(app):
+    assert isinstance(app.json, OrjsonProvider)
+
+
+def test_same_values_as_flask(providers):
+    orjson_provider, flask_provider = providers
+
+    assert json.loads(orjson_provider.dumps(SAMPLE)) == json.loads(flask_provider.dumps(SAMPLE))
+
+
+def test_keys_are_sorted_and_text_is_utf8(providers):
+    orjson_provider, _ = providers
+
+    text = orjson_provider.dumps({'b': 1, 'a': 'ñ', 'c': {'z': 1, 'y': 2}})
+
+    assert text == '{"a":"ñ","b":1,"c":{"y":2,"z":1}}'
+
+
+def test_non_string_keys(providers):
+    orjson_provider, _ = providers
+
+    assert json.loads(orjson_provider.dumps({1: 'uno', 2: 'dos'})) == {'1': 'uno', '2': 'dos'}
+
+
+def test_unknown_options_fall_back_to_the_stdlib(providers):
+    orjson_provider, _ = providers
+
+    assert orjson_provider.dumps({'a': 'ñ'}, ensure_ascii=True) == '{"a": "\\u00f1"}'
+
+
+def test_unserializable_values_raise_type_error(providers):
+    orjson_provider, flask_provider = providers
+
+    for provider in (orjson_provider, flask_provider):
+        with pytest.raises(TypeError):
+            provider.dumps({'a': object()})
+
+
+def test_jsonify_response(app):
+    with app.test_request_context():
+        response = jsonify(SAMPLE)
+
+    assert response.mimetype == 'application/json'
+    body = response.get_data()
+    assert body.endswith(b'}\n') and b'\n' not in body[:-1]
+    assert 'Canción en español ñ €'.encode() in body
+    assert json.loads(body)['creado'] == 'Sat, 01 Mar 2025 12:30:05 GMT'
+    assert list(json.loads(body)) == sorted(SAMPLE)
+
+
+def test_jsonify_is_indented_when_not_compact(app):
+    app.json.compact = False
+    with app.test_request_context():
+        body = jsonify({'b': 1, 'a': [1]}).get_data(as_text=True)
+
+    assert body == '{\n  "a": [\n    1\n  ],\n  "b": 1\n}\n'
+
+
+def test_request_bodies_are_parsed_with_orjson(app, client, user):
+    podcast = client.post('/podcasts', headers=user, content_type='multipart/form-data', data={
+        'title': 'JSON', 'description': 'JSON', 'category': 'Ciencia',
+        'audio_file': (io.BytesIO(b'ID3' + bytes(100)), 'json.mp3'),
+    }).get_json()['podcast_id']
+
+    response = client.post(f"/api/podcasts/{podcast}/comments", headers=user,
+                           data='{"text": "¡Qué bueno! 🎧"}'.encode(), content_type='application/json')
+
+    assert response.status_code == 201
+    assert response.get_json()['comment']['text'] == '¡Qué bueno! 🎧'
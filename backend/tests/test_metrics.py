@@ -0,0 +1,142 @@
+# backend/tests/test_metrics.py
+"""GET /metrics (services/metrics.py): métricas por petición y suma de las copias de los workers."""
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from services.metrics import merge_snapshots, render_prometheus
+
+LIST_LABELS = 'endpoint="podcasts.get_all_podcasts",method="GET"'
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    return make_app(METRICS_ENABLED=True, METRICS_DIR=str(tmp_path / 'metrics'))
+
+
+@pytest.fixture
+def catalog(seed, auth_headers):
+    (user_id,), podcast_ids = seed(podcasts=3)
+    return auth_headers(user_id), podcast_ids
+
+
+def _samples(client):
+    """{serie: valor} de la exposición de /metrics (sin las líneas # HELP / # TYPE)."""
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line and not line.startswith('#'):
+            series, value = line.rsplit(' ', 1)
+            samples[series] = float(value)
+    return samples
+
+
+def _delta(before, after, series):
+    return after.get(series, 0) - before.get(series, 0)
+
+
+def test_requests_are_counted_by_endpoint_and_status(client, catalog):
+    headers, _ = catalog
+    before = _samples(client)
+
+    assert client.get('/podcasts', headers=headers).status_code == 200
+    assert client.get('/podcasts', headers=headers).status_code == 200
+    assert client.get('/podcasts?cursor=basura', headers=headers).status_code == 400
+    after = _samples(client)
+
+    assert _delta(before, after, f'ambaria_http_requests_total{{{LIST_LABELS},status="200"}}') == 2
+    assert _delta(before, after, f'ambaria_http_requests_total{{{LIST_LABELS},status="400"}}') == 1
+    assert _delta(before, after, f'ambaria_http_request_duration_seconds_count{{{LIST_LABELS}}}') == 3
+    assert _delta(before, after, f'ambaria_http_request_duration_seconds_bucket{{{LIST_LABELS},le="+Inf"}}') == 3
+    assert _delta(before, after, f'ambaria_sql_statements_total{{{LIST_LABELS}}}') >= 2
+    assert _delta(before, after, f'ambaria_http_response_size_bytes_count{{{LIST_LABELS}}}') == 3
+
+
+def test_streamed_response_size_is_counted_when_sent(client, catalog):
+    headers, _ = catalog
+    before = _samples(client)
+
+    body = client.get('/podcasts?stream=1', headers=headers).get_data()
+    after = _samples(client)
+
+    assert _delta(before, after, f'ambaria_http_response_size_bytes_sum{{{LIST_LABELS}}}') == len(body)
+
+
+def test_upload_bytes_are_counted(client, user):
+    labels = 'endpoint="podcasts.create_podcast",method="POST"'
+    before = _samples(client)
+
+    response = client.post('/podcasts', headers=user, content_type='multipart/form-data', data={
+        'title': 'Subida', 'description': 'Medida', 'category': 'Ciencia',
+        'audio_file': (io.BytesIO(b'ID3' + bytes(5000)), 'subida.mp3'),
+    })
+    assert response.status_code == 201
+    after = _samples(client)
+
+    assert _delta(before, after, f'ambaria_upload_bytes_total{{{labels}}}') == response.request.content_length
+    assert _delta(before, after, f'ambaria_upload_seconds_total{{{labels}}}') > 0
+
+
+def test_cache_collector_reports_catalog_cache(client, catalog):
+    headers, _ = catalog
+    client.get('/podcasts', headers=headers)
+    client.get('/podcasts', headers=headers)
+
+    samples = _samples(client)
+
+    assert samples['ambaria_cache_entries{cache="catalog"}'] >= 1
+    assert samples['ambaria_cache_hits_total{cache="catalog"}'] >= 1
+
+
+def test_token_protects_the_endpoint(make_app):
+    app = make_app(METRICS_ENABLED=True, METRICS_TOKEN='secreto')
+    client = app.test_client()
+
+    response = client.get('/metrics')
+    assert response.status_code == 401
+    assert response.get_json()['code'] == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secreto'}).status_code == 200
+
+
+def test_snapshots_of_other_workers_are_added(app, client, tmp_path):
+    metrics_dir = tmp_path / 'metrics'
+    metrics_dir.mkdir()
+    # Un worker que ya terminó: su pid no existe
+    finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+    finished.wait()
+    (metrics_dir / f"{finished.pid}.json").write_text(json.dumps({
+        'counters': [['ambaria_http_requests_total', [['endpoint', 'hello'], ['method', 'GET'], ['status', '200']], 40]],
+        'histograms': [],
+        'collected': [['ambaria_cache_entries', [['cache', 'catalog']], 1000]],
+    }))
+    before = _samples(client)['ambaria_http_requests_total{endpoint="hello",method="GET",status="200"}']
+
+    client.get('/')
+    after = _samples(client)
+
+    assert after['ambaria_http_requests_total{endpoint="hello",method="GET",status="200"}'] == before + 1
+    assert before >= 40
+    # Los gauges de un worker terminado no se suman
+    assert after.get('ambaria_cache_entries{cache="catalog"}', 0) < 1000
+
+
+def test_merge_and_render_histograms():
+    snapshot = {'counters': [], 'histograms': [
+        ['ambaria_http_request_duration_seconds', [['endpoint', 'hello'], ['method', 'GET']],
+         [1, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 1], 12.5],
+    ]}
+
+    text = render_prometheus(*merge_snapshots([snapshot, dict(snapshot, live=False)]))
+
+    labels = 'endpoint="hello",method="GET"'
+    assert f'ambaria_http_request_duration_seconds_bucket{{{labels},le="0.005"}} 2' in text
+    assert f'ambaria_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 6' in text
+    assert f'ambaria_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 8' in text
+    assert f'ambaria_http_request_duration_seconds_sum{{{labels}}} 25.0' in text
+    assert f'ambaria_http_request_duration_seconds_count{{{labels}}} 8' in text
+    assert '# TYPE ambaria_http_request_duration_seconds histogram' in text
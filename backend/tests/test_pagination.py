@@ -0,0 +1,64 @@
+# backend/tests/test_pagination.py
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models.podcast import Podcast
+from services.pagination import decode_cursor, encode_cursor, InvalidCursor
+
+
+def _walk(client, url, headers, key):
+    """Recorre todas las páginas siguiendo next_cursor; devuelve los ids en orden."""
+    ids, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ''), headers=headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        ids += [item['id'] for item in body[key]]
+        cursor = body['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize('cursor', ['no-es-un-cursor', 'bWFs', '!!!!'])
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_podcast_pages_cover_catalog_once_in_order(app, client, seed, auth_headers):
+    (user_id,), podcast_ids = seed(podcasts=7)
+    app.config['CATALOG_CACHE_ENABLED'] = False
+
+    ids = _walk(client, '/podcasts?limit=2', auth_headers(user_id), 'podcasts')
+
+    # created_at DESC y, a igual fecha (van de dos en dos), id DESC; sin huecos ni repetidos
+    assert ids == sorted(podcast_ids, key=lambda podcast_id: ((podcast_id - 1) // 2, podcast_id), reverse=True)
+
+
+def test_podcast_page_stable_when_newer_rows_arrive(app, client, seed, auth_headers):
+    (user_id,), podcast_ids = seed(podcasts=4)
+    app.config['CATALOG_CACHE_ENABLED'] = False
+    headers = auth_headers(user_id)
+
+    first = client.get('/podcasts?limit=2', headers=headers).get_json()
+    # Un podcast nuevo (más reciente que todos) no desplaza la página siguiente
+    with app.app_context():
+        db.session.add(Podcast(title='Nuevo', audio_path='nuevo.mp3', user_id=user_id, created_at=datetime(2026, 1, 1)))
+        db.session.commit()
+    second = client.get(f"/podcasts?limit=2&cursor={first['next_cursor']}", headers=headers).get_json()
+
+    assert [p['id'] for p in first['podcasts'] + second['podcasts']] == [4, 3, 2, 1]
+
+
+def test_invalid_cursor_is_bad_request(client, seed, auth_headers):
+    (user_id,), _ = seed(podcasts=1)
+    response = client.get('/podcasts?cursor=basura', headers=auth_headers(user_id))
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 400
@@ -0,0 +1,168 @@
+# backend/tests/test_plays.py
+"""Reproducciones: búfer por worker (services/play_events.py), agregados por hora/día y su lectura."""
+import os
+import runpy
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from models.play_stats import PlayEvent, PodcastPlaysDaily, PodcastPlaysHourly
+import services.play_events as play_events
+from services.play_events import day_start, flush_play_events
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def app(make_app):
+    # El hilo de vaciado no llega a despertarse solo: las pruebas vacían a mano
+    return make_app(PLAY_EVENTS_FLUSH_SIZE=1000, PLAY_EVENTS_FLUSH_INTERVAL=3600)
+
+
+@pytest.fixture
+def podcast(seed, auth_headers):
+    (user_id,), (podcast_id,) = seed(podcasts=1)
+    return auth_headers(user_id), podcast_id
+
+
+@pytest.fixture
+def yesterday():
+    """Medianoche de ayer (UTC): las horas de ayer siempre están dentro de PLAY_EVENTS_MAX_AGE_DAYS."""
+    return day_start(datetime.utcnow()) - timedelta(days=1)
+
+
+def _play(client, headers, podcast_id, played_at):
+    response = client.post(f"/podcasts/{podcast_id}/plays", headers=headers,
+                           json={'played_at': played_at.isoformat() + 'Z'})
+    assert response.status_code == 202
+    return response
+
+
+def _rows(app, model):
+    with app.app_context():
+        return {(row.podcast_id, row.period_start): row.plays for row in model.query}
+
+
+def _event_count(app):
+    with app.app_context():
+        return PlayEvent.query.count()
+
+
+def test_plays_wait_in_the_buffer_until_flushed(app, client, podcast, yesterday):
+    headers, podcast_id = podcast
+    for minutes in (615, 645, 650, 665):
+        _play(client, headers, podcast_id, yesterday + timedelta(minutes=minutes))
+
+    assert _event_count(app) == 0
+    assert flush_play_events() == 4
+    assert _event_count(app) == 4
+    assert _rows(app, PodcastPlaysHourly) == {
+        (podcast_id, yesterday + timedelta(hours=10)): 3,
+        (podcast_id, yesterday + timedelta(hours=11)): 1,
+    }
+    assert _rows(app, PodcastPlaysDaily) == {(podcast_id, yesterday): 4}
+    assert flush_play_events() == 0
+
+
+def test_later_flushes_add_to_existing_rollups(app, client, podcast, yesterday):
+    headers, podcast_id = podcast
+    _play(client, headers, podcast_id, yesterday + timedelta(hours=10))
+    flush_play_events()
+
+    response = client.post('/podcasts/plays', headers=headers, json={'plays': [
+        {'podcast_id': podcast_id, 'played_at': (yesterday + timedelta(hours=10, minutes=30)).isoformat()},
+        {'podcast_id': podcast_id, 'played_at': (yesterday + timedelta(hours=23)).isoformat()},
+        # Los de podcasts que no existen se descartan al volcar
+        {'podcast_id': 999},
+    ]})
+    assert response.status_code == 202
+    assert response.get_json()['accepted'] == 3
+
+    assert flush_play_events() == 2
+    assert _rows(app, PodcastPlaysHourly) == {
+        (podcast_id, yesterday + timedelta(hours=10)): 2,
+        (podcast_id, yesterday + timedelta(hours=23)): 1,
+    }
+    assert _rows(app, PodcastPlaysDaily) == {(podcast_id, yesterday): 3}
+
+
+def test_series_is_read_from_the_rollups(app, client, podcast, yesterday):
+    headers, podcast_id = podcast
+    for hours in (9, 9, 20):
+        _play(client, headers, podcast_id, yesterday + timedelta(hours=hours))
+    flush_play_events()
+
+    hourly = client.get(f"/podcasts/{podcast_id}/plays?granularity=hour&days=2", headers=headers).get_json()
+    daily = client.get(f"/podcasts/{podcast_id}/plays?granularity=day", headers=headers).get_json()
+
+    assert [(point['period_start'], point['plays']) for point in hourly['series']] == [
+        ((yesterday + timedelta(hours=9)).isoformat() + 'Z', 2),
+        ((yesterday + timedelta(hours=20)).isoformat() + 'Z', 1),
+    ]
+    assert (daily['total'], len(daily['series'])) == (3, 1)
+
+
+@pytest.mark.parametrize('query', ['granularity=week', 'days=muchos'])
+def test_bad_series_query(client, podcast, query):
+    headers, podcast_id = podcast
+
+    response = client.get(f"/podcasts/{podcast_id}/plays?{query}", headers=headers)
+
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 400
+
+
+def test_played_at_out_of_range_is_rejected(client, podcast):
+    headers, podcast_id = podcast
+    for played_at in (datetime.utcnow() - timedelta(days=8), datetime.utcnow() + timedelta(hours=1)):
+        response = client.post(f"/podcasts/{podcast_id}/plays", headers=headers,
+                               json={'played_at': played_at.isoformat()})
+        assert response.status_code == 400
+
+
+def test_failed_flush_keeps_the_events(app, client, podcast, yesterday, monkeypatch):
+    headers, podcast_id = podcast
+    _play(client, headers, podcast_id, yesterday)
+    write_play_events = play_events.write_play_events
+
+    def fail(events):
+        raise OperationalError('INSERT', {}, Exception('BD caída'))
+    monkeypatch.setattr(play_events, 'write_play_events', fail)
+    assert flush_play_events() == 0
+
+    monkeypatch.setattr(play_events, 'write_play_events', write_play_events)
+    assert flush_play_events() == 1
+    assert _rows(app, PodcastPlaysDaily) == {(podcast_id, yesterday): 1}
+
+
+def test_full_buffer_wakes_the_flusher_thread(make_app, seed, auth_headers, yesterday):
+    app = make_app(PLAY_EVENTS_FLUSH_SIZE=2, PLAY_EVENTS_FLUSH_INTERVAL=3600)
+    client = app.test_client()
+    (user_id,), (podcast_id,) = seed(podcasts=1)
+    headers = auth_headers(user_id)
+
+    _play(client, headers, podcast_id, yesterday)
+    _play(client, headers, podcast_id, yesterday)
+
+    deadline = time.monotonic() + 5
+    while _event_count(app) < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _event_count(app) == 2
+
+
+def test_worker_exit_flushes_plays_and_metrics(make_app, seed, auth_headers, yesterday, tmp_path, monkeypatch):
+    metrics_dir = tmp_path / 'metrics'
+    monkeypatch.setenv('METRICS_DIR', str(metrics_dir))
+    app = make_app(PLAY_EVENTS_FLUSH_SIZE=1000, PLAY_EVENTS_FLUSH_INTERVAL=3600, METRICS_DIR=str(metrics_dir))
+    (user_id,), (podcast_id,) = seed(podcasts=1)
+    _play(app.test_client(), auth_headers(user_id), podcast_id, yesterday)
+    assert len(play_events._buffer.events) == 1
+
+    gunicorn_conf = runpy.run_path(os.path.join(BACKEND_DIR, 'gunicorn.conf.py'))
+    gunicorn_conf['worker_exit'](None, SimpleNamespace(wsgi=app))
+
+    assert _event_count(app) == 1
+    assert os.listdir(metrics_dir)
@@ -0,0 +1,110 @@
+# backend/tests/test_podcast_page.py
+"""Vista de detalle en una petición (GET /podcasts/<id>/page) y búsqueda por lotes (GET /podcasts?ids=)."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+from models.comment import Comment
+import routes.podcast_routes as podcast_routes
+
+
+@pytest.fixture
+def catalog(app, seed, auth_headers):
+    """3 podcasts de 2 usuarios; el primero con 3 comentarios del segundo usuario."""
+    (owner, commenter), podcast_ids = seed(podcasts=3, user_count=2)
+    with app.app_context():
+        db.session.add_all([
+            Comment(text=f"comentario {i}", user_id=commenter, podcast_id=podcast_ids[0],
+                    created_at=datetime(2025, 2, 1) + timedelta(minutes=i))
+            for i in range(3)
+        ])
+        db.session.commit()
+    return auth_headers(owner), podcast_ids
+
+
+def _statements(app, client, url, headers):
+    """GET url; devuelve (respuesta, sentencias SQL emitidas)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return response, statements
+
+
+def test_page_has_podcast_author_and_first_comments(client, catalog):
+    headers, (podcast_id, _, _) = catalog
+
+    response = client.get(f"/podcasts/{podcast_id}/page?limit=2", headers=headers)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['podcast']['id'], body['podcast']['title'], body['podcast']['artist']) == (podcast_id, 'Episodio 0', 'Usuario 0')
+    assert body['author'] == {'id': 1, 'name': 'Usuario 0', 'profile_picture': None}
+    assert [comment['text'] for comment in body['comments']] == ['comentario 2', 'comentario 1']
+    assert {comment['username'] for comment in body['comments']} == {'Usuario 1'}
+
+    # La página siguiente sale del endpoint de comentarios con el mismo cursor
+    rest = client.get(f"/api/podcasts/{podcast_id}/comments?limit=2&cursor={body['next_cursor']}").get_json()
+    assert [comment['text'] for comment in rest['comments']] == ['comentario 0']
+    assert rest['next_cursor'] is None
+
+
+def test_page_needs_at_most_three_queries(app, client, catalog):
+    headers, (podcast_id, _, _) = catalog
+    url = f"/podcasts/{podcast_id}/page"
+
+    # Podcast, comentarios y los dos autores (el del podcast y el de los comentarios) en una consulta
+    response, statements = _statements(app, client, url, headers)
+    assert response.status_code == 200
+    assert len(statements) == 3
+    # Con los autores en la caché de usuarios, dos
+    assert len(_statements(app, client, url, headers)[1]) == 2
+
+
+def test_page_errors(client, catalog):
+    headers, (podcast_id, _, _) = catalog
+
+    missing = client.get('/podcasts/999/page', headers=headers)
+    assert (missing.status_code, missing.get_json()['code']) == (404, 404)
+    assert client.get(f"/podcasts/{podcast_id}/page?limit=abc", headers=headers).status_code == 400
+
+
+def test_ids_keep_the_requested_order_and_report_missing(client, catalog):
+    headers, (first, second, third) = catalog
+
+    body = client.get(f"/podcasts?ids={third},999,{first},{third}", headers=headers).get_json()
+
+    assert [podcast['id'] for podcast in body['podcasts']] == [third, first]
+    assert body['not_found'] == [999]
+    assert 'next_cursor' not in body
+
+
+def test_ids_are_read_in_one_query(app, client, catalog):
+    headers, podcast_ids = catalog
+    ids = ','.join(map(str, podcast_ids))
+
+    response, statements = _statements(app, client, f"/podcasts?ids={ids}", headers)
+
+    assert response.status_code == 200
+    assert len([statement for statement in statements if 'FROM podcasts' in statement]) == 1
+
+
+@pytest.mark.parametrize('ids', ['', ',', '1,dos', '1,2,3'])
+def test_bad_ids_are_bad_requests(client, catalog, monkeypatch, ids):
+    headers, _ = catalog
+    monkeypatch.setattr(podcast_routes, 'BATCH_LOOKUP_MAX_IDS', 2)
+
+    response = client.get(f"/podcasts?ids={ids}", headers=headers)
+
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 400
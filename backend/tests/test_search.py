@@ -0,0 +1,112 @@
+# backend/tests/test_search.py
+"""GET /podcasts/search sobre el índice FTS5 (models/podcast_search.py) y su cursor por relevancia."""
+import pytest
+
+from extensions import db
+from models.comment import Comment
+from models.podcast import Podcast
+from services.search import rebuild_search_index
+
+
+@pytest.fixture
+def catalog(app, seed, auth_headers):
+    (user_id,), _ = seed(podcasts=0)
+    with app.app_context():
+        podcasts = [
+            Podcast(title='Guitarra española', description='Clases para principiantes', category='Música',
+                    audio_path='a.mp3', user_id=user_id),
+            Podcast(title='Historia de Roma', description='La guitarra en la antigüedad', category='Historia',
+                    audio_path='b.mp3', user_id=user_id),
+            Podcast(title='Cocina fácil', description='Recetas rápidas', category='Cocina',
+                    audio_path='c.mp3', user_id=user_id),
+            Podcast(title='Música electrónica', description='Sintetizadores', category='Música',
+                    audio_path='d.mp3', user_id=user_id),
+        ]
+        db.session.add_all(podcasts)
+        db.session.flush()
+        db.session.add(Comment(text='Me recuerda a mi profesor de guitarra', user_id=user_id, podcast_id=podcasts[2].id))
+        db.session.commit()
+        return auth_headers(user_id), [podcast.id for podcast in podcasts]
+
+
+def _search(client, headers, query):
+    response = client.get(f"/podcasts/search?{query}", headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def _ids(client, headers, query):
+    return [podcast['id'] for podcast in _search(client, headers, query)['podcasts']]
+
+
+def test_title_outranks_description_and_comments(client, catalog):
+    headers, (guitar, rome, cooking, _) = catalog
+
+    assert _ids(client, headers, 'q=guitarra') == [guitar, rome, cooking]
+
+
+def test_terms_match_as_prefixes_and_without_accents(client, catalog):
+    headers, (guitar, _, _, electronic) = catalog
+
+    assert _ids(client, headers, 'q=guit') == _ids(client, headers, 'q=guitarra')
+    assert _ids(client, headers, 'q=musica') == [electronic]
+    assert _ids(client, headers, 'q=ESPAÑOLA') == [guitar]
+
+
+def test_every_term_must_match(client, catalog):
+    headers, (guitar, _, _, _) = catalog
+
+    assert _ids(client, headers, 'q=guitarra clases') == [guitar]
+    assert _ids(client, headers, 'q=guitarra sintetizadores') == []
+
+
+def test_category_filter(client, catalog):
+    headers, (guitar, _, _, _) = catalog
+
+    assert _ids(client, headers, 'q=guitarra&category=Música') == [guitar]
+
+
+def test_rank_cursor_walks_every_result_once(client, catalog):
+    headers, _ = catalog
+    expected = _ids(client, headers, 'q=guitarra')
+    ids, cursor = [], None
+    while True:
+        body = _search(client, headers, 'q=guitarra&limit=1' + (f"&cursor={cursor}" if cursor else ''))
+        ids += [podcast['id'] for podcast in body['podcasts']]
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    assert ids == expected
+
+
+@pytest.mark.parametrize('query', ['q=', 'q=%21%3F', 'q=guitarra&cursor=basura'])
+def test_bad_queries_are_bad_requests(client, catalog, query):
+    response = client.get(f"/podcasts/search?{query}", headers=catalog[0])
+
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 400
+
+
+def test_index_follows_writes(app, client, catalog):
+    headers, (guitar, rome, cooking, _) = catalog
+
+    with app.app_context():
+        db.session.get(Podcast, rome).title = 'Historia del violín'
+        db.session.delete(db.session.get(Podcast, guitar))
+        db.session.add(Comment(text='Una guitarra de verdad', user_id=1, podcast_id=rome))
+        db.session.commit()
+
+    assert _ids(client, headers, 'q=violin') == [rome]
+    assert sorted(_ids(client, headers, 'q=guitarra')) == sorted([rome, cooking])
+
+
+def test_rebuild_search_index(app, client, catalog):
+    headers, podcast_ids = catalog
+
+    with app.app_context():
+        db.session.execute(db.text('DELETE FROM podcast_search'))
+        db.session.commit()
+        assert rebuild_search_index() == len(podcast_ids)
+
+    assert len(_ids(client, headers, 'q=guitarra')) == 3
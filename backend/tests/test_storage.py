@@ -0,0 +1,112 @@
+# backend/tests/test_storage.py
+"""Recuento de referencias de los blobs (<sha256>.<ext>) al crear, editar y borrar podcasts."""
+import io
+import os
+
+from extensions import db
+from models.blob import Blob
+from models.podcast import Podcast
+import routes.podcast_routes as podcast_routes
+from services.storage import unlink_unreferenced
+
+AUDIO = b'ID3' + bytes(range(256)) * 8
+OTHER_AUDIO = b'ID3' + bytes(reversed(range(256))) * 8
+
+
+def _create(client, headers, audio=AUDIO):
+    response = client.post('/podcasts', headers=headers, content_type='multipart/form-data', data={
+        'title': 'Episodio', 'description': 'Descripción', 'category': 'Música',
+        'audio_file': (io.BytesIO(audio), 'episodio.mp3'),
+    })
+    assert response.status_code == 201, response.get_json()
+    body = response.get_json()
+    return body['podcast_id'], body['audio_url'].rsplit('/', 1)[1]
+
+
+def _ref_count(app, filename):
+    with app.app_context():
+        blob = db.session.get(Blob, filename)
+        return blob.ref_count if blob else None
+
+
+def _on_disk(app, filename):
+    return os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+
+
+def test_same_content_is_stored_once(app, client, user):
+    _, first = _create(client, user)
+    _, second = _create(client, user)
+
+    assert first == second
+    assert _ref_count(app, first) == 2
+
+
+def test_shared_file_survives_until_last_podcast_is_deleted(app, client, user):
+    first_id, filename = _create(client, user)
+    second_id, _ = _create(client, user)
+
+    assert client.delete(f"/podcasts/{first_id}", headers=user).status_code == 200
+    assert _ref_count(app, filename) == 1
+    assert _on_disk(app, filename)
+
+    assert client.delete(f"/podcasts/{second_id}", headers=user).status_code == 200
+    assert _ref_count(app, filename) is None
+    assert not _on_disk(app, filename)
+
+
+def test_bulk_delete_releases_every_reference(app, client, user):
+    ids = [_create(client, user)[0] for _ in range(3)]
+    _, filename = _create(client, user)
+
+    response = client.delete('/podcasts', json={'ids': ids}, headers=user)
+
+    assert response.get_json()['deleted'] == ids
+    assert _ref_count(app, filename) == 1
+    assert _on_disk(app, filename)
+
+
+def test_replacing_audio_releases_the_old_file(app, client, user):
+    podcast_id, old = _create(client, user)
+    shared_id, shared = _create(client, user, OTHER_AUDIO)
+    _create(client, user, OTHER_AUDIO)
+
+    def replace(target_id, audio):
+        return client.put(f"/podcasts/{target_id}", headers=user, content_type='multipart/form-data',
+                          data={'audio_file': (io.BytesIO(audio), 'nuevo.mp3')})
+
+    assert replace(podcast_id, b'ID3 otro audio').status_code == 200
+    assert _ref_count(app, old) is None
+    assert not _on_disk(app, old)
+
+    # Si otro podcast comparte el archivo anterior, se queda
+    assert replace(shared_id, b'ID3 y otro').status_code == 200
+    assert _ref_count(app, shared) == 1
+    assert _on_disk(app, shared)
+
+
+def test_failed_update_removes_the_new_file(app, client, user, monkeypatch):
+    podcast_id, old = _create(client, user)
+
+    def fail():
+        raise RuntimeError('fallo simulado')
+    monkeypatch.setattr(podcast_routes, 'bump_catalog_version', fail)
+    before = set(os.listdir(app.config['UPLOAD_FOLDER']))
+
+    response = client.put(f"/podcasts/{podcast_id}", headers=user, content_type='multipart/form-data',
+                          data={'title': 'Cambiado', 'audio_file': (io.BytesIO(b'ID3 nuevo'), 'nuevo.mp3')})
+
+    assert response.status_code == 500
+    assert response.get_json()['code'] == 500
+    assert set(os.listdir(app.config['UPLOAD_FOLDER'])) == before
+    assert _ref_count(app, old) == 1
+    with app.app_context():
+        assert db.session.get(Podcast, podcast_id).title == 'Episodio'
+
+
+def test_unlink_unreferenced_keeps_referenced_files(app, client, user):
+    _, filename = _create(client, user)
+    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+
+    with app.app_context():
+        assert unlink_unreferenced(path) is False
+    assert _on_disk(app, filename)
@@ -0,0 +1,68 @@
+# backend/tests/test_streaming.py
+"""Catálogo completo en NDJSON (GET /podcasts?stream=1 o Accept: application/x-ndjson)."""
+import json
+
+import pytest
+
+import routes.podcast_routes as podcast_routes
+
+
+@pytest.fixture
+def catalog(seed, auth_headers):
+    (user_id,), podcast_ids = seed(podcasts=5)
+    return auth_headers(user_id), podcast_ids
+
+
+def _lines(response):
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.is_streamed
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_stream_emits_one_podcast_per_line_in_catalog_order(client, catalog, monkeypatch):
+    headers, podcast_ids = catalog
+    # Lotes más pequeños que el catálogo: la partición no pierde ni repite filas
+    monkeypatch.setattr(podcast_routes, 'STREAM_BATCH_SIZE', 2)
+
+    podcasts = _lines(client.get('/podcasts?stream=1', headers=headers))
+
+    assert [p['id'] for p in podcasts] == [5, 4, 3, 2, 1]
+    assert podcasts[-1]['title'] == 'Episodio 0'
+    assert podcasts[-1]['artist'] == 'Usuario 0'
+
+
+def test_accept_header_selects_ndjson(client, catalog):
+    headers, podcast_ids = catalog
+
+    podcasts = _lines(client.get('/podcasts', headers={**headers, 'Accept': 'application/x-ndjson'}))
+
+    assert len(podcasts) == len(podcast_ids)
+
+
+@pytest.mark.parametrize('accept', ['*/*', 'application/json', 'application/json, application/x-ndjson'])
+def test_other_accept_headers_keep_paginated_json(client, catalog, accept):
+    headers, _ = catalog
+
+    response = client.get('/podcasts', headers={**headers, 'Accept': accept})
+
+    assert response.mimetype == 'application/json'
+    assert 'next_cursor' in response.get_json()
+
+
+def test_stream_applies_category_filter(client, catalog):
+    headers, _ = catalog
+
+    podcasts = _lines(client.get('/podcasts?stream=1&category=Música', headers=headers))
+
+    assert [p['id'] for p in podcasts] == [4, 2]
+    assert {p['category'] for p in podcasts} == {'Música'}
+
+
+def test_streamed_responses_are_not_cached(client, catalog):
+    headers, _ = catalog
+
+    for _ in range(2):
+        response = client.get('/podcasts?stream=1', headers=headers)
+        assert response.headers['X-Catalog-Cache'] == 'MISS'
+        response.close()
@@ -0,0 +1,110 @@
+# backend/tests/test_thumbnails.py
+"""Miniaturas de portadas (services/thumbnails.py): variantes, caché LRU y borrado con la portada."""
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from services.thumbnails import THUMBNAIL_FORMATS, THUMBNAIL_SIZES, prune_cache, thumbnail_cache_dir
+
+
+def _png(width, height, color=(200, 30, 30)):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _create(client, headers, cover):
+    response = client.post('/podcasts', headers=headers, content_type='multipart/form-data', data={
+        'title': 'Con portada', 'description': 'Portada', 'category': 'Arte',
+        'audio_file': (io.BytesIO(b'ID3' + bytes(100)), 'episodio.mp3'),
+        'cover_image': (io.BytesIO(cover), 'portada.png'),
+    })
+    assert response.status_code == 201, response.get_json()
+    body = response.get_json()
+    return body['podcast_id'], body['cover_image_url'].rsplit('/', 1)[1]
+
+
+def _variants(app, filename):
+    cache_dir = thumbnail_cache_dir(app.config)
+    return sorted(name for name in os.listdir(cache_dir) if name.startswith(filename)) if os.path.isdir(cache_dir) else []
+
+
+@pytest.mark.parametrize('fmt, mimetype', [('webp', 'image/webp'), ('jpeg', 'image/jpeg')])
+def test_variant_fits_requested_size(client, user, fmt, mimetype):
+    _, cover = _create(client, user, _png(600, 400))
+
+    response = client.get(f"/thumbnails/180/{fmt}/{cover}")
+
+    assert response.status_code == 200
+    assert response.mimetype == mimetype
+    assert response.cache_control.immutable
+    with Image.open(io.BytesIO(response.get_data())) as image:
+        assert image.size == (180, 120)
+
+
+def test_small_covers_are_not_upscaled(client, user):
+    _, cover = _create(client, user, _png(100, 50))
+
+    with Image.open(io.BytesIO(client.get(f"/thumbnails/300/jpeg/{cover}").get_data())) as image:
+        assert image.size == (100, 50)
+
+
+def test_unknown_size_or_format_is_not_found(client, user):
+    _, cover = _create(client, user, _png(100, 50))
+
+    assert client.get(f"/thumbnails/64/webp/{cover}").status_code == 404
+    assert client.get(f"/thumbnails/50/gif/{cover}").status_code == 404
+    assert client.get('/thumbnails/50/webp/no-existe.png').status_code == 404
+
+
+def test_new_cover_gets_every_variant(app, client, user):
+    _, cover = _create(client, user, _png(400, 400))
+
+    assert len(_variants(app, cover)) == len(THUMBNAIL_SIZES) * len(THUMBNAIL_FORMATS)
+
+
+def test_variants_are_deleted_with_the_last_reference(app, client, user):
+    first_id, cover = _create(client, user, _png(400, 400))
+    second_id, _ = _create(client, user, _png(400, 400))
+
+    # Otro podcast sigue usando la misma portada: las variantes se quedan
+    assert client.delete(f"/podcasts/{first_id}", headers=user).status_code == 200
+    assert _variants(app, cover)
+
+    assert client.delete(f"/podcasts/{second_id}", headers=user).status_code == 200
+    assert _variants(app, cover) == []
+
+
+def test_replaced_cover_loses_its_variants(app, client, user):
+    podcast_id, old_cover = _create(client, user, _png(400, 400))
+
+    response = client.put(f"/podcasts/{podcast_id}", headers=user, content_type='multipart/form-data',
+                          data={'cover_image': (io.BytesIO(_png(400, 400, (0, 0, 255))), 'nueva.png')})
+
+    assert response.status_code == 200
+    assert _variants(app, old_cover) == []
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    for age, name in enumerate(['reciente', 'media', 'antigua']):
+        path = tmp_path / name
+        path.write_bytes(bytes(100))
+        os.utime(path, (1_000_000 - age * 1000, 1_000_000))
+    (tmp_path / 'a.tmp').write_bytes(bytes(1000))
+
+    # 300 bytes con un máximo de 250: se poda hasta el 90 % (225), la menos usada primero
+    assert prune_cache(str(tmp_path), 250) == 1
+    assert sorted(os.listdir(tmp_path)) == ['a.tmp', 'media', 'reciente']
+    assert prune_cache(str(tmp_path), 250) == 0
+
+
+def test_serving_a_variant_marks_it_used(app, client, user):
+    _, cover = _create(client, user, _png(400, 400))
+    path = os.path.join(thumbnail_cache_dir(app.config), f"{cover}.50.webp")
+    os.utime(path, (0, os.stat(path).st_mtime))
+
+    client.get(f"/thumbnails/50/webp/{cover}")
+
+    assert os.stat(path).st_atime > 0
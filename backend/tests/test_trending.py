@@ -0,0 +1,114 @@
+# backend/tests/test_trending.py
+"""Ranking de tendencias: recálculo (services/trending.py, flask refresh-trending) y GET /podcasts/trending."""
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models.comment import Comment
+from models.play_stats import PlayEvent
+from models.podcast import Podcast
+from models.trending import PodcastTrending
+from services.play_events import write_play_events
+from services.trending import refresh_trending
+
+
+@pytest.fixture
+def catalog(app, seed, auth_headers):
+    """
+    4 podcasts antiguos (los impares, de Música); el 1 con un comentario reciente y el 2
+    con 5 reproducciones recientes, que pesan más que un comentario.
+    """
+    (user_id,), podcast_ids = seed(podcasts=4)
+    now = datetime.utcnow()
+    with app.app_context():
+        db.session.add(Comment(text='Recién escuchado', user_id=user_id, podcast_id=podcast_ids[1], created_at=now))
+        db.session.commit()
+        write_play_events([(podcast_ids[2], user_id, now)] * 5)
+    return auth_headers(user_id), podcast_ids
+
+
+def _trending(client, headers, query=''):
+    response = client.get(f"/podcasts/trending?{query}", headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response
+
+
+def _ids(client, headers, query=''):
+    return [podcast['id'] for podcast in _trending(client, headers, query).get_json()['podcasts']]
+
+
+def _refresh(app, full=False):
+    with app.app_context():
+        return refresh_trending(full=full)
+
+
+def test_newest_first_until_the_first_refresh(client, catalog):
+    headers, podcast_ids = catalog
+
+    # Mismo created_at de dos en dos: desempata el id
+    assert _ids(client, headers) == [podcast_ids[i] for i in (3, 2, 1, 0)]
+
+
+def test_recent_activity_ranks_first(app, client, catalog):
+    headers, podcast_ids = catalog
+
+    assert _refresh(app) == {'full': True, 'recomputed': 4, 'removed': 0}
+
+    body = _trending(client, headers).get_json()
+    assert [podcast['id'] for podcast in body['podcasts']] == [podcast_ids[i] for i in (2, 1, 3, 0)]
+    # La puntuación guardada solo sirve para ordenar: no se expone
+    assert all('trending_score' not in podcast for podcast in body['podcasts'])
+    assert _ids(client, headers, 'category=Música') == [podcast_ids[1], podcast_ids[3]]
+    assert _ids(client, headers, 'limit=1') == [podcast_ids[2]]
+
+
+def test_incremental_refresh_only_recomputes_active_podcasts(app, client, catalog):
+    headers, podcast_ids = catalog
+    _refresh(app)
+
+    with app.app_context():
+        db.session.add_all([Comment(text=f"comentario {i}", user_id=1, podcast_id=podcast_ids[0],
+                                    created_at=datetime.utcnow()) for i in range(3)])
+        db.session.commit()
+
+    assert _refresh(app) == {'full': False, 'recomputed': 1, 'removed': 0}
+    assert _ids(client, headers)[0] == podcast_ids[0]
+    assert _refresh(app) == {'full': False, 'recomputed': 0, 'removed': 0}
+
+
+def test_refresh_picks_up_deletions_and_category_changes(app, client, catalog):
+    headers, podcast_ids = catalog
+    _refresh(app)
+
+    with app.app_context():
+        db.session.execute(db.delete(PlayEvent))
+        db.session.execute(db.delete(Podcast).where(Podcast.id == podcast_ids[2]))
+        db.session.get(Podcast, podcast_ids[0]).category = 'Música'
+        db.session.commit()
+
+    assert _refresh(app)['removed'] == 1
+    with app.app_context():
+        assert db.session.get(PodcastTrending, podcast_ids[0]).category == 'Música'
+    assert _ids(client, headers, 'category=Música') == [podcast_ids[1], podcast_ids[3], podcast_ids[0]]
+
+
+def test_refresh_invalidates_the_cached_ranking(app, client, catalog):
+    headers, _ = catalog
+    _trending(client, headers)
+    assert _trending(client, headers).headers['X-Catalog-Cache'] == 'HIT'
+
+    _refresh(app)
+
+    assert _trending(client, headers).headers['X-Catalog-Cache'] == 'MISS'
+
+
+def test_refresh_trending_command(app, catalog):
+    runner = app.test_cli_runner()
+
+    first = runner.invoke(args=['refresh-trending'])
+    second = runner.invoke(args=['refresh-trending', '--full'])
+
+    assert first.exit_code == 0, first.output
+    assert 'Recálculo completo: 4 podcasts, 0 filas eliminadas' in first.output
+    assert 'Recálculo completo: 4 podcasts' in second.output
@@ -0,0 +1,137 @@
+# backend/tests/test_upload_sessions.py
+"""Subidas reanudables: offset, reanudación y finalize (services/resumable_uploads.py)."""
+import os
+
+import pytest
+
+from extensions import db
+from models.podcast import Podcast
+import routes.upload_session_routes as upload_session_routes
+
+CONTENT = b'ID3' + os.urandom(997)
+FORM = {'title': 'Por trozos', 'description': 'Subida reanudable', 'category': 'Ciencia'}
+
+
+def _create(client, headers, size=len(CONTENT)):
+    response = client.post('/upload-sessions', json={'filename': 'largo.mp3', 'size': size}, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def _patch(client, headers, session_id, offset, chunk):
+    return client.patch(f"/upload-sessions/{session_id}", data=chunk, headers={
+        **headers, 'Content-Type': 'application/offset+octet-stream', 'Upload-Offset': str(offset)})
+
+
+def _part(app, session_id):
+    return os.path.join(app.config['UPLOAD_FOLDER'], '.sessions', f"{session_id}.part")
+
+
+def test_create_session(client, user):
+    response = client.post('/upload-sessions', json={'filename': 'largo.mp3', 'size': 10}, headers=user)
+
+    assert response.status_code == 201
+    assert response.headers['Upload-Offset'] == '0'
+    assert response.headers['Upload-Length'] == '10'
+    assert response.headers['Location'].endswith(f"/upload-sessions/{response.get_json()['id']}")
+
+
+@pytest.mark.parametrize('payload, status', [
+    ({'filename': 'largo.exe', 'size': 10}, 400),
+    ({'filename': 'largo.mp3'}, 400),
+    ({'filename': 'largo.mp3', 'size': 0}, 400),
+])
+def test_create_session_rejects_bad_requests(client, user, payload, status):
+    assert client.post('/upload-sessions', json=payload, headers=user).status_code == status
+
+
+def test_chunks_advance_the_offset_and_resume(client, user):
+    session_id = _create(client, user)
+
+    response = _patch(client, user, session_id, 0, CONTENT[:400])
+    assert response.status_code == 204
+    assert response.headers['Upload-Offset'] == '400'
+
+    # El cliente "pierde" la respuesta y reenvía desde 0: el servidor le dice dónde seguir
+    response = _patch(client, user, session_id, 0, CONTENT[:400])
+    assert response.status_code == 409
+    assert response.headers['Upload-Offset'] == '400'
+
+    response = client.head(f"/upload-sessions/{session_id}", headers=user)
+    assert response.headers['Upload-Offset'] == '400'
+
+    response = _patch(client, user, session_id, 400, CONTENT[400:])
+    assert response.status_code == 204
+    assert response.headers['Upload-Offset'] == str(len(CONTENT))
+
+
+def test_chunk_past_declared_length_is_rejected(app, client, user):
+    session_id = _create(client, user, size=10)
+
+    assert _patch(client, user, session_id, 0, b'x' * 11).status_code == 413
+    assert os.path.getsize(_part(app, session_id)) == 0
+
+
+def test_chunk_requires_offset_content_type(client, user):
+    session_id = _create(client, user)
+    response = client.patch(f"/upload-sessions/{session_id}", data=b'x',
+                            headers={**user, 'Content-Type': 'application/octet-stream', 'Upload-Offset': '0'})
+    assert response.status_code == 415
+
+
+def test_sessions_are_private(client, user, auth_headers):
+    session_id = _create(client, user)
+    assert client.get(f"/upload-sessions/{session_id}", headers=auth_headers(999)).status_code == 404
+
+
+def test_finalize_creates_podcast(app, client, user):
+    session_id = _create(client, user)
+    _patch(client, user, session_id, 0, CONTENT)
+
+    response = client.post(f"/upload-sessions/{session_id}/finalize", data=FORM, headers=user)
+
+    assert response.status_code == 201
+    body = response.get_json()
+    filename = body['audio_url'].rsplit('/', 1)[1]
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], filename), 'rb') as f:
+        assert f.read() == CONTENT
+    assert not os.path.exists(_part(app, session_id))
+    assert client.get(f"/upload-sessions/{session_id}", headers=user).status_code == 404
+    with app.app_context():
+        assert db.session.get(Podcast, body['podcast_id']).title == 'Por trozos'
+
+
+def test_finalize_incomplete_upload_conflicts(client, user):
+    session_id = _create(client, user)
+    _patch(client, user, session_id, 0, CONTENT[:10])
+
+    response = client.post(f"/upload-sessions/{session_id}/finalize", data=FORM, headers=user)
+
+    assert response.status_code == 409
+    assert response.headers['Upload-Offset'] == '10'
+
+
+def test_finalize_can_be_retried_after_a_failure(app, client, user, monkeypatch):
+    session_id = _create(client, user)
+    _patch(client, user, session_id, 0, CONTENT)
+
+    def fail():
+        raise RuntimeError('fallo simulado')
+    with monkeypatch.context() as patch:
+        patch.setattr(upload_session_routes, 'bump_catalog_version', fail)
+        response = client.post(f"/upload-sessions/{session_id}/finalize", data=FORM, headers=user)
+    assert response.status_code == 500
+    # El .part se conserva mientras el podcast no esté confirmado
+    assert os.path.getsize(_part(app, session_id)) == len(CONTENT)
+
+    response = client.post(f"/upload-sessions/{session_id}/finalize", data=FORM, headers=user)
+    assert response.status_code == 201
+    assert not os.path.exists(_part(app, session_id))
+
+
+def test_delete_session_removes_part(app, client, user):
+    session_id = _create(client, user)
+    _patch(client, user, session_id, 0, CONTENT[:10])
+
+    assert client.delete(f"/upload-sessions/{session_id}", headers=user).status_code == 204
+    assert not os.path.exists(_part(app, session_id))
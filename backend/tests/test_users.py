@@ -0,0 +1,93 @@
+# backend/tests/test_users.py
+"""Alta/actualización desde Google (services/users.py) y caché de usuarios por worker."""
+import pytest
+from sqlalchemy import update
+
+from extensions import db
+from models.user import User
+from services.catalog_cache import bump_catalog_version, current_catalog_state
+from services.users import upsert_google_user
+
+PROFILE = {'google_id': '100001', 'email': 'ana@ambaria.test', 'name': 'Ana', 'picture': 'https://fotos.test/ana.png'}
+
+
+def _upsert(app, **changes):
+    with app.app_context():
+        return upsert_google_user(dict(PROFILE, **changes))
+
+
+def _catalog_version(app):
+    with app.app_context():
+        return current_catalog_state()[0]
+
+
+@pytest.fixture
+def profile_user(app, auth_headers):
+    user_id = _upsert(app).id
+    return user_id, auth_headers(user_id)
+
+
+def test_new_user_does_not_bump_catalog_version(app):
+    version = _catalog_version(app)
+
+    user_id, email, picture = _upsert(app)
+
+    assert (email, picture) == (PROFILE['email'], PROFILE['picture'])
+    assert _catalog_version(app) == version
+    with app.app_context():
+        assert db.session.get(User, user_id).name == 'Ana'
+
+
+def test_repeat_login_writes_nothing(app, profile_user):
+    user_id, _ = profile_user
+    version = _catalog_version(app)
+
+    assert _upsert(app)[0] == user_id
+    assert _catalog_version(app) == version
+    with app.app_context():
+        assert User.query.count() == 1
+
+
+def test_new_name_or_picture_bumps_catalog_version(app, profile_user):
+    user_id, _ = profile_user
+    version = _catalog_version(app)
+
+    _upsert(app, name='Ana María')
+    _upsert(app, name='Ana María', picture=None)
+
+    assert _catalog_version(app) == version + 2
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        assert (user.name, user.profile_picture) == ('Ana María', None)
+
+
+def test_profile_is_served_from_the_worker_cache(app, client, profile_user):
+    user_id, headers = profile_user
+    assert client.get('/profile', headers=headers).get_json()['message'] == '¡Bienvenido, Ana!'
+
+    # Cambio sin pasar por upsert_google_user ni por la versión del catálogo
+    with app.app_context():
+        db.session.execute(update(User).where(User.id == user_id).values(name='Directo en la BD'))
+        db.session.commit()
+
+    assert client.get('/profile', headers=headers).get_json()['message'] == '¡Bienvenido, Ana!'
+
+
+def test_profile_changed_by_another_worker_is_not_stale(app, client, profile_user):
+    user_id, headers = profile_user
+    client.get('/profile', headers=headers)
+
+    # Lo que escribe el login en otro worker: fila nueva y versión del catálogo, sin tocar la caché de este
+    with app.app_context():
+        db.session.execute(update(User).where(User.id == user_id)
+                           .values(name='Ana María', profile_picture='https://fotos.test/nueva.png'))
+        bump_catalog_version()
+        db.session.commit()
+
+    profile = client.get('/profile', headers=headers).get_json()
+    assert profile['message'] == '¡Bienvenido, Ana María!'
+    assert profile['profile_picture'] == 'https://fotos.test/nueva.png'
+
+
+def test_unknown_user_profile_is_not_found(client, auth_headers):
+    assert client.get('/profile', headers=auth_headers(999)).status_code == 404
@@ -0,0 +1,153 @@
+# backend/tests/test_waveform.py
+"""Sidecar de picos (services/waveform.py) y GET /podcasts/<id>/peaks."""
+import io
+import os
+
+import pytest
+
+from extensions import db
+from models.podcast import Podcast
+import services.media_jobs as media_jobs
+from services.waveform import (
+    BASE_SAMPLES_PER_PEAK, HEADER, CorruptPeaksError, compute_peaks, read_peaks_index, read_peaks_level,
+    sidecar_path,
+)
+
+# Tono de amplitud 12000/32768: cuantizado a int8, unos ±46
+PEAK = round(12000 / 32768 * 127)
+
+
+def _pairs(data):
+    values = [value - 256 if value > 127 else value for value in data]
+    return list(zip(values[0::2], values[1::2]))
+
+
+def _upload(client, headers, audio, filename):
+    response = client.post('/podcasts', headers=headers, content_type='multipart/form-data', data={
+        'title': 'Onda', 'description': 'Picos', 'category': 'Ciencia',
+        'audio_file': (io.BytesIO(audio), filename),
+    })
+    assert response.status_code == 201
+    return response.get_json()['podcast_id']
+
+
+def _audio_path(app, podcast_id):
+    with app.app_context():
+        return db.session.get(Podcast, podcast_id).audio_path
+
+
+def test_levels_halve_until_one_peak(tmp_path, make_wav):
+    audio = tmp_path / 'tono.wav'
+    audio.write_bytes(make_wav(seconds=1, sample_rate=8000, channels=2))
+
+    peaks_path = compute_peaks(str(audio))
+    sample_rate, total_frames, levels = read_peaks_index(peaks_path)
+
+    assert peaks_path == sidecar_path(str(audio))
+    assert (sample_rate, total_frames) == (8000, 8000)
+    # 8000 / 256 -> 32 picos en el nivel 0, y cada nivel agrupa de dos en dos
+    assert [(spp, count) for spp, count, _ in levels] == \
+        [(BASE_SAMPLES_PER_PEAK << i, 32 >> i) for i in range(6)]
+    for spp, count, offset in levels:
+        pairs = _pairs(read_peaks_level(peaks_path, offset, count))
+        assert len(pairs) == count
+        assert all(abs(low + PEAK) <= 1 and abs(high - PEAK) <= 1 for low, high in pairs)
+
+
+def test_undecodable_audio_leaves_sidecar_without_levels(tmp_path):
+    audio = tmp_path / 'episodio.mp3'
+    audio.write_bytes(b'ID3' + bytes(1000))
+
+    peaks_path = compute_peaks(str(audio))
+
+    assert read_peaks_index(peaks_path) == (0, 0, [])
+
+
+@pytest.mark.parametrize('damage', [
+    lambda data: data[:HEADER.size - 1],          # cabecera cortada
+    lambda data: b'XXXX' + data[4:],              # otro formato
+    lambda data: data[:HEADER.size + 20],         # tabla de niveles cortada
+    lambda data: data[:-10],                      # datos cortados
+])
+def test_damaged_sidecar_is_rejected(tmp_path, make_wav, damage):
+    audio = tmp_path / 'tono.wav'
+    audio.write_bytes(make_wav())
+    peaks_path = compute_peaks(str(audio))
+    with open(peaks_path, 'rb') as f:
+        data = f.read()
+    with open(peaks_path, 'wb') as f:
+        f.write(damage(data))
+
+    with pytest.raises(CorruptPeaksError):
+        read_peaks_index(peaks_path)
+
+
+def test_peaks_endpoint(client, user, make_wav):
+    podcast_id = _upload(client, user, make_wav(), 'tono.wav')
+
+    response = client.get(f"/podcasts/{podcast_id}/peaks?width=4", headers=user)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/octet-stream'
+    # El nivel más grueso con al menos 4 picos
+    assert response.headers['X-Peaks-Level'] == '3'
+    assert response.headers['X-Peaks-Levels'] == '6'
+    assert response.headers['X-Peaks-Samples-Per-Peak'] == str(BASE_SAMPLES_PER_PEAK * 8)
+    assert response.headers['X-Peaks-Sample-Rate'] == '8000'
+    assert len(_pairs(response.get_data())) == 4
+
+    etag = response.headers['ETag']
+    assert client.get(f"/podcasts/{podcast_id}/peaks?width=4", headers={**user, 'If-None-Match': etag}).status_code == 304
+    assert client.get(f"/podcasts/{podcast_id}/peaks?level=0", headers=user).headers['ETag'] != etag
+
+
+@pytest.mark.parametrize('query', ['level=6', 'level=-1', 'width=0'])
+def test_bad_zoom_is_bad_request(client, user, make_wav, query):
+    podcast_id = _upload(client, user, make_wav(), 'tono.wav')
+
+    assert client.get(f"/podcasts/{podcast_id}/peaks?{query}", headers=user).status_code == 400
+
+
+def test_unsupported_format_is_remembered(app, client, user, monkeypatch):
+    podcast_id = _upload(client, user, b'ID3' + bytes(1000), 'episodio.mp3')
+    assert os.path.exists(sidecar_path(_audio_path(app, podcast_id)))
+
+    def fail(audio_path):
+        raise AssertionError('no se debe volver a analizar el audio')
+    monkeypatch.setattr(media_jobs, 'compute_peaks', fail)
+
+    for _ in range(2):
+        response = client.get(f"/podcasts/{podcast_id}/peaks", headers=user)
+        assert response.status_code == 415
+        assert response.get_json()['code'] == 415
+
+
+def test_corrupt_sidecar_is_regenerated(app, client, user, make_wav):
+    podcast_id = _upload(client, user, make_wav(), 'tono.wav')
+    peaks_path = sidecar_path(_audio_path(app, podcast_id))
+    with open(peaks_path, 'r+b') as f:
+        f.truncate(HEADER.size + 5)
+
+    response = client.get(f"/podcasts/{podcast_id}/peaks?level=0", headers=user)
+
+    assert response.status_code == 200
+    assert len(_pairs(response.get_data())) == 32
+    assert read_peaks_index(peaks_path)[2]
+
+
+def test_sidecar_still_corrupt_after_regenerating_is_server_error(app, client, user, make_wav, monkeypatch):
+    podcast_id = _upload(client, user, make_wav(), 'tono.wav')
+    peaks_path = sidecar_path(_audio_path(app, podcast_id))
+
+    def write_garbage(audio_path):
+        with open(sidecar_path(audio_path), 'wb') as f:
+            f.write(b'basura')
+        return sidecar_path(audio_path)
+    write_garbage(_audio_path(app, podcast_id))
+    monkeypatch.setattr(media_jobs, 'compute_peaks', write_garbage)
+
+    response = client.get(f"/podcasts/{podcast_id}/peaks", headers=user)
+
+    assert response.status_code == 500
+    assert response.get_json()['code'] == 500
+    assert os.path.exists(peaks_path)
@@ -0,0 +1,5 @@
+# backend/wsgi.py
+# Punto de entrada WSGI para gunicorn (ver gunicorn.conf.py).
+from app import create_app
+
+app = create_app()
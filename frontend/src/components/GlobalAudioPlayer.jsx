@@ -2,6 +2,9 @@
 import React, { useRef, useEffect, useState } from 'react';
 import audioPlayerStore from '../store/useAudioPlayerStore.jsx';
 import { FaPlay, FaPause } from 'react-icons/fa';
+import axios from 'axios';
+
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
 const GlobalAudioPlayer = () => {
     const audioRef = useRef(new Audio());
@@ -30,6 +33,19 @@ const GlobalAudioPlayer = () => {
     }, [currentPodcast, isPlaying]);
 
 
+    // Registra una reproducción cada vez que empieza a sonar un episodio distinto
+    const currentPodcastId = currentPodcast ? currentPodcast.id : null;
+    useEffect(() => {
+        const token = localStorage.getItem('jwt_token');
+        if (!currentPodcastId || !token) {
+            return;
+        }
+        axios.post(`${API_URL}/podcasts/${currentPodcastId}/plays`, {}, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        }).catch((err) => console.error('Error al registrar la reproducción:', err.response?.data || err.message));
+    }, [currentPodcastId]);
+
+
     useEffect(() => {
         const audio = audioRef.current;
 
@@ -159,11 +175,15 @@ const GlobalAudioPlayer = () => {
             zIndex: 1000
         }}>
             <div style={{ display: 'flex', alignItems: 'center' }}>
-                <img
-                    src={currentPodcast.cover_image_url || 'https://placehold.co/50x50/000/FFF?text=Podcast'}
-                    alt="Podcast Cover"
-                    style={{ width: '50px', height: '50px', borderRadius: '5px', marginRight: '15px', objectFit: 'cover' }}
-                />
+                <picture style={{ display: 'contents' }}>
+                  {/* Miniatura WebP del tamaño mostrado; JPEG reducido u original como respaldo */}
+                  <source srcSet={currentPodcast.cover_image_variants?.webp?.['50']} type="image/webp" />
+                  <img
+                      src={currentPodcast.cover_image_variants?.jpeg?.['50'] || currentPodcast.cover_image_url || 'https://placehold.co/50x50/000/FFF?text=Podcast'}
+                      alt="Podcast Cover"
+                      style={{ width: '50px', height: '50px', borderRadius: '5px', marginRight: '15px', objectFit: 'cover' }}
+                  />
+                </picture>
                 <div>
                     <h4 style={{ margin: 0, fontSize: '1.1em', color: '#8AFFD2' }}>{currentPodcast.title}</h4>
                     <p style={{ margin: '5px 0 0 0', fontSize: '0.9em', color: '#bbb' }}>{currentPodcast.artist}</p>
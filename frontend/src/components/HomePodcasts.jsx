@@ -15,6 +15,10 @@ const HomePodcasts = () => {
 
   const [categories, setCategories] = useState([]);
   const [selectedCategory, setSelectedCategory] = useState('All');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // 'recent' = listado paginado por fecha; 'trending' = top de /podcasts/trending
+  const [sortMode, setSortMode] = useState('recent');
 
   const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
@@ -30,9 +34,9 @@ const HomePodcasts = () => {
       setLoading(true);
       setError(null);
 
-      let url = `${API_URL}/podcasts`;
+      let url = sortMode === 'trending' ? `${API_URL}/podcasts/trending` : `${API_URL}/podcasts`;
       if (selectedCategory && selectedCategory !== 'All') {
-        url = `${API_URL}/podcasts?category=${encodeURIComponent(selectedCategory)}`;
+        url = `${url}?category=${encodeURIComponent(selectedCategory)}`;
       }
       
       console.log(`DEBUG HOME: Obteniendo podcasts de: ${url}`);
@@ -43,6 +47,7 @@ const HomePodcasts = () => {
           }
         });
         setPodcasts(response.data.podcasts);
+        setNextCursor(response.data.next_cursor || null);
       } catch (err) {
         console.error('Error al obtener podcasts:', err);
         setError('Error al cargar podcasts.');
@@ -56,7 +61,7 @@ const HomePodcasts = () => {
     };
 
     fetchPodcasts();
-  }, [navigate, API_URL, selectedCategory]);
+  }, [navigate, API_URL, selectedCategory, sortMode]);
 
   useEffect(() => {
     const fetchCategories = async () => {
@@ -82,6 +87,33 @@ const HomePodcasts = () => {
     setSelectedCategory(category);
   };
 
+  // Carga la siguiente página usando el cursor devuelto por el backend
+  const handleLoadMore = async () => {
+    const token = localStorage.getItem('jwt_token');
+    if (!token || !nextCursor) {
+      return;
+    }
+    setLoadingMore(true);
+    try {
+      const params = { cursor: nextCursor };
+      if (selectedCategory && selectedCategory !== 'All') {
+        params.category = selectedCategory;
+      }
+      const response = await axios.get(`${API_URL}/podcasts`, {
+        params,
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      });
+      setPodcasts((prev) => [...prev, ...response.data.podcasts]);
+      setNextCursor(response.data.next_cursor || null);
+    } catch (err) {
+      console.error('Error al cargar más podcasts:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading && podcasts.length === 0) {
     return (
       <div className="main-content-wrapper" style={{ ...pageContainerStyle, textAlign: 'center', justifyContent: 'flex-start' }}>
@@ -104,6 +136,25 @@ const HomePodcasts = () => {
       <div style={{ ...contentBoxStyle, width: '100%', margin: '0 auto', boxSizing: 'border-box' }}>
         <h1 style={{ color: '#00FFFF', marginBottom: '20px', textAlign: 'center' }}>Explorar Podcasts</h1>
 
+        <div style={{ display: 'flex', justifyContent: 'center', gap: '10px', marginBottom: '15px' }}>
+          {[['recent', 'Recientes'], ['trending', 'Tendencias']].map(([mode, label]) => (
+            <button
+              key={mode}
+              onClick={() => setSortMode(mode)}
+              style={{
+                ...secondaryButtonStyle,
+                backgroundColor: sortMode === mode ? '#cc00cc' : '#555',
+                color: 'white',
+                padding: '8px 15px',
+                borderRadius: '20px',
+                minWidth: 'auto'
+              }}
+            >
+              {label}
+            </button>
+          ))}
+        </div>
+
         <div className="flex-container-responsive" style={{
           overflowX: 'auto',
           whiteSpace: 'nowrap',
@@ -163,23 +214,30 @@ const HomePodcasts = () => {
               >
                 {/* INICIO: CÓDIGO MEJORADO PARA IMAGENES */}
                 {console.log(`DEBUG IMAGEN HomePodcasts: URL para ${podcast.title}: ${podcast.cover_image_url}`)}
-                <img
-                  src={podcast.cover_image_url || 'https://placehold.co/180x180/424242/ffffff?text=No+Image'} // Fallback
-                  alt={podcast.title}
-                  style={{
-                    width: '100%',
-                    height: 'auto',
-                    maxHeight: '180px',
-                    objectFit: 'cover',
-                    borderRadius: '8px',
-                    marginBottom: '15px',
-                    boxShadow: '0 2px 5px rgba(0, 0, 0, 0.2)'
-                  }}
-                  onError={(e) => { e.target.onerror = null; e.target.src = 'https://placehold.co/180x180/424242/ffffff?text=Error+Loading'; }} // Fallback en error
-                />
+                <picture style={{ display: 'contents' }}>
+                  {/* Miniatura WebP del tamaño mostrado; JPEG reducido u original como respaldo */}
+                  <source srcSet={podcast.cover_image_variants?.webp?.['180']} type="image/webp" />
+                  <img
+                    src={podcast.cover_image_variants?.jpeg?.['180'] || podcast.cover_image_url || 'https://placehold.co/180x180/424242/ffffff?text=No+Image'} // Fallback
+                    alt={podcast.title}
+                    style={{
+                      width: '100%',
+                      height: 'auto',
+                      maxHeight: '180px',
+                      objectFit: 'cover',
+                      borderRadius: '8px',
+                      marginBottom: '15px',
+                      boxShadow: '0 2px 5px rgba(0, 0, 0, 0.2)'
+                    }}
+                    onError={(e) => { e.target.onerror = null; e.target.src = 'https://placehold.co/180x180/424242/ffffff?text=Error+Loading'; }} // Fallback en error
+                  />
+                </picture>
                 {/* FIN: CÓDIGO MEJORADO PARA IMAGENES */}
                 <h3 style={{ color: '#00FFFF', fontSize: '1.4em', margin: '10px 0' }}>{podcast.title}</h3>
                 <p style={{ color: '#ccc', fontSize: '1em', margin: '0 0 10px 0' }}>Artista: {podcast.artist}</p>
+                <p style={{ color: '#bbb', fontSize: '0.85em', margin: '0 0 10px 0' }}>
+                  {podcast.comment_count || 0} {podcast.comment_count === 1 ? 'comentario' : 'comentarios'}
+                </p>
                 <p style={{ color: '#aaa', fontSize: '0.9em', margin: '0 0 15px 0', maxHeight: '80px', overflow: 'hidden' }}>{podcast.description}</p>
 
                 <div style={{ display: 'flex', gap: '10px', marginTop: 'auto', width: '100%', justifyContent: 'center' }}>
@@ -214,6 +272,13 @@ const HomePodcasts = () => {
             ))
           )}
         </div>
+        {nextCursor && (
+          <div style={{ textAlign: 'center', marginTop: '20px' }}>
+            <button onClick={handleLoadMore} disabled={loadingMore} style={secondaryButtonStyle}>
+              {loadingMore ? 'Cargando...' : 'Cargar más'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
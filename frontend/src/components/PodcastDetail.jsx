@@ -15,6 +15,8 @@ const PodcastDetail = () => {
   const [comments, setComments] = useState([]);
   const [newCommentText, setNewCommentText] = useState('');
   const [commentLoading, setCommentLoading] = useState(false);
+  const [commentsCursor, setCommentsCursor] = useState(null);
+  const [loadingMoreComments, setLoadingMoreComments] = useState(false);
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
@@ -65,6 +67,7 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
         });
         console.log("DEBUG PODCAST DETAIL: Comentarios recibidos:", response.data.comments);
         setComments(response.data.comments);
+        setCommentsCursor(response.data.next_cursor || null);
       } catch (err) {
         console.error('Error al obtener comentarios:', err.response?.data || err.message);
         if (err.response && err.response.status !== 404) {
@@ -80,6 +83,25 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
     }
   }, [id, podcast, API_URL]);
 
+  // Carga la siguiente página de comentarios usando el cursor devuelto por el backend
+  const handleLoadMoreComments = async () => {
+    if (!commentsCursor) {
+      return;
+    }
+    setLoadingMoreComments(true);
+    try {
+      const response = await axios.get(`${API_URL}/api/podcasts/${id}/comments`, {
+        params: { cursor: commentsCursor }
+      });
+      setComments((prev) => [...prev, ...response.data.comments]);
+      setCommentsCursor(response.data.next_cursor || null);
+    } catch (err) {
+      console.error('Error al cargar más comentarios:', err.response?.data || err.message);
+    } finally {
+      setLoadingMoreComments(false);
+    }
+  };
+
   const handleAddComment = async (e) => {
     e.preventDefault();
     setCommentLoading(true);
@@ -201,19 +223,23 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
         {/* INICIO: CÓDIGO MEJORADO PARA IMAGENES */}
         {console.log(`DEBUG IMAGEN PodcastDetail: URL para ${podcast.title}: ${podcast.cover_image_url}`)}
-        <img
-          src={podcast.cover_image_url || 'https://placehold.co/300x300/424242/ffffff?text=No+Image'} // Fallback
-          alt={podcast.title}
-          style={{
-            width: '100%',
-            maxWidth: '300px', // Mantiene un tamaño máximo para desktop
-            height: 'auto',
-            borderRadius: '8px',
-            marginBottom: '20px',
-            boxShadow: '0 2px 4px rgba(0, 0, 0, 0.3)'
-          }}
-          onError={(e) => { e.target.onerror = null; e.target.src = 'https://placehold.co/300x300/424242/ffffff?text=Error+Loading'; }} // Fallback en error
-        />
+        <picture style={{ display: 'contents' }}>
+          {/* Miniatura WebP del tamaño mostrado; JPEG reducido u original como respaldo */}
+          <source srcSet={podcast.cover_image_variants?.webp?.['300']} type="image/webp" />
+          <img
+            src={podcast.cover_image_variants?.jpeg?.['300'] || podcast.cover_image_url || 'https://placehold.co/300x300/424242/ffffff?text=No+Image'} // Fallback
+            alt={podcast.title}
+            style={{
+              width: '100%',
+              maxWidth: '300px', // Mantiene un tamaño máximo para desktop
+              height: 'auto',
+              borderRadius: '8px',
+              marginBottom: '20px',
+              boxShadow: '0 2px 4px rgba(0, 0, 0, 0.3)'
+            }}
+            onError={(e) => { e.target.onerror = null; e.target.src = 'https://placehold.co/300x300/424242/ffffff?text=Error+Loading'; }} // Fallback en error
+          />
+        </picture>
         {/* FIN: CÓDIGO MEJORADO PARA IMAGENES */}
         <h1 style={{ color: '#8AFFD2', marginBottom: '10px', textAlign: 'center' }}>{podcast.title}</h1>
         {podcast.artist && <p style={{ color: '#bbb', fontSize: '1.1em', marginBottom: '15px' }}>Artista: {podcast.artist}</p>}
@@ -332,6 +358,13 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
               ))}
             </div>
           )}
+          {commentsCursor && (
+            <div style={{ textAlign: 'center', marginTop: '10px' }}>
+              <button onClick={handleLoadMoreComments} disabled={loadingMoreComments} style={secondaryButtonStyle}>
+                {loadingMoreComments ? 'Cargando...' : 'Cargar más comentarios'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
     </div>
@@ -232,19 +232,23 @@ const Profile = () => {
               }}>
                 {/* INICIO: CÓDIGO MEJORADO PARA IMAGENES */}
                 {console.log(`DEBUG IMAGEN Profile: URL para ${podcast.title}: ${podcast.cover_image_url}`)}
-                <img
-                  src={podcast.cover_image_url || 'https://placehold.co/150x150/424242/ffffff?text=No+Image'} // Fallback
-                  alt={podcast.title}
-                  style={{
-                    width: '100%',
-                    height: 'auto',
-                    maxHeight: '150px',
-                    objectFit: 'cover',
-                    borderRadius: '4px',
-                    marginBottom: '10px'
-                  }}
-                  onError={(e) => { e.target.onerror = null; e.target.src = 'https://placehold.co/150x150/424242/ffffff?text=Error+Loading'; }} // Fallback en error
-                />
+                <picture style={{ display: 'contents' }}>
+                  {/* Miniatura WebP del tamaño mostrado; JPEG reducido u original como respaldo */}
+                  <source srcSet={podcast.cover_image_variants?.webp?.['180']} type="image/webp" />
+                  <img
+                    src={podcast.cover_image_variants?.jpeg?.['180'] || podcast.cover_image_url || 'https://placehold.co/150x150/424242/ffffff?text=No+Image'} // Fallback
+                    alt={podcast.title}
+                    style={{
+                      width: '100%',
+                      height: 'auto',
+                      maxHeight: '150px',
+                      objectFit: 'cover',
+                      borderRadius: '4px',
+                      marginBottom: '10px'
+                    }}
+                    onError={(e) => { e.target.onerror = null; e.target.src = 'https://placehold.co/150x150/424242/ffffff?text=Error+Loading'; }} // Fallback en error
+                  />
+                </picture>
                 {/* FIN: CÓDIGO MEJORADO PARA IMAGENES */}
                 <h3 style={{ color: '#00FFFF', fontSize: '1.2em', margin: '10px 0' }}>{podcast.title}</h3>
                 <p style={{ color: '#ccc', fontSize: '0.9em', margin: '0 0 10px 0' }}>Artista: {podcast.artist}</p>
@@ -58,6 +58,7 @@ const UploadPodcast = () => {
         try {
             const response = await fetch(`${API_URL}/podcasts`, {
                 method: 'POST',
+                credentials: 'include',
                 headers: {
                     'Authorization': `Bearer ${token}`
                 },
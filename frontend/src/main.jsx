@@ -2,6 +2,11 @@
 import React from 'react';
 import ReactDOM from 'react-dom/client';
 import App from './App.jsx'; 
+import axios from 'axios';
+
+// Cookies en las peticiones a la API: el backend guarda en una el estado del catálogo tras
+// cada escritura para que las lecturas siguientes del usuario la vean (réplica de lectura)
+axios.defaults.withCredentials = true;
 // import './index.css'; // Si tienes un archivo CSS global, asegúrate de que la ruta sea correcta.
 
 ReactDOM.createRoot(document.getElementById('root')).render(